@@ -0,0 +1,39 @@
+"""
+Accounts Module - Ciclo de vida da conta do usuário
+===================================================
+- deletion.py: registro das coleções do usuário e exclusão em cascata
+  (paralela, com job em background e status)
+"""
+
+from .deletion import (
+    CREDENTIAL_COLLECTIONS,
+    DELETION_JOB_STALE_SECONDS,
+    DELETION_JOBS,
+    AccountDeletionError,
+    USER_COLLECTIONS,
+    UserCollection,
+    delete_user_data,
+    ensure_deletion_indexes,
+    get_deletion_job,
+    owner_filter,
+    run_deletion_job,
+    start_deletion_job,
+)
+
+__all__ = [
+    # Registro
+    'CREDENTIAL_COLLECTIONS',
+    'USER_COLLECTIONS',
+    'UserCollection',
+    'owner_filter',
+
+    # Exclusão
+    'AccountDeletionError',
+    'DELETION_JOB_STALE_SECONDS',
+    'DELETION_JOBS',
+    'delete_user_data',
+    'ensure_deletion_indexes',
+    'get_deletion_job',
+    'run_deletion_job',
+    'start_deletion_job',
+]
@@ -0,0 +1,210 @@
+"""
+Exclusão de conta em cascata
+============================
+USER_COLLECTIONS registra cada coleção com dados do usuário e por quais
+campos ela é ligada a ele. A exclusão roda um único delete_many por coleção
+(filtro $or quando há mais de um campo) e todas as coleções em paralelo com
+asyncio.gather - em vez de 3 deletes sequenciais por coleção.
+
+Coleção nova com dados do usuário? Registre aqui, senão ela fica órfã.
+
+Falhas: cada coleção é tentada PURGE_ATTEMPTS vezes; se alguma continuar
+falhando, delete_user_data() levanta AccountDeletionError com o que foi e o
+que não foi removido. As credenciais (CREDENTIAL_COLLECTIONS) só saem
+depois que todo o resto saiu - o usuário continua podendo reenviar o pedido.
+
+Modo em background: start_deletion_job() grava o status em
+`account_deletion_jobs` e executa a limpeza numa task; o app acompanha por
+get_deletion_job() (done ou failed + failed_collections). Os deletes são
+idempotentes, então um job que falhou pode ser simplesmente reenviado.
+Job parado em pending/running há mais de DELETION_JOB_STALE_SECONDS (worker
+morreu no meio) é marcado como failed na consulta, para o app não ficar
+esperando para sempre.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from diet.trace import DIET_TRACES
+from jobs import JOBS, cancel_user_jobs
+from notifications import NOTIFICATION_COUNTERS, NOTIFICATIONS
+from sync import SYNC_COUNTERS, SYNC_MUTATIONS
+from tracking import WATER_COLLECTION, WEIGHT_LEGACY, WEIGHT_SERIES
+
+logger = logging.getLogger(__name__)
+
+DELETION_JOBS = "account_deletion_jobs"
+DELETION_JOB_TTL_DAYS = 7
+DELETION_JOB_STALE_SECONDS = 600
+
+PURGE_ATTEMPTS = 3
+PURGE_RETRY_DELAY = 0.5  # segundos, dobra a cada tentativa
+
+
+@dataclass(frozen=True)
+class UserCollection:
+    name: str
+    keys: Tuple[str, ...] = ("user_id",)
+
+
+USER_COLLECTIONS: Tuple[UserCollection, ...] = (
+    # Conta e perfil (_id = user_id)
+    UserCollection("users_auth", ("_id", "id")),
+    UserCollection("user_profiles", ("_id",)),
+    UserCollection("user_settings"),
+    # Planos
+    UserCollection("diet_plans"),
+    UserCollection(DIET_TRACES),
+    UserCollection("workout_plans"),
+    UserCollection("workout_history"),
+    UserCollection("training_cycles"),
+    UserCollection("training_sessions"),
+    UserCollection("workout_tracking"),
+    UserCollection("cardio_sessions"),
+    # Tracking (weight_series é time-series: filtro só no metaField user_id)
+    UserCollection(WATER_COLLECTION),
+    UserCollection(WEIGHT_SERIES),
+    UserCollection(WEIGHT_LEGACY),
+    # Notificações e sync
+    UserCollection(NOTIFICATIONS),
+    UserCollection(NOTIFICATION_COUNTERS, ("_id",)),
+    UserCollection(SYNC_COUNTERS, ("_id",)),
+    UserCollection(SYNC_MUTATIONS),
+    # Fila de jobs (regeneração de dieta)
+    UserCollection(JOBS),
+    # Legado: sem escrita no código atual, formato de chave incerto
+    UserCollection("diets", ("_id", "user_id", "id")),
+    UserCollection("workouts", ("_id", "user_id", "id")),
+    UserCollection("weight_history", ("_id", "user_id", "id")),
+    UserCollection("progress_photos", ("_id", "user_id", "id")),
+    UserCollection("meal_logs", ("_id", "user_id", "id")),
+)
+
+# Removidas por último, só se o resto saiu (login continua funcionando para reenviar)
+CREDENTIAL_COLLECTIONS = frozenset({"users_auth"})
+
+# Tasks em andamento (referência forte até terminarem)
+_running: Set[asyncio.Task] = set()
+
+
+def owner_filter(user_id: str, keys: Tuple[str, ...]) -> Dict:
+    if len(keys) == 1:
+        return {keys[0]: user_id}
+    return {"$or": [{key: user_id} for key in keys]}
+
+
+class AccountDeletionError(Exception):
+    """Alguma coleção não foi limpa; `deleted` tem o que saiu, `failed` o erro de cada uma que falhou"""
+
+    def __init__(self, deleted: Dict[str, int], failed: Dict[str, str]):
+        super().__init__(f"Falha ao limpar {', '.join(sorted(failed))}")
+        self.deleted = deleted
+        self.failed = failed
+
+
+async def _purge(db, collection: UserCollection, user_id: str) -> int:
+    for attempt in range(PURGE_ATTEMPTS):
+        try:
+            result = await db[collection.name].delete_many(owner_filter(user_id, collection.keys))
+            return result.deleted_count
+        except Exception as e:
+            logger.warning(f"Erro ao limpar {collection.name} (tentativa {attempt + 1}/{PURGE_ATTEMPTS}): {e}")
+            if attempt + 1 == PURGE_ATTEMPTS:
+                raise
+            await asyncio.sleep(PURGE_RETRY_DELAY * 2 ** attempt)
+
+
+async def _purge_all(db, collections: Iterable[UserCollection], user_id: str,
+                     deleted: Dict[str, int], failed: Dict[str, str]):
+    collections = list(collections)
+    results = await asyncio.gather(*(_purge(db, c, user_id) for c in collections), return_exceptions=True)
+    for collection, result in zip(collections, results):
+        if isinstance(result, Exception):
+            failed[collection.name] = str(result) or type(result).__name__
+        elif result:
+            deleted[collection.name] = result
+
+
+async def delete_user_data(db, user_id: str) -> Dict[str, int]:
+    """
+    Remove os dados do usuário de todas as coleções; retorna {coleção: removidos}.
+    Levanta AccountDeletionError (credenciais mantidas) se alguma coleção falhar.
+    """
+    deleted: Dict[str, int] = {}
+    failed: Dict[str, str] = {}
+    # Nenhum worker pega job novo do usuário durante a limpeza (o que já roda
+    # confere o perfil antes de gravar)
+    await cancel_user_jobs(db, user_id)
+    await _purge_all(db, (c for c in USER_COLLECTIONS if c.name not in CREDENTIAL_COLLECTIONS), user_id, deleted, failed)
+    if not failed:
+        await _purge_all(db, (c for c in USER_COLLECTIONS if c.name in CREDENTIAL_COLLECTIONS), user_id, deleted, failed)
+    if failed:
+        raise AccountDeletionError(deleted, failed)
+    return deleted
+
+
+async def run_deletion_job(db, job_id: str, user_id: str, raise_errors: bool = True) -> Optional[Dict[str, int]]:
+    """
+    Executa o job e grava done/failed. Com raise_errors=False (task em
+    background, ninguém aguarda) a falha fica só no status e retorna None.
+    """
+    jobs = db[DELETION_JOBS]
+    await jobs.update_one({"_id": job_id}, {"$set": {"status": "running", "started_at": datetime.utcnow()}})
+    try:
+        deleted = await delete_user_data(db, user_id)
+    except Exception as e:
+        logger.error(f"Job de exclusão {job_id} falhou: {e}")
+        details = {"deleted_data": e.deleted, "failed_collections": e.failed} if isinstance(e, AccountDeletionError) else {}
+        await jobs.update_one(
+            {"_id": job_id},
+            {"$set": {"status": "failed", "error": str(e), **details, "finished_at": datetime.utcnow()}},
+        )
+        if raise_errors:
+            raise
+        return None
+    await jobs.update_one(
+        {"_id": job_id},
+        {"$set": {"status": "done", "deleted_data": deleted, "finished_at": datetime.utcnow()}},
+    )
+    logger.info(f"✅ Conta excluída (job {job_id}): {user_id} {deleted}")
+    return deleted
+
+
+async def start_deletion_job(db, user_id: str) -> str:
+    """Registra o job (status "pending") e dispara a limpeza em background"""
+    job_id = str(uuid.uuid4())
+    await db[DELETION_JOBS].insert_one({
+        "_id": job_id,
+        "user_id": user_id,
+        "status": "pending",
+        "created_at": datetime.utcnow(),
+    })
+    task = asyncio.get_running_loop().create_task(run_deletion_job(db, job_id, user_id, raise_errors=False))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return job_id
+
+
+async def get_deletion_job(db, job_id: str) -> Optional[Dict]:
+    jobs = db[DELETION_JOBS]
+    job = await jobs.find_one({"_id": job_id}, {"user_id": 0})
+    if not job or job.get("status") not in ("pending", "running"):
+        return job
+
+    now = datetime.utcnow()
+    since = job.get("started_at") or job.get("created_at") or now
+    if now - since < timedelta(seconds=DELETION_JOB_STALE_SECONDS):
+        return job
+    # Worker morreu no meio: o status só muda se o job ainda estiver parado no mesmo ponto
+    stale = {"status": "failed", "error": "Job interrompido", "finished_at": now}
+    await jobs.update_one({"_id": job_id, "status": job["status"], "started_at": job.get("started_at")}, {"$set": stale})
+    return {**job, **stale}
+
+
+async def ensure_deletion_indexes(db):
+    """TTL dos jobs (os filtros por user_id usam os índices já existentes de cada coleção)"""
+    await db[DELETION_JOBS].create_index("created_at", expireAfterSeconds=DELETION_JOB_TTL_DAYS * 86400)
@@ -0,0 +1,6 @@
+"""
+Benchmarks - Suíte offline de desempenho
+========================================
+Roda localmente (sem servidor, sem preview remoto) sobre corpus sintéticos
+fixos. Uso: `cd backend && python -m benchmarks.diet_engine --help`
+"""
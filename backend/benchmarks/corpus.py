@@ -0,0 +1,106 @@
+"""
+Corpus sintético de perfis para o benchmark do motor de dieta.
+
+Produto cartesiano fixo (sem aleatoriedade) de:
+- restrição: nenhuma / vegetariano / vegano / sem_lactose
+- refeições: 4 / 5 / 6
+- objetivo: cutting / manutencao / bulking
+- porte: tiny (metas mínimas) / medium / huge (metas máximas)
+
+As metas saem de diet/formulas.py, igual ao POST /user/profile.
+
+trace_corpus() carrega o corpus de regressão com entradas reais
+anonimizadas (benchmarks/replay.py export-corpus) no mesmo formato.
+"""
+
+import json
+from itertools import product
+from typing import Dict, List, NamedTuple
+
+from diet.formulas import calculate_profile_targets, normalize_goal
+
+RESTRICTIONS = ("nenhuma", "vegetariano", "vegano", "sem_lactose")
+MEAL_COUNTS = (4, 5, 6)
+GOALS = ("cutting", "manutencao", "bulking")
+
+# (peso, altura, idade, sexo, frequência, nível)
+BODY_SIZES = {
+    "tiny": (42.0, 150.0, 65, "feminino", 0, "novato"),
+    "medium": (75.0, 175.0, 30, "masculino", 4, "intermediario"),
+    "huge": (140.0, 200.0, 22, "masculino", 6, "avancado"),
+}
+
+# Preferências típicas do onboarding (filtradas pelas restrições no motor)
+FOOD_PREFERENCES = [
+    "frango", "ovos", "tofu", "arroz_branco", "batata_doce", "aveia",
+    "feijao", "azeite", "banana", "iogurte_zero", "whey_protein",
+]
+
+
+class DietBenchCase(NamedTuple):
+    case_id: str
+    classes: Dict[str, str]   # dimensão → valor (ex.: {"goal": "cutting"})
+    profile: Dict
+    target_calories: float
+    target_macros: Dict[str, float]
+    meal_count: int
+
+
+def diet_corpus() -> List[DietBenchCase]:
+    cases = []
+    for restriction, meal_count, goal, size in product(RESTRICTIONS, MEAL_COUNTS, GOALS, BODY_SIZES):
+        weight, height, age, sex, frequency, level = BODY_SIZES[size]
+        targets = calculate_profile_targets(weight, height, age, sex, frequency, level, goal)
+        case_id = f"{restriction}-{meal_count}m-{goal}-{size}"
+        cases.append(DietBenchCase(
+            case_id=case_id,
+            classes={"restriction": restriction, "meals": str(meal_count), "goal": goal, "size": size},
+            profile={
+                "_id": f"bench-{case_id}",
+                "weight": weight,
+                "height": height,
+                "age": age,
+                "sex": sex,
+                "goal": goal,
+                "training_level": level,
+                "weekly_training_frequency": frequency,
+                "dietary_restrictions": [] if restriction == "nenhuma" else [restriction],
+                "food_preferences": list(FOOD_PREFERENCES),
+            },
+            target_calories=targets["target_calories"],
+            target_macros=targets["macros"],
+            meal_count=meal_count,
+        ))
+    return cases
+
+
+def trace_corpus(path: str) -> List[DietBenchCase]:
+    """Casos do corpus de traces (só entrada "plan": a que o benchmark cronometra)"""
+    with open(path, encoding="utf-8") as f:
+        corpus = json.load(f)
+    cases = []
+    for item in corpus:
+        if item["entry"] != "plan":
+            continue
+        inputs = item["inputs"]
+        restrictions = inputs["dietary_restrictions"]
+        cases.append(DietBenchCase(
+            case_id=f"trace-{item['case_id']}",
+            classes={
+                "restriction": restrictions[0] if restrictions else "nenhuma",
+                "meals": str(inputs["meal_count"]),
+                "goal": normalize_goal(inputs["goal"]),
+                "source": "trace",
+            },
+            profile={
+                "_id": f"trace-{item['case_id']}",
+                "weight": inputs["weight"],
+                "goal": inputs["goal"],
+                "dietary_restrictions": list(restrictions),
+                "food_preferences": list(inputs["food_preferences"]),
+            },
+            target_calories=inputs["target_calories"],
+            target_macros=inputs["target_macros"],
+            meal_count=inputs["meal_count"],
+        ))
+    return cases
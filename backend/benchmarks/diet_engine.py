@@ -0,0 +1,213 @@
+"""
+Benchmark offline de DietAIService.generate_diet_plan
+=====================================================
+Gera a dieta de cada perfil do corpus (benchmarks/corpus.py) N vezes e
+reporta, no total e por classe (restrição, refeições, objetivo, porte):
+
+- latência p50 / p99 (ms)
+- pico de memória alocada por geração (KiB, tracemalloc)
+- erro final de macros (% médio e máximo |computado - meta| / meta)
+
+Comparado a um baseline JSON, sai com código 1 se alguma métrica piorar
+além do limite (para CI). O motor ordena os conjuntos de alimentos antes de
+iterar, então o erro de macros é reprodutível em qualquer PYTHONHASHSEED:
+
+    python -m benchmarks.diet_engine --baseline benchmarks/baselines/diet_engine.json
+    python -m benchmarks.diet_engine --save-baseline benchmarks/baselines/diet_engine.json
+
+Com --corpus o benchmark roda o corpus de traces reais (benchmarks/replay.py
+export-corpus) no lugar do sintético - use um baseline próprio para ele.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from diet.profiling import macro_error_pct
+
+from .corpus import DietBenchCase, diet_corpus, trace_corpus
+
+# Tolerâncias padrão do gate de regressão
+DEFAULT_LATENCY_THRESHOLD = 0.25     # +25% em p50/p99
+DEFAULT_MEMORY_THRESHOLD = 0.25      # +25% no pico de memória
+DEFAULT_MACRO_ERROR_SLACK = 1.0      # +1 ponto percentual no erro médio
+LATENCY_NOISE_FLOOR_MS = 0.5         # diferenças abaixo disso são ruído
+
+
+def _generate(service, case: DietBenchCase):
+    # O motor imprime bastante diagnóstico; fora do timing isso seria I/O puro
+    with contextlib.redirect_stdout(io.StringIO()):
+        return service.generate_diet_plan(
+            user_profile=dict(case.profile),
+            target_calories=case.target_calories,
+            target_macros=dict(case.target_macros),
+            meal_count=case.meal_count,
+        )
+
+
+def _summarize(latencies_ms: List[float], peaks_kib: List[float], errors: List[float]) -> Dict:
+    lat = np.asarray(latencies_ms)
+    return {
+        "samples": int(lat.size),
+        "p50_ms": round(float(np.percentile(lat, 50)), 3),
+        "p99_ms": round(float(np.percentile(lat, 99)), 3),
+        "mean_ms": round(float(lat.mean()), 3),
+        "peak_kib": round(float(np.mean(peaks_kib)), 1),
+        "macro_error_pct": round(float(np.mean(errors)), 2),
+        "macro_error_max_pct": round(float(np.max(errors)), 2),
+    }
+
+
+def run_diet_benchmark(repeat: int = 5, warmup: int = 1,
+                       cases: Optional[Iterable[DietBenchCase]] = None) -> Dict:
+    """Roda o corpus e devolve o relatório (dict serializável em JSON)"""
+    from diet_service import DietAIService
+
+    service = DietAIService()
+    cases = list(cases) if cases is not None else diet_corpus()
+
+    per_case = {}
+    for case in cases:
+        for _ in range(warmup):
+            _generate(service, case)
+
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            plan = _generate(service, case)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        # Execução separada para memória (tracemalloc distorce a latência)
+        tracemalloc.start()
+        _generate(service, case)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        per_case[case.case_id] = {
+            "classes": case.classes,
+            "latencies_ms": latencies,
+            "peak_kib": peak / 1024,
+            "macro_error_pct": macro_error_pct(plan.computed_macros, plan.target_macros),
+        }
+
+    groups = defaultdict(list)
+    for case_id, result in per_case.items():
+        groups["overall"].append(result)
+        for dimension, value in result["classes"].items():
+            groups[f"{dimension}:{value}"].append(result)
+
+    classes = {}
+    for name, results in sorted(groups.items()):
+        classes[name] = _summarize(
+            [lat for r in results for lat in r["latencies_ms"]],
+            [r["peak_kib"] for r in results],
+            [r["macro_error_pct"] for r in results],
+        )
+
+    return {
+        "meta": {
+            "cases": len(per_case),
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "classes": classes,
+        "cases": {
+            case_id: {
+                "p50_ms": round(float(np.percentile(r["latencies_ms"], 50)), 3),
+                "peak_kib": round(r["peak_kib"], 1),
+                "macro_error_pct": round(r["macro_error_pct"], 2),
+            }
+            for case_id, r in per_case.items()
+        },
+    }
+
+
+def compare_reports(current: Dict, baseline: Dict,
+                    latency_threshold: float = DEFAULT_LATENCY_THRESHOLD,
+                    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+                    macro_error_slack: float = DEFAULT_MACRO_ERROR_SLACK) -> List[str]:
+    """Lista de regressões (vazia = OK) do relatório atual contra o baseline"""
+    regressions = []
+    for name, base in baseline.get("classes", {}).items():
+        cur = current["classes"].get(name)
+        if cur is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            limit = max(base[metric] * (1 + latency_threshold), base[metric] + LATENCY_NOISE_FLOOR_MS)
+            if cur[metric] > limit:
+                regressions.append(f"{name}: {metric} {cur[metric]:.3f} > {limit:.3f} (baseline {base[metric]:.3f})")
+        limit = base["peak_kib"] * (1 + memory_threshold)
+        if cur["peak_kib"] > limit:
+            regressions.append(f"{name}: peak_kib {cur['peak_kib']:.1f} > {limit:.1f} (baseline {base['peak_kib']:.1f})")
+        limit = base["macro_error_pct"] + macro_error_slack
+        if cur["macro_error_pct"] > limit:
+            regressions.append(
+                f"{name}: macro_error_pct {cur['macro_error_pct']:.2f} > {limit:.2f} (baseline {base['macro_error_pct']:.2f})"
+            )
+    return regressions
+
+
+def format_report(report: Dict) -> str:
+    header = f"{'classe':<24}{'p50 ms':>9}{'p99 ms':>9}{'pico KiB':>10}{'erro %':>9}{'erro máx':>10}"
+    lines = [header, "-" * len(header)]
+    for name, s in report["classes"].items():
+        lines.append(
+            f"{name:<24}{s['p50_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['peak_kib']:>10.1f}"
+            f"{s['macro_error_pct']:>9.2f}{s['macro_error_max_pct']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline do motor de dieta")
+    parser.add_argument("--repeat", type=int, default=5, help="gerações cronometradas por perfil")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--baseline", help="JSON de baseline para o gate de regressão")
+    parser.add_argument("--save-baseline", help="salva o relatório atual como baseline")
+    parser.add_argument("--output", help="salva o relatório completo (JSON)")
+    parser.add_argument("--corpus", help="corpus de traces (JSON) no lugar do corpus sintético")
+    parser.add_argument("--latency-threshold", type=float, default=DEFAULT_LATENCY_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    parser.add_argument("--macro-error-slack", type=float, default=DEFAULT_MACRO_ERROR_SLACK)
+    args = parser.parse_args(argv)
+
+    cases = trace_corpus(args.corpus) if args.corpus else None
+    report = run_diet_benchmark(repeat=args.repeat, warmup=args.warmup, cases=cases)
+    print(format_report(report))
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\n📄 Relatório salvo em {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(
+            report, baseline,
+            latency_threshold=args.latency_threshold,
+            memory_threshold=args.memory_threshold,
+            macro_error_slack=args.macro_error_slack,
+        )
+        if regressions:
+            print("\n❌ Regressões em relação ao baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✅ Sem regressões em relação ao baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
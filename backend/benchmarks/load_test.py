@@ -0,0 +1,352 @@
+"""
+Load test local do server.app (sem preview remoto)
+==================================================
+Sobe o app FastAPI em processo (httpx + ASGITransport) apontando para um
+Mongo local (--mongo-url) ou para o mongomock-motor em memória (padrão),
+semeia N usuários com histórico e roda a jornada típica do app com
+concorrência configurável:
+
+    login → dashboard (perfil + ciclo + água) → dieta → água +250ml → toggle de exercício
+
+Reporta throughput, histograma de latência por rota e lag do event loop.
+
+    pip install mongomock-motor   # só para o modo em memória
+    python -m benchmarks.load_test --users 200 --concurrency 50 --duration 30
+    python -m benchmarks.load_test --mongo-url mongodb://localhost:27017 --json out.json
+
+Com --mongo-url os dados vão para um banco descartável (laf_loadtest_<ts>),
+removido no final salvo --keep-db.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+LOADTEST_PASSWORD = "LoadTest2025!"
+
+# Limites superiores (ms) dos buckets do histograma
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, float("inf"))
+
+PROFILE_TEMPLATES = (
+    {"sex": "masculino", "weight": 82.0, "height": 178.0, "age": 29, "goal": "bulking",
+     "training_level": "intermediario", "weekly_training_frequency": 4, "available_time_per_session": 60},
+    {"sex": "feminino", "weight": 63.0, "height": 165.0, "age": 34, "goal": "cutting",
+     "training_level": "iniciante", "weekly_training_frequency": 3, "available_time_per_session": 45},
+    {"sex": "masculino", "weight": 95.0, "height": 185.0, "age": 41, "goal": "manutencao",
+     "training_level": "avancado", "weekly_training_frequency": 6, "available_time_per_session": 90},
+    {"sex": "feminino", "weight": 55.0, "height": 158.0, "age": 23, "goal": "bulking",
+     "training_level": "novato", "weekly_training_frequency": 2, "available_time_per_session": 30,
+     "dietary_restrictions": ["vegetariano"]},
+)
+
+
+# ==================== MÉTRICAS ====================
+
+class LoadTestStats:
+    """Latências por rota + lag do event loop"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.loop_lag_ms: List[float] = []
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def record(self, route: str, latency_ms: float, status: int):
+        self.latencies[route].append(latency_ms)
+        self.statuses[route][status] += 1
+
+    def report(self) -> Dict:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        total = sum(len(v) for v in self.latencies.values())
+        routes = {}
+        for route, values in sorted(self.latencies.items()):
+            lat = np.asarray(values)
+            counts, _ = np.histogram(lat, bins=(0,) + HISTOGRAM_BUCKETS_MS)
+            routes[route] = {
+                "requests": int(lat.size),
+                "rps": round(lat.size / elapsed, 1) if elapsed else 0.0,
+                "p50_ms": round(float(np.percentile(lat, 50)), 2),
+                "p90_ms": round(float(np.percentile(lat, 90)), 2),
+                "p99_ms": round(float(np.percentile(lat, 99)), 2),
+                "max_ms": round(float(lat.max()), 2),
+                "status": {str(k): v for k, v in sorted(self.statuses[route].items())},
+                "histogram": {
+                    ("inf" if upper == float("inf") else f"le_{upper:g}ms"): int(c)
+                    for upper, c in zip(HISTOGRAM_BUCKETS_MS, counts)
+                },
+            }
+        lag = np.asarray(self.loop_lag_ms or [0.0])
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+            "event_loop_lag_ms": {
+                "samples": len(self.loop_lag_ms),
+                "p50": round(float(np.percentile(lag, 50)), 2),
+                "p99": round(float(np.percentile(lag, 99)), 2),
+                "max": round(float(lag.max()), 2),
+            },
+            "routes": routes,
+        }
+
+
+async def monitor_loop_lag(stats: LoadTestStats, stop: asyncio.Event, interval: float = 0.01):
+    """Mede o atraso do event loop: quanto um sleep(interval) passa do previsto"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        stats.loop_lag_ms.append(max(0.0, (loop.time() - start - interval) * 1000))
+
+
+# ==================== BANCO / APP ====================
+
+def connect_database(mongo_url: Optional[str], db_name: str):
+    """Motor real (mongod local) ou mongomock-motor em memória"""
+    if mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(mongo_url)
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit("mongomock-motor não instalado: `pip install mongomock-motor` ou use --mongo-url")
+        client = AsyncMongoMockClient()
+    return client, client[db_name]
+
+
+def bind_app(database):
+    """Importa server.py e troca o banco global (rotas, AuthService, stores) pelo do teste"""
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    import server
+    from auth_service import AuthService
+
+    server.db = database
+    server.auth_service = AuthService(database)
+    server.weight_store = server.WeightStore(database)
+    server.notification_scheduler.db = database
+    server.notification_scheduler.weight_store = server.weight_store
+    server.job_workers.db = database
+    server.readiness_probe.db = database
+    return server.app
+
+
+async def seed_users(http, database, n_users: int, rng: random.Random) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Cria N usuários completos: auth + perfil (via API, calcula metas) + dieta
+    e treino gerados + histórico de peso, treinos e água.
+
+    Retorna (usuários, falhas de geração por rota/status).
+    """
+    from auth_service import hash_password
+
+    password_hash, salt = hash_password(LOADTEST_PASSWORD)
+    now = datetime.utcnow()
+    users = []
+    failures: Dict[str, int] = defaultdict(int)
+
+    for i in range(n_users):
+        user_id = str(uuid.uuid4())
+        email = f"loadtest{i}@laf.test"
+        template = dict(PROFILE_TEMPLATES[i % len(PROFILE_TEMPLATES)])
+        template["weight"] = round(template["weight"] + rng.uniform(-5, 5), 1)
+
+        await database.users_auth.insert_one({
+            "_id": user_id, "id": user_id, "email": email,
+            "password_hash": password_hash, "salt": salt,
+            "is_active": True, "created_at": now,
+        })
+        resp = await http.post("/api/user/profile", json={"id": user_id, "name": f"Load {i}", **template})
+        resp.raise_for_status()
+        # Falhas de geração não abortam o seed: ficam no relatório (e a rota responde 404)
+        resp = await http.post("/api/diet/generate", params={"user_id": user_id})
+        if resp.status_code != 200:
+            failures[f"POST /diet/generate {resp.status_code}"] += 1
+        resp = await http.post("/api/workout/generate", params={"user_id": user_id})
+        workout = resp.json() if resp.status_code == 200 else {}
+        if resp.status_code != 200:
+            failures[f"POST /workout/generate {resp.status_code}"] += 1
+
+        await database.weight_series.insert_many([
+            {"_id": str(uuid.uuid4()), "user_id": user_id,
+             "weight": round(template["weight"] + rng.uniform(-2, 2), 1),
+             "recorded_at": now - timedelta(weeks=w)}
+            for w in range(1, 13)
+        ])
+        await database.workout_history.insert_many([
+            {"_id": str(uuid.uuid4()), "user_id": user_id, "workout_day_name": "Treino",
+             "exercises_completed": 6, "total_exercises": 6, "duration_minutes": 55,
+             "completed_at": now - timedelta(days=d)}
+            for d in range(1, 40, 2)
+        ])
+        await database.water_sodium_tracker.insert_many([
+            {"_id": str(uuid.uuid4()), "user_id": user_id,
+             "date": (now - timedelta(days=d)).replace(hour=0, minute=0, second=0, microsecond=0),
+             "day": (now - timedelta(days=d)).strftime("%Y-%m-%d"),
+             "water_ml": rng.randrange(1000, 4000, 250), "sodium_mg": rng.randrange(500, 3000, 100)}
+            for d in range(1, 31)
+        ])
+
+        users.append({
+            "user_id": user_id,
+            "email": email,
+            "workout_id": workout.get("id"),
+            "workout_days": len(workout.get("workout_days", [])),
+        })
+    return users, dict(failures)
+
+
+# ==================== CENÁRIO ====================
+
+async def timed(http, stats: LoadTestStats, route: str, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    resp = await http.request(method, url, **kwargs)
+    stats.record(route, (time.perf_counter() - start) * 1000, resp.status_code)
+    return resp
+
+
+async def user_journey(http, stats: LoadTestStats, user: Dict, rng: random.Random):
+    """Jornada típica de uma abertura do app"""
+    user_id = user["user_id"]
+    await timed(http, stats, "POST /auth/login", "POST", "/api/auth/login",
+                json={"email": user["email"], "password": LOADTEST_PASSWORD})
+
+    await asyncio.gather(
+        timed(http, stats, "GET /user/profile", "GET", f"/api/user/profile/{user_id}"),
+        timed(http, stats, "GET /training-cycle/status", "GET", f"/api/training-cycle/status/{user_id}"),
+        timed(http, stats, "GET /tracker/water-sodium", "GET", f"/api/tracker/water-sodium/{user_id}"),
+    )
+    await timed(http, stats, "GET /diet", "GET", f"/api/diet/{user_id}")
+    await timed(http, stats, "POST /tracker/water-sodium", "POST", f"/api/tracker/water-sodium/{user_id}",
+                json={"water_ml": 250})
+
+    if user["workout_id"] and user["workout_days"]:
+        await timed(http, stats, "PUT /workout/exercise/complete", "PUT",
+                    f"/api/workout/{user['workout_id']}/exercise/complete",
+                    json={"workout_day_index": rng.randrange(user["workout_days"]),
+                          "exercise_index": 0, "completed": rng.random() < 0.5})
+
+
+async def virtual_user(http, stats: LoadTestStats, users: List[Dict], rng: random.Random,
+                       deadline: float, iterations: Optional[int], think_time: float):
+    done = 0
+    while time.perf_counter() < deadline and (iterations is None or done < iterations):
+        await user_journey(http, stats, rng.choice(users), rng)
+        done += 1
+        if think_time:
+            await asyncio.sleep(rng.uniform(0, think_time))
+
+
+async def run_load_test(n_users: int = 100, concurrency: int = 20, duration: float = 20.0,
+                        iterations: Optional[int] = None, think_time: float = 0.0,
+                        mongo_url: Optional[str] = None, keep_db: bool = False, seed: int = 42) -> Dict:
+    import httpx
+
+    db_name = f"laf_loadtest_{int(time.time())}"
+    client, database = connect_database(mongo_url, db_name)
+    app = bind_app(database)
+    rng = random.Random(seed)
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as http:
+            seed_start = time.perf_counter()
+            users, seed_failures = await seed_users(http, database, n_users, rng)
+            seed_seconds = time.perf_counter() - seed_start
+
+            stats = LoadTestStats()
+            stop = asyncio.Event()
+            lag_task = asyncio.create_task(monitor_loop_lag(stats, stop))
+            deadline = time.perf_counter() + duration
+            await asyncio.gather(*(
+                virtual_user(http, stats, users, random.Random(seed + vu), deadline, iterations, think_time)
+                for vu in range(concurrency)
+            ))
+            stats.finished_at = time.perf_counter()
+            stop.set()
+            await lag_task
+    finally:
+        if mongo_url and not keep_db:
+            await client.drop_database(db_name)
+
+    report = stats.report()
+    report["config"] = {
+        "users": n_users, "concurrency": concurrency, "duration_s": duration,
+        "iterations": iterations, "think_time_s": think_time,
+        "backend": "mongod" if mongo_url else "mongomock-motor",
+        "seed_seconds": round(seed_seconds, 2),
+        "seed_failures": seed_failures,
+    }
+    return report
+
+
+def format_report(report: Dict) -> str:
+    lag = report["event_loop_lag_ms"]
+    lines = [
+        f"⏱️  {report['requests']} requisições em {report['elapsed_s']}s → {report['throughput_rps']} req/s "
+        f"({report['config']['backend']}, {report['config']['concurrency']} usuários simultâneos)",
+        f"🔁 lag do event loop: p50={lag['p50']}ms p99={lag['p99']}ms max={lag['max']}ms",
+        "",
+        f"{'rota':<34}{'req':>7}{'req/s':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  status",
+    ]
+    if report["config"]["seed_failures"]:
+        lines.insert(2, f"⚠️  falhas no seed: {report['config']['seed_failures']}")
+    for route, r in report["routes"].items():
+        status = " ".join(f"{k}:{v}" for k, v in r["status"].items())
+        lines.append(
+            f"{route:<34}{r['requests']:>7}{r['rps']:>8}{r['p50_ms']:>9}{r['p90_ms']:>9}"
+            f"{r['p99_ms']:>9}{r['max_ms']:>9}  {status}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test local do server.app")
+    parser.add_argument("--users", type=int, default=100, help="usuários semeados")
+    parser.add_argument("--concurrency", type=int, default=20, help="usuários virtuais simultâneos")
+    parser.add_argument("--duration", type=float, default=20.0, help="duração em segundos")
+    parser.add_argument("--iterations", type=int, help="jornadas por usuário virtual (ignora --duration)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pausa máxima entre jornadas (s)")
+    parser.add_argument("--mongo-url", help="mongod local; sem isso usa mongomock-motor")
+    parser.add_argument("--keep-db", action="store_true", help="não apaga o banco de teste no mongod")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="salva o relatório completo (com histogramas)")
+    args = parser.parse_args(argv)
+
+    duration = float("inf") if args.iterations else args.duration
+
+    # O motor de dieta e os logs INFO do servidor poluiriam a saída e o timing
+    logging.disable(logging.INFO)
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        report = asyncio.run(run_load_test(
+            n_users=args.users, concurrency=args.concurrency, duration=duration,
+            iterations=args.iterations, think_time=args.think_time,
+            mongo_url=args.mongo_url, keep_db=args.keep_db, seed=args.seed,
+        ))
+    logging.disable(logging.NOTSET)
+    if args.iterations:
+        report["config"]["duration_s"] = None
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n📄 Relatório salvo em {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Replay offline de gerações de dieta + corpus de regressão
+=========================================================
+Substitui os scripts de depuração manuais (debug_vegetarian.py,
+test_tofu_issue.py) que batiam na API de produção: lê o trace gravado com
+a dieta (diet/trace.py), regenera localmente com as MESMAS entradas e
+mostra o diff alimento a alimento contra o que foi salvo.
+
+    # dieta atual do usuário (ou --diet-id); sai com 1 se houver diff
+    python -m benchmarks.replay replay --mongo-url ... --user-id <id>
+
+    # trace salvo em arquivo (JSON de um trace ou de um caso do corpus)
+    python -m benchmarks.replay replay --trace-file caso.json
+
+    # corpus anonimizado (sem ids/datas, dedupe por digest) para o benchmark
+    python -m benchmarks.replay export-corpus --mongo-url ... --output corpus.json
+    python -m benchmarks.diet_engine --corpus corpus.json
+
+O motor é determinístico (não depende de PYTHONHASHSEED): diff só aparece
+quando o algoritmo mudou - o replay avisa se o trace é de outra versão.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from diet.storage import hydrate_diet
+from diet.trace import DIET_ENGINE_VERSION, DIET_TRACES, anonymize, diff_meals, replay
+
+
+async def load_case(db, user_id: Optional[str] = None, diet_id: Optional[str] = None) -> Tuple[Dict, Optional[List[Dict]]]:
+    """(trace, refeições salvas) da dieta pedida - ou da mais recente do usuário"""
+    if diet_id:
+        trace = await db[DIET_TRACES].find_one({"_id": diet_id})
+    else:
+        trace = await db[DIET_TRACES].find_one({"user_id": user_id}, sort=[("created_at", -1)])
+    if not trace:
+        raise LookupError("Nenhum trace de geração encontrado")
+    stored = hydrate_diet(await db.diet_plans.find_one({"_id": trace["_id"]}))
+    return trace, (stored or {}).get("meals")
+
+
+async def export_corpus(db, limit: int = 0, engine: Optional[str] = DIET_ENGINE_VERSION) -> List[Dict]:
+    """Traces anonimizados, um por combinação de entradas (digest)"""
+    query = {"engine": engine} if engine else {}
+    corpus: Dict[str, Dict] = {}
+    cursor = db[DIET_TRACES].find(query, {"user_id": 0}).sort("created_at", -1)
+    async for trace in cursor:
+        corpus.setdefault(trace["digest"], anonymize(trace))
+        if limit and len(corpus) >= limit:
+            break
+    return list(corpus.values())
+
+
+def replay_report(trace: Dict, stored: Optional[List[Dict]]) -> Tuple[List[str], List[Dict], Optional[List[str]]]:
+    """(avisos, refeições regeneradas, diff contra as salvas - None sem dieta salva)"""
+    warnings = []
+    if trace.get("engine", DIET_ENGINE_VERSION) != DIET_ENGINE_VERSION:
+        warnings.append(f"trace gerado pelo motor {trace['engine']}, replay com {DIET_ENGINE_VERSION}")
+    replayed = replay(trace)
+    return warnings, replayed, diff_meals(stored, replayed) if stored is not None else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay offline de gerações de dieta")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("replay", "export-corpus"):
+        command = sub.add_parser(name)
+        command.add_argument("--mongo-url", default=os.environ.get("MONGO_URL"))
+        command.add_argument("--db-name", default=os.environ.get("DB_NAME", "laf_database"))
+        if name == "replay":
+            command.add_argument("--user-id")
+            command.add_argument("--diet-id")
+            command.add_argument("--trace-file", help="JSON de um trace/caso do corpus (sem Mongo)")
+        else:
+            command.add_argument("--output", required=True)
+            command.add_argument("--limit", type=int, default=0)
+            command.add_argument("--all-engines", action="store_true", help="inclui traces de versões antigas do motor")
+    args = parser.parse_args(argv)
+
+    if args.command == "replay" and args.trace_file:
+        with open(args.trace_file, encoding="utf-8") as f:
+            trace = json.load(f)
+        warnings, replayed, diff = replay_report(trace, trace.get("meals"))
+    else:
+        if not args.mongo_url:
+            parser.error("--mongo-url (ou MONGO_URL) é obrigatório")
+        if args.command == "replay" and not (args.user_id or args.diet_id):
+            parser.error("informe --user-id, --diet-id ou --trace-file")
+
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def run():
+            client = AsyncIOMotorClient(args.mongo_url)
+            try:
+                db = client[args.db_name]
+                if args.command == "export-corpus":
+                    return await export_corpus(db, args.limit, None if args.all_engines else DIET_ENGINE_VERSION)
+                return await load_case(db, args.user_id, args.diet_id)
+            finally:
+                client.close()
+
+        result = asyncio.run(run())
+        if args.command == "export-corpus":
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+            print(f"📄 {len(result)} casos anonimizados salvos em {args.output}")
+            return 0
+        warnings, replayed, diff = replay_report(*result)
+
+    for line in warnings:
+        print(f"⚠️  {line}")
+    if diff is None:
+        print("Sem dieta salva para comparar; replay:")
+        for meal in replayed:
+            print(f"  {meal.get('name')}: " + ", ".join(f"{f.get('key')} {f.get('grams')}g" for f in meal.get("foods", [])))
+        return 0
+    if not diff:
+        print("✅ Replay idêntico à dieta salva")
+        return 0
+    print("❌ Diferenças (salvo -> replay):")
+    for line in diff:
+        print(f"  - {line}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
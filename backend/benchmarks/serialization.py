@@ -0,0 +1,130 @@
+"""
+Benchmark de serialização das respostas por endpoint
+====================================================
+Compara, com payloads reais gerados pelos motores de dieta e treino:
+
+- before: caminho padrão do FastAPI (serialize_response → jsonable_encoder,
+  revalidação quando há response_model) + JSONResponse (json.dumps)
+- after: web.json_response (model_dump + orjson, sem revalidação)
+
+Só mede a serialização (nada de rede ou Mongo):
+
+    python -m benchmarks.serialization --repeat 300
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from starlette.responses import JSONResponse
+
+from web import json_response
+
+from .corpus import diet_corpus
+
+
+def _payloads() -> List[Tuple[str, object, Optional[type]]]:
+    """(endpoint, conteúdo retornado pelo handler, response_model)"""
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    from diet_service import DietAIService
+    from server import UserProfile
+    from workout_service import WorkoutAIService
+
+    case = next(c for c in diet_corpus() if c.case_id == "nenhuma-6m-manutencao-medium")
+    with contextlib.redirect_stdout(io.StringIO()):
+        diet_plan = DietAIService().generate_diet_plan(
+            user_profile=dict(case.profile),
+            target_calories=case.target_calories,
+            target_macros=dict(case.target_macros),
+            meal_count=case.meal_count,
+        )
+        workout_plan = WorkoutAIService().generate_workout_plan(user_profile=dict(case.profile))
+
+    now = datetime.utcnow()
+    stored_diet = {**diet_plan.model_dump(), "_id": diet_plan.id, "diet_type": "training", "updated_at": now}
+    stored_workout = {**workout_plan.model_dump(), "_id": workout_plan.id, "updated_at": now}
+    profile = UserProfile(**{
+        **case.profile, "id": "bench-user", "name": "Bench",
+        "available_time_per_session": 60, "tdee": 2500.0, "target_calories": case.target_calories, "macros": dict(case.target_macros),
+    })
+
+    return [
+        ("POST /api/diet/generate", diet_plan, None),
+        ("GET /api/diet/{user_id}", stored_diet, None),
+        ("GET /api/workout/{user_id}", stored_workout, None),
+        ("GET /api/user/profile/{user_id}", profile, UserProfile),
+    ]
+
+
+def _fastapi_default(content, response_model) -> Callable[[], Awaitable[bytes]]:
+    field = create_response_field(name="bench", type_=response_model, mode="serialization") if response_model else None
+
+    async def run() -> bytes:
+        encoded = await serialize_response(field=field, response_content=content, is_coroutine=True)
+        return JSONResponse(encoded).body
+
+    return run
+
+
+def _orjson(content) -> Callable[[], Awaitable[bytes]]:
+    async def run() -> bytes:
+        return json_response(content).body
+    return run
+
+
+async def _time(func: Callable[[], Awaitable[bytes]], repeat: int) -> Dict:
+    await func()  # aquecimento
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    arr = np.asarray(samples)
+    return {"p50_us": float(np.percentile(arr, 50)), "p99_us": float(np.percentile(arr, 99)), "bytes": len(body)}
+
+
+async def _run(repeat: int) -> Dict[str, Dict]:
+    report = {}
+    for endpoint, content, response_model in _payloads():
+        before = await _time(_fastapi_default(content, response_model), repeat)
+        after = await _time(_orjson(content), repeat)
+        report[endpoint] = {
+            "before": before,
+            "after": after,
+            "speedup": round(before["p50_us"] / after["p50_us"], 2) if after["p50_us"] else None,
+        }
+    return report
+
+
+def run_serialization_benchmark(repeat: int = 200) -> Dict[str, Dict]:
+    return asyncio.run(_run(repeat))
+
+
+def format_report(report: Dict[str, Dict]) -> str:
+    lines = [f"{'endpoint':<34}{'before p50':>12}{'after p50':>12}{'speedup':>9}{'bytes':>9}"]
+    for endpoint, row in report.items():
+        lines.append(
+            f"{endpoint:<34}{row['before']['p50_us']:>10.0f}us{row['after']['p50_us']:>10.0f}us"
+            f"{row['speedup']:>8.1f}x{row['after']['bytes']:>9}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Custo de serialização por endpoint (antes/depois do orjson)")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+    print(format_report(run_serialization_benchmark(args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -35,6 +35,9 @@ from .constants import (
     CARBS_COMPLEMENTARES,
     CARBS_LANCHE,
     CARBS_ALMOCO_JANTAR,
+    BATATA_DOCE_PERMITIDA_EM,
+    OVOS_PERMITIDO_EM,
+    OVOS_LIMITE_MAXIMO,
     GORDURAS_PRINCIPAIS,
     GORDURAS_SNACKS,
     FRUTAS_FREQUENTES,
@@ -59,6 +62,35 @@ from .constants import (
     SUPPLEMENTS,
 )
 
+from .formulas import (
+    normalize_goal,
+    calculate_bmr,
+    calculate_cardio_burn,
+    calculate_tdee,
+    calculate_target_calories,
+    calculate_macros,
+    calculate_profile_targets,
+)
+
+from .batch import (
+    calculate_targets_batch,
+    profile_targets_from_batch,
+)
+
+from .executor import (
+    diet_queue_depth,
+    run_in_diet_executor,
+    shutdown_diet_executor,
+)
+
+from .profiling import (
+    DietProfile,
+    current_profile,
+    diet_profile,
+    profiled_stage,
+    stage,
+)
+
 __all__ = [
     # Limits
     'TOL_PERCENT',
@@ -90,6 +122,9 @@ __all__ = [
     'CARBS_COMPLEMENTARES',
     'CARBS_LANCHE',
     'CARBS_ALMOCO_JANTAR',
+    'BATATA_DOCE_PERMITIDA_EM',
+    'OVOS_PERMITIDO_EM',
+    'OVOS_LIMITE_MAXIMO',
     'GORDURAS_PRINCIPAIS',
     'GORDURAS_SNACKS',
     'FRUTAS_FREQUENTES',
@@ -112,4 +147,29 @@ __all__ = [
     # Data
     'FOODS',
     'SUPPLEMENTS',
+    
+    # Formulas
+    'normalize_goal',
+    'calculate_bmr',
+    'calculate_cardio_burn',
+    'calculate_tdee',
+    'calculate_target_calories',
+    'calculate_macros',
+    'calculate_profile_targets',
+    
+    # Batch calculator
+    'calculate_targets_batch',
+    'profile_targets_from_batch',
+    
+    # Executor
+    'diet_queue_depth',
+    'run_in_diet_executor',
+    'shutdown_diet_executor',
+    
+    # Profiling
+    'DietProfile',
+    'current_profile',
+    'diet_profile',
+    'profiled_stage',
+    'stage',
 ]
@@ -0,0 +1,165 @@
+"""
+Batch TDEE / Macro Calculator
+=============================
+Versão vetorizada (NumPy) do cálculo de metas usado no perfil do usuário.
+
+Espelha exatamente calculate_bmr → calculate_tdee → calculate_target_calories
+→ calculate_macros de diet/formulas.py (mesmas tabelas de fatores), mas recebe
+COLUNAS (uma posição por usuário) e devolve arrays. Usado pelo job de recálculo
+em massa quando fatores ou regras mudam, evitando o loop perfil-a-perfil.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from .formulas import (
+    ACTIVITY_FACTORS,
+    ACTIVITY_FREQUENCY_LIMITS,
+    CARB_FLOOR_G_PER_KG,
+    CARDIO_KCAL_PER_MIN,
+    DEFAULT_CARDIO_KCAL_PER_MIN,
+    FAT_G_PER_KG,
+    FAT_LIMITS_G_PER_KG,
+    GOAL_CALORIE_DELTAS,
+    MAX_DEFICIT,
+    MAX_SURPLUS,
+    PROTEIN_G_PER_KG,
+    PROTEIN_LIMITS_G_PER_KG,
+    RECOMP_LEVELS,
+    TRAINING_BONUS,
+    normalize_goal,
+)
+
+# Códigos de objetivo (para operar em arrays)
+GOAL_ORDER = ("manutencao", "cutting", "bulking")
+GOAL_CODES = {goal: code for code, goal in enumerate(GOAL_ORDER)}
+GOAL_MANUTENCAO = GOAL_CODES["manutencao"]
+
+GOAL_DELTAS = np.array([GOAL_CALORIE_DELTAS[g] for g in GOAL_ORDER], dtype=np.float64)
+CARB_FLOORS = np.array([CARB_FLOOR_G_PER_KG[g] for g in GOAL_ORDER], dtype=np.float64)
+
+
+def _encode(values: Iterable, mapper) -> np.ndarray:
+    """Aplica `mapper` uma vez por valor distinto (colunas categóricas repetem muito)."""
+    memo = {}
+    out = []
+    for value in values:
+        if value not in memo:
+            memo[value] = mapper(value)
+        out.append(memo[value])
+    return np.asarray(out)
+
+
+def _goal_code(goal: Optional[str]) -> int:
+    return GOAL_CODES[normalize_goal(str(goal) if goal else None)]
+
+
+def _is_male(sex: Optional[str]) -> bool:
+    return bool(sex) and str(sex).lower() == "masculino"
+
+
+def _training_bonus(level: Optional[str]) -> float:
+    return float(TRAINING_BONUS.get(str(level).lower(), 0)) if level else 0.0
+
+
+def _is_recomp_level(level: Optional[str]) -> bool:
+    level = str(level).lower() if level else 'intermediario'
+    return level in RECOMP_LEVELS
+
+
+def _cardio_kcal_per_min(intensity: Optional[str]) -> float:
+    intensity = str(intensity).lower() if intensity else 'moderado'
+    return float(CARDIO_KCAL_PER_MIN.get(intensity, DEFAULT_CARDIO_KCAL_PER_MIN))
+
+
+def _float_column(values: Sequence, default: float = 0.0) -> np.ndarray:
+    return np.array([default if v is None else v for v in values], dtype=np.float64)
+
+
+def calculate_targets_batch(
+    weight: Sequence[float],
+    height: Sequence[float],
+    age: Sequence[int],
+    sex: Sequence[str],
+    training_frequency: Sequence[int],
+    training_level: Sequence[str],
+    goal: Sequence[str],
+    cardio_minutos_semana: Optional[Sequence[int]] = None,
+    intensidade_cardio: Optional[Sequence[str]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    🎯 Calcula BMR, TDEE, calorias meta e macros para N usuários de uma vez.
+
+    Todas as colunas devem ter o mesmo tamanho. Os valores retornados NÃO são
+    arredondados (o chamador arredonda igual ao fluxo do perfil: TDEE e meta
+    com 0 casas, macros com 1 casa).
+
+    Retorna: {"bmr", "tdee", "target_calories", "protein", "carbs", "fat"}
+    """
+    w = _float_column(weight)
+    h = _float_column(height)
+    a = _float_column(age)
+    n = len(w)
+    freq = _float_column(training_frequency)
+
+    if cardio_minutos_semana is None:
+        cardio_minutos_semana = [0] * n
+    if intensidade_cardio is None:
+        intensidade_cardio = ['moderado'] * n
+
+    # 1. BMR (Mifflin-St Jeor)
+    sex_offset = np.where(_encode(sex, _is_male), 5.0, -161.0)
+    bmr = (10 * w) + (6.25 * h) - (5 * a) + sex_offset
+
+    # 2. TDEE = BMR × fator + bônus + cardio/7
+    factor_idx = np.searchsorted(ACTIVITY_FREQUENCY_LIMITS, freq, side='left')
+    factor = np.asarray(ACTIVITY_FACTORS)[factor_idx]
+    bonus = _encode(training_level, _training_bonus).astype(np.float64)
+
+    cardio_min = _float_column(cardio_minutos_semana)
+    cardio_weekly = np.where(
+        cardio_min > 0,
+        cardio_min * _encode(intensidade_cardio, _cardio_kcal_per_min).astype(np.float64),
+        0.0,
+    )
+    tdee = bmr * factor + bonus + cardio_weekly / 7
+
+    # 3. Calorias meta = TDEE + delta (recomposição zera o delta de iniciantes)
+    goal_code = _encode(goal, _goal_code).astype(np.intp)
+    recomp = _encode(training_level, _is_recomp_level).astype(bool)
+    delta = np.where(recomp & (goal_code != GOAL_MANUTENCAO), 0.0, GOAL_DELTAS[goal_code])
+    delta = np.clip(delta, MAX_DEFICIT, MAX_SURPLUS)
+    target_calories = tdee + delta
+
+    # 4. Macros: proteína e gordura fixas por kg, carboidrato fecha as calorias
+    protein = np.clip(w * PROTEIN_G_PER_KG, w * PROTEIN_LIMITS_G_PER_KG[0], w * PROTEIN_LIMITS_G_PER_KG[1])
+    fat = np.clip(w * FAT_G_PER_KG, w * FAT_LIMITS_G_PER_KG[0], w * FAT_LIMITS_G_PER_KG[1])
+    carb_floor = w * CARB_FLOORS[goal_code]
+    # A validação ±5% da versão escalar recalcula exatamente este mesmo valor
+    carbs = np.maximum(carb_floor, (target_calories - protein * 4 - fat * 9) / 4)
+
+    return {
+        "bmr": bmr,
+        "tdee": tdee,
+        "target_calories": target_calories,
+        "protein": protein,
+        "carbs": carbs,
+        "fat": fat,
+    }
+
+
+def profile_targets_from_batch(result: Dict[str, np.ndarray], i: int) -> Dict:
+    """
+    Extrai os campos calculados do usuário `i` no mesmo formato (e arredondamento)
+    salvo por POST /user/profile.
+    """
+    return {
+        "tdee": round(float(result["tdee"][i]), 0),
+        "target_calories": round(float(result["target_calories"][i]), 0),
+        "macros": {
+            "protein": round(float(result["protein"][i]), 1),
+            "carbs": round(float(result["carbs"][i]), 1),
+            "fat": round(float(result["fat"][i]), 1),
+        },
+    }
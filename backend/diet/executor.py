@@ -0,0 +1,62 @@
+"""
+Diet Engine Executor
+====================
+A geração de dieta é CPU pura (dezenas de ms) e rodava direto no event loop,
+travando as outras requisições. Aqui ela vai para um executor dedicado.
+
+UM worker só: o motor usa estado global (diet_service._current_diet_restrictions),
+então duas gerações em paralelo se atropelariam. A fila fica visível em
+diet_queue_depth() (usada pelo /ready) e no gauge laf_diet_executor_queue_depth.
+
+O contexto (contextvars) é copiado para o worker, então o profiler de etapas
+(diet/profiling.py) continua funcionando e as tags do sampler
+(observability/sampler.py) são publicadas para a thread do worker.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from prometheus_client import Gauge
+
+from observability.sampler import publish_thread_tags
+
+DIET_EXECUTOR_WORKERS = 1
+
+DIET_QUEUE_DEPTH = Gauge(
+    "laf_diet_executor_queue_depth",
+    "Gerações de dieta aguardando ou em execução no executor",
+)
+
+_executor = ThreadPoolExecutor(max_workers=DIET_EXECUTOR_WORKERS, thread_name_prefix="diet-engine")
+_pending = 0
+
+
+def _run_tagged(func, args, kwargs):
+    with publish_thread_tags():
+        return func(*args, **kwargs)
+
+
+async def run_in_diet_executor(func, *args, **kwargs):
+    """Executa `func(*args, **kwargs)` no executor do motor de dieta"""
+    global _pending
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, _run_tagged, func, args, kwargs)
+
+    _pending += 1
+    DIET_QUEUE_DEPTH.inc()
+    try:
+        return await loop.run_in_executor(_executor, call)
+    finally:
+        _pending -= 1
+        DIET_QUEUE_DEPTH.dec()
+
+
+def diet_queue_depth() -> int:
+    """Gerações enfileiradas + em execução"""
+    return _pending
+
+
+def shutdown_diet_executor():
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,208 @@
+"""
+Diet Module - Nutrition Formulas
+================================
+Fonte única para BMR, TDEE, calorias meta e macros.
+
+Todos os fatores ficam em tabelas no topo do módulo; a versão escalar
+(usada pelas rotas) e a versão vetorizada (diet/batch.py) leem as mesmas
+tabelas, então uma mudança de regra vale para os dois caminhos.
+"""
+
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== TABELAS DE FATORES ====================
+
+# Objetivo: aliases aceitos → valor normalizado
+GOAL_ALIASES = {
+    "ganho_muscular": "bulking", "bulking": "bulking", "hipertrofia": "bulking",
+    "ganho": "bulking", "massa": "bulking",
+    "cutting": "cutting", "definicao": "cutting", "definição": "cutting",
+    "emagrecimento": "cutting", "emagrecer": "cutting",
+    "manutencao": "manutencao", "manutenção": "manutencao",
+    "maintenance": "manutencao", "manter": "manutencao",
+}
+DEFAULT_GOAL = "manutencao"
+
+# Fator de atividade por frequência semanal: (limite superior inclusivo, fator)
+ACTIVITY_FREQUENCY_LIMITS = (1, 3, 5)
+ACTIVITY_FACTORS = (1.2, 1.375, 1.55, 1.725)  # sedentário, leve, moderado, intenso
+
+# Bônus de treino (kcal/dia) por nível
+TRAINING_BONUS = {
+    'beginner': 0, 'iniciante': 0, 'novato': 0,
+    'intermediate': 50, 'intermediario': 50,
+    'advanced': 100, 'avancado': 100,
+}
+
+# Gasto do cardio (kcal/min) por intensidade
+CARDIO_KCAL_PER_MIN = {
+    'leve': 5, 'light': 5,
+    'moderado': 8, 'moderate': 8,
+    'intenso': 11, 'intense': 11, 'high': 11,
+}
+DEFAULT_CARDIO_KCAL_PER_MIN = 8
+
+# Níveis que fazem recomposição (delta 0 em cutting/bulking)
+RECOMP_LEVELS = ('novato', 'iniciante', 'beginner')
+
+# Delta calórico (kcal) sobre o TDEE por objetivo
+GOAL_CALORIE_DELTAS = {"manutencao": 0, "cutting": -300, "bulking": 200}
+MAX_SURPLUS = 400   # Máximo +400 kcal
+MAX_DEFICIT = -600  # Máximo -600 kcal
+
+# Macros (g/kg)
+PROTEIN_G_PER_KG = 2.0
+PROTEIN_LIMITS_G_PER_KG = (1.8, 2.3)
+FAT_G_PER_KG = 0.9
+FAT_LIMITS_G_PER_KG = (0.7, 1.0)
+CARB_FLOOR_G_PER_KG = {"manutencao": 3.0, "cutting": 2.0, "bulking": 4.5}
+
+
+# ==================== FÓRMULAS ====================
+
+def normalize_goal(goal: str) -> str:
+    """
+    Normaliza o objetivo para valores consistentes.
+
+    Aceita:
+    - "ganho_muscular", "bulking", "hipertrofia" → "bulking"
+    - "cutting", "definicao", "emagrecimento" → "cutting"
+    - "manutencao", "manutenção", "maintenance" → "manutencao"
+    """
+    if not goal:
+        return DEFAULT_GOAL
+    return GOAL_ALIASES.get(goal.lower().strip(), DEFAULT_GOAL)
+
+
+def calculate_bmr(weight: float, height: float, age: int, sex: str) -> float:
+    """
+    Calcula Taxa Metabólica Basal usando fórmula de Mifflin-St Jeor
+    """
+    offset = 5 if sex.lower() == "masculino" else -161
+    return (10 * weight) + (6.25 * height) - (5 * age) + offset
+
+
+def activity_factor(training_frequency: float) -> float:
+    """Fator de atividade a partir da frequência semanal de treino"""
+    for limit, factor in zip(ACTIVITY_FREQUENCY_LIMITS, ACTIVITY_FACTORS):
+        if training_frequency <= limit:
+            return factor
+    return ACTIVITY_FACTORS[-1]
+
+
+def calculate_cardio_burn(cardio_minutos_semana: int, intensidade_cardio: str) -> int:
+    """
+    Calcula gasto calórico semanal do cardio baseado em minutos e intensidade.
+
+    Intensidades (kcal/min): leve 5, moderado 8, intenso 11.
+
+    Retorna: calorias semanais gastas no cardio
+    """
+    if not cardio_minutos_semana or cardio_minutos_semana <= 0:
+        return 0
+
+    intensidade = intensidade_cardio.lower() if intensidade_cardio else 'moderado'
+    kcal_min = CARDIO_KCAL_PER_MIN.get(intensidade, DEFAULT_CARDIO_KCAL_PER_MIN)
+
+    cardio_semanal = cardio_minutos_semana * kcal_min
+    logger.debug("[CARDIO] %smin/semana × %skcal/min = %skcal/semana", cardio_minutos_semana, kcal_min, cardio_semanal)
+    return cardio_semanal
+
+
+def calculate_tdee(bmr: float, training_frequency: int, training_level: str,
+                   cardio_minutos_semana: int = 0, intensidade_cardio: str = 'moderado') -> float:
+    """
+    Calcula TDEE (Total Daily Energy Expenditure)
+
+    1. TDEE_base = BMR × Fator de Atividade + Bônus de Treino
+    2. TDEE_real = TDEE_base + (Cardio_semanal / 7)
+
+    Se cardio_minutos_semana for 0 ou vazio: TDEE_real = TDEE_base
+    """
+    factor = activity_factor(training_frequency)
+    bonus = TRAINING_BONUS.get(training_level.lower(), 0)
+    tdee_base = bmr * factor + bonus
+
+    cardio_semanal = calculate_cardio_burn(cardio_minutos_semana, intensidade_cardio)
+    if cardio_semanal > 0:
+        tdee_real = tdee_base + cardio_semanal / 7
+        logger.debug("[TDEE] BMR=%.0f × %s + bonus=%s + cardio=%s/7 = %.0fkcal", bmr, factor, bonus, cardio_semanal, tdee_real)
+        return tdee_real
+
+    logger.debug("[TDEE] BMR=%.0f × %s + bonus=%s = TDEE=%.0fkcal (sem cardio)", bmr, factor, bonus, tdee_base)
+    return tdee_base
+
+
+def calorie_delta(goal: str, training_level: Optional[str] = 'intermediario') -> int:
+    """
+    Delta calórico sobre o TDEE para o objetivo (já com as travas anti-exagero).
+    Iniciantes em cutting/bulking fazem recomposição (delta 0).
+    """
+    goal = normalize_goal(goal)
+    level = training_level.lower() if training_level else 'intermediario'
+
+    if level in RECOMP_LEVELS and goal in ('cutting', 'bulking'):
+        delta = 0
+    else:
+        delta = GOAL_CALORIE_DELTAS[goal]
+    return max(MAX_DEFICIT, min(MAX_SURPLUS, delta))
+
+
+def calculate_target_calories(tdee: float, goal: str, weight: float, training_level: str = 'intermediario') -> float:
+    """
+    🎯 Calcula calorias meta: TDEE + delta do objetivo
+
+    - Bulking: +200 | Manutenção: 0 | Cutting: -300
+    - Recomposição (iniciante/novato em cutting/bulking): 0
+    - Travas: máximo +400, mínimo -600
+    """
+    delta = calorie_delta(goal, training_level)
+    target = tdee + delta
+    logger.debug("[META] TDEE=%.0f kcal | delta=%+.0f | meta=%.0f kcal", tdee, delta, target)
+    return target
+
+
+def calculate_macros(target_calories: float, weight: float, goal: str) -> Dict[str, float]:
+    """
+    🎯 Calcula macros com regras esportivas
+
+    1. PROTEÍNA: peso × 2.0 g/kg (limites 1.8 - 2.3)
+    2. GORDURA: peso × 0.9 g/kg (limites 0.7 - 1.0)
+    3. CARBOIDRATO: fecha as calorias, com piso por objetivo
+       (cutting 2.0, manutenção 3.0, bulking 4.5 g/kg)
+    """
+    goal = normalize_goal(goal)
+
+    protein_g = max(weight * PROTEIN_LIMITS_G_PER_KG[0], min(weight * PROTEIN_LIMITS_G_PER_KG[1], weight * PROTEIN_G_PER_KG))
+    fat_g = max(weight * FAT_LIMITS_G_PER_KG[0], min(weight * FAT_LIMITS_G_PER_KG[1], weight * FAT_G_PER_KG))
+
+    carb_min = weight * CARB_FLOOR_G_PER_KG[goal]
+    carb_g = max(carb_min, (target_calories - protein_g * 4 - fat_g * 9) / 4)
+
+    return {
+        "protein": round(protein_g, 1),
+        "carbs": round(carb_g, 1),
+        "fat": round(fat_g, 1)
+    }
+
+
+def calculate_profile_targets(weight: float, height: float, age: int, sex: str,
+                              training_frequency: int, training_level: str, goal: str,
+                              cardio_minutos_semana: int = 0,
+                              intensidade_cardio: str = 'moderado') -> Dict:
+    """
+    Pipeline completo do perfil: BMR → TDEE → meta → macros.
+    Retorna os campos no formato salvo em user_profiles.
+    """
+    bmr = calculate_bmr(weight, height, age, sex)
+    tdee = calculate_tdee(bmr, training_frequency, training_level, cardio_minutos_semana, intensidade_cardio)
+    target_calories = calculate_target_calories(tdee, goal, weight, training_level)
+    return {
+        "tdee": round(tdee, 0),
+        "target_calories": round(target_calories, 0),
+        "macros": calculate_macros(target_calories, weight, goal),
+    }
@@ -0,0 +1,211 @@
+"""
+Diet Generation Profiler
+========================
+Profiler leve por etapa do pipeline de DietAIService.generate_diet_plan.
+
+- Etapas (validate_user_foods, generate_diet, fine_tune_diet, ...) são
+  medidas com relógio monotônico via @profiled_stage / stage()
+- Contadores: chamadas de calc_food, iterações de fine-tune
+- Erro final de macros (% médio |computado - meta| / meta)
+
+O perfil ativo vive num ContextVar: sem perfil ativo tudo vira no-op. Ao
+fechar o perfil, os valores vão para histogramas Prometheus (registry
+padrão) e podem ser devolvidos no header Server-Timing.
+
+Tempos de etapas aninhadas são inclusivos (a etapa externa inclui a interna).
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Iterator, Optional
+
+from prometheus_client import Histogram
+
+MACROS = ("protein", "carbs", "fat")
+FINE_TUNE_ITERATIONS = "fine_tune_iterations"
+
+# ==================== MÉTRICAS PROMETHEUS ====================
+
+DIET_GENERATION_SECONDS = Histogram(
+    "laf_diet_generation_seconds",
+    "Tempo total de geração da dieta",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DIET_STAGE_SECONDS = Histogram(
+    "laf_diet_stage_seconds",
+    "Tempo por etapa do pipeline de dieta",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+DIET_CALC_FOOD_CALLS = Histogram(
+    "laf_diet_calc_food_calls",
+    "Chamadas de calc_food por geração",
+    buckets=(25, 50, 100, 200, 400, 800, 1600, 3200),
+)
+DIET_FINE_TUNE_ITERATIONS = Histogram(
+    "laf_diet_fine_tune_iterations",
+    "Passadas do loop de ajuste de fine_tune_diet por geração (todas as chamadas)",
+    buckets=(1, 5, 10, 25, 50, 100, 150, 300, 600, 900, 1200, 1500),
+)
+DIET_MACRO_ERROR_PERCENT = Histogram(
+    "laf_diet_macro_error_percent",
+    "Erro final médio de macros (%) por geração",
+    buckets=(1, 2, 5, 10, 15, 20, 30, 50, 100),
+)
+
+
+# ==================== PERFIL ====================
+
+class DietProfile:
+    """Tempos e contadores de UMA geração de dieta"""
+
+    __slots__ = ("started_at", "total_seconds", "stages", "counters", "macro_error_pct")
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.total_seconds: Optional[float] = None
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.macro_error_pct: Optional[float] = None
+
+    def add_stage(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.counters[f"{name}_calls"] = self.counters.get(f"{name}_calls", 0) + 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_ms": round((self.total_seconds or 0.0) * 1000, 3),
+            "stages_ms": {name: round(sec * 1000, 3) for name, sec in self.stages.items()},
+            "counters": dict(self.counters),
+            "macro_error_pct": self.macro_error_pct,
+        }
+
+    def server_timing(self) -> str:
+        """Valor do header Server-Timing (visível no DevTools)"""
+        parts = [f"{name};dur={sec * 1000:.2f}" for name, sec in self.stages.items()]
+        parts.append(f"total;dur={(self.total_seconds or 0.0) * 1000:.2f}")
+        if "calc_food" in self.counters:
+            parts.append(f'calc_food;desc="{self.counters["calc_food"]} calls"')
+        if self.macro_error_pct is not None:
+            parts.append(f'macro_error;desc="{self.macro_error_pct:.2f}%"')
+        return ", ".join(parts)
+
+
+_current_profile: ContextVar[Optional[DietProfile]] = ContextVar("diet_profile", default=None)
+
+
+def current_profile() -> Optional[DietProfile]:
+    return _current_profile.get()
+
+
+def _observe(profile: DietProfile):
+    DIET_GENERATION_SECONDS.observe(profile.total_seconds)
+    for name, seconds in profile.stages.items():
+        DIET_STAGE_SECONDS.labels(stage=name).observe(seconds)
+    DIET_CALC_FOOD_CALLS.observe(profile.counters.get("calc_food", 0))
+    DIET_FINE_TUNE_ITERATIONS.observe(profile.counters.get(FINE_TUNE_ITERATIONS, 0))
+    if profile.macro_error_pct is not None:
+        DIET_MACRO_ERROR_PERCENT.observe(profile.macro_error_pct)
+
+
+@contextmanager
+def diet_profile() -> Iterator[DietProfile]:
+    """
+    Abre um perfil de geração. Se já existe um ativo (ex.: aberto pelo
+    endpoint para montar o header), reutiliza e não observa de novo.
+    """
+    active = _current_profile.get()
+    if active is not None:
+        yield active
+        return
+
+    profile = DietProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+        profile.total_seconds = time.perf_counter() - profile.started_at
+        _observe(profile)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mede um trecho como etapa `name` do perfil ativo"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_stage(name, time.perf_counter() - start)
+
+
+def profiled_stage(name: str):
+    """Decorator: cada chamada da função conta como a etapa `name`"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.add_stage(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def count(name: str, amount: int = 1):
+    """Soma `amount` ao contador `name` do perfil ativo (para laços internos)"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.counters[name] = profile.counters.get(name, 0) + amount
+
+
+def counted(name: str):
+    """Decorator: conta chamadas (sem medir tempo - para funções muito quentes)"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is not None:
+                profile.counters[name] = profile.counters.get(name, 0) + 1
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profiled_generation(func):
+    """Decorator do gerador: abre (ou reutiliza) o perfil durante a chamada"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with diet_profile():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def macro_error_pct(computed: Dict[str, float], target: Dict[str, float]) -> float:
+    """Erro médio absoluto (%) entre macros computados e a meta"""
+    errors = [abs(computed[m] - target[m]) / target[m] * 100 for m in MACROS if target.get(m)]
+    return sum(errors) / len(errors) if errors else 0.0
+
+
+def diet_segment(restrictions, meal_count) -> Dict[str, str]:
+    """Classe do perfil para tags do sampler (restrições + nº de refeições)"""
+    return {
+        "restrictions": "+".join(sorted(restrictions or [])) or "nenhuma",
+        "meal_count": str(meal_count or "default"),
+    }
+
+
+def record_macro_error(computed: Dict[str, float], target: Dict[str, float]):
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.macro_error_pct = round(macro_error_pct(computed, target), 2)
@@ -0,0 +1,136 @@
+"""
+Formato compacto dos documentos de diet_plans
+=============================================
+Cada alimento salvo repetia campos derivados (name, quantity,
+quantity_display, unit_equivalent, category, macros) que calc_food recalcula
+a partir de key + grams. No formato compacto (storage_version = 2):
+
+- alimento: ["frango", 150]  (chave + gramas)
+- refeição: "meal_type" no lugar do nome padrão; total_calories/macros
+  saem (são a soma dos alimentos)
+
+A compactação é SEM PERDA: um alimento/refeição só é compactado se a
+hidratação reproduz exatamente o que estava salvo. Caso contrário (alimento
+fora do catálogo, macros ajustados à mão, nome personalizado) o campo fica
+como está.
+
+A leitura aceita os dois formatos (documentos antigos continuam válidos);
+migrations/compact_diet_plans.py converte os existentes.
+"""
+
+from typing import Dict, List, Optional
+
+from .constants import (
+    FOODS,
+    MEAL_TYPE_ALMOCO,
+    MEAL_TYPE_CAFE,
+    MEAL_TYPE_CEIA,
+    MEAL_TYPE_JANTAR,
+    MEAL_TYPE_LANCHE_MANHA,
+    MEAL_TYPE_LANCHE_TARDE,
+)
+
+STORAGE_VERSION = 2
+
+MEAL_TYPE_NAMES = {
+    MEAL_TYPE_CAFE: "Café da Manhã",
+    MEAL_TYPE_LANCHE_MANHA: "Lanche Manhã",
+    MEAL_TYPE_ALMOCO: "Almoço",
+    MEAL_TYPE_LANCHE_TARDE: "Lanche Tarde",
+    MEAL_TYPE_JANTAR: "Jantar",
+    MEAL_TYPE_CEIA: "Ceia",
+}
+_MEAL_TYPE_BY_NAME = {name: meal_type for meal_type, name in MEAL_TYPE_NAMES.items()}
+
+
+def _food_portion(food_key: str, grams: int) -> Dict:
+    # Import tardio: diet_service importa o pacote diet
+    from diet_service import food_portion
+    return food_portion(food_key, grams)
+
+
+def _meal_totals(foods: List[Dict]) -> Dict:
+    return {
+        "total_calories": sum(f.get("calories", 0) for f in foods),
+        "macros": {
+            "protein": sum(f.get("protein", 0) for f in foods),
+            "carbs": sum(f.get("carbs", 0) for f in foods),
+            "fat": sum(f.get("fat", 0) for f in foods),
+        },
+    }
+
+
+# ==================== COMPACTAR ====================
+
+def compact_food(food: Dict):
+    key = food.get("key")
+    grams = food.get("grams")
+    if key in FOODS and type(grams) is int and _food_portion(key, grams) == food:
+        return [key, grams]
+    return food
+
+
+def compact_meal(meal: Dict) -> Dict:
+    foods = meal.get("foods", [])
+    compact = {k: v for k, v in meal.items() if k not in ("name", "foods", "total_calories", "macros")}
+
+    meal_type = _MEAL_TYPE_BY_NAME.get(meal.get("name"))
+    if meal_type and "meal_type" not in meal:
+        compact["meal_type"] = meal_type
+    elif "name" in meal:
+        compact["name"] = meal["name"]
+
+    totals = _meal_totals(foods)
+    for field in ("total_calories", "macros"):
+        if field in meal and meal[field] != totals[field]:
+            compact[field] = meal[field]
+
+    compact["foods"] = [compact_food(food) for food in foods]
+    return compact
+
+
+def compact_meals(meals: List[Dict]) -> List[Dict]:
+    return [compact_meal(meal) for meal in meals]
+
+
+def compact_diet(diet: Dict) -> Dict:
+    """Cópia do documento no formato compacto (para insert/replace)"""
+    if diet.get("storage_version") == STORAGE_VERSION:
+        return diet
+    compact = dict(diet)
+    compact["meals"] = compact_meals(diet.get("meals", []))
+    compact["storage_version"] = STORAGE_VERSION
+    return compact
+
+
+# ==================== HIDRATAR ====================
+
+def hydrate_food(food) -> Dict:
+    if isinstance(food, list):
+        return _food_portion(food[0], food[1])
+    return food
+
+
+def hydrate_meal(meal: Dict) -> Dict:
+    foods = [hydrate_food(food) for food in meal.get("foods", [])]
+    hydrated = {"id": meal["id"]} if "id" in meal else {}
+    skip = {"id", "foods"}
+    if "name" not in meal and meal.get("meal_type") in MEAL_TYPE_NAMES:
+        hydrated["name"] = MEAL_TYPE_NAMES[meal["meal_type"]]
+        skip.add("meal_type")
+    hydrated.update({k: v for k, v in meal.items() if k not in skip})
+    hydrated["foods"] = foods
+    totals = _meal_totals(foods)
+    hydrated.setdefault("total_calories", totals["total_calories"])
+    hydrated.setdefault("macros", totals["macros"])
+    return hydrated
+
+
+def hydrate_diet(diet: Optional[Dict]) -> Optional[Dict]:
+    """Documento no formato completo (aceita os dois formatos; None passa direto)"""
+    if not diet or diet.get("storage_version") != STORAGE_VERSION:
+        return diet
+    hydrated = dict(diet)
+    hydrated.pop("storage_version")
+    hydrated["meals"] = [hydrate_meal(meal) for meal in diet.get("meals", [])]
+    return hydrated
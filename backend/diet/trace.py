@@ -0,0 +1,147 @@
+"""
+Trace de geração de dieta (replay e corpus de regressão)
+========================================================
+Cada dieta gerada grava em `diet_generation_traces` (_id = id da dieta)
+as entradas EXATAS que o motor recebeu - só o que ele lê do perfil:
+
+    {_id, user_id, created_at, entry, engine, digest,
+     inputs: {food_preferences, dietary_restrictions, goal, weight,
+              target_calories, target_macros, meal_count, meal_times}}
+
+- entry: "plan" (DietAIService.generate_diet_plan) ou "meals"
+  (diet_service.generate_diet, usado pelo switch-goal)
+- engine: DIET_ENGINE_VERSION - suba ao mudar o algoritmo; o diff do replay
+  entre versões diferentes é esperado
+- o motor ordena os conjuntos de candidatos antes de iterar: a saída não
+  depende de PYTHONHASHSEED e o replay é idêntico em qualquer processo
+- digest: sha1 das entradas (dedupe do corpus)
+
+replay()/diff_meals() regeneram offline e comparam; anonymize() gera os
+casos do corpus (benchmarks/replay.py export-corpus).
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DIET_TRACES = "diet_generation_traces"
+DIET_ENGINE_VERSION = "v14"
+TRACE_TTL_DAYS = int(os.environ.get("DIET_TRACE_TTL_DAYS", "180"))
+
+TRACE_ENTRIES = ("plan", "meals")
+
+
+def trace_digest(entry: str, inputs: Dict) -> str:
+    canonical = json.dumps({"entry": entry, **inputs}, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def build_trace(diet_id: Optional[str], user_id: str, entry: str, user_profile: Dict, target_calories: float,
+                target_macros: Dict, meal_count: int, meal_times: Optional[List[Dict]] = None) -> Dict:
+    """
+    Documento de trace com as entradas da geração. Monte ANTES de gerar
+    (diet_id pode vir depois, quando o id da dieta existir).
+    """
+    inputs = {
+        "food_preferences": list(user_profile.get("food_preferences") or []),
+        "dietary_restrictions": list(user_profile.get("dietary_restrictions") or []),
+        "goal": user_profile.get("goal", "manutencao"),
+        "weight": user_profile.get("weight", 70),
+        "target_calories": target_calories,
+        "target_macros": dict(target_macros),
+        "meal_count": meal_count,
+        "meal_times": meal_times,
+    }
+    return {
+        "_id": diet_id,
+        "user_id": user_id,
+        "created_at": datetime.utcnow(),
+        "entry": entry,
+        "engine": DIET_ENGINE_VERSION,
+        "digest": trace_digest(entry, inputs),
+        "inputs": inputs,
+    }
+
+
+async def save_trace(db, trace: Dict):
+    await db[DIET_TRACES].replace_one({"_id": trace["_id"]}, trace, upsert=True)
+
+
+async def ensure_trace_indexes(db):
+    await db[DIET_TRACES].create_index([("user_id", 1), ("created_at", -1)])
+    await db[DIET_TRACES].create_index("created_at", expireAfterSeconds=TRACE_TTL_DAYS * 86400)
+
+
+def anonymize(trace: Dict) -> Dict:
+    """Caso do corpus: só entradas + versão (sem ids ou datas)"""
+    return {
+        "case_id": trace["digest"][:12],
+        "entry": trace["entry"],
+        "engine": trace["engine"],
+        "inputs": trace["inputs"],
+    }
+
+
+# ==================== REPLAY ====================
+
+def replay(trace: Dict, quiet: bool = True) -> List[Dict]:
+    """Regenera as refeições a partir do trace (mesma chamada que a API fez)"""
+    import diet_service
+
+    if trace["entry"] not in TRACE_ENTRIES:
+        raise ValueError(f"Entrada de trace desconhecida: {trace['entry']}")
+    inputs = trace["inputs"]
+    # O motor imprime bastante diagnóstico
+    with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+        if trace["entry"] == "meals":
+            macros = inputs["target_macros"]
+            return diet_service.generate_diet(
+                target_p=int(macros["protein"]),
+                target_c=int(macros["carbs"]),
+                target_f=int(macros["fat"]),
+                preferred=set(inputs["food_preferences"]),
+                restrictions=inputs["dietary_restrictions"],
+                meal_count=inputs["meal_count"],
+                goal=inputs["goal"],
+            )
+        plan = diet_service.DietAIService().generate_diet_plan(
+            user_profile={
+                "user_id": trace.get("user_id", "replay"),
+                "food_preferences": inputs["food_preferences"],
+                "dietary_restrictions": inputs["dietary_restrictions"],
+                "goal": inputs["goal"],
+                "weight": inputs["weight"],
+            },
+            target_calories=inputs["target_calories"],
+            target_macros=dict(inputs["target_macros"]),
+            meal_count=inputs["meal_count"],
+            meal_times=inputs["meal_times"],
+        )
+        return [meal.dict() if hasattr(meal, "dict") else dict(meal) for meal in plan.meals]
+
+
+def _portions(meal: Dict) -> Dict[str, float]:
+    portions: Dict[str, float] = {}
+    for food in meal.get("foods", []):
+        key = food.get("key") or food.get("name")
+        portions[key] = portions.get(key, 0) + food.get("grams", 0)
+    return portions
+
+
+def diff_meals(stored: List[Dict], replayed: List[Dict]) -> List[str]:
+    """Diferenças alimento a alimento (chave + gramas) entre duas listas de refeições"""
+    lines = []
+    if len(stored) != len(replayed):
+        lines.append(f"refeições: {len(stored)} -> {len(replayed)}")
+    for index in range(max(len(stored), len(replayed))):
+        before = _portions(stored[index]) if index < len(stored) else {}
+        after = _portions(replayed[index]) if index < len(replayed) else {}
+        name = (stored[index] if index < len(stored) else replayed[index]).get("name", f"#{index + 1}")
+        for key in sorted(set(before) | set(after)):
+            if before.get(key) != after.get(key):
+                lines.append(f"{name}: {key} {before.get(key, '-')}g -> {after.get(key, '-')}g")
+    return lines
@@ -21,42 +21,75 @@ FILOSOFIA: NUNCA TRAVAR, NUNCA FALHAR, SEMPRE GERAR DIETA VÁLIDA
 """
 
 import os
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional, Set
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
 import random
 
+# Constantes, banco de alimentos e restrições (fonte única em diet/constants.py)
+from diet.constants import (
+    TOL_PERCENT,
+    MIN_FOOD_GRAMS,
+    MAX_FOOD_GRAMS,
+    MAX_CARB_GRAMS,
+    MIN_MEAL_CALORIES,
+    MIN_DAILY_CALORIES,
+    MAX_COTTAGE_TOTAL,
+    MAX_AVEIA_TOTAL,
+    MAX_IOGURTE_OCORRENCIAS,
+    MIN_PROTEINS,
+    MIN_CARBS,
+    MIN_FATS,
+    MIN_FRUITS,
+    DEFAULT_PROTEINS,
+    DEFAULT_CARBS,
+    DEFAULT_FATS,
+    DEFAULT_FRUITS,
+    ALIMENTOS_PERMITIDOS_LANCHE,
+    RESTRICTION_EXCLUSIONS,
+    PROTEINS_PRINCIPAIS,
+    PROTEINS_LEVES,
+    CARBS_PRINCIPAIS,
+    CARBS_COMPLEMENTARES,
+    CARBS_LANCHE,
+    BATATA_DOCE_PERMITIDA_EM,
+    OVOS_PERMITIDO_EM,
+    OVOS_LIMITE_MAXIMO,
+    GORDURAS_PRINCIPAIS,
+    GORDURAS_SNACKS,
+    FRUTAS_FREQUENTES,
+    FRUTAS_OPCIONAIS,
+    LEGUMES_PRINCIPAIS,
+    VERDURAS_SALADA,
+    CARBS_ALMOCO_JANTAR,
+    PROTEINS_ALMOCO_JANTAR,
+    CARNES_APENAS_ALMOCO_JANTAR,
+    FOODS_CAFE_LANCHE_MANHA,
+    FOODS_LANCHE_TARDE,
+    MEAL_TYPE_CAFE,
+    MEAL_TYPE_LANCHE_MANHA,
+    MEAL_TYPE_ALMOCO,
+    MEAL_TYPE_LANCHE_TARDE,
+    MEAL_TYPE_JANTAR,
+    MEAL_TYPE_CEIA,
+    FOODS,
+    SUPPLEMENTS,
+)
 
-# ==================== NORMALIZAÇÃO DE OBJETIVO ====================
 
-def normalize_goal(goal: str) -> str:
-    """
-    Normaliza o objetivo para valores consistentes.
-    
-    Aceita:
-    - "ganho_muscular", "bulking", "hipertrofia" → "bulking"
-    - "cutting", "definicao", "emagrecimento" → "cutting"
-    - "manutencao", "manutenção", "maintenance" → "manutencao"
-    """
-    if not goal:
-        return "manutencao"
-    
-    goal = goal.lower().strip()
-    
-    # Bulking aliases
-    if goal in ["ganho_muscular", "bulking", "hipertrofia", "ganho", "massa"]:
-        return "bulking"
-    
-    # Cutting aliases
-    if goal in ["cutting", "definicao", "definição", "emagrecimento", "emagrecer"]:
-        return "cutting"
-    
-    # Manutenção aliases
-    if goal in ["manutencao", "manutenção", "maintenance", "manter"]:
-        return "manutencao"
-    
-    return "manutencao"  # Default
+# ==================== NORMALIZAÇÃO DE OBJETIVO ====================
+# Fórmulas nutricionais (objetivo, cardio, TDEE) vivem em diet/formulas.py
+from diet.formulas import normalize_goal, calculate_cardio_burn
+from diet.profiling import (
+    FINE_TUNE_ITERATIONS,
+    count,
+    counted,
+    profiled_generation,
+    profiled_stage,
+    record_macro_error,
+)
 
 
 # ==================== MODELS ====================
@@ -89,38 +122,6 @@ class DietGenerateRequest(BaseModel):
     user_id: str
 
 
-# ==================== TOLERÂNCIAS ====================
-TOL_PERCENT = 0.05  # ±5%
-
-# ==================== LIMITES DE SEGURANÇA ====================
-MIN_FOOD_GRAMS = 10       # Mínimo 10g por alimento
-MAX_FOOD_GRAMS = 800      # Máximo 800g por alimento (aumentado para permitir dietas altas)
-MAX_CARB_GRAMS = 2000     # Máximo para carboidratos (arroz, batata) - SEM LIMITE PRÁTICO
-MIN_MEAL_CALORIES = 50    # Mínimo 50kcal por refeição
-MIN_DAILY_CALORIES = 800  # Mínimo 800kcal por dia (segurança)
-
-# ==================== LIMITES GLOBAIS ESPECIAIS ====================
-# Estes limites se aplicam à DIETA INTEIRA, não por refeição
-MAX_COTTAGE_TOTAL = 20    # MÁXIMO 20g de cottage na dieta TODA (1 pote = 300g, muito!)
-MAX_AVEIA_TOTAL = 80      # MÁXIMO 80g de aveia na dieta TODA
-MAX_IOGURTE_OCORRENCIAS = 1  # Iogurte zero aparece no MÁXIMO 1x por dia (muito repetitivo)
-
-
-# ==================== MÍNIMOS NECESSÁRIOS ====================
-MIN_PROTEINS = 3
-MIN_CARBS = 3
-MIN_FATS = 2
-MIN_FRUITS = 2
-
-
-# ==================== AUTO-COMPLETE PADRÕES ====================
-# Ordem de prioridade para auto-complete (alimentos comuns e baratos no Brasil)
-
-DEFAULT_PROTEINS = ["frango", "patinho", "ovos", "atum", "cottage", "tilapia"]
-DEFAULT_CARBS = ["arroz_branco", "arroz_integral", "batata_doce", "aveia", "macarrao", "pao_integral"]  # Feijão removido - só usar se selecionado
-DEFAULT_FATS = ["azeite", "pasta_amendoim", "castanhas", "amendoas", "queijo"]
-DEFAULT_FRUITS = ["banana", "maca", "laranja", "morango", "mamao", "melancia"]
-
 # ==================== VARIÁVEL GLOBAL DE RESTRIÇÕES ====================
 # Usada pelas funções de fallback para respeitar restrições alimentares
 _current_diet_restrictions: List[str] = []
@@ -294,119 +295,6 @@ def get_lanche_safe_food(food_type: str = "protein") -> str:
         return get_restriction_safe_fruit()
 
 
-# Alimentos PERMITIDOS em lanches (lista branca)
-ALIMENTOS_PERMITIDOS_LANCHE = {
-    "maca", "banana", "laranja", "morango", "pera", "kiwi", "mamao", "melancia", "abacaxi", "manga", "uva",  # Frutas
-    "castanhas", "amendoas", "nozes", "pasta_amendoim",  # Oleaginosas
-    "iogurte_zero", "iogurte_natural",  # Iogurtes
-    "pao_integral", "pao", "pao_forma", "aveia", "tapioca",  # Carboidratos leves
-    "mel", "granola",  # Doces
-    "whey_protein",  # Suplemento
-}
-
-
-# ==================== RESTRIÇÕES ALIMENTARES ====================
-
-RESTRICTION_EXCLUSIONS = {
-    # Versões com maiúsculas
-    "Vegetariano": {"frango", "coxa_frango", "patinho", "carne_moida", "suino", 
-                   "tilapia", "atum", "salmao", "camarao", "sardinha", "peru"},
-    "Sem Lactose": {"cottage", "queijo", "cream_cheese", "manteiga", "iogurte_zero", "iogurte_natural", "whey_protein"},
-    "Sem Glúten": {"aveia", "macarrao", "macarrao_integral", "pao", "pao_integral", "pao_forma", "seitan"},
-    "Low Carb": {"arroz_branco", "arroz_integral", "batata_doce", "batata", 
-                 "macarrao", "pao", "pao_integral", "banana", "manga", "uva"},
-    "Diabético": {"mel", "leite_condensado", "granola", "banana", "manga", "uva", 
-                  "melancia", "abacaxi", "mamao", "tapioca", "pao", "pao_integral", 
-                  "pao_forma", "farofa", "arroz_branco"},
-    # Versões lowercase (como vem do frontend)
-    "vegetariano": {"frango", "coxa_frango", "patinho", "carne_moida", "suino", 
-                   "tilapia", "atum", "salmao", "camarao", "sardinha", "peru"},
-    "sem_lactose": {"cottage", "queijo", "cream_cheese", "manteiga", "iogurte_zero", "iogurte_natural", "whey_protein"},
-    "sem_gluten": {"aveia", "macarrao", "macarrao_integral", "pao", "pao_integral", "pao_forma", "seitan"},
-    "low_carb": {"arroz_branco", "arroz_integral", "batata_doce", "batata", 
-                 "macarrao", "pao", "pao_integral", "banana", "manga", "uva",
-                 "aveia", "tapioca", "cuscuz", "feijao", "lentilha", "grao_de_bico"},
-}
-
-
-# ==================== REGRAS OBRIGATÓRIAS POR REFEIÇÃO ====================
-# Estas regras NUNCA devem ser violadas
-
-# ==================== SUBCATEGORIAS DE ALIMENTOS (PRD) ====================
-
-# 🍗 PROTEÍNAS
-# Proteínas Principais (base da refeição)
-PROTEINS_PRINCIPAIS = {"frango", "patinho", "carne_moida", "tilapia", "atum", "salmao", "peru"}
-
-# Proteínas Secundárias / Leves (lanches, café, ceia)
-# NOTA: iogurte_natural REMOVIDO - usar apenas iogurte_zero
-PROTEINS_LEVES = {"ovos", "cottage", "whey_protein", "iogurte_zero"}
-
-# 🍚 CARBOIDRATOS
-# Carboidratos Principais (base energética da refeição)
-CARBS_PRINCIPAIS = {"arroz_branco", "arroz_integral", "batata_doce", "macarrao"}
-
-# Carboidratos Complementares (acompanham o carb principal, não são base)
-CARBS_COMPLEMENTARES = {"feijao", "lentilha"}
-
-# Carboidratos de Lanche / Rápidos
-CARBS_LANCHE = {"pao_integral", "pao", "tapioca", "aveia"}
-
-# 🥔 BATATA DOCE - REGRAS ESPECIAIS
-# Batata doce SÓ pode aparecer no ALMOÇO e JANTAR (NUNCA café, lanches ou ceia)
-BATATA_DOCE_PERMITIDA_EM = {"almoco", "jantar", "almoco_jantar"}
-
-# 🥚 OVOS - REGRAS ESPECIAIS
-# Ovos SÓ podem aparecer no CAFÉ DA MANHÃ
-# Limite máximo: 6 ovos (300g)
-OVOS_PERMITIDO_EM = {"cafe", "cafe_da_manha"}
-OVOS_LIMITE_MAXIMO = 300  # 6 ovos × 50g = 300g
-
-# 🥑 GORDURAS
-# Gorduras Saudáveis Principais
-GORDURAS_PRINCIPAIS = {"azeite", "abacate"}
-
-# Gorduras de Apoio / Snacks
-GORDURAS_SNACKS = {"castanhas", "amendoas", "nozes", "pasta_amendoim"}
-
-# 🍎 FRUTAS
-# Frutas de Uso Frequente
-FRUTAS_FREQUENTES = {"banana", "maca", "laranja", "mamao"}
-
-# Frutas Opcionais
-FRUTAS_OPCIONAIS = {"morango", "melancia", "uva", "pera", "manga", "abacaxi", "kiwi"}
-
-# 🥦 VEGETAIS E LEGUMES
-# Legumes Principais (acompanhamento do prato)
-LEGUMES_PRINCIPAIS = {"brocolis", "espinafre", "couve", "cenoura", "abobrinha"}
-
-# Verduras Base de Salada
-VERDURAS_SALADA = {"alface", "pepino", "tomate", "salada"}
-
-# Carboidrato principal para almoço/jantar - SEMPRE arroz ou macarrão
-CARBS_ALMOCO_JANTAR = {"arroz_branco", "arroz_integral", "macarrao", "macarrao_integral", "batata_doce"}
-
-# Proteína principal para almoço/jantar - NUNCA ovo
-PROTEINS_ALMOCO_JANTAR = {"frango", "coxa_frango", "patinho", "carne_moida", "tilapia", "atum", "salmao", "camarao", "peru", "suino"}
-
-# Carnes que SÓ podem aparecer no almoço e jantar (NUNCA em lanches, café ou ceia)
-CARNES_APENAS_ALMOCO_JANTAR = {"frango", "coxa_frango", "patinho", "carne_moida", "tilapia", "atum", "salmao", "camarao", "peru", "suino", "sardinha"}
-
-# Alimentos EXCLUSIVOS para café da manhã e lanche da manhã
-FOODS_CAFE_LANCHE_MANHA = {"ovos", "claras", "pao", "pao_integral", "pao_forma", "cottage", "tapioca"}
-
-# Alimentos EXCLUSIVOS para lanche da tarde (doces)
-FOODS_LANCHE_TARDE = {"mel", "leite_condensado", "granola"}
-
-# Tipos de refeição
-MEAL_TYPE_CAFE = "cafe"
-MEAL_TYPE_LANCHE_MANHA = "lanche_manha"
-MEAL_TYPE_ALMOCO = "almoco"
-MEAL_TYPE_LANCHE_TARDE = "lanche_tarde"
-MEAL_TYPE_JANTAR = "jantar"
-MEAL_TYPE_CEIA = "ceia"
-
-
 def get_meal_type_from_name(meal_name: str) -> str:
     """Determina o tipo de refeição pelo nome"""
     name_lower = meal_name.lower()
@@ -574,216 +462,6 @@ FOOD_NORMALIZATION = {
 }
 
 
-# ==================== BANCO DE ALIMENTOS ====================
-# Valores por 100g baseados na Tabela TACO (Tabela Brasileira de Composição de Alimentos)
-# p=proteína, c=carboidrato, f=gordura (lipídios)
-# unit = medida caseira equivalente a X gramas
-# Fonte: TACO 4ª edição revisada (UNICAMP/NEPA)
-
-FOODS = {
-    # === PROTEÍNAS === (TACO - Carnes e derivados)
-    # Frango, peito, sem pele, grelhado: 159kcal, 31.5g P, 0g C, 3.2g F
-    "frango": {"name": "Peito de Frango", "p": 31.5, "c": 0.0, "f": 3.2, "category": "protein", "unit": "filé médio", "unit_g": 150},
-    # Frango, coxa, sem pele, cozida: 215kcal, 26.6g P, 0g C, 11.9g F
-    "coxa_frango": {"name": "Coxa de Frango", "p": 26.6, "c": 0.0, "f": 11.9, "category": "protein", "unit": "coxa média", "unit_g": 100},
-    # Carne, patinho, sem gordura, grelhado: 219kcal, 35.9g P, 0g C, 7.3g F
-    "patinho": {"name": "Patinho (Carne Magra)", "p": 35.9, "c": 0.0, "f": 7.3, "category": "protein", "unit": "bife médio", "unit_g": 120},
-    # Carne, moída, refogada: 212kcal, 26.7g P, 0g C, 11.2g F
-    "carne_moida": {"name": "Carne Moída", "p": 26.7, "c": 0.0, "f": 11.2, "category": "protein", "unit": "colher sopa cheia", "unit_g": 30},
-    # Carne, suína, lombo, assado: 210kcal, 32.1g P, 0g C, 8.1g F
-    "suino": {"name": "Carne Suína", "p": 32.1, "c": 0.0, "f": 8.1, "category": "protein", "unit": "bife médio", "unit_g": 120},
-    # Ovo, de galinha, inteiro, cozido: 146kcal, 13.3g P, 0.6g C, 9.5g F
-    "ovos": {"name": "Ovos Inteiros", "p": 13.3, "c": 0.6, "f": 9.5, "category": "protein", "unit": "unidade grande", "unit_g": 50},
-    # Ovo, de galinha, clara, cozida: 53kcal, 10.9g P, 0.8g C, 0.0g F
-    "claras": {"name": "Claras de Ovo", "p": 10.9, "c": 0.8, "f": 0.0, "category": "protein", "unit": "clara", "unit_g": 33},
-    # Peixe, tilápia, filé, grelhado: 129kcal, 26.5g P, 0g C, 2.7g F
-    "tilapia": {"name": "Tilápia", "p": 26.5, "c": 0.0, "f": 2.7, "category": "protein", "unit": "filé médio", "unit_g": 120},
-    # Atum, conserva em óleo, drenado: 166kcal, 26.2g P, 0g C, 6.4g F
-    "atum": {"name": "Atum", "p": 26.2, "c": 0.0, "f": 6.4, "category": "protein", "unit": "lata drenada", "unit_g": 120},
-    # Salmão, filé, grelhado: 243kcal, 26.3g P, 0g C, 14.7g F
-    "salmao": {"name": "Salmão", "p": 26.3, "c": 0.0, "f": 14.7, "category": "protein", "unit": "filé médio", "unit_g": 150},
-    # Camarão, cozido: 90kcal, 18.4g P, 0g C, 1.5g F
-    "camarao": {"name": "Camarão", "p": 18.4, "c": 0.0, "f": 1.5, "category": "protein", "unit": "porção média", "unit_g": 100},
-    # Sardinha, conserva em óleo, drenada: 285kcal, 25.9g P, 0g C, 19.7g F
-    "sardinha": {"name": "Sardinha", "p": 25.9, "c": 0.0, "f": 19.7, "category": "protein", "unit": "lata drenada", "unit_g": 90},
-    # Peru, peito, sem pele, assado: 155kcal, 29.8g P, 0g C, 3.2g F
-    "peru": {"name": "Peru", "p": 29.8, "c": 0.0, "f": 3.2, "category": "protein", "unit": "fatias finas", "unit_g": 50},
-    # Queijo, cottage: 98kcal, 11.1g P, 3.4g C, 4.3g F
-    "cottage": {"name": "Queijo Cottage", "p": 11.1, "c": 3.4, "f": 4.3, "category": "protein", "subcategory": "light", "unit": "colher sopa", "unit_g": 30},
-    # Iogurte, desnatado: 41kcal, 4.1g P, 5.5g C, 0.3g F
-    "iogurte_zero": {"name": "Iogurte Zero", "p": 4.1, "c": 5.5, "f": 0.3, "category": "protein", "subcategory": "light", "unit": "garrafa", "unit_g": 1150, "max_g": 500},
-    # Whey Protein (média mercado): 370kcal, 80g P, 5g C, 3g F
-    "whey_protein": {"name": "Whey Protein", "p": 80.0, "c": 5.0, "f": 3.0, "category": "protein", "subcategory": "supplement", "unit": "scoop", "unit_g": 30},
-    # Requeijão, light: 135kcal, 8.5g P, 3.0g C, 10g F
-    "requeijao_light": {"name": "Requeijão Light", "p": 8.5, "c": 3.0, "f": 10.0, "category": "protein", "subcategory": "light", "unit": "colher sopa", "unit_g": 30},
-    # Tofu: 70kcal, 6.6g P, 2.2g C, 4.0g F
-    "tofu": {"name": "Tofu", "p": 6.6, "c": 2.2, "f": 4.0, "category": "protein", "unit": "fatia média", "unit_g": 80},
-    
-    # === PROTEÍNAS VEGETAIS (para vegetarianos/veganos) ===
-    # Tempeh: 193kcal, 19.0g P, 9.4g C, 10.8g F (USDA)
-    "tempeh": {"name": "Tempeh", "p": 19.0, "c": 9.4, "f": 10.8, "category": "protein", "subcategory": "vegetal", "unit": "fatia média", "unit_g": 100},
-    # Seitan: 118kcal, 21.2g P, 5.4g C, 1.4g F (USDA)
-    "seitan": {"name": "Seitan", "p": 21.2, "c": 5.4, "f": 1.4, "category": "protein", "subcategory": "vegetal", "unit": "porção", "unit_g": 100},
-    # Edamame, cozido: 121kcal, 11.9g P, 8.9g C, 5.2g F (USDA)
-    "edamame": {"name": "Edamame", "p": 11.9, "c": 8.9, "f": 5.2, "category": "protein", "subcategory": "vegetal", "unit": "xícara", "unit_g": 100},
-    # Grão de bico, cozido: 164kcal, 8.9g P, 27.4g C, 2.6g F (TACO)
-    "grao_de_bico": {"name": "Grão de Bico", "p": 8.9, "c": 27.4, "f": 2.6, "category": "protein", "subcategory": "vegetal", "unit": "concha média", "unit_g": 100},
-    # Proteína de ervilha (média mercado): 370kcal, 80g P, 4g C, 2g F
-    "proteina_ervilha": {"name": "Proteína de Ervilha", "p": 80.0, "c": 4.0, "f": 2.0, "category": "protein", "subcategory": "supplement_vegetal", "unit": "scoop", "unit_g": 30},
-    
-    # === CARBOIDRATOS === (TACO - Cereais e derivados)
-    # Arroz, integral, cozido: 124kcal, 2.6g P, 25.8g C, 1.0g F (TACO)
-    "arroz_integral": {"name": "Arroz Integral", "p": 2.6, "c": 25.8, "f": 1.0, "category": "carb", "unit": "xícara cozida", "unit_g": 120},
-    # Arroz, tipo 1, cozido: 128kcal, 2.5g P, 28.1g C, 0.2g F (TACO)
-    "arroz_branco": {"name": "Arroz Branco", "p": 2.5, "c": 28.1, "f": 0.2, "category": "carb", "unit": "xícara cozida", "unit_g": 120},
-    # Batata doce, cozida: 77kcal, 0.6g P, 18.4g C, 0.1g F (TACO)
-    "batata_doce": {"name": "Batata Doce", "p": 0.6, "c": 18.4, "f": 0.1, "category": "carb", "unit": "unidade média", "unit_g": 150},
-    # Aveia, flocos, crua: 394kcal, 13.9g P, 66.6g C, 8.5g F (TACO)
-    "aveia": {"name": "Aveia", "p": 13.9, "c": 66.6, "f": 8.5, "category": "carb", "unit": "colher sopa", "unit_g": 15},
-    # Macarrão, trigo, cozido: 102kcal, 3.4g P, 19.9g C, 0.5g F (TACO)
-    "macarrao": {"name": "Macarrão", "p": 3.4, "c": 19.9, "f": 0.5, "category": "carb", "unit": "xícara cozido", "unit_g": 140},
-    # Macarrão integral cozido: 120kcal, 5.0g P, 23.5g C, 0.8g F (estimado)
-    "macarrao_integral": {"name": "Macarrão Integral", "p": 5.0, "c": 23.5, "f": 0.8, "category": "carb", "unit": "xícara cozido", "unit_g": 140},
-    # Pão, francês: 300kcal, 8.0g P, 58.6g C, 3.1g F (TACO)
-    "pao": {"name": "Pão Francês", "p": 8.0, "c": 58.6, "f": 3.1, "category": "carb", "unit": "unidade", "unit_g": 50},
-    # Pão, forma, integral: 253kcal, 9.4g P, 49.9g C, 2.9g F (TACO)
-    "pao_integral": {"name": "Pão Integral", "p": 9.4, "c": 49.9, "f": 2.9, "category": "carb", "unit": "fatia", "unit_g": 30},
-    # Pão de forma tradicional: 271kcal, 9.4g P, 50.7g C, 3.7g F (TACO)
-    "pao_forma": {"name": "Pão de Forma", "p": 9.4, "c": 50.7, "f": 3.7, "category": "carb", "unit": "fatia", "unit_g": 25},
-    # Tapioca: 345kcal, 0.0g P, 87.8g C, 0.0g F (TACO - fécula seca) / hidratada ~100kcal/100g
-    "tapioca": {"name": "Tapioca", "p": 0.0, "c": 24.5, "f": 0.0, "category": "carb", "unit": "goma hidratada", "unit_g": 50},
-    # Cuscuz de milho, cozido: 112kcal, 2.5g P, 25.0g C, 0.3g F (TACO)
-    "cuscuz": {"name": "Cuscuz", "p": 2.5, "c": 25.0, "f": 0.3, "category": "carb", "unit": "porção", "unit_g": 100},
-    # Feijão, carioca, cozido: 76kcal, 4.8g P, 13.6g C, 0.5g F (TACO)
-    "feijao": {"name": "Feijão", "p": 4.8, "c": 13.6, "f": 0.5, "category": "carb", "unit": "concha média", "unit_g": 100},
-    # Lentilha, cozida: 93kcal, 6.3g P, 16.3g C, 0.5g F (TACO)
-    "lentilha": {"name": "Lentilha", "p": 6.3, "c": 16.3, "f": 0.5, "category": "carb", "unit": "concha média", "unit_g": 100},
-    # Quinoa, cozida: 120kcal, 4.4g P, 21.3g C, 1.9g F (USDA)
-    "quinoa": {"name": "Quinoa", "p": 4.4, "c": 21.3, "f": 1.9, "category": "carb", "unit": "porção", "unit_g": 100},
-    # Gema de ovo: 352kcal, 16.1g P, 1.6g C, 30.9g F (TACO)
-    "gema": {"name": "Gema de Ovo", "p": 16.1, "c": 1.6, "f": 30.9, "category": "fat", "unit": "unidade", "unit_g": 17},
-    # Farinha de mandioca, crua (farofa): 361kcal, 1.2g P, 87.9g C, 0.3g F (TACO)
-    "farofa": {"name": "Farofa", "p": 1.2, "c": 87.9, "f": 0.3, "category": "carb", "unit": "colher sopa", "unit_g": 20},
-    # Granola: 421kcal, 10.1g P, 63.7g C, 14.8g F (média mercado)
-    "granola": {"name": "Granola", "p": 10.1, "c": 63.7, "f": 14.8, "category": "carb", "unit": "xícara", "unit_g": 40},
-    
-    # === GORDURAS === (TACO - Óleos e gorduras)
-    # Azeite de oliva: 884kcal, 0g P, 0g C, 100g F (TACO)
-    "azeite": {"name": "Azeite de Oliva", "p": 0.0, "c": 0.0, "f": 100.0, "category": "fat", "unit": "colher sopa", "unit_g": 13},
-    # Pasta de amendoim: 593kcal, 28.5g P, 18.6g C, 46.1g F (USDA)
-    "pasta_amendoim": {"name": "Pasta de Amendoim", "p": 28.5, "c": 18.6, "f": 46.1, "category": "fat", "unit": "colher sopa", "unit_g": 15},
-    # Pasta de amêndoa: 614kcal, 21.0g P, 19.0g C, 56.0g F (USDA)
-    "pasta_amendoa": {"name": "Pasta de Amêndoa", "p": 21.0, "c": 19.0, "f": 56.0, "category": "fat", "unit": "colher sopa", "unit_g": 15},
-    # Óleo de coco: 862kcal, 0g P, 0g C, 100g F (TACO)
-    "oleo_coco": {"name": "Óleo de Coco", "p": 0.0, "c": 0.0, "f": 100.0, "category": "fat", "unit": "colher sopa", "unit_g": 13},
-    # Castanha do Pará: 643kcal, 14.5g P, 12.3g C, 63.5g F (TACO)
-    "castanhas": {"name": "Castanhas", "p": 14.5, "c": 12.3, "f": 63.5, "category": "fat", "unit": "unidades", "unit_g": 10},
-    # Amêndoa, torrada, salgada: 581kcal, 18.6g P, 29.5g C, 47.3g F (TACO)
-    "amendoas": {"name": "Amêndoas", "p": 18.6, "c": 29.5, "f": 47.3, "category": "fat", "unit": "unidades", "unit_g": 5},
-    # Noz: 620kcal, 14.0g P, 18.4g C, 59.4g F (TACO)
-    "nozes": {"name": "Nozes", "p": 14.0, "c": 18.4, "f": 59.4, "category": "fat", "unit": "unidade", "unit_g": 8},
-    # Chia: 486kcal, 16.5g P, 42.1g C, 30.7g F (USDA)
-    "chia": {"name": "Chia", "p": 16.5, "c": 42.1, "f": 30.7, "category": "fat", "unit": "colher sopa", "unit_g": 15},
-    # Linhaça: 495kcal, 14.1g P, 43.3g C, 32.3g F (TACO)
-    "linhaca": {"name": "Linhaça", "p": 14.1, "c": 43.3, "f": 32.3, "category": "fat", "unit": "colher sopa", "unit_g": 15},
-    # Queijo, minas, frescal: 264kcal, 17.4g P, 3.2g C, 20.2g F (TACO)
-    "queijo": {"name": "Queijo", "p": 17.4, "c": 3.2, "f": 20.2, "category": "fat", "unit": "fatia média", "unit_g": 30},
-    # Amendoim, torrado, salgado: 606kcal, 22.5g P, 20.3g C, 50.0g F (TACO)
-    "amendoim": {"name": "Amendoim", "p": 22.5, "c": 20.3, "f": 50.0, "category": "fat", "unit": "punhado", "unit_g": 30},
-    
-    # === FRUTAS === (TACO - Frutas e derivados)
-    # Banana, prata: 98kcal, 1.3g P, 26.0g C, 0.1g F (TACO)
-    "banana": {"name": "Banana", "p": 1.3, "c": 26.0, "f": 0.1, "category": "fruit", "unit": "unidade média", "unit_g": 120},
-    # Maçã, fuji: 56kcal, 0.3g P, 15.2g C, 0.0g F (TACO)
-    "maca": {"name": "Maçã", "p": 0.3, "c": 15.2, "f": 0.0, "category": "fruit", "unit": "unidade média", "unit_g": 150},
-    # Laranja, pera: 37kcal, 1.0g P, 8.9g C, 0.1g F (TACO)
-    "laranja": {"name": "Laranja", "p": 1.0, "c": 8.9, "f": 0.1, "category": "fruit", "unit": "unidade média", "unit_g": 180},
-    # Morango: 30kcal, 0.9g P, 6.8g C, 0.3g F (TACO)
-    "morango": {"name": "Morango", "p": 0.9, "c": 6.8, "f": 0.3, "category": "fruit", "unit": "xícara", "unit_g": 150},
-    # Mamão, papaia: 40kcal, 0.5g P, 10.4g C, 0.1g F (TACO)
-    "mamao": {"name": "Mamão", "p": 0.5, "c": 10.4, "f": 0.1, "category": "fruit", "unit": "fatia média", "unit_g": 150},
-    # Manga, haden: 64kcal, 0.4g P, 16.7g C, 0.3g F (TACO)
-    "manga": {"name": "Manga", "p": 0.4, "c": 16.7, "f": 0.3, "category": "fruit", "unit": "unidade pequena", "unit_g": 200},
-    # Melancia: 33kcal, 0.9g P, 8.1g C, 0.0g F (TACO)
-    "melancia": {"name": "Melancia", "p": 0.9, "c": 8.1, "f": 0.0, "category": "fruit", "unit": "fatia média", "unit_g": 200},
-    # Abacate: 96kcal, 1.2g P, 6.0g C, 8.4g F (TACO)
-    "abacate": {"name": "Abacate", "p": 1.2, "c": 6.0, "f": 8.4, "category": "fat", "unit": "metade", "unit_g": 100},
-    # Uva, itália: 53kcal, 0.7g P, 13.6g C, 0.2g F (TACO)
-    "uva": {"name": "Uva", "p": 0.7, "c": 13.6, "f": 0.2, "category": "fruit", "unit": "cacho pequeno", "unit_g": 100},
-    # Abacaxi: 48kcal, 0.9g P, 12.3g C, 0.1g F (TACO)
-    "abacaxi": {"name": "Abacaxi", "p": 0.9, "c": 12.3, "f": 0.1, "category": "fruit", "unit": "fatia média", "unit_g": 100},
-    # Melão: 29kcal, 0.7g P, 7.5g C, 0.0g F (TACO)
-    "melao": {"name": "Melão", "p": 0.7, "c": 7.5, "f": 0.0, "category": "fruit", "unit": "fatia média", "unit_g": 150},
-    # Kiwi: 51kcal, 1.3g P, 11.5g C, 0.6g F (TACO)
-    "kiwi": {"name": "Kiwi", "p": 1.3, "c": 11.5, "f": 0.6, "category": "fruit", "unit": "unidade", "unit_g": 75},
-    # Pera: 53kcal, 0.6g P, 14.0g C, 0.1g F (TACO)
-    "pera": {"name": "Pera", "p": 0.6, "c": 14.0, "f": 0.1, "category": "fruit", "unit": "unidade média", "unit_g": 180},
-    # Pêssego: 36kcal, 0.8g P, 9.3g C, 0.1g F (TACO)
-    "pessego": {"name": "Pêssego", "p": 0.8, "c": 9.3, "f": 0.1, "category": "fruit", "unit": "unidade média", "unit_g": 150},
-    # Mirtilo: 32kcal, 0.6g P, 6.9g C, 0.0g F (USDA)
-    "mirtilo": {"name": "Mirtilo", "p": 0.6, "c": 6.9, "f": 0.0, "category": "fruit", "unit": "xícara", "unit_g": 150},
-    # Açaí, polpa: 58kcal, 0.8g P, 6.2g C, 3.9g F (TACO)
-    "acai": {"name": "Açaí", "p": 0.8, "c": 6.2, "f": 3.9, "category": "fruit", "unit": "polpa 100g", "unit_g": 100},
-    
-    # === VEGETAIS E LEGUMES === (TACO)
-    # Fonte de fibras, vitaminas, minerais - NÃO substituem macros principais
-    
-    # Folhas verdes (saladas)
-    # Alface, crespa: 11kcal, 1.3g P, 1.7g C, 0.2g F (TACO)
-    "salada": {"name": "Salada Verde", "p": 1.3, "c": 1.7, "f": 0.2, "category": "vegetable", "unit": "prato cheio", "unit_g": 100},
-    "alface": {"name": "Alface", "p": 1.3, "c": 1.7, "f": 0.2, "category": "vegetable", "unit": "folhas", "unit_g": 50},
-    # Rúcula: 18kcal, 2.2g P, 2.2g C, 0.3g F (TACO)
-    "rucola": {"name": "Rúcula", "p": 2.2, "c": 2.2, "f": 0.3, "category": "vegetable", "unit": "maço", "unit_g": 50},
-    # Espinafre, refogado: 42kcal, 2.6g P, 6.4g C, 0.5g F (TACO)
-    "espinafre": {"name": "Espinafre", "p": 2.6, "c": 6.4, "f": 0.5, "category": "vegetable", "unit": "xícara", "unit_g": 100},
-    # Couve, manteiga, refogada: 90kcal, 3.1g P, 12.7g C, 3.0g F (TACO)
-    "couve": {"name": "Couve", "p": 3.1, "c": 12.7, "f": 3.0, "category": "vegetable", "unit": "folhas refogadas", "unit_g": 100},
-    
-    # Crucíferas (alto valor nutricional)
-    # Brócolis, cozido: 24kcal, 2.1g P, 4.4g C, 0.2g F (TACO)
-    "brocolis": {"name": "Brócolis", "p": 2.1, "c": 4.4, "f": 0.2, "category": "vegetable", "unit": "xícara cozido", "unit_g": 100},
-    # Couve-flor, cozida: 19kcal, 1.2g P, 4.0g C, 0.2g F (TACO)
-    "couve_flor": {"name": "Couve-flor", "p": 1.2, "c": 4.0, "f": 0.2, "category": "vegetable", "unit": "xícara cozida", "unit_g": 100},
-    
-    # Legumes variados
-    # Cenoura, crua: 34kcal, 1.3g P, 7.7g C, 0.2g F (TACO)
-    "cenoura": {"name": "Cenoura", "p": 1.3, "c": 7.7, "f": 0.2, "category": "vegetable", "unit": "unidade média", "unit_g": 80},
-    # Abobrinha, cozida: 15kcal, 0.6g P, 3.3g C, 0.1g F (TACO)
-    "abobrinha": {"name": "Abobrinha", "p": 0.6, "c": 3.3, "f": 0.1, "category": "vegetable", "unit": "unidade média", "unit_g": 150},
-    # Pepino, cru: 10kcal, 0.9g P, 2.0g C, 0.1g F (TACO)
-    "pepino": {"name": "Pepino", "p": 0.9, "c": 2.0, "f": 0.1, "category": "vegetable", "unit": "unidade", "unit_g": 150},
-    # Tomate: 15kcal, 1.1g P, 3.1g C, 0.2g F (TACO)
-    "tomate": {"name": "Tomate", "p": 1.1, "c": 3.1, "f": 0.2, "category": "vegetable", "unit": "unidade média", "unit_g": 120},
-    # Beterraba, cozida: 32kcal, 1.2g P, 7.2g C, 0.1g F (TACO)
-    "beterraba": {"name": "Beterraba", "p": 1.2, "c": 7.2, "f": 0.1, "category": "vegetable", "unit": "unidade média", "unit_g": 100},
-    # Vagem, cozida: 25kcal, 1.5g P, 5.1g C, 0.2g F (TACO)
-    "vagem": {"name": "Vagem", "p": 1.5, "c": 5.1, "f": 0.2, "category": "vegetable", "unit": "xícara cozida", "unit_g": 100},
-    # Pimentão, vermelho, cru: 31kcal, 1.3g P, 6.8g C, 0.2g F (TACO)
-    "pimentao": {"name": "Pimentão", "p": 1.3, "c": 6.8, "f": 0.2, "category": "vegetable", "unit": "unidade média", "unit_g": 120},
-    
-    # === EXTRAS/DOCES (APENAS para café da manhã e lanches - MÁXIMO 30g) ===
-    # Leite condensado: 320kcal, 7.9g P, 55.4g C, 8.3g F (TACO)
-    "leite_condensado": {"name": "Leite Condensado", "p": 7.9, "c": 55.4, "f": 8.3, "category": "extra", "unit": "colher sopa", "unit_g": 20},
-    # Mel: 309kcal, 0.3g P, 84.0g C, 0.0g F (TACO)
-    "mel": {"name": "Mel", "p": 0.3, "c": 84.0, "f": 0.0, "category": "extra", "unit": "colher sopa", "unit_g": 21},
-    # whey_protein já está definido como proteína acima - não duplicar aqui
-}
-
-
-# === SUPLEMENTOS (não contam como macros da dieta) ===
-SUPPLEMENTS = {
-    "creatina": {"name": "Creatina (5g/dia)"},
-    "multivitaminico": {"name": "Multivitamínico"},
-    "omega3": {"name": "Ômega 3"},
-    "cafeina": {"name": "Cafeína"},
-    "vitamina_d": {"name": "Vitamina D"},
-    "vitamina_c": {"name": "Vitamina C"},
-    "zinco": {"name": "Zinco"},
-    "magnesio": {"name": "Magnésio"},
-    "colageno": {"name": "Colágeno"},
-}
-
-
 # ==================== FUNÇÕES UTILITÁRIAS ====================
 
 def round_to_10(value: float) -> int:
@@ -824,77 +502,84 @@ def normalize_food(pref: str) -> str:
     return pref
 
 
-def calc_food(food_key: str, grams: float, round_down: bool = False) -> Dict:
+# ========== ALIMENTOS CONTÁVEIS ==========
+# Estes alimentos devem ser em unidades INTEIRAS (1, 2, 3...)
+# Não faz sentido "1.5 ovos" ou "0.6 pote de iogurte"
+COUNTABLE_FOODS = {
+    # Ovos - sempre em unidades inteiras
+    "ovos": 50,           # 1 ovo = ~50g
+    "claras": 33,         # 1 clara = ~33g
+    
+    # Pães - sempre em fatias/unidades inteiras
+    "pao": 50,            # 1 pão francês = ~50g
+    "pao_integral": 30,   # 1 fatia = ~30g
+    "pao_forma": 25,      # 1 fatia = ~25g
+    
+    # Cottage - ajuste por colheres (30g cada)
+    "cottage": 30,     # 1 colher = 30g
+    
+    # Frutas unitárias
+    "banana": 120,        # 1 unidade = ~120g
+    "maca": 150,          # 1 unidade = ~150g
+    "laranja": 180,       # 1 unidade = ~180g
+    "kiwi": 75,           # 1 unidade = ~75g
+    "pera": 180,          # 1 unidade = ~180g
+    "mamao": 150,         # 1 fatia = ~150g
+    "manga": 200,         # 1 unidade = ~200g
+    
+    # Batatas - sempre em unidades inteiras
+    "batata_doce": 150,   # 1 unidade = ~150g
+}
+
+# MÍNIMO DE UNIDADES para certos alimentos
+COUNTABLE_MIN_UNITS = {
+    "pao_integral": 2,  # Mínimo 2 fatias de pão integral
+    "pao_forma": 2,     # Mínimo 2 fatias de pão de forma
+    "pao": 1,           # Mínimo 1 pão francês
+}
+
+
+def _pluralize_unit(unit: str) -> str:
+    """Pluraliza a medida caseira ("unidade média" -> "unidades médias")"""
+    if " " in unit:
+        parts = unit.split(" ")
+        plural_parts = []
+        for part in parts:
+            if part.endswith("ção"):
+                plural_parts.append(part[:-3] + "ções")
+            elif part.endswith("a"):
+                plural_parts.append(part + "s")
+            elif part.endswith("e"):
+                plural_parts.append(part + "s")
+            elif not part.endswith("s"):
+                plural_parts.append(part + "s")
+            else:
+                plural_parts.append(part)
+        return " ".join(plural_parts)
+    if unit.endswith("ção"):
+        return unit[:-3] + "ções"
+    if unit.endswith("e") or unit.endswith("a") or not unit.endswith("s"):
+        return unit + "s"
+    return unit
+
+
+def normalize_food_grams(food_key: str, grams: float, round_down: bool = False) -> int:
     """
-    Calcula macros de um alimento em quantidade específica.
-    
-    ✅ GARANTIAS:
-    - SEMPRE retorna um dict válido (nunca None)
-    - grams SEMPRE >= MIN_FOOD_GRAMS (10g)
-    - grams SEMPRE <= MAX_FOOD_GRAMS (800g) ou MAX_CARB_GRAMS (1200g) para carbs
-    - Alimentos CONTÁVEIS (ovos, pão, iogurte) são ajustados para unidades inteiras
-    - TODOS os campos obrigatórios preenchidos
+    Ajusta a quantidade às regras do cardápio:
+    - contáveis: unidades inteiras (mínimo/máximo de unidades)
+    - demais: múltiplos de 10g entre MIN_FOOD_GRAMS e o máximo do alimento
     
     Parâmetros:
     - round_down: Se True, arredonda contáveis para BAIXO (menos macros)
                   Se False (padrão), arredonda para o mais próximo
-    
-    Formato: "Nome – Xg (≈ Y medida caseira)"
     """
-    # FALLBACK: Se alimento não existe, usa frango como default
-    if food_key not in FOODS:
-        food_key = "frango"
-    
     f = FOODS[food_key]
     
-    # Determina limite máximo baseado na categoria
-    max_grams = MAX_CARB_GRAMS if f["category"] == "carb" else MAX_FOOD_GRAMS
-    
-    # ========== ALIMENTOS CONTÁVEIS ==========
-    # Estes alimentos devem ser em unidades INTEIRAS (1, 2, 3...)
-    # Não faz sentido "1.5 ovos" ou "0.6 pote de iogurte"
-    COUNTABLE_FOODS = {
-        # Ovos - sempre em unidades inteiras
-        "ovos": 50,           # 1 ovo = ~50g
-        "claras": 33,         # 1 clara = ~33g
-        
-        # Pães - sempre em fatias/unidades inteiras
-        "pao": 50,            # 1 pão francês = ~50g
-        "pao_integral": 30,   # 1 fatia = ~30g
-        "pao_forma": 25,      # 1 fatia = ~25g
-        
-        # Cottage - ajuste por colheres (30g cada)
-        "cottage": 30,     # 1 colher = 30g
-        
-        # Frutas unitárias
-        "banana": 120,        # 1 unidade = ~120g
-        "maca": 150,          # 1 unidade = ~150g
-        "laranja": 180,       # 1 unidade = ~180g
-        "kiwi": 75,           # 1 unidade = ~75g
-        "pera": 180,          # 1 unidade = ~180g
-        "mamao": 150,         # 1 fatia = ~150g
-        "manga": 200,         # 1 unidade = ~200g
-        
-        # Batatas - sempre em unidades inteiras
-        "batata_doce": 150,   # 1 unidade = ~150g
-    }
-    
-    unit = f.get("unit", "porção")
-    unit_g = f.get("unit_g", 100)
-    
-    # Se é alimento contável, ajusta para unidades inteiras
     if food_key in COUNTABLE_FOODS:
         unit_weight = COUNTABLE_FOODS[food_key]
         # Calcula quantas unidades seriam necessárias
         units_needed = grams / unit_weight
-        
-        # MÍNIMO DE UNIDADES para certos alimentos
-        MIN_UNITS = {
-            "pao_integral": 2,  # Mínimo 2 fatias de pão integral
-            "pao_forma": 2,     # Mínimo 2 fatias de pão de forma
-            "pao": 1,           # Mínimo 1 pão francês
-        }
-        min_units = MIN_UNITS.get(food_key, 1)
+        min_units = COUNTABLE_MIN_UNITS.get(food_key, 1)
         
         # IMPORTANTE: Arredondar para baixo quando round_down=True
         # Isso ajuda a manter os macros abaixo do target para ajuste fino posterior
@@ -907,70 +592,53 @@ def calc_food(food_key: str, grams: float, round_down: bool = False) -> Dict:
         max_units = 10 if food_key in ["ovos", "claras"] else 4
         units_int = min(units_int, max_units)
         # Recalcula gramas baseado em unidades inteiras
-        g = units_int * unit_weight
-        unit_qty = units_int
-        
+        return units_int * unit_weight
+    
+    # Alimentos não-contáveis: usa lógica normal (múltiplos de 10g)
+    # Determina limite máximo baseado na categoria
+    max_grams = MAX_CARB_GRAMS if f["category"] == "carb" else MAX_FOOD_GRAMS
+    g = round_to_10(grams)
+    
+    # Verifica se tem limite máximo específico do alimento
+    food_max_g = f.get("max_g", max_grams)
+    g = max(MIN_FOOD_GRAMS, min(food_max_g, g))
+    
+    # GARANTIA: Sempre > 0
+    if g <= 0:
+        g = MIN_FOOD_GRAMS
+    return g
+
+
+@lru_cache(maxsize=8192, typed=True)
+def _food_portion(food_key: str, g: int) -> Dict:
+    f = FOODS[food_key]
+    unit = f.get("unit", "porção")
+    unit_g = f.get("unit_g", 100)
+    
+    if food_key in COUNTABLE_FOODS:
         # Formato especial para contáveis
+        units_int = round(g / COUNTABLE_FOODS[food_key])
         if units_int == 1:
             unit_str = f"= {units_int} {unit}"
         else:
-            # Pluraliza corretamente
-            unit_plural = unit
-            # Trata casos especiais de pluralização
-            if " " in unit:
-                # "unidade média" -> "unidades médias"
-                parts = unit.split(" ")
-                plural_parts = []
-                for part in parts:
-                    if part.endswith("ção"):
-                        plural_parts.append(part[:-3] + "ções")
-                    elif part.endswith("a"):
-                        plural_parts.append(part + "s")
-                    elif part.endswith("e"):
-                        plural_parts.append(part + "s")
-                    elif not part.endswith("s"):
-                        plural_parts.append(part + "s")
-                    else:
-                        plural_parts.append(part)
-                unit_plural = " ".join(plural_parts)
-            elif unit.endswith("ção"):
-                unit_plural = unit[:-3] + "ções"
-            elif unit.endswith("e"):
-                unit_plural = unit + "s"
-            elif unit.endswith("a"):
-                unit_plural = unit + "s"
-            elif not unit.endswith("s"):
-                unit_plural = unit + "s"
-            unit_str = f"= {units_int} {unit_plural}"
-    else:
-        # Alimentos não-contáveis: usa lógica normal (múltiplos de 10g)
-        g = round_to_10(grams)
-        
-        # Verifica se tem limite máximo específico do alimento
-        food_max_g = f.get("max_g", max_grams)
-        g = max(MIN_FOOD_GRAMS, min(food_max_g, g))
-        
-        # GARANTIA: Sempre > 0
-        if g <= 0:
-            g = MIN_FOOD_GRAMS
-        
+            unit_str = f"= {units_int} {_pluralize_unit(unit)}"
+    elif unit_g > 0:
         # Calcula equivalente em medida caseira
-        if unit_g > 0:
-            unit_qty = g / unit_g
-            
-            # Para garrafas/líquidos: mostra em ml quando < 1 garrafa
-            if unit == "garrafa" and unit_qty < 1:
-                ml = g  # 1g ≈ 1ml para iogurte
-                unit_str = f"≈ {int(ml)}ml"
-            elif unit_qty >= 1:
-                if unit_qty == int(unit_qty):
-                    unit_str = f"≈ {int(unit_qty)} {unit}"
-                else:
-                    unit_str = f"≈ {unit_qty:.1f} {unit}"
+        unit_qty = g / unit_g
+        
+        # Para garrafas/líquidos: mostra em ml quando < 1 garrafa
+        if unit == "garrafa" and unit_qty < 1:
+            ml = g  # 1g ≈ 1ml para iogurte
+            unit_str = f"≈ {int(ml)}ml"
+        elif unit_qty >= 1:
+            if unit_qty == int(unit_qty):
+                unit_str = f"≈ {int(unit_qty)} {unit}"
             else:
                 unit_str = f"≈ {unit_qty:.1f} {unit}"
         else:
-            unit_str = "porção"
+            unit_str = f"≈ {unit_qty:.1f} {unit}"
+    else:
+        unit_str = "porção"
     
     ratio = g / 100
     
@@ -999,6 +667,42 @@ def calc_food(food_key: str, grams: float, round_down: bool = False) -> Dict:
     }
 
 
+def food_portion(food_key: str, g: int) -> Dict:
+    """
+    Campos derivados de um alimento JÁ na quantidade final (sem arredondar).
+    
+    Usado por calc_food e para hidratar dietas salvas no formato compacto
+    (diet/storage.py), que guardam só chave + gramas. Memoizado: devolve
+    sempre uma cópia nova.
+    """
+    return dict(_food_portion(food_key, g))
+
+
+@counted("calc_food")
+def calc_food(food_key: str, grams: float, round_down: bool = False) -> Dict:
+    """
+    Calcula macros de um alimento em quantidade específica.
+    
+    ✅ GARANTIAS:
+    - SEMPRE retorna um dict válido (nunca None)
+    - grams SEMPRE >= MIN_FOOD_GRAMS (10g)
+    - grams SEMPRE <= MAX_FOOD_GRAMS (800g) ou MAX_CARB_GRAMS (1200g) para carbs
+    - Alimentos CONTÁVEIS (ovos, pão, iogurte) são ajustados para unidades inteiras
+    - TODOS os campos obrigatórios preenchidos
+    
+    Parâmetros:
+    - round_down: Se True, arredonda contáveis para BAIXO (menos macros)
+                  Se False (padrão), arredonda para o mais próximo
+    
+    Formato: "Nome – Xg (≈ Y medida caseira)"
+    """
+    # FALLBACK: Se alimento não existe, usa frango como default
+    if food_key not in FOODS:
+        food_key = "frango"
+    
+    return food_portion(food_key, normalize_food_grams(food_key, grams, round_down))
+
+
 def sum_foods(foods: List[Dict]) -> Tuple[int, int, int, int]:
     """Soma totais de uma lista de alimentos"""
     p = sum(f.get("protein", 0) for f in foods)
@@ -1019,6 +723,7 @@ def filter_by_restrictions(foods: Set[str], restrictions: List[str]) -> Set[str]
 
 # ==================== AUTO-COMPLETAR INTELIGENTE ====================
 
+@profiled_stage("validate_user_foods")
 def validate_user_foods(preferred: Set[str], restrictions: List[str]) -> Tuple[Set[str], bool, str]:
     """
     🧠 AUTO-COMPLETAR INTELIGENTE
@@ -1177,7 +882,7 @@ def get_available_by_category(preferred: Set[str], category: str, restrictions:
         available = category_foods
     
     available_set = filter_by_restrictions(set(available), restrictions)
-    return list(available_set)
+    return sorted(available_set)
 
 
 def select_food(preferred: Set[str], category: str, restrictions: List[str], priority: List[str]) -> str:
@@ -1191,175 +896,6 @@ def select_food(preferred: Set[str], category: str, restrictions: List[str], pri
     return available[0] if available else priority[0]
 
 
-# ==================== CÁLCULO DE TDEE/MACROS ====================
-
-def calculate_cardio_burn(cardio_minutos_semana: int, intensidade_cardio: str) -> int:
-    """
-    Calcula gasto calórico semanal do cardio baseado em minutos e intensidade.
-    
-    Intensidades (kcal/min):
-    - Leve: 5 kcal/min (caminhada, bike leve)
-    - Moderado: 8 kcal/min (caminhada rápida, bike moderada)
-    - Intenso: 11 kcal/min (corrida, HIIT, escada)
-    
-    Retorna: calorias semanais gastas no cardio
-    """
-    if not cardio_minutos_semana or cardio_minutos_semana <= 0:
-        return 0
-    
-    kcal_por_min = {
-        'leve': 5,
-        'light': 5,
-        'moderado': 8,
-        'moderate': 8,
-        'intenso': 11,
-        'intense': 11,
-        'high': 11
-    }
-    
-    intensidade = intensidade_cardio.lower() if intensidade_cardio else 'moderado'
-    kcal_min = kcal_por_min.get(intensidade, 8)  # Default: moderado
-    
-    cardio_semanal = cardio_minutos_semana * kcal_min
-    print(f"[CARDIO] {cardio_minutos_semana}min/semana × {kcal_min}kcal/min = {cardio_semanal}kcal/semana")
-    
-    return cardio_semanal
-
-
-def calculate_tdee(weight: float, height: float, age: int, gender: str, 
-                   activity_level: str, training_level: str, 
-                   cardio_minutos_semana: int = 0, intensidade_cardio: str = 'moderado') -> float:
-    """
-    Calcula TDEE (Total Daily Energy Expenditure) usando Mifflin-St Jeor
-    
-    FÓRMULA COMPLETA:
-    1. BMR = Mifflin-St Jeor
-    2. TDEE_base = BMR × Fator de Atividade + Bônus de Treino
-    3. Cardio_semanal = minutos × kcal/min (SE informado)
-    4. TDEE_real = TDEE_base + (Cardio_semanal / 7)
-    
-    Se cardio não informado: TDEE_real = TDEE_base
-    """
-    # PASSO 1: Calcular BMR (Mifflin-St Jeor)
-    if gender.lower() in ['masculino', 'male', 'm']:
-        bmr = 10 * weight + 6.25 * height - 5 * age + 5
-    else:
-        bmr = 10 * weight + 6.25 * height - 5 * age - 161
-    
-    # PASSO 2: Multiplicador de atividade
-    activity_multipliers = {
-        'sedentary': 1.2, 'sedentario': 1.2,
-        'lightly_active': 1.375, 'leve': 1.375,
-        'moderately_active': 1.55, 'moderado': 1.55,
-        'very_active': 1.725, 'intenso': 1.725,
-        'extra_active': 1.9, 'muito_intenso': 1.9
-    }
-    
-    multiplier = activity_multipliers.get(activity_level.lower(), 1.55)
-    
-    # PASSO 3: Bônus de treino
-    training_bonus = {
-        'beginner': 0, 'iniciante': 0, 'novato': 0,
-        'intermediate': 50, 'intermediario': 50,
-        'advanced': 100, 'avancado': 100
-    }
-    
-    bonus = training_bonus.get(training_level.lower(), 0)
-    
-    # PASSO 4: TDEE Base
-    tdee_base = bmr * multiplier + bonus
-    
-    # PASSO 5: Adicionar cardio (SE informado)
-    cardio_semanal = calculate_cardio_burn(cardio_minutos_semana, intensidade_cardio)
-    
-    if cardio_semanal > 0:
-        cardio_diario = cardio_semanal / 7
-        tdee_real = tdee_base + cardio_diario
-        print(f"[TDEE] BMR={bmr:.0f} × {multiplier} + bonus={bonus} = TDEE_base={tdee_base:.0f}")
-        print(f"[TDEE] Cardio diário = {cardio_semanal}/7 = {cardio_diario:.0f}kcal")
-        print(f"[TDEE] TDEE_real = {tdee_base:.0f} + {cardio_diario:.0f} = {tdee_real:.0f}kcal")
-        return tdee_real
-    else:
-        print(f"[TDEE] BMR={bmr:.0f} × {multiplier} + bonus={bonus} = TDEE={tdee_base:.0f}kcal (sem cardio)")
-        return tdee_base
-
-
-def calculate_target_macros(weight: float, tdee: float, goal: str, gender: str = 'masculino') -> Dict:
-    """
-    🎯 CALCULA MACROS COM LIMITES DE SEGURANÇA
-    
-    1. Aplicar multiplicador baseado no objetivo
-    2. Distribuir macros a partir das calorias ajustadas
-    3. Aplicar LIMITES obrigatórios
-    
-    CUTTING: TDEE × 0.80 (-20% déficit)
-       - Proteína: peso × 2.2g (máx 2.4g/kg)
-       - Gordura: peso × 0.8g (mín 0.6g/kg)
-       - Carboidrato: calorias restantes
-    
-    MANUTENÇÃO: TDEE × 1.00
-       - Proteína: peso × 2.0g
-       - Gordura: peso × 0.85g
-       - Carboidrato: calorias restantes
-    
-    BULKING: TDEE × 1.12 (+12% superávit)
-       - Proteína: peso × 2.0g
-       - Gordura: peso × 0.9g
-       - Carboidrato: calorias restantes
-    
-    LIMITES OBRIGATÓRIOS:
-       - Gordura mínima: 0.6g/kg
-       - Proteína máxima: 2.4g/kg
-    """
-    
-    # PASSO 1: Ajusta TDEE baseado no objetivo
-    if goal.lower() == 'cutting':
-        target_calories = tdee * 0.80  # -20% déficit
-    elif goal.lower() == 'bulking':
-        target_calories = tdee * 1.12  # +12% superávit
-    else:  # manutenção
-        target_calories = tdee
-    
-    # PASSO 2: Distribui macros base
-    if goal.lower() == 'cutting':
-        protein = weight * 2.2
-        fat = weight * 0.8
-    elif goal.lower() == 'bulking':
-        protein = weight * 2.0
-        fat = weight * 0.9
-    else:  # manutenção
-        protein = weight * 2.0
-        fat = weight * 0.85
-    
-    # PASSO 3: Aplicar LIMITES obrigatórios
-    # Gordura mínima: 0.6g/kg
-    fat = max(fat, weight * 0.6)
-    
-    # Proteína máxima: 2.4g/kg
-    protein = min(protein, weight * 2.4)
-    
-    # PASSO 4: Carboidratos = calorias restantes
-    protein_cal = protein * 4
-    fat_cal = fat * 9
-    carbs_cal = target_calories - protein_cal - fat_cal
-    carbs = max(50, carbs_cal / 4)  # Mínimo 50g de carbs
-    
-    # Fibra mínima
-    fiber_target = 30 if gender.lower() in ['masculino', 'male', 'm'] else 25
-    
-    print(f"[MACROS] Peso={weight}kg, TDEE={tdee:.0f}, Goal={goal}")
-    print(f"[MACROS] Target={target_calories:.0f}kcal | P={protein:.0f}g C={carbs:.0f}g F={fat:.0f}g")
-    print(f"[MACROS] Limites aplicados: Gordura mín={weight*0.6:.0f}g, Proteína máx={weight*2.4:.0f}g")
-    
-    return {
-        'calories': round(target_calories),
-        'protein': round(protein),
-        'carbs': round(carbs),
-        'fat': round(fat),
-        'fiber_target': fiber_target
-    }
-
-
 # ==================== REGRAS POR REFEIÇÃO ====================
 # IMPORTANTE: Usar APENAS alimentos ATIVOS no sistema
 # REGRA DE FALHA: Se arroz, frango, peixe ou azeite aparecerem em lanches ou café, 
@@ -1426,21 +962,21 @@ def get_allowed_foods(meal_type: str, preferred: Set[str], restrictions: List[st
     # 🎯 PRIMEIRO: Pega TODOS os alimentos do usuário da categoria
     # (ignora as regras da refeição - a preferência do usuário é soberana!)
     user_foods_in_category = []
-    for food_key in preferred:
+    for food_key in sorted(preferred):
         if food_key in FOODS and FOODS[food_key]["category"] == category:
             user_foods_in_category.append(food_key)
     
     # Se o usuário escolheu alimentos da categoria, usa ESSES
     # (mesmo que não sejam "típicos" da refeição)
     if user_foods_in_category:
-        return list(filter_by_restrictions(set(user_foods_in_category), restrictions))
+        return sorted(filter_by_restrictions(set(user_foods_in_category), restrictions))
     
     if category == "fruit":
         # Frutas: se permitido, retorna todas as frutas disponíveis
         if rules.get("fruits"):
             all_fruits = [k for k, v in FOODS.items() if v["category"] == "fruit"]
             available = [f for f in all_fruits if f in preferred] if preferred else all_fruits
-            return list(filter_by_restrictions(set(available), restrictions))
+            return sorted(filter_by_restrictions(set(available), restrictions))
         return []
     
     # Se o usuário NÃO escolheu nada da categoria, usa as regras da refeição
@@ -1452,7 +988,7 @@ def get_allowed_foods(meal_type: str, preferred: Set[str], restrictions: List[st
     # Retorna alimentos permitidos na refeição que não violam restrições
     available = [food_key for food_key in allowed_in_meal if food_key in FOODS]
     
-    return list(filter_by_restrictions(set(available), restrictions))
+    return sorted(filter_by_restrictions(set(available), restrictions))
 
 
 def select_best_food(meal_type: str, preferred: Set[str], restrictions: List[str], 
@@ -1553,6 +1089,7 @@ def get_safe_fallback(category: str, restrictions: List[str], fallback_list: Lis
 
 # ==================== GERAÇÃO DE DIETA ====================
 
+@profiled_stage("generate_diet")
 def generate_diet(target_p: int, target_c: int, target_f: int,
                   preferred: Set[str], restrictions: List[str], meal_count: int = 6,
                   original_preferred: Set[str] = None, goal: str = "manutencao") -> List[Dict]:
@@ -1650,7 +1187,7 @@ def generate_diet(target_p: int, target_c: int, target_f: int,
         # Primeiro: tenta pegar TODOS os alimentos do usuário da categoria
         # (ignora meal_type - o que importa é a preferência do usuário!)
         user_foods = []
-        for p in preferred:
+        for p in sorted(preferred):
             if p in FOODS and p not in excluded_by_restrictions:
                 if FOODS[p]["category"] == category:
                     user_foods.append(p)
@@ -2191,6 +1728,7 @@ def generate_diet(target_p: int, target_c: int, target_f: int,
     return meals
 
 
+@profiled_stage("fine_tune_diet")
 def fine_tune_diet(meals: List[Dict], target_p: int, target_c: int, target_f: int) -> List[Dict]:
     """
     Ajuste fino ULTRA-AGRESSIVO para atingir macros.
@@ -2295,6 +1833,7 @@ def fine_tune_diet(meals: List[Dict], target_p: int, target_c: int, target_f: in
         all_indices = [0, 1, 2, 3, 4, 5]
     
     for iteration in range(150):  # Mais iterações
+        count(FINE_TUNE_ITERATIONS)
         all_foods = [f for m in meals for f in m["foods"]]
         curr_p, curr_c, curr_f, curr_cal = sum_foods(all_foods)
         
@@ -2696,10 +2235,10 @@ def validate_and_fix_meal(meal: Dict, meal_index: int, preferred: Set[str] = Non
             excluded_by_restrictions.update(RESTRICTION_EXCLUSIONS[r])
     
     # 🎯 EXTRAI ALIMENTOS PREFERIDOS POR CATEGORIA
-    user_proteins = [p for p in preferred if p in FOODS and FOODS[p]["category"] == "protein" and p not in excluded_by_restrictions]
-    user_carbs = [p for p in preferred if p in FOODS and FOODS[p]["category"] == "carb" and p not in excluded_by_restrictions]
-    user_fats = [p for p in preferred if p in FOODS and FOODS[p]["category"] == "fat" and p not in excluded_by_restrictions]
-    user_fruits = [p for p in preferred if p in FOODS and FOODS[p]["category"] == "fruit" and p not in excluded_by_restrictions]
+    user_proteins = [p for p in sorted(preferred) if p in FOODS and FOODS[p]["category"] == "protein" and p not in excluded_by_restrictions]
+    user_carbs = [p for p in sorted(preferred) if p in FOODS and FOODS[p]["category"] == "carb" and p not in excluded_by_restrictions]
+    user_fats = [p for p in sorted(preferred) if p in FOODS and FOODS[p]["category"] == "fat" and p not in excluded_by_restrictions]
+    user_fruits = [p for p in sorted(preferred) if p in FOODS and FOODS[p]["category"] == "fruit" and p not in excluded_by_restrictions]
     
     # Meal names padrão (6 refeições)
     default_meals = [
@@ -2864,6 +2403,7 @@ def validate_and_fix_meal(meal: Dict, meal_index: int, preferred: Set[str] = Non
     }
 
 
+@profiled_stage("apply_global_limits")
 def apply_global_limits(meals: List[Dict], preferred: Set[str] = None) -> List[Dict]:
     """
     ✅ APLICA LIMITES GLOBAIS NA DIETA TODA
@@ -3052,6 +2592,7 @@ def apply_global_limits(meals: List[Dict], preferred: Set[str] = None) -> List[D
     return meals
 
 
+@profiled_stage("validate_and_fix_diet")
 def validate_and_fix_diet(meals: List[Dict], target_p: int, target_c: int, target_f: int,
                           preferred: Set[str] = None, meal_count: int = 6, restrictions: List[str] = None) -> List[Dict]:
     """
@@ -3209,6 +2750,7 @@ def validate_and_fix_diet(meals: List[Dict], target_p: int, target_c: int, targe
     return validated_meals
 
 
+@profiled_stage("validate_food_frequency")
 def validate_food_frequency(meals: List[Dict], preferred: Set[str] = None) -> List[Dict]:
     """
     🔄 Etapa 4 do PRD: Validação de Frequência de Alimentos
@@ -3245,10 +2787,10 @@ def validate_food_frequency(meals: List[Dict], preferred: Set[str] = None) -> Li
     # 🎯 NOVA LÓGICA: Identifica categorias com opções limitadas
     # Organiza os alimentos preferidos por categoria
     user_substitutes = {
-        "protein": [f for f in preferred if f in FOODS and FOODS[f]["category"] == "protein"],
-        "carb": [f for f in preferred if f in FOODS and FOODS[f]["category"] == "carb"],
-        "fat": [f for f in preferred if f in FOODS and FOODS[f]["category"] == "fat"],
-        "fruit": [f for f in preferred if f in FOODS and FOODS[f]["category"] == "fruit"]
+        "protein": [f for f in sorted(preferred) if f in FOODS and FOODS[f]["category"] == "protein"],
+        "carb": [f for f in sorted(preferred) if f in FOODS and FOODS[f]["category"] == "carb"],
+        "fat": [f for f in sorted(preferred) if f in FOODS and FOODS[f]["category"] == "fat"],
+        "fruit": [f for f in sorted(preferred) if f in FOODS and FOODS[f]["category"] == "fruit"]
     }
     
     # 🎯 NOVA REGRA: Se o usuário tem 2 ou menos alimentos na categoria,
@@ -3345,6 +2887,7 @@ class DietAIService:
     def __init__(self):
         self.api_key = os.environ.get('EMERGENT_LLM_KEY')
     
+    @profiled_generation
     def generate_diet_plan(self, user_profile: Dict, target_calories: float, target_macros: Dict[str, float], meal_count: int = 6, meal_times: List[Dict] = None) -> DietPlan:
         """
         Gera plano de dieta personalizado.
@@ -3523,7 +3066,7 @@ class DietAIService:
             proteinas_cafe = []  # Para café da manhã
             proteinas_principais = []  # Para almoço/jantar
             
-            for p in proteinas_validas:
+            for p in sorted(proteinas_validas):
                 if p in {"ovos", "claras", "whey_protein", "cottage", "iogurte_zero"}:
                     proteinas_cafe.append(p)
                 if p in PROTEINAS_ANIMAIS or p in PROTEINAS_VEGETAIS:
@@ -3794,7 +3337,7 @@ class DietAIService:
             # Adiciona refeições extras se necessário (com alimentos do usuário)
             while len(meals) < meal_count:
                 # 🚫 Usa alimentos do usuário, não defaults!
-                user_protein = next((f for f in preferred_foods if f in FOODS and FOODS[f]["category"] == "protein"), None)
+                user_protein = next((f for f in sorted(preferred_foods) if f in FOODS and FOODS[f]["category"] == "protein"), None)
                 if user_protein:
                     meals.append({
                         "name": f"Refeição {len(meals) + 1}",
@@ -4391,6 +3934,11 @@ class DietAIService:
         if auto_completed:
             notes += " | 🔄 Auto-completada"
         
+        record_macro_error(
+            {"protein": total_p, "carbs": total_c, "fat": total_f},
+            {"protein": target_p, "carbs": target_c, "fat": target_f},
+        )
+        
         return DietPlan(
             user_id=user_profile.get('user_id') or user_profile.get('_id') or user_profile.get('id'),
             target_calories=target_cal_int,
@@ -0,0 +1,33 @@
+"""
+Jobs Module - Fila de jobs em background
+========================================
+- queue.py: fila durável no MongoDB com coalescing por usuário e pool de
+  workers no processo da API (regeneração de dieta após troca de objetivo)
+"""
+
+from .queue import (
+    JOB_WORKERS,
+    JOBS,
+    JobHandler,
+    JobWorkerPool,
+    cancel_user_jobs,
+    enqueue,
+    ensure_job_indexes,
+    get_job,
+    latest_job,
+)
+
+__all__ = [
+    # Fila
+    'JOBS',
+    'cancel_user_jobs',
+    'enqueue',
+    'ensure_job_indexes',
+    'get_job',
+    'latest_job',
+
+    # Workers
+    'JOB_WORKERS',
+    'JobHandler',
+    'JobWorkerPool',
+]
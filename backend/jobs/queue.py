@@ -0,0 +1,225 @@
+"""
+Fila de jobs durável no MongoDB + pool de workers local
+=======================================================
+Cada job é um documento em `jobs`:
+
+    {_id, kind, user_id, payload, status, attempts, run_after, created_at,
+     updated_at, locked_until, worker, result, error}
+
+status: queued -> running -> done | failed (volta para queued enquanto
+houver tentativas, com backoff em run_after). cancel_user_jobs() tira da
+fila os jobs de um usuário (exclusão de conta): status "cancelled".
+
+Coalescing: enqueue() de um job (kind, user_id) que já está na fila só
+atualiza o payload do job existente (índice único parcial em
+(kind, user_id) com status "queued"). Um job já em execução não é tocado:
+o novo fica na fila e só é pego quando o anterior terminar, então o
+resultado final sempre reflete o último pedido.
+
+Se o worker cair, o job fica "running" até locked_until vencer e então é
+retomado por outro worker.
+
+    JOB_WORKERS=2                # tasks por processo (0 desliga)
+    JOB_POLL_INTERVAL=1.0        # segundos entre buscas com a fila vazia
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+JOBS = "jobs"
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "1.0"))
+JOB_LOCK_SECONDS = 300
+JOB_MAX_ATTEMPTS = 3
+JOB_TTL_DAYS = 7
+
+# handler(job) -> resultado (dict serializável) gravado no job
+JobHandler = Callable[[Dict], Awaitable[Optional[Dict]]]
+
+
+async def enqueue(db, kind: str, user_id: str, payload: Optional[Dict] = None) -> Dict:
+    """
+    Coloca um job na fila (ou atualiza o que já está esperando para o mesmo
+    usuário). Retorna {"job_id", "status", "coalesced"}.
+    """
+    now = datetime.utcnow()
+    job_id = str(uuid.uuid4())
+    query = {"kind": kind, "user_id": user_id, "status": "queued"}
+    update = {
+        "$set": {"payload": payload or {}, "updated_at": now},
+        "$setOnInsert": {"_id": job_id, "attempts": 0, "run_after": now, "created_at": now},
+    }
+    for _ in range(3):
+        try:
+            job = await db[JOBS].find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER, projection={"_id": 1}
+            )
+        except DuplicateKeyError:
+            # Outro request criou o job no mesmo instante: a próxima volta atualiza o dele
+            continue
+        return {"job_id": job["_id"], "status": "queued", "coalesced": job["_id"] != job_id}
+    raise RuntimeError(f"Não foi possível enfileirar {kind} para {user_id}")
+
+
+async def cancel_user_jobs(db, user_id: str) -> int:
+    """Cancela os jobs do usuário que ainda estão na fila; retorna quantos"""
+    result = await db[JOBS].update_many(
+        {"user_id": user_id, "status": "queued"},
+        {"$set": {"status": "cancelled", "updated_at": datetime.utcnow()}},
+    )
+    return result.modified_count
+
+
+async def get_job(db, job_id: str) -> Optional[Dict]:
+    return await db[JOBS].find_one({"_id": job_id}, {"payload": 0, "worker": 0, "locked_until": 0})
+
+
+async def latest_job(db, kind: str, user_id: str) -> Optional[Dict]:
+    return await db[JOBS].find_one(
+        {"kind": kind, "user_id": user_id},
+        {"payload": 0, "worker": 0, "locked_until": 0},
+        sort=[("created_at", -1)],
+    )
+
+
+async def ensure_job_indexes(db):
+    await db[JOBS].create_index(
+        [("kind", 1), ("user_id", 1)],
+        unique=True,
+        partialFilterExpression={"status": "queued"},
+        name="kind_user_queued_unique",
+    )
+    await db[JOBS].create_index([("status", 1), ("run_after", 1)])
+    await db[JOBS].create_index([("kind", 1), ("user_id", 1), ("created_at", -1)])
+    await db[JOBS].create_index("updated_at", expireAfterSeconds=JOB_TTL_DAYS * 86400)
+
+
+class JobWorkerPool:
+    """N tasks asyncio que consomem a fila; o trabalho pesado vai para os executores de cada handler"""
+
+    def __init__(self, db, handlers: Dict[str, JobHandler], workers: int = JOB_WORKERS,
+                 poll_interval: float = JOB_POLL_INTERVAL):
+        self.db = db
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+
+    async def claim(self, now: Optional[datetime] = None) -> Optional[Dict]:
+        """Pega o próximo job pronto, pulando usuários com job do mesmo tipo em execução"""
+        now = now or datetime.utcnow()
+        jobs = self.db[JOBS]
+        skip: List[str] = []
+        while True:
+            candidate = await jobs.find_one(
+                {
+                    "_id": {"$nin": skip},
+                    "kind": {"$in": list(self.handlers)},
+                    "$or": [
+                        {"status": "queued", "run_after": {"$lte": now}},
+                        {"status": "running", "locked_until": {"$lte": now}},
+                    ],
+                },
+                {"kind": 1, "user_id": 1, "status": 1},
+                sort=[("run_after", 1)],
+            )
+            if candidate is None:
+                return None
+
+            if candidate["status"] == "queued":
+                busy = await jobs.find_one({
+                    "kind": candidate["kind"], "user_id": candidate["user_id"],
+                    "status": "running", "locked_until": {"$gt": now},
+                }, {"_id": 1})
+                if busy:
+                    skip.append(candidate["_id"])
+                    continue
+
+            job = await jobs.find_one_and_update(
+                {"_id": candidate["_id"], "status": candidate["status"]},
+                {
+                    "$set": {
+                        "status": "running",
+                        "worker": self.owner,
+                        "locked_until": now + timedelta(seconds=JOB_LOCK_SECONDS),
+                        "updated_at": now,
+                    },
+                    "$inc": {"attempts": 1},
+                },
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is not None:
+                return job
+            # Outro worker levou: tenta o próximo
+
+    async def run_job(self, job: Dict):
+        jobs = self.db[JOBS]
+        try:
+            result = await self.handlers[job["kind"]](job)
+        except Exception as e:
+            retry = job.get("attempts", 1) < JOB_MAX_ATTEMPTS
+            logger.error(f"Job {job['kind']} {job['_id']} falhou (tentativa {job.get('attempts')}): {e}")
+            now = datetime.utcnow()
+            update = {"status": "queued" if retry else "failed", "error": str(e), "updated_at": now}
+            if retry:
+                update["run_after"] = now + timedelta(seconds=2 ** job.get("attempts", 1))
+            try:
+                await jobs.update_one({"_id": job["_id"]}, {"$set": update})
+            except DuplicateKeyError:
+                # Já existe um pedido mais novo na fila para o usuário: ele substitui este
+                await jobs.update_one({"_id": job["_id"]}, {"$set": {**update, "status": "failed"}})
+            return
+        await jobs.update_one(
+            {"_id": job["_id"]},
+            {"$set": {"status": "done", "result": result or {}, "updated_at": datetime.utcnow()}},
+        )
+
+    async def run_pending(self) -> int:
+        """Processa a fila até esvaziar (testes/scripts); retorna quantos jobs rodaram"""
+        processed = 0
+        while True:
+            job = await self.claim()
+            if job is None:
+                return processed
+            await self.run_job(job)
+            processed += 1
+
+    async def _loop(self):
+        while True:
+            try:
+                job = await self.claim()
+            except Exception as e:
+                logger.warning(f"Falha ao buscar job na fila: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self.run_job(job)
+
+    def start(self):
+        """Inicia os workers (chamar no startup); workers <= 0 desliga"""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._loop()) for _ in range(max(0, self.workers))]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
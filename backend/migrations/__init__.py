@@ -0,0 +1,6 @@
+"""
+Migrações de dados do MongoDB (scripts idempotentes, rodados à mão):
+
+    python -m migrations.compact_diet_plans --mongo-url mongodb://... --db-name ...
+    python -m migrations.tracking_timeseries --mongo-url mongodb://... --db-name ...
+"""
@@ -0,0 +1,88 @@
+"""
+Migração: diet_plans para o formato compacto (diet/storage.py)
+==============================================================
+Lê as dietas ainda no formato completo (sem storage_version = 2) em lotes
+e regrava cada uma compactada via bulk_write.
+
+- Idempotente: dietas já compactas não são lidas de novo
+- Concorrência: o replace só acontece se _id + revision não mudaram desde
+  a leitura (uma edição no meio do caminho vence; a dieta fica para a
+  próxima execução)
+- --dry-run: só mede o ganho de espaço
+
+    python -m migrations.compact_diet_plans --mongo-url mongodb://localhost:27017 --db-name laf
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+import bson
+from pymongo import ReplaceOne
+
+from diet.storage import STORAGE_VERSION, compact_diet
+
+
+async def migrate_diet_plans(db, batch_size: int = 500, dry_run: bool = False) -> Dict:
+    scanned = replaced = bytes_before = bytes_after = 0
+    batch: List[ReplaceOne] = []
+
+    async def flush():
+        nonlocal replaced, batch
+        if batch and not dry_run:
+            result = await db.diet_plans.bulk_write(batch, ordered=False)
+            replaced += result.modified_count
+        batch = []
+
+    cursor = db.diet_plans.find({"storage_version": {"$ne": STORAGE_VERSION}}, batch_size=batch_size)
+    async for diet in cursor:
+        scanned += 1
+        compact = compact_diet(diet)
+        bytes_before += len(bson.encode(diet))
+        bytes_after += len(bson.encode(compact))
+        batch.append(ReplaceOne({"_id": diet["_id"], "revision": diet.get("revision")}, compact))
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+
+    return {
+        "scanned": scanned,
+        "replaced": replaced,
+        "dry_run": dry_run,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "ratio": round(bytes_before / bytes_after, 2) if bytes_after else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Compacta os documentos de diet_plans")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME", "laf_database"))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.mongo_url:
+        parser.error("--mongo-url (ou MONGO_URL) é obrigatório")
+
+    async def run():
+        client = AsyncIOMotorClient(args.mongo_url)
+        try:
+            return await migrate_diet_plans(client[args.db_name], args.batch_size, args.dry_run)
+        finally:
+            client.close()
+
+    report = asyncio.run(run())
+    print(
+        f"🗜️  {report['scanned']} dietas lidas, {report['replaced']} regravadas"
+        f"{' (dry-run)' if args.dry_run else ''} | "
+        f"{report['bytes_before']} → {report['bytes_after']} bytes ({report['ratio']}x)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
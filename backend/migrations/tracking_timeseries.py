@@ -0,0 +1,132 @@
+"""
+Migração: peso para time-series e chave de dia no tracker de água
+=================================================================
+1. Copia weight_records → weight_series (time-series no MongoDB 7.0+). Idempotente:
+   registros cujo _id já está na série são pulados. A coleção antiga fica
+   intacta (leitura dupla) até WEIGHT_LEGACY_READ=0.
+2. Preenche `day` nos buckets antigos de water_sodium_tracker. Buckets
+   duplicados do mesmo usuário/dia (corrida do read-modify-write antigo) são
+   fundidos num só antes, senão o índice único (user_id, day) recusaria.
+
+    python -m migrations.tracking_timeseries --mongo-url mongodb://localhost:27017 --db-name laf
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
+
+from tracking import WATER_COLLECTION, WEIGHT_LEGACY, WEIGHT_SERIES, day_key, ensure_tracking_collections
+from tracking.collections import ensure_weight_series
+from tracking.water import WATER_FLAGS_PIPELINE
+
+
+async def migrate_weight_records(db, batch_size: int = 1000, dry_run: bool = False) -> Dict:
+    scanned = copied = 0
+
+    async def flush(batch: List[Dict]):
+        nonlocal copied
+        ids = [record["_id"] for record in batch]
+        present = {doc["_id"] async for doc in db[WEIGHT_SERIES].find({"_id": {"$in": ids}}, {"_id": 1})}
+        missing = [record for record in batch if record["_id"] not in present]
+        if missing and not dry_run:
+            await db[WEIGHT_SERIES].insert_many(missing, ordered=False)
+        copied += len(missing)
+
+    batch: List[Dict] = []
+    async for record in db[WEIGHT_LEGACY].find({}, batch_size=batch_size):
+        scanned += 1
+        batch.append(record)
+        if len(batch) >= batch_size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+
+    return {"scanned": scanned, "copied": copied}
+
+
+async def backfill_water_days(db, dry_run: bool = False) -> Dict:
+    collection = db[WATER_COLLECTION]
+    keyed = merged = 0
+    targets: Dict[Tuple[str, str], str] = {}
+
+    cursor = collection.find({"day": {"$exists": False}}).sort([("user_id", 1), ("date", 1)])
+    async for bucket in cursor:
+        key = (bucket["user_id"], day_key(bucket["date"]))
+        target_id = targets.get(key)
+        if target_id is None:
+            existing = await collection.find_one({"user_id": key[0], "day": key[1]}, {"_id": 1})
+            target_id = existing["_id"] if existing else None
+
+        if target_id is None:
+            # Primeiro bucket do dia: só ganha a chave
+            targets[key] = bucket["_id"]
+            keyed += 1
+            if not dry_run:
+                await collection.update_one({"_id": bucket["_id"]}, {"$set": {"day": key[1]}})
+            continue
+
+        # Duplicado: soma no bucket do dia e apaga este
+        merged += 1
+        if dry_run:
+            continue
+        await collection.update_one(
+            {"_id": target_id},
+            {
+                "$inc": {"water_ml": bucket.get("water_ml", 0), "sodium_mg": bucket.get("sodium_mg", 0)},
+                "$push": {"entries_log": {"$each": bucket.get("entries_log", [])}},
+            },
+        )
+        await collection.update_one({"_id": target_id}, WATER_FLAGS_PIPELINE)
+        await collection.delete_one({"_id": bucket["_id"]})
+
+    return {"keyed": keyed, "merged": merged}
+
+
+async def migrate_tracking(db, batch_size: int = 1000, dry_run: bool = False) -> Dict:
+    # A time-series precisa existir antes do primeiro insert (senão vira coleção comum)
+    if not dry_run:
+        await ensure_weight_series(db)
+    report = {
+        "weight": await migrate_weight_records(db, batch_size, dry_run),
+        "water": await backfill_water_days(db, dry_run),
+        "dry_run": dry_run,
+    }
+    # Índice único (user_id, day) só depois de fundir duplicados
+    if not dry_run:
+        await ensure_tracking_collections(db)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Peso → time-series e chave de dia no tracker de água")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME", "laf_database"))
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.mongo_url:
+        parser.error("--mongo-url (ou MONGO_URL) é obrigatório")
+
+    async def run():
+        client = AsyncIOMotorClient(args.mongo_url)
+        try:
+            return await migrate_tracking(client[args.db_name], args.batch_size, args.dry_run)
+        finally:
+            client.close()
+
+    report = asyncio.run(run())
+    weight, water = report["weight"], report["water"]
+    print(
+        f"⚖️  peso: {weight['scanned']} lidos, {weight['copied']} copiados para {WEIGHT_SERIES}\n"
+        f"💧 água: {water['keyed']} buckets com chave de dia, {water['merged']} duplicados fundidos"
+        f"{' (dry-run)' if args.dry_run else ''}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+"""
+Notifications Module - Lembretes materializados e contador de não lidas
+=======================================================================
+- store.py: gravação com dedupe_key, leitura projetada e contador de não lidas
+- reminders.py: regras dos lembretes (peso, água/sódio abaixo do mínimo)
+- scheduler.py: task em background que materializa os lembretes
+"""
+
+from .reminders import hydration_alerts, superseded_key, weight_reminders
+
+from .scheduler import NOTIFICATION_SCAN_INTERVAL, NotificationScheduler
+
+from .store import (
+    NOTIFICATION_COUNTERS,
+    NOTIFICATIONS,
+    ensure_notification_indexes,
+    list_notifications,
+    mark_read,
+    publish,
+    recount_unread,
+    unread_count,
+)
+
+__all__ = [
+    # Regras
+    'hydration_alerts',
+    'superseded_key',
+    'weight_reminders',
+
+    # Agendador
+    'NOTIFICATION_SCAN_INTERVAL',
+    'NotificationScheduler',
+
+    # Coleção + contador
+    'NOTIFICATION_COUNTERS',
+    'NOTIFICATIONS',
+    'ensure_notification_indexes',
+    'list_notifications',
+    'mark_read',
+    'publish',
+    'recount_unread',
+    'unread_count',
+]
@@ -0,0 +1,110 @@
+"""
+Regras de lembretes materializados pelo agendador
+=================================================
+Cada regra devolve documentos prontos para publish() com uma dedupe_key
+estável dentro do "ciclo" do lembrete:
+
+- weight_update:<data do último peso>       (>= 7 dias sem registrar)
+- weight_update_soon:<data do último peso>  (5-6 dias)
+  Só entram usuários com o último peso nos últimos WEIGHT_REMINDER_WINDOW_DAYS:
+  cada ciclo é considerado perto do vencimento (com folga para varreduras
+  perdidas) e inativos antigos não pesam em toda varredura.
+- water_minimum:<dia> / sodium_minimum:<dia> (dia anterior fechado abaixo
+  do mínimo seguro - os alertas de segurança da Peak Week)
+
+Um novo registro de peso muda a data do ciclo, então o lembrete seguinte é
+outro documento.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from tracking import SODIUM_MIN_MG, WATER_COLLECTION, WATER_MIN_ML, WeightStore, day_key
+
+WEIGHT_REMINDER_DAYS = 7
+WEIGHT_REMINDER_SOON_DAYS = 5
+WEIGHT_REMINDER_WINDOW_DAYS = WEIGHT_REMINDER_DAYS + 3
+
+
+def _notification(user_id: str, dedupe_key: str, now: datetime, **fields) -> Dict:
+    notification_id = str(uuid.uuid4())
+    return {
+        "_id": notification_id,
+        "id": notification_id,
+        "user_id": user_id,
+        "dedupe_key": dedupe_key,
+        "created_at": now,
+        **fields,
+    }
+
+
+def superseded_key(dedupe_key: str) -> Optional[str]:
+    """dedupe_key do lembrete "em breve" que um lembrete vencido substitui"""
+    prefix = "weight_update:"
+    if dedupe_key.startswith(prefix):
+        return "weight_update_soon:" + dedupe_key[len(prefix):]
+    return None
+
+
+async def weight_reminders(db, now: datetime, weight_store: WeightStore) -> List[Dict]:
+    stale = await weight_store.last_recorded_between(
+        now - timedelta(days=WEIGHT_REMINDER_WINDOW_DAYS),
+        now - timedelta(days=WEIGHT_REMINDER_SOON_DAYS),
+    )
+    reminders = []
+    for user_id, last in stale.items():
+        days_since_last = (now - last).days
+        cycle = last.strftime("%Y-%m-%d")
+        if days_since_last >= WEIGHT_REMINDER_DAYS:
+            reminders.append(_notification(
+                user_id, f"weight_update:{cycle}", now,
+                type="weight_update",
+                title="📊 Hora de atualizar seu peso!",
+                message=f"Já se passaram {days_since_last} dias desde seu último registro. Registre seu peso para acompanhar seu progresso.",
+                action_url="/progress",
+                priority="high",
+            ))
+        else:
+            reminders.append(_notification(
+                user_id, f"weight_update_soon:{cycle}", now,
+                type="weight_update",
+                title="⏰ Atualização de peso em breve",
+                message=f"Em {14 - days_since_last} dia(s) você poderá registrar seu novo peso.",
+                action_url="/progress",
+                priority="low",
+            ))
+    return reminders
+
+
+async def hydration_alerts(db, now: datetime) -> List[Dict]:
+    """Alertas do dia anterior com água/sódio registrados abaixo do mínimo"""
+    yesterday = day_key(now - timedelta(days=1))
+    cursor = db[WATER_COLLECTION].find(
+        {"day": yesterday, "$or": [{"water_below_minimum": True}, {"sodium_below_minimum": True}]},
+        {"user_id": 1, "water_ml": 1, "sodium_mg": 1},
+    )
+    alerts = []
+    async for bucket in cursor:
+        user_id = bucket["user_id"]
+        water_ml = bucket.get("water_ml", 0)
+        sodium_mg = bucket.get("sodium_mg", 0)
+        if 0 < water_ml < WATER_MIN_ML:
+            alerts.append(_notification(
+                user_id, f"water_minimum:{yesterday}", now,
+                type="water_minimum",
+                title="💧 Hidratação abaixo do mínimo",
+                message=f"Ontem você registrou {water_ml}ml de água, abaixo do mínimo seguro (2L). Aumente a hidratação!",
+                action_url="/tracker",
+                priority="high",
+            ))
+        if 0 < sodium_mg < SODIUM_MIN_MG:
+            alerts.append(_notification(
+                user_id, f"sodium_minimum:{yesterday}", now,
+                type="sodium_minimum",
+                title="🧂 Sódio abaixo do mínimo",
+                message=f"Ontem você registrou {sodium_mg}mg de sódio, abaixo do mínimo seguro (500mg). Não corte completamente!",
+                action_url="/tracker",
+                priority="high",
+            ))
+    return alerts
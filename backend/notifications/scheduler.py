@@ -0,0 +1,94 @@
+"""
+Agendador de lembretes (task asyncio no processo da API)
+========================================================
+A cada NOTIFICATION_SCAN_INTERVAL segundos materializa os lembretes
+(reminders.py) em `notifications`. Com vários workers, só um roda a
+varredura por intervalo: um lease em `scheduler_leases` é tomado com
+find_one_and_update (expira sozinho se o dono cair). Mesmo se dois rodarem,
+as dedupe_keys impedem duplicatas.
+
+    NOTIFICATION_SCAN_INTERVAL=900   # segundos (0 desliga)
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from tracking import WeightStore
+
+from .reminders import hydration_alerts, superseded_key, weight_reminders
+from .store import mark_read, publish
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_SCAN_INTERVAL = float(os.environ.get("NOTIFICATION_SCAN_INTERVAL", "900"))
+
+SCHEDULER_LEASES = "scheduler_leases"
+_LEASE_ID = "notifications"
+
+
+class NotificationScheduler:
+    def __init__(self, db, weight_store: Optional[WeightStore] = None, interval: float = NOTIFICATION_SCAN_INTERVAL):
+        self.db = db
+        self.weight_store = weight_store or WeightStore(db)
+        self.interval = interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+
+    async def _acquire_lease(self, now: datetime) -> bool:
+        try:
+            await self.db[SCHEDULER_LEASES].update_one(
+                {"_id": _LEASE_ID, "$or": [{"expires_at": {"$lte": now}}, {"owner": self.owner}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.interval)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # Lease válido de outro worker: o filtro não casou e o upsert colidiu no _id
+            return False
+        return True
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict:
+        """Uma varredura completa; devolve o que foi criado"""
+        now = now or datetime.utcnow()
+        weight = await weight_reminders(self.db, now, self.weight_store)
+        hydration = await hydration_alerts(self.db, now)
+        created = await publish(self.db, weight + hydration)
+
+        # Lembrete vencido recém-criado substitui o "em breve" do mesmo ciclo
+        for notification in created:
+            soon_key = superseded_key(notification["dedupe_key"])
+            if soon_key:
+                await mark_read(self.db, notification["user_id"], {"dedupe_key": soon_key})
+
+        return {"candidates": len(weight) + len(hydration), "created": len(created)}
+
+    async def _loop(self):
+        while True:
+            now = datetime.utcnow()
+            try:
+                if await self._acquire_lease(now):
+                    report = await self.run_once(now)
+                    if report["created"]:
+                        logger.info(f"Notificações criadas pelo agendador: {report['created']}")
+            except Exception as e:
+                logger.warning(f"Falha na varredura de notificações: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Inicia a task (chamar no startup); interval <= 0 desliga"""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
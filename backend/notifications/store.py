@@ -0,0 +1,128 @@
+"""
+Coleção de notificações + contador de não lidas
+===============================================
+- publish(): grava lembretes com dedupe_key (upsert $setOnInsert no índice
+  único (user_id, dedupe_key)): rodar o agendador duas vezes não duplica.
+- notification_counters: {_id: user_id, unread: n}, mantido com $inc a
+  cada notificação nova (+1) e a cada leitura (-modified_count). O GET e o
+  badge leem um documento em vez de contar a lista.
+
+Usuários antigos sem contador ganham um por recontagem (índice
+(user_id, read)): o $inc só atua em contador que já existe - começar do
+zero deixaria o badge errado para quem já tinha notificações não lidas.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from sync import next_sync_seqs, sync_stamp
+from tracking import WATER_COLLECTION
+
+NOTIFICATIONS = "notifications"
+NOTIFICATION_COUNTERS = "notification_counters"
+
+# Campos que o app mostra (GET /notifications)
+NOTIFICATION_PROJECTION = {
+    "type": 1, "title": 1, "message": 1, "created_at": 1,
+    "read": 1, "action_url": 1, "priority": 1,
+}
+
+
+async def _inc_unread(db, deltas: Dict[str, int]):
+    """$inc nos contadores existentes; quem ainda não tem contador é recontado"""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    result = await db[NOTIFICATION_COUNTERS].bulk_write([
+        UpdateOne({"_id": user_id}, {"$inc": {"unread": delta}})
+        for user_id, delta in deltas.items()
+    ], ordered=False)
+    if result.matched_count == len(deltas):
+        return
+    existing = await db[NOTIFICATION_COUNTERS].distinct("_id", {"_id": {"$in": list(deltas)}})
+    for user_id in set(deltas) - set(existing):
+        # A coleção já reflete esta escrita: a contagem é o valor certo
+        await recount_unread(db, user_id)
+
+
+async def publish(db, notifications: Iterable[Dict]) -> List[Dict]:
+    """
+    Grava as notificações que ainda não existem (por user_id + dedupe_key).
+    Cada uma precisa de um _id próprio. Retorna as que foram criadas.
+    """
+    notifications = list(notifications)
+    if not notifications:
+        return []
+
+    operations = [
+        UpdateOne(
+            {"user_id": n["user_id"], "dedupe_key": n["dedupe_key"]},
+            {"$setOnInsert": {**n, "read": False}},
+            upsert=True,
+        )
+        for n in notifications
+    ]
+    result = await db[NOTIFICATIONS].bulk_write(operations, ordered=False)
+    if not result.upserted_ids:
+        return []
+
+    upserted = set(result.upserted_ids.values())
+    created = [n for n in notifications if n["_id"] in upserted]
+    per_user = Counter(n["user_id"] for n in created)
+
+    # Carimbo do /sync e contador de não lidas, em lote
+    seqs = await next_sync_seqs(db, list(per_user))
+    await db[NOTIFICATIONS].bulk_write([
+        UpdateOne({"_id": n["_id"]}, {"$set": {"sync_seq": seqs[n["user_id"]]}})
+        for n in created
+    ], ordered=False)
+    await _inc_unread(db, per_user)
+    return created
+
+
+async def mark_read(db, user_id: str, query: Optional[Dict] = None) -> int:
+    """Marca como lidas as não lidas do usuário que casam com `query`; retorna quantas"""
+    stamp = await sync_stamp(db, user_id)
+    result = await db[NOTIFICATIONS].update_many(
+        {**(query or {}), "user_id": user_id, "read": False},
+        {"$set": {"read": True, "read_at": stamp["updated_at"], **stamp}},
+    )
+    await _inc_unread(db, {user_id: -result.modified_count})
+    return result.modified_count
+
+
+async def unread_count(db, user_id: str) -> int:
+    counter = await db[NOTIFICATION_COUNTERS].find_one({"_id": user_id})
+    if counter is not None:
+        return max(0, counter.get("unread", 0))
+    return await recount_unread(db, user_id)
+
+
+async def recount_unread(db, user_id: str) -> int:
+    """Recalcula o contador a partir da coleção (usuários antigos / reparo)"""
+    unread = await db[NOTIFICATIONS].count_documents({"user_id": user_id, "read": False})
+    await db[NOTIFICATION_COUNTERS].update_one({"_id": user_id}, {"$set": {"unread": unread}}, upsert=True)
+    return unread
+
+
+async def list_notifications(db, user_id: str, unread_only: bool = False, limit: int = 50) -> List[Dict]:
+    """Uma busca no índice (user_id, read, created_at) com projeção"""
+    query = {"user_id": user_id}
+    if unread_only:
+        query["read"] = False
+    cursor = db[NOTIFICATIONS].find(query, NOTIFICATION_PROJECTION).sort("created_at", -1)
+    return await cursor.to_list(length=limit)
+
+
+async def ensure_notification_indexes(db):
+    await db[NOTIFICATIONS].create_index([("user_id", 1), ("created_at", -1)])
+    await db[NOTIFICATIONS].create_index([("user_id", 1), ("read", 1), ("created_at", -1)])
+    await db[NOTIFICATIONS].create_index(
+        [("user_id", 1), ("dedupe_key", 1)],
+        unique=True,
+        partialFilterExpression={"dedupe_key": {"$exists": True}},
+    )
+    # Varredura diária do agendador (alertas de água/sódio do dia anterior)
+    await db[WATER_COLLECTION].create_index([("day", 1)])
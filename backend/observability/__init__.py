@@ -0,0 +1,53 @@
+"""
+Observability Module - Métricas Prometheus
+==========================================
+- metrics.py: middleware HTTP (latência/tamanho/status por rota), lag do event loop
+- mongo.py: tempos de comandos do Mongo via command monitoring do pymongo
+- readiness.py: probe /ready (Mongo, pool, event loop, executor de dieta)
+- sampler.py: profiler estatístico opt-in (collapsed stacks + tags)
+"""
+
+from .metrics import (
+    MetricsMiddleware,
+    last_event_loop_lag,
+    metrics_response,
+    start_event_loop_lag_monitor,
+    stop_event_loop_lag_monitor,
+)
+
+from .mongo import MongoCommandMetrics
+
+from .readiness import PoolUsage, ReadinessProbe
+
+from .sampler import (
+    SamplingProfiler,
+    current_sampling,
+    publish_thread_tags,
+    sample_tags,
+    start_sampling,
+    stop_sampling,
+)
+
+__all__ = [
+    # HTTP / event loop
+    'MetricsMiddleware',
+    'last_event_loop_lag',
+    'metrics_response',
+    'start_event_loop_lag_monitor',
+    'stop_event_loop_lag_monitor',
+    
+    # Mongo
+    'MongoCommandMetrics',
+    
+    # Readiness
+    'PoolUsage',
+    'ReadinessProbe',
+    
+    # Sampling profiler
+    'SamplingProfiler',
+    'current_sampling',
+    'publish_thread_tags',
+    'sample_tags',
+    'start_sampling',
+    'stop_sampling',
+]
@@ -0,0 +1,151 @@
+"""
+Métricas HTTP e do event loop (Prometheus)
+==========================================
+MetricsMiddleware é um middleware ASGI puro: mede cada requisição HTTP e
+rotula pelo TEMPLATE da rota (ex.: /api/diet/{user_id}), não pela URL, para
+manter a cardinalidade baixa. Requisições sem rota viram "<unmatched>".
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.responses import Response
+
+UNMATCHED_ROUTE = "<unmatched>"
+EXCLUDED_PATHS = frozenset({"/metrics"})
+
+HTTP_REQUESTS = Counter(
+    "laf_http_requests_total",
+    "Requisições HTTP por rota e status",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "laf_http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "laf_http_response_size_bytes",
+    "Tamanho do corpo da resposta por rota",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "laf_http_requests_in_flight",
+    "Requisições HTTP em andamento",
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "laf_event_loop_lag_seconds",
+    "Atraso do event loop (quanto um sleep passa do previsto)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+EVENT_LOOP_LAG_LAST = Gauge(
+    "laf_event_loop_lag_last_seconds",
+    "Último atraso medido do event loop",
+)
+
+
+def _route_templates(app) -> Dict:
+    """endpoint → template da rota (primeira rota vence, igual ao roteador)"""
+    templates = {}
+    for route in getattr(app, "routes", []):
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is not None and endpoint not in templates:
+            templates[endpoint] = route.path
+    return templates
+
+
+class MetricsMiddleware:
+    """Latência, status, tamanho da resposta e requisições em andamento"""
+
+    def __init__(self, app):
+        self.app = app
+        self._templates: Optional[Dict] = None
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._templates is None:
+            self._templates = _route_templates(scope.get("app"))
+        return self._templates.get(endpoint, UNMATCHED_ROUTE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        response_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            # O roteador do Starlette grava o endpoint no próprio scope
+            method = scope["method"]
+            route = self._route_label(scope)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_SECONDS.labels(method, route).observe(elapsed)
+            HTTP_RESPONSE_BYTES.labels(method, route).observe(response_bytes)
+
+
+# ==================== EVENT LOOP LAG ====================
+
+EVENT_LOOP_LAG_INTERVAL = 0.5
+_lag_task: Optional[asyncio.Task] = None
+_last_lag = 0.0
+
+
+async def _monitor_event_loop_lag(interval: float):
+    global _last_lag
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+        _last_lag = lag
+
+
+def start_event_loop_lag_monitor(interval: float = EVENT_LOOP_LAG_INTERVAL):
+    """Inicia a amostragem do lag do event loop (chamar no startup)"""
+    global _lag_task
+    if _lag_task is None or _lag_task.done():
+        _lag_task = asyncio.get_running_loop().create_task(_monitor_event_loop_lag(interval))
+
+
+async def stop_event_loop_lag_monitor():
+    global _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        try:
+            await _lag_task
+        except asyncio.CancelledError:
+            pass
+        _lag_task = None
+
+
+def last_event_loop_lag() -> float:
+    """Último lag medido em segundos (0 antes da primeira amostra)"""
+    return _last_lag
+
+
+def metrics_response() -> Response:
+    """Exposição Prometheus do registry padrão"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,67 @@
+"""
+Tempos de comandos do Mongo (pymongo command monitoring)
+========================================================
+Registrado no AsyncIOMotorClient via event_listeners. O Motor executa o
+pymongo em threads, então o estado por comando fica num dict protegido
+por lock (chave: conexão + request_id).
+"""
+
+import threading
+from typing import Dict, Tuple
+
+from prometheus_client import Counter, Histogram
+from pymongo import monitoring
+
+MONGO_COMMAND_SECONDS = Histogram(
+    "laf_mongo_command_duration_seconds",
+    "Duração dos comandos do Mongo por coleção e operação",
+    ["collection", "command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "laf_mongo_command_failures_total",
+    "Comandos do Mongo que falharam por coleção e operação",
+    ["collection", "command"],
+)
+
+# Comandos de handshake/monitoramento (sem coleção)
+NO_COLLECTION = "-"
+
+
+def _collection_of(command_name: str, command) -> str:
+    if command_name == "getMore":
+        target = command.get("collection")
+    else:
+        target = command.get(command_name)
+    return target if isinstance(target, str) else NO_COLLECTION
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Histograma de latência por (coleção, comando) + contador de falhas"""
+
+    def __init__(self):
+        self._pending: Dict[Tuple, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event) -> Tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        labels = (_collection_of(event.command_name, event.command), event.command_name)
+        with self._lock:
+            self._pending[self._key(event)] = labels
+
+    def _finish(self, event):
+        with self._lock:
+            labels = self._pending.pop(self._key(event), None)
+        return labels or (NO_COLLECTION, event.command_name)
+
+    def succeeded(self, event):
+        collection, command = self._finish(event)
+        MONGO_COMMAND_SECONDS.labels(collection, command).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection, command = self._finish(event)
+        MONGO_COMMAND_SECONDS.labels(collection, command).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, command).inc()
@@ -0,0 +1,143 @@
+"""
+Readiness probe (/ready)
+========================
+/health só diz que o processo está vivo. /ready diz se o pod deve RECEBER
+tráfego:
+
+- Mongo responde ao ping dentro do timeout
+- pool de conexões do Mongo abaixo do limite de uso
+- lag do event loop abaixo do limite
+- fila do executor de dieta abaixo do limite
+
+O resultado fica em cache por READY_CACHE_SECONDS para a probe não virar
+fonte de carga (e probes simultâneas compartilham a mesma verificação).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+READY_CACHE_SECONDS = float(os.environ.get("READY_CACHE_SECONDS", "1.0"))
+READY_MONGO_TIMEOUT_MS = float(os.environ.get("READY_MONGO_TIMEOUT_MS", "500"))
+READY_MAX_LOOP_LAG_MS = float(os.environ.get("READY_MAX_LOOP_LAG_MS", "250"))
+READY_MAX_POOL_USAGE = float(os.environ.get("READY_MAX_POOL_USAGE", "0.9"))
+READY_MAX_DIET_QUEUE = int(os.environ.get("READY_MAX_DIET_QUEUE", "16"))
+
+
+class PoolUsage(monitoring.ConnectionPoolListener):
+    """Conexões em uso (e threads esperando conexão) por servidor do Mongo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked_out: Dict[Tuple, int] = defaultdict(int)
+        self.waiting: Dict[Tuple, int] = defaultdict(int)
+
+    def _add(self, counts: Dict[Tuple, int], address, delta: int):
+        with self._lock:
+            counts[address] = max(0, counts[address] + delta)
+
+    def connection_check_out_started(self, event):
+        self._add(self.waiting, event.address, 1)
+
+    def connection_check_out_failed(self, event):
+        self._add(self.waiting, event.address, -1)
+
+    def connection_checked_out(self, event):
+        self._add(self.waiting, event.address, -1)
+        self._add(self.checked_out, event.address, 1)
+
+    def connection_checked_in(self, event):
+        self._add(self.checked_out, event.address, -1)
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.checked_out.pop(event.address, None)
+
+    def pool_closed(self, event):
+        self.pool_cleared(event)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def snapshot(self) -> Tuple[int, int]:
+        """(maior nº de conexões em uso num servidor, total esperando)"""
+        with self._lock:
+            return max(self.checked_out.values(), default=0), sum(self.waiting.values())
+
+
+class ReadinessProbe:
+    def __init__(self, db, pool_usage: PoolUsage, max_pool_size: int,
+                 loop_lag: Callable[[], float], diet_queue_depth: Callable[[], int]):
+        self.db = db
+        self.pool_usage = pool_usage
+        self.max_pool_size = max_pool_size or 1
+        self.loop_lag = loop_lag
+        self.diet_queue_depth = diet_queue_depth
+        self._cached: Optional[Tuple[float, bool, Dict]] = None
+        self._lock = asyncio.Lock()
+
+    async def _check_mongo(self) -> Dict:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.db.command("ping"), timeout=READY_MONGO_TIMEOUT_MS / 1000)
+        except asyncio.TimeoutError:
+            return {"ok": False, "error": f"ping > {READY_MONGO_TIMEOUT_MS:.0f}ms"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)[:200]}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+    def _check_pool(self) -> Dict:
+        in_use, waiting = self.pool_usage.snapshot()
+        usage = in_use / self.max_pool_size
+        return {
+            "ok": usage < READY_MAX_POOL_USAGE,
+            "in_use": in_use,
+            "max_pool_size": self.max_pool_size,
+            "waiting": waiting,
+        }
+
+    def _check_event_loop(self) -> Dict:
+        lag_ms = self.loop_lag() * 1000
+        return {"ok": lag_ms < READY_MAX_LOOP_LAG_MS, "lag_ms": round(lag_ms, 2)}
+
+    def _check_diet_executor(self) -> Dict:
+        depth = self.diet_queue_depth()
+        return {"ok": depth < READY_MAX_DIET_QUEUE, "queue_depth": depth, "max_queue": READY_MAX_DIET_QUEUE}
+
+    async def check(self) -> Tuple[bool, Dict]:
+        """(pronto?, detalhes por verificação) - cacheado por READY_CACHE_SECONDS"""
+        cached = self._cached
+        if cached and time.monotonic() - cached[0] < READY_CACHE_SECONDS:
+            return cached[1], cached[2]
+
+        async with self._lock:
+            cached = self._cached
+            if cached and time.monotonic() - cached[0] < READY_CACHE_SECONDS:
+                return cached[1], cached[2]
+
+            checks = {
+                "mongo": await self._check_mongo(),
+                "mongo_pool": self._check_pool(),
+                "event_loop": self._check_event_loop(),
+                "diet_executor": self._check_diet_executor(),
+            }
+            ready = all(check["ok"] for check in checks.values())
+            self._cached = (time.monotonic(), ready, checks)
+            return ready, checks
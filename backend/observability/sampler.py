@@ -0,0 +1,195 @@
+"""
+Profiler estatístico por amostragem (opt-in, por worker)
+========================================================
+Uma thread daemon lê sys._current_frames() a cada `interval` e conta as
+pilhas de todas as threads do processo. Sem sessão ativa não há custo
+nenhum; com sessão ativa o custo é proporcional à frequência (100 Hz por
+padrão ≈ 1-2% de CPU). O intervalo mínimo é SAMPLER_MIN_INTERVAL (5 ms,
+200 Hz) e a duração máxima SAMPLER_MAX_SECONDS: uma sessão não consegue
+prender um worker em amostragem contínua.
+
+Saída no formato "collapsed stacks" (uma linha por pilha: `a;b;c N`),
+pronta para flamegraph.pl / speedscope / inferno.
+
+Tags: sample_tags(route=..., restrictions=...) grava tags num ContextVar
+(seguro com corrotinas intercaladas). Código síncrono que roda em outra
+thread (ex.: executor do motor de dieta) publica essas tags para a thread
+com publish_thread_tags(), e cada amostra daquela thread recebe as tags
+como frames-raiz (`restrictions=vegetariano;meal_count=5;...`).
+
+O estado é do PROCESSO: com vários workers, cada um tem sua sessão.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SAMPLER_DEFAULT_INTERVAL = 0.01
+SAMPLER_MIN_INTERVAL = 0.005
+SAMPLER_MAX_SECONDS = 120.0
+SAMPLER_MAX_DEPTH = 64
+
+_sample_tags: ContextVar[Tuple[Tuple[str, str], ...]] = ContextVar("sample_tags", default=())
+_thread_tags: Dict[int, Tuple[Tuple[str, str], ...]] = {}
+
+
+# ==================== TAGS ====================
+
+@contextmanager
+def sample_tags(**tags) -> Iterator[None]:
+    """Acrescenta tags ao contexto atual (herdadas por publish_thread_tags)"""
+    merged = dict(_sample_tags.get())
+    merged.update({key: str(value) for key, value in tags.items()})
+    token = _sample_tags.set(tuple(sorted(merged.items())))
+    try:
+        yield
+    finally:
+        _sample_tags.reset(token)
+
+
+@contextmanager
+def publish_thread_tags() -> Iterator[None]:
+    """Expõe as tags do contexto para o sampler enquanto esta thread roda o bloco"""
+    tags = _sample_tags.get()
+    if not tags:
+        yield
+        return
+    ident = threading.get_ident()
+    previous = _thread_tags.get(ident)
+    _thread_tags[ident] = tags
+    try:
+        yield
+    finally:
+        if previous is None:
+            _thread_tags.pop(ident, None)
+        else:
+            _thread_tags[ident] = previous
+
+
+# ==================== SAMPLER ====================
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+def _collapse(frame) -> List[str]:
+    stack = []
+    while frame is not None and len(stack) < SAMPLER_MAX_DEPTH:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class SamplingProfiler:
+    """Sessão de amostragem com duração fixa"""
+
+    def __init__(self, seconds: float, interval: float = SAMPLER_DEFAULT_INTERVAL):
+        self.seconds = min(max(seconds, 0.1), SAMPLER_MAX_SECONDS)
+        self.interval = max(interval, SAMPLER_MIN_INTERVAL)
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="laf-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        names = {}
+        deadline = time.monotonic() + self.seconds
+        try:
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                if len(names) != threading.active_count():
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                self._sample(own_ident, names)
+                self._stop.wait(self.interval)
+        finally:
+            self.finished_at = time.time()
+
+    def _sample(self, own_ident: int, names: Dict[int, str]):
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            root = [f"thread={names.get(ident, ident)}"]
+            root.extend(f"{key}={value}" for key, value in _thread_tags.get(ident, ()))
+            self.stacks[";".join(root + _collapse(frame))] += 1
+        self.samples += 1
+
+    # ---------- Saída ----------
+    # dict(...) copia em C (atômico sob o GIL): dá para ler com a sessão rodando
+
+    def collapsed(self) -> str:
+        """Formato collapsed stacks (flamegraph)"""
+        return "\n".join(f"{stack} {count}" for stack, count in Counter(dict(self.stacks)).most_common())
+
+    def summary(self, top: int = 25) -> Dict:
+        """Funções com mais amostras 'self' (topo da pilha) e contagem por tag"""
+        self_counts: Counter = Counter()
+        by_tag: Counter = Counter()
+        for stack, count in dict(self.stacks).items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for frame in frames:
+                if "=" in frame and not frame.startswith("thread="):
+                    by_tag[frame] += count
+        return {
+            "pid": os.getpid(),
+            "running": self.running,
+            "seconds": self.seconds,
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "top_self": [{"frame": frame, "samples": n} for frame, n in self_counts.most_common(top)],
+            "by_tag": dict(by_tag.most_common()),
+        }
+
+
+# ==================== SESSÃO DO WORKER ====================
+
+_session: Optional[SamplingProfiler] = None
+_session_lock = threading.Lock()
+
+
+def start_sampling(seconds: float, interval: float = SAMPLER_DEFAULT_INTERVAL) -> Optional[SamplingProfiler]:
+    """Inicia uma sessão neste worker; None se já houver uma em andamento"""
+    global _session
+    with _session_lock:
+        if _session is not None and _session.running:
+            return None
+        _session = SamplingProfiler(seconds, interval)
+        _session.start()
+        return _session
+
+
+def current_sampling() -> Optional[SamplingProfiler]:
+    """Sessão atual (em andamento ou a última concluída)"""
+    return _session
+
+
+def stop_sampling():
+    """Encerra a sessão em andamento (espera no máximo um intervalo)"""
+    if _session is not None:
+        _session.stop()
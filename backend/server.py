@@ -1,7 +1,13 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Header, Depends, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Header, Depends, Request, Response
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+import asyncio
+import hmac
+from collections import OrderedDict
 import os
 import logging
 from pathlib import Path
@@ -10,6 +16,51 @@ from typing import List, Optional, Dict, Tuple
 import uuid
 from datetime import datetime, timedelta
 from bson import ObjectId
+import numpy as np
+
+from accounts import AccountDeletionError, delete_user_data, ensure_deletion_indexes, get_deletion_job, start_deletion_job
+from jobs import JobWorkerPool, enqueue, ensure_job_indexes, get_job
+from notifications import (
+    NotificationScheduler,
+    ensure_notification_indexes,
+    list_notifications,
+    mark_read,
+    unread_count,
+)
+from observability import (
+    MetricsMiddleware,
+    MongoCommandMetrics,
+    PoolUsage,
+    ReadinessProbe,
+    last_event_loop_lag,
+    current_sampling,
+    metrics_response,
+    sample_tags,
+    start_event_loop_lag_monitor,
+    start_sampling,
+    stop_event_loop_lag_monitor,
+    stop_sampling,
+)
+from diet.executor import diet_queue_depth, run_in_diet_executor, shutdown_diet_executor
+from diet.profiling import diet_segment
+from diet.storage import STORAGE_VERSION, compact_diet, compact_meals, hydrate_diet
+from diet.trace import DIET_TRACES, build_trace, ensure_trace_indexes, save_trace
+from tracking import (
+    WATER_HISTORY_PROJECTION,
+    WeightDeleteUnsupported,
+    WeightStore,
+    add_water_entries,
+    add_water_entry,
+    day_start as day_start_of,
+    device_moment,
+    downsample,
+    ensure_tracking_collections,
+    find_water_day,
+    water_history,
+    weight_trend,
+)
+from sync import apply_mutations, collect_changes, ensure_mutation_indexes, ensure_sync_indexes, next_sync_seqs, sync_stamp
+from web import CompressionMiddleware, LafJSONResponse, etag_matches, json_response, not_modified, plan_etag
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -18,7 +69,8 @@ load_dotenv(ROOT_DIR / '.env')
 mongo_url = os.environ.get('MONGO_URL') or os.environ.get('DATABASE_URL')
 if not mongo_url:
     raise ValueError("MONGO_URL or DATABASE_URL environment variable is required")
-client = AsyncIOMotorClient(mongo_url)
+mongo_pool_usage = PoolUsage()
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics(), mongo_pool_usage])
 db_name = os.environ.get('DB_NAME', 'laf_database')
 db = client[db_name]
 
@@ -26,7 +78,8 @@ db = client[db_name]
 from auth_service import AuthService, SignUpRequest, LoginRequest, decode_token
 
 # Create the main app
-app = FastAPI()
+# orjson como serializador padrão (datetime/UUID nativos)
+app = FastAPI(default_response_class=LafJSONResponse)
 
 # CORS Middleware - Must be added early for preflight requests
 app.add_middleware(
@@ -37,6 +90,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressão Brotli/GZip (respostas >= 1KB)
+app.add_middleware(CompressionMiddleware)
+
+# Métricas Prometheus por rota (latência, status, tamanho, em andamento)
+app.add_middleware(MetricsMiddleware)
+
 api_router = APIRouter(prefix="/api")
 
 # ROOT LEVEL ROUTES - Required for Kubernetes deployment
@@ -56,6 +115,37 @@ async def root_health_check():
     """Health check endpoint at root level for Kubernetes probes"""
     return {"status": "healthy", "service": "LAF Backend"}
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métricas Prometheus (HTTP, Mongo, event loop e pipeline de dieta)"""
+    return metrics_response()
+
+# Registros de peso (time-series + leitura dupla da coleção antiga)
+weight_store = WeightStore(db)
+
+# Lembretes materializados em background (peso, água/sódio)
+notification_scheduler = NotificationScheduler(db, weight_store)
+
+readiness_probe = ReadinessProbe(
+    db,
+    pool_usage=mongo_pool_usage,
+    max_pool_size=client.options.pool_options.max_pool_size,
+    loop_lag=last_event_loop_lag,
+    diet_queue_depth=diet_queue_depth,
+)
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe para Kubernetes: 503 quando Mongo não responde ou o
+    worker está saturado (pool, event loop, fila de dieta). Cache de 1s.
+    """
+    ready, checks = await readiness_probe.check()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "checks": checks}
+    )
+
 # Initialize auth service
 auth_service = AuthService(db)
 
@@ -228,6 +318,19 @@ class WaterSodiumEntryCreate(BaseModel):
     notes: Optional[str] = None
 
 
+class WaterSodiumBatchEntry(WaterSodiumEntryCreate):
+    """Entrada registrada offline (recorded_at = horário no aparelho, UTC)"""
+    recorded_at: Optional[datetime] = None
+
+
+class WaterSodiumBatchRequest(BaseModel):
+    """Request para aplicar a fila offline de água/sódio"""
+    entries: List[WaterSodiumBatchEntry]
+
+
+WATER_BATCH_MAX_ENTRIES = 200
+
+
 # ==================== SETTINGS MODELS ====================
 
 class MealTimeConfig(BaseModel):
@@ -296,271 +399,25 @@ class AdjustedMacros(BaseModel):
 
 # ==================== CÁLCULOS TDEE ====================
 
-def calculate_bmr(weight: float, height: float, age: int, sex: str) -> float:
-    """
-    Calcula Taxa Metabólica Basal usando fórmula de Mifflin-St Jeor
-    """
-    if sex.lower() == "masculino":
-        bmr = (10 * weight) + (6.25 * height) - (5 * age) + 5
-    else:  # feminino
-        bmr = (10 * weight) + (6.25 * height) - (5 * age) - 161
-    return bmr
-
-def normalize_goal(goal: str) -> str:
-    """
-    Normaliza o objetivo para valores consistentes.
-    
-    Aceita:
-    - "ganho_muscular", "bulking", "hipertrofia" → "bulking"
-    - "cutting", "definicao", "emagrecimento" → "cutting"
-    - "manutencao", "manutenção", "maintenance" → "manutencao"
-    """
-    if not goal:
-        return "manutencao"
-    
-    goal = goal.lower().strip()
-    
-    # Bulking aliases
-    if goal in ["ganho_muscular", "bulking", "hipertrofia", "ganho", "massa"]:
-        return "bulking"
-    
-    # Cutting aliases
-    if goal in ["cutting", "definicao", "definição", "emagrecimento", "emagrecer"]:
-        return "cutting"
-    
-    # Manutenção aliases
-    if goal in ["manutencao", "manutenção", "maintenance", "manter"]:
-        return "manutencao"
-    
-    return "manutencao"  # Default
-
-
-def calculate_cardio_burn(cardio_minutos_semana: int, intensidade_cardio: str) -> int:
-    """
-    Calcula gasto calórico semanal do cardio baseado em minutos e intensidade.
-    
-    Intensidades (kcal/min):
-    - Leve: 5 kcal/min (caminhada leve, bike leve)
-    - Moderado: 8 kcal/min (caminhada rápida, bike moderada)
-    - Intenso: 11 kcal/min (corrida, HIIT, escada)
-    
-    Retorna: calorias semanais gastas no cardio
-    """
-    if not cardio_minutos_semana or cardio_minutos_semana <= 0:
-        return 0
-    
-    kcal_por_min = {
-        'leve': 5,
-        'light': 5,
-        'moderado': 8,
-        'moderate': 8,
-        'intenso': 11,
-        'intense': 11,
-        'high': 11
-    }
-    
-    intensidade = intensidade_cardio.lower() if intensidade_cardio else 'moderado'
-    kcal_min = kcal_por_min.get(intensidade, 8)  # Default: moderado
-    
-    cardio_semanal = cardio_minutos_semana * kcal_min
-    print(f"[CARDIO] {cardio_minutos_semana}min/semana × {kcal_min}kcal/min = {cardio_semanal}kcal/semana")
-    
-    return cardio_semanal
-
-
-def calculate_tdee(bmr: float, training_frequency: int, training_level: str, 
-                   cardio_minutos_semana: int = 0, intensidade_cardio: str = 'moderado') -> float:
-    """
-    Calcula TDEE (Total Daily Energy Expenditure)
-    
-    FÓRMULA COMPLETA (conforme especificação):
-    1. BMR = Mifflin-St Jeor (calculado antes)
-    2. TDEE_base = BMR × Fator de Atividade + Bônus de Treino
-    3. Cardio_semanal = minutos × kcal/min (SE informado pelo usuário)
-    4. TDEE_real = TDEE_base + (Cardio_semanal / 7)
-    
-    Se cardio_minutos_semana for 0 ou vazio: TDEE_real = TDEE_base
-    
-    Fatores de atividade (baseado na frequência de treino):
-    - 1.2 sedentário (0-1x/semana)
-    - 1.375 leve (2-3x/semana)
-    - 1.55 moderado (4-5x/semana)
-    - 1.725 intenso (6-7x/semana)
-    
-    Bônus de treino:
-    - Novato/Iniciante: +0 kcal
-    - Intermediário: +50 kcal
-    - Avançado: +100 kcal
-    """
-    # PASSO 1: Mapeia frequência para fator de atividade
-    if training_frequency <= 1:
-        factor = 1.2   # sedentário
-    elif training_frequency <= 3:
-        factor = 1.375  # leve
-    elif training_frequency <= 5:
-        factor = 1.55   # moderado
-    else:
-        factor = 1.725  # intenso
-    
-    # PASSO 2: Bônus de treino
-    training_bonus = {
-        'beginner': 0, 'iniciante': 0, 'novato': 0,
-        'intermediate': 50, 'intermediario': 50,
-        'advanced': 100, 'avancado': 100
-    }
-    bonus = training_bonus.get(training_level.lower(), 0)
-    
-    # PASSO 3: TDEE Base
-    tdee_base = bmr * factor + bonus
-    
-    # PASSO 4: Adicionar cardio (SE informado pelo usuário)
-    cardio_semanal = calculate_cardio_burn(cardio_minutos_semana, intensidade_cardio)
-    
-    if cardio_semanal > 0:
-        cardio_diario = cardio_semanal / 7
-        tdee_real = tdee_base + cardio_diario
-        print(f"[TDEE] BMR={bmr:.0f} × {factor} + bonus={bonus} = TDEE_base={tdee_base:.0f}")
-        print(f"[TDEE] Cardio diário = {cardio_semanal}/7 = {cardio_diario:.0f}kcal")
-        print(f"[TDEE] TDEE_real = {tdee_base:.0f} + {cardio_diario:.0f} = {tdee_real:.0f}kcal")
-        return tdee_real
-    else:
-        print(f"[TDEE] BMR={bmr:.0f} × {factor} + bonus={bonus} = TDEE={tdee_base:.0f}kcal (sem cardio)")
-        return tdee_base
-
-def calculate_target_calories(tdee: float, goal: str, weight: float, training_level: str = 'intermediario') -> float:
-    """
-    🎯 Calcula calorias meta baseado no TDEE + Delta
-    
-    REGRA PRINCIPAL: calorias_meta = TDEE + delta
-    
-    DELTAS POR OBJETIVO:
-    - Ganho de massa (bulking): +150 a +300 (padrão +200)
-    - Manutenção: -100 a +100 (padrão 0)
-    - Perda de gordura (cutting): -250 a -450 (padrão -300)
-    - Recomposição (iniciante/retorno): -150 a +150 (padrão 0)
-    
-    TRAVAS ANTI-EXAGERO:
-    - Máximo: +400 kcal acima do TDEE
-    - Mínimo: -600 kcal abaixo do TDEE
-    """
-    goal = normalize_goal(goal)
-    level = training_level.lower() if training_level else 'intermediario'
-    
-    # Verifica se é recomposição (iniciante/novato)
-    is_recomp = level in ['novato', 'iniciante', 'beginner']
-    
-    # Define delta padrão baseado no objetivo
-    if is_recomp and goal in ['cutting', 'bulking']:
-        # Iniciantes podem fazer recomposição (ganhar músculo e perder gordura)
-        delta = 0
-        delta_reason = "recomposição (iniciante)"
-    elif goal == "cutting":
-        delta = -300  # Déficit moderado para preservar massa muscular
-        delta_reason = "perda de gordura"
-    elif goal == "bulking":
-        delta = 200  # Superávit controlado para ganho limpo
-        delta_reason = "ganho de massa"
-    else:  # manutenção
-        delta = 0
-        delta_reason = "manutenção"
-    
-    # TRAVAS ANTI-EXAGERO (nunca violar!)
-    MAX_SURPLUS = 400   # Máximo +400 kcal
-    MAX_DEFICIT = -600  # Máximo -600 kcal
-    
-    # Aplica travas
-    if delta > MAX_SURPLUS:
-        delta = MAX_SURPLUS
-        print(f"[TRAVA] Delta reduzido para +{MAX_SURPLUS} (limite máximo de superávit)")
-    elif delta < MAX_DEFICIT:
-        delta = MAX_DEFICIT
-        print(f"[TRAVA] Delta aumentado para {MAX_DEFICIT} (limite máximo de déficit)")
-    
-    # Calcula meta
-    target = tdee + delta
-    
-    # Log detalhado (saída obrigatória)
-    print(f"[META] ════════════════════════════════════")
-    print(f"[META] TDEE: {tdee:.0f} kcal")
-    print(f"[META] Meta inicial: {target:.0f} kcal")
-    print(f"[META] Delta aplicado: {delta:+.0f} kcal ({delta_reason})")
-    print(f"[META] Nota: estimativa inicial; ajustes a cada 2 semanas pelo sistema do app")
-    print(f"[META] ════════════════════════════════════")
-    
-    return target
-
-def calculate_macros(target_calories: float, weight: float, goal: str) -> Dict[str, float]:
-    """
-    🎯 Calcula macros com regras esportivas
-    
-    REGRAS:
-    1. PROTEÍNA (prioridade): peso × 2.0 g/kg
-       - Limites: 1.8 - 2.3 g/kg
-       
-    2. GORDURA (controlada): peso × 0.9 g/kg
-       - Limites: 0.7 - 1.0 g/kg
-       - NUNCA usar para compensar calorias
-       
-    3. CARBOIDRATO (macro de ajuste):
-       - Pisos mínimos por objetivo:
-         * CUTTING: peso × 2.0
-         * MANUTENÇÃO: peso × 3.0
-         * BULKING: peso × 4.5
-       - Ajustado para bater calorias ±5%
-    """
-    goal = normalize_goal(goal)
-    
-    # 1. PROTEÍNA - fixa em 2.0 g/kg
-    protein_g = weight * 2.0
-    # Validação de limites
-    protein_min = weight * 1.8
-    protein_max = weight * 2.3
-    protein_g = max(protein_min, min(protein_max, protein_g))
-    
-    # 2. GORDURA - fixa em 0.9 g/kg
-    fat_g = weight * 0.9
-    # Validação de limites
-    fat_min = weight * 0.7
-    fat_max = weight * 1.0
-    fat_g = max(fat_min, min(fat_max, fat_g))
-    
-    # 3. CARBOIDRATO - macro de ajuste
-    # Pisos mínimos por objetivo
-    if goal == "cutting":
-        carb_min = weight * 2.0
-    elif goal == "bulking":
-        carb_min = weight * 4.5
-    else:  # manutenção
-        carb_min = weight * 3.0
-    
-    # Calorias de proteína e gordura (fixas)
-    protein_cal = protein_g * 4
-    fat_cal = fat_g * 9
-    
-    # Calorias restantes para carboidrato
-    carb_cal = target_calories - protein_cal - fat_cal
-    carb_g = carb_cal / 4
-    
-    # Garante piso mínimo de carbs
-    carb_g = max(carb_min, carb_g)
-    
-    # 4. VALIDAÇÃO FINAL - calorias dentro de ±5%
-    total_cal = (protein_g * 4) + (carb_g * 4) + (fat_g * 9)
-    cal_diff_pct = abs(total_cal - target_calories) / target_calories * 100
-    
-    # Se fora do ±5%, ajusta APENAS carboidrato
-    if cal_diff_pct > 5:
-        # Recalcula carbs para bater calorias
-        carb_cal_needed = target_calories - protein_cal - fat_cal
-        carb_g_adjusted = carb_cal_needed / 4
-        # Mas nunca abaixo do piso
-        carb_g = max(carb_min, carb_g_adjusted)
-    
-    return {
-        "protein": round(protein_g, 1),
-        "carbs": round(carb_g, 1),
-        "fat": round(fat_g, 1)
-    }
+# Fonte única das fórmulas (também usada pelo recálculo em massa)
+from diet.formulas import (
+    calculate_bmr,
+    normalize_goal,
+    calculate_cardio_burn,
+    calculate_tdee,
+    calculate_target_calories,
+    calculate_macros,
+    calculate_profile_targets,
+)
+from workout.schedule import (
+    DAY_TYPE_DIET,
+    build_weekly_schedule,
+    is_schedule_current,
+    iter_schedule_range,
+    resolve_day,
+    to_date,
+    weekday_of,
+)
 
 # ==================== ROUTES ====================
 
@@ -628,38 +485,39 @@ async def create_or_update_user_profile(profile_data: UserProfileCreate):
     # UPSERT: Atualiza se existe, cria se não existe (IDEMPOTENT)
     profile_dict["_id"] = profile_data.id
     
-    await db.user_profiles.update_one(
-        {"_id": profile_data.id},
-        {"$set": profile_dict, "$setOnInsert": {"created_at": datetime.utcnow()}},
-        upsert=True
-    )
-    
-    # ✅ SALVA meal_count nas user_settings também (mínimo 4 refeições)
+    # ✅ meal_count (mínimo 4 refeições) vai no próprio perfil (fallback) e nas user_settings
     meal_count = profile_data.meal_count if profile_data.meal_count and profile_data.meal_count in [4, 5, 6] else 6
+    profile_dict["meal_count"] = meal_count
     logger.info(f"Saving meal_count={meal_count} for user {profile_data.id}")
     
-    await db.user_settings.update_one(
-        {"user_id": profile_data.id},
-        {"$set": {"meal_count": meal_count, "user_id": profile_data.id, "updated_at": datetime.utcnow()}},
-        upsert=True
-    )
+    # 🔄 Carimbo do /sync (perfil + settings desta requisição)
+    stamp = await sync_stamp(db, profile_data.id)
+    profile_dict.update(stamp)
     
-    # Também salva meal_count no próprio perfil para fallback
-    await db.user_profiles.update_one(
-        {"_id": profile_data.id},
-        {"$set": {"meal_count": meal_count}}
-    )
-    
-    # Vincula profile ao users_auth
-    await db.users_auth.update_one(
-        {"_id": profile_data.id},
-        {"$set": {"profile_id": profile_data.id, "updated_at": datetime.utcnow()}}
+    # Perfil, settings e vínculo no users_auth são independentes: uma latência de escrita.
+    # Todos são upserts/sets idempotentes - se um falhar, o reenvio do onboarding completa.
+    await asyncio.gather(
+        db.user_profiles.update_one(
+            {"_id": profile_data.id},
+            {"$set": profile_dict, "$setOnInsert": {"created_at": datetime.utcnow()}},
+            upsert=True
+        ),
+        db.user_settings.update_one(
+            {"user_id": profile_data.id},
+            {"$set": {"meal_count": meal_count, "user_id": profile_data.id, **stamp}},
+            upsert=True
+        ),
+        # Vincula profile ao users_auth
+        db.users_auth.update_one(
+            {"_id": profile_data.id},
+            {"$set": {"profile_id": profile_data.id, "updated_at": datetime.utcnow()}}
+        ),
     )
     
     logger.info(f"Profile upserted for user {profile_data.id}")
     
-    # Retorna perfil
-    return UserProfile(**profile_dict)
+    # Retorna perfil (já validado: não passa pelo response_model de novo)
+    return json_response(UserProfile(**profile_dict))
 
 @api_router.get("/user/profile/{user_id}", response_model=UserProfile)
 async def get_user_profile(user_id: str):
@@ -671,13 +529,13 @@ async def get_user_profile(user_id: str):
         raise HTTPException(status_code=404, detail="Perfil não encontrado")
     
     profile["id"] = profile["_id"]
-    return UserProfile(**profile)
+    return json_response(UserProfile(**profile))
 
 @api_router.put("/user/profile/{user_id}", response_model=UserProfile)
 async def update_user_profile(user_id: str, update_data: UserProfileUpdate):
     """
     Atualiza perfil do usuário e recalcula métricas.
-    Se o objetivo mudar, regenera a dieta automaticamente.
+    Se o objetivo mudar, enfileira a regeneração da dieta (diet_regeneration.job_id).
     """
     # Busca perfil existente
     existing_profile = await db.user_profiles.find_one({"_id": user_id})
@@ -731,7 +589,7 @@ async def update_user_profile(user_id: str, update_data: UserProfileUpdate):
             update_dict["target_calories"] = round(target_calories, 0)
             update_dict["macros"] = macros
         
-        update_dict["updated_at"] = datetime.utcnow()
+        update_dict.update(await sync_stamp(db, user_id))
         
         await db.user_profiles.update_one(
             {"_id": user_id},
@@ -740,91 +598,19 @@ async def update_user_profile(user_id: str, update_data: UserProfileUpdate):
         
         logger.info(f"Profile updated for user {user_id}: {list(update_dict.keys())}")
     
-    # Se objetivo mudou, regenera a dieta automaticamente
+    # Se objetivo mudou, a dieta é regenerada em background (fila de jobs)
+    diet_job = None
     if goal_changed:
-        try:
-            logger.info(f"Regenerating diet for user {user_id} due to goal change")
-            # Busca perfil atualizado para gerar nova dieta
-            updated_profile_data = await db.user_profiles.find_one({"_id": user_id})
-            if updated_profile_data:
-                # Usar DietAIService (mesmo que o endpoint oficial)
-                from diet_service import DietAIService
-                
-                # Busca meal_count das settings ou usa o do perfil
-                user_settings = await db.user_settings.find_one({"user_id": user_id})
-                meal_count = 6  # Padrão
-                meal_times = None
-                
-                if user_settings and user_settings.get('meal_count') in [4, 5, 6]:
-                    meal_count = user_settings.get('meal_count')
-                    meal_times = user_settings.get('meal_times', None)
-                elif updated_profile_data.get('meal_count') and updated_profile_data.get('meal_count') in [4, 5, 6]:
-                    meal_count = updated_profile_data.get('meal_count')
-                
-                # Gera nova dieta usando DietAIService (mesmo fluxo do endpoint /api/diet/generate)
-                diet_service = DietAIService()
-                diet_plan = diet_service.generate_diet_plan(
-                    user_profile=dict(updated_profile_data),
-                    target_calories=updated_profile_data.get('target_calories', 2000),
-                    target_macros=updated_profile_data.get('macros', {"protein": 150, "carbs": 200, "fat": 60}),
-                    meal_count=meal_count,
-                    meal_times=meal_times
-                )
-                
-                # Calcula totais reais dos alimentos
-                computed_protein = sum(sum(f["protein"] for f in m.foods) for m in diet_plan.meals)
-                computed_carbs = sum(sum(f["carbs"] for f in m.foods) for m in diet_plan.meals)
-                computed_fat = sum(sum(f["fat"] for f in m.foods) for m in diet_plan.meals)
-                computed_calories = sum(sum(f["calories"] for f in m.foods) for m in diet_plan.meals)
-                
-                # Converte para formato de dicionário para salvar no MongoDB
-                meals_data = []
-                for meal in diet_plan.meals:
-                    meal_dict = {
-                        "id": str(uuid.uuid4()),
-                        "name": meal.name,
-                        "time": meal.time,
-                        "foods": [dict(f) if hasattr(f, '__dict__') else f for f in meal.foods],
-                        "total_calories": meal.total_calories,
-                        "macros": meal.macros
-                    }
-                    meals_data.append(meal_dict)
-                
-                # Salva nova dieta
-                diet_id = str(uuid.uuid4())
-                diet_doc = {
-                    "_id": diet_id,
-                    "id": diet_id,
-                    "user_id": user_id,
-                    "diet_type": "training",
-                    "target_calories": updated_profile_data.get('target_calories', 2000),
-                    "target_macros": updated_profile_data.get('macros', {"protein": 150, "carbs": 200, "fat": 60}),
-                    "computed_calories": computed_calories,
-                    "computed_protein": computed_protein,
-                    "computed_carbs": computed_carbs,
-                    "computed_fat": computed_fat,
-                    "meals": meals_data,
-                    "version": 14,
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                }
-                
-                # Remove dieta antiga e salva nova
-                await db.diet_plans.delete_many({"user_id": user_id})
-                await db.diet_plans.insert_one(diet_doc)
-                
-                target_cal = updated_profile_data.get('target_calories', 2000)
-                logger.info(f"DIETA REGENERADA - User: {user_id} | Goal: {updated_profile_data.get('goal')} | Target: {target_cal} | Computed: {computed_calories}")
-        except Exception as e:
-            logger.error(f"Error regenerating diet for user {user_id}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            # Não falha o endpoint, apenas loga o erro
-    
-    # Retorna perfil atualizado
+        diet_job = await enqueue(db, DIET_REGENERATION, user_id, {"source": "profile"})
+        logger.info(f"Diet regeneration queued for user {user_id}: {diet_job['job_id']}")
+    
+    # Retorna perfil atualizado (+ job da nova dieta, se houver)
     updated_profile = await db.user_profiles.find_one({"_id": user_id})
     updated_profile["id"] = updated_profile["_id"]
-    return UserProfile(**updated_profile)
+    content = UserProfile(**updated_profile).model_dump()
+    if diet_job:
+        content["diet_regeneration"] = {"job_id": diet_job["job_id"], "status": diet_job["status"]}
+    return json_response(content)
 
 @api_router.get("/")
 async def root():
@@ -834,6 +620,10 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "LAF Backend"}
 
+@api_router.get("/ready")
+async def api_readiness_check():
+    return await readiness_check()
+
 # ==================== AUTH ENDPOINTS ====================
 
 @api_router.post("/auth/signup")
@@ -895,6 +685,7 @@ async def logout(authorization: Optional[str] = Header(None)):
 class DeleteAccountRequest(BaseModel):
     user_id: str
     password: str
+    background: bool = False  # True: responde na hora com job_id e limpa em background
 
 
 @api_router.delete("/auth/delete-account")
@@ -903,15 +694,11 @@ async def delete_account(request: DeleteAccountRequest):
     Exclui permanentemente a conta do usuário e todos os seus dados.
     Requer confirmação com a senha da conta.
     
-    Dados excluídos:
-    - users_auth (credenciais)
-    - user_profiles (perfil)
-    - user_settings (configurações)
-    - diet_plans (dietas)
-    - workouts (treinos)
-    - training_cycles (ciclos de treino)
-    - weight_history (histórico de peso)
-    - cardio_sessions (sessões de cardio)
+    As coleções excluídas ficam no registro accounts.USER_COLLECTIONS
+    (um delete por coleção, todas em paralelo).
+    
+    Com background=true a resposta traz um job_id; acompanhe em
+    GET /auth/delete-account/jobs/{job_id}.
     """
     import hashlib
     
@@ -920,10 +707,7 @@ async def delete_account(request: DeleteAccountRequest):
     
     try:
         # 1. Buscar usuário auth
-        user_auth = await db.users_auth.find_one({"_id": user_id})
-        if not user_auth:
-            # Tentar buscar por id também
-            user_auth = await db.users_auth.find_one({"id": user_id})
+        user_auth = await db.users_auth.find_one({"$or": [{"_id": user_id}, {"id": user_id}]})
         
         if not user_auth:
             raise HTTPException(status_code=404, detail="Usuário não encontrado")
@@ -939,34 +723,17 @@ async def delete_account(request: DeleteAccountRequest):
         # 3. Excluir todos os dados do usuário
         logger.info(f"🗑️ Iniciando exclusão de conta: {user_id}")
         
-        # Excluir dados em todas as coleções
-        collections_to_clean = [
-            "users_auth",
-            "user_profiles", 
-            "user_settings",
-            "diet_plans",
-            "diets",
-            "workouts",
-            "training_cycles",
-            "weight_history",
-            "cardio_sessions",
-            "progress_photos",
-            "meal_logs",
-        ]
+        if request.background:
+            # Credenciais saem por último, dentro do job: se ele falhar o usuário reenvia
+            job_id = await start_deletion_job(db, user_id)
+            return {
+                "success": True,
+                "message": "Exclusão da conta iniciada",
+                "job_id": job_id,
+                "status": "pending",
+            }
         
-        deleted_counts = {}
-        for collection_name in collections_to_clean:
-            try:
-                collection = db[collection_name]
-                # Tentar deletar por _id e user_id
-                result1 = await collection.delete_many({"_id": user_id})
-                result2 = await collection.delete_many({"user_id": user_id})
-                result3 = await collection.delete_many({"id": user_id})
-                total = result1.deleted_count + result2.deleted_count + result3.deleted_count
-                if total > 0:
-                    deleted_counts[collection_name] = total
-            except Exception as e:
-                logger.warning(f"Erro ao limpar {collection_name}: {e}")
+        deleted_counts = await delete_user_data(db, user_id)
         
         logger.info(f"✅ Conta excluída com sucesso: {user_id}")
         logger.info(f"   Dados removidos: {deleted_counts}")
@@ -979,14 +746,31 @@ async def delete_account(request: DeleteAccountRequest):
         
     except HTTPException:
         raise
+    except AccountDeletionError as e:
+        logger.error(f"Exclusão incompleta da conta {user_id}: {e.failed}")
+        raise HTTPException(status_code=500, detail="Exclusão incompleta; a conta foi mantida, tente novamente")
     except Exception as e:
         logger.error(f"Erro ao excluir conta {user_id}: {e}")
         raise HTTPException(status_code=500, detail="Erro ao excluir conta")
 
+
+@api_router.get("/auth/delete-account/jobs/{job_id}")
+async def get_delete_account_job(job_id: str):
+    """Status do job de exclusão: pending, running, done ou failed (com failed_collections)"""
+    job = await get_deletion_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de exclusão não encontrado")
+    job["job_id"] = job.pop("_id")
+    return job
+
 # ==================== DIET ENDPOINTS ====================
 
+# Devolve os tempos por etapa da geração no header Server-Timing (debug)
+DIET_TIMING_HEADER = os.environ.get('DIET_TIMING_HEADER', '').lower() in ('1', 'true', 'yes')
+
+
 @api_router.post("/diet/generate")
-async def generate_diet(user_id: str, request_meal_count: Optional[int] = None):
+async def generate_diet(user_id: str, response: Response, request_meal_count: Optional[int] = None):
     """
     Gera um plano de dieta personalizado.
     
@@ -1033,13 +817,26 @@ async def generate_diet(user_id: str, request_meal_count: Optional[int] = None):
         diet_service = DietAIService()
         
         # Gera plano de dieta (NUNCA falha - sistema bulletproof)
-        diet_plan = diet_service.generate_diet_plan(
-            user_profile=dict(user_profile),
+        from diet.profiling import diet_profile
+        segment = diet_segment(user_profile.get('dietary_restrictions'), meal_count)
+        trace = build_trace(
+            None, user_id, "plan", user_profile,
             target_calories=user_profile.get('target_calories', 2000),
             target_macros=user_profile.get('macros', {"protein": 150, "carbs": 200, "fat": 60}),
             meal_count=meal_count,
             meal_times=meal_times
         )
+        with diet_profile() as generation_profile, sample_tags(route="/api/diet/generate", **segment):
+            diet_plan = await run_in_diet_executor(
+                diet_service.generate_diet_plan,
+                user_profile=dict(user_profile),
+                target_calories=user_profile.get('target_calories', 2000),
+                target_macros=user_profile.get('macros', {"protein": 150, "carbs": 200, "fat": 60}),
+                meal_count=meal_count,
+                meal_times=meal_times
+            )
+        if DIET_TIMING_HEADER:
+            response.headers["Server-Timing"] = generation_profile.server_timing()
         
         # VALIDAÇÃO INFORMATIVA (apenas log, não bloqueia)
         # Soma REAL dos alimentos (não os valores pre-computados)
@@ -1093,8 +890,12 @@ async def generate_diet(user_id: str, request_meal_count: Optional[int] = None):
         # Define o _id como o id da dieta
         diet_dict["_id"] = diet_dict["id"]
         
-        # Insere nova dieta
-        await db.diet_plans.insert_one(diet_dict)
+        # Insere nova dieta (+ trace das entradas para replay)
+        trace["_id"] = diet_dict["id"]
+        await asyncio.gather(
+            db.diet_plans.insert_one(compact_diet(diet_dict)),
+            save_trace(db, trace),
+        )
         
         logger.info(
             f"DIETA V14 GERADA COM SUCESSO - User: {user_id} | "
@@ -1109,9 +910,9 @@ async def generate_diet(user_id: str, request_meal_count: Optional[int] = None):
         if lang_code in ['en', 'es']:
             from diet.translations import translate_diet
             diet_dict_translated = translate_diet(diet_plan.dict(), lang_code)
-            return diet_dict_translated
+            return json_response(diet_dict_translated, response)
         
-        return diet_plan
+        return json_response(diet_plan, response)
         
     except HTTPException:
         raise
@@ -1123,44 +924,37 @@ async def generate_diet(user_id: str, request_meal_count: Optional[int] = None):
         logger.error(f"Erro inesperado ao gerar dieta: {e}")
         raise HTTPException(status_code=500, detail=f"Erro ao gerar sugestões: {str(e)}")
 
-@api_router.get("/diet/{user_id}")
-async def get_user_diet(user_id: str):
-    """
-    Busca o plano de dieta mais recente do usuário.
-    
-    🎯 AJUSTE DINÂMICO POR DIA:
-    - Dia de Treino: quantidades originais (+5% cal, +15% carbs)
-    - Dia de Descanso: quantidades reduzidas (-5% cal, -20% carbs)
-    
-    Apenas as QUANTIDADES mudam, não os alimentos!
-    """
-    diet_plan = await db.diet_plans.find_one(
-        {"user_id": user_id},
-        sort=[("created_at", -1)]
-    )
-    
-    if not diet_plan:
-        raise HTTPException(status_code=404, detail="Sugestões não encontradas")
-    
-    diet_plan["id"] = diet_plan["_id"]
+def _diet_day_context(user_profile: Optional[Dict], day_type: Optional[str] = None) -> Dict:
+    """Tipo do dia (treino/descanso), multiplicadores e idioma da dieta (hoje, ou do day_type dado)"""
+    # 🎯 DETERMINA TIPO DE DIA (treino ou descanso)
+    if day_type is None:
+        training_days = user_profile.get("training_days", []) if user_profile else []
+        today_weekday = datetime.now().weekday()
+        day_type = "train" if today_weekday in training_days else "rest"
     
-    # Busca perfil do usuário
-    user_profile = await db.user_profiles.find_one({"_id": user_id})
+    # 🎯 MULTIPLICADORES BASEADOS NO TIPO DE DIA (mesma tabela da agenda semanal)
+    # Treino: +5% calorias, +15% carboidratos | Descanso: -5% calorias, -20% carboidratos
+    day_diet = DAY_TYPE_DIET[day_type]
     
-    # 🎯 DETERMINA TIPO DE DIA (treino ou descanso)
-    training_days = user_profile.get("training_days", []) if user_profile else []
-    today_weekday = datetime.now().weekday()
-    is_training_day = today_weekday in training_days
+    user_language = (user_profile.get('language', 'pt-BR') if user_profile else None) or 'pt-BR'
+    lang_code = user_language.split('-')[0]
     
-    # 🎯 MULTIPLICADORES BASEADOS NO TIPO DE DIA
-    if is_training_day:
-        calorie_mult = 1.05  # +5% calorias
-        carb_mult = 1.15     # +15% carboidratos
-        diet_type = "training"
-    else:
-        calorie_mult = 0.95  # -5% calorias
-        carb_mult = 0.80     # -20% carboidratos
-        diet_type = "rest"
+    return {
+        "diet_type": day_diet["type"],
+        "is_training_day": day_type == "train",
+        "calorie_multiplier": day_diet["calorie_multiplier"],
+        "carb_multiplier": day_diet["carb_multiplier"],
+        "lang_code": lang_code,
+    }
+
+
+def _present_diet(diet_plan: Dict, day: Dict) -> Dict:
+    """Dieta como o app mostra: quantidades ajustadas ao tipo do dia + tradução"""
+    diet_type = day["diet_type"]
+    is_training_day = day["is_training_day"]
+    calorie_mult = day["calorie_multiplier"]
+    carb_mult = day["carb_multiplier"]
+    lang_code = day["lang_code"]
     
     # 🎯 AJUSTA QUANTIDADES DOS ALIMENTOS
     adjusted_meals = []
@@ -1249,17 +1043,51 @@ async def get_user_diet(user_id: str):
     }
     
     # Traduz baseado no idioma do perfil do usuário
-    if user_profile:
-        user_language = user_profile.get('language', 'pt-BR')
-        lang_code = user_language.split('-')[0] if user_language else 'pt'
-        
-        if lang_code in ['en', 'es']:
-            from diet.translations import translate_diet
-            return translate_diet(diet_plan, lang_code)
+    if lang_code in ['en', 'es']:
+        from diet.translations import translate_diet
+        return translate_diet(diet_plan, lang_code)
     
     return diet_plan
 
 
+@api_router.get("/diet/{user_id}")
+async def get_user_diet(user_id: str, request: Request, response: Response):
+    """
+    Busca o plano de dieta mais recente do usuário.
+    
+    🎯 AJUSTE DINÂMICO POR DIA:
+    - Dia de Treino: quantidades originais (+5% cal, +15% carbs)
+    - Dia de Descanso: quantidades reduzidas (-5% cal, -20% carbs)
+    
+    Apenas as QUANTIDADES mudam, não os alimentos!
+    
+    📦 ETag (plano + revisão + tipo do dia + idioma): If-None-Match → 304
+    """
+    diet_plan = hydrate_diet(await db.diet_plans.find_one(
+        {"user_id": user_id},
+        sort=[("created_at", -1)]
+    ))
+    
+    if not diet_plan:
+        raise HTTPException(status_code=404, detail="Sugestões não encontradas")
+    
+    diet_plan["id"] = diet_plan["_id"]
+    
+    # Busca perfil do usuário
+    user_profile = await db.user_profiles.find_one({"_id": user_id})
+    
+    day = _diet_day_context(user_profile)
+    
+    # 📦 GET condicional: nada mudou → só o header
+    etag = plan_etag(diet_plan, day["diet_type"], day["lang_code"])
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    
+    return json_response(_present_diet(diet_plan, day), response)
+
+
 @api_router.delete("/diet/{user_id}")
 async def delete_user_diet(user_id: str):
     """
@@ -1306,10 +1134,10 @@ async def get_food_substitutes(user_id: str, food_key: str):
     from diet_service import FOODS
     
     # Busca dieta pelo user_id
-    diet_plan = await db.diet_plans.find_one({"user_id": user_id})
+    diet_plan = hydrate_diet(await db.diet_plans.find_one({"user_id": user_id}))
     if not diet_plan:
         # Tenta buscar por _id também (compatibilidade)
-        diet_plan = await db.diet_plans.find_one({"_id": user_id})
+        diet_plan = hydrate_diet(await db.diet_plans.find_one({"_id": user_id}))
     if not diet_plan:
         raise HTTPException(status_code=404, detail="Dieta não encontrada")
     
@@ -1404,10 +1232,10 @@ async def substitute_food(user_id: str, request: FoodSubstitutionRequest):
     from diet_service import FOODS
     
     # Busca dieta pelo user_id
-    diet_plan = await db.diet_plans.find_one({"user_id": user_id})
+    diet_plan = hydrate_diet(await db.diet_plans.find_one({"user_id": user_id}))
     if not diet_plan:
         # Tenta buscar por _id também (compatibilidade)
-        diet_plan = await db.diet_plans.find_one({"_id": user_id})
+        diet_plan = hydrate_diet(await db.diet_plans.find_one({"_id": user_id}))
     if not diet_plan:
         raise HTTPException(status_code=404, detail="Dieta não encontrada")
     
@@ -1508,15 +1336,16 @@ async def substitute_food(user_id: str, request: FoodSubstitutionRequest):
     await db.diet_plans.update_one(
         {"_id": diet_id},
         {"$set": {
-            "meals": meals,
+            "meals": compact_meals(meals),
+            "storage_version": STORAGE_VERSION,
             "computed_calories": total_calories,
             "computed_macros": {"protein": total_protein, "carbs": total_carbs, "fat": total_fat},
             "updated_at": datetime.utcnow()
-        }}
+        }, "$inc": {"revision": 1}}
     )
     
     # Retorna dieta atualizada
-    updated_diet = await db.diet_plans.find_one({"_id": diet_id})
+    updated_diet = hydrate_diet(await db.diet_plans.find_one({"_id": diet_id}))
     updated_diet["id"] = updated_diet["_id"]
     
     logger.info(f"Food substituted in diet {diet_id}: {original_food.get('name')} -> {new_food['name']}")
@@ -1544,10 +1373,7 @@ async def check_can_update_weight(user_id: str):
     block_days = 14
     
     # Busca último registro
-    last_record = await db.weight_records.find_one(
-        {"user_id": user_id},
-        sort=[("recorded_at", -1)]
-    )
+    last_record = await weight_store.latest(user_id)
     
     if not last_record:
         # Primeiro registro - verifica dias desde cadastro
@@ -1614,10 +1440,7 @@ async def record_weight(user_id: str, record: WeightRecordCreate):
     block_days = 14
     
     # Verifica último registro
-    last_record = await db.weight_records.find_one(
-        {"user_id": user_id},
-        sort=[("recorded_at", -1)]
-    )
+    last_record = await weight_store.latest(user_id)
     
     if last_record:
         days_since_last = (datetime.utcnow() - last_record["recorded_at"]).days
@@ -1648,14 +1471,17 @@ async def record_weight(user_id: str, record: WeightRecordCreate):
     # Salva no banco
     record_dict = weight_record.dict()
     record_dict["_id"] = record_dict["id"]
-    await db.weight_records.insert_one(record_dict)
+    await weight_store.insert(record_dict)
     
     # Atualiza peso no perfil do usuário
     await db.user_profiles.update_one(
         {"_id": user_id},
-        {"$set": {"weight": round(record.weight, 1), "updated_at": datetime.utcnow()}}
+        {"$set": {"weight": round(record.weight, 1), **await sync_stamp(db, user_id)}}
     )
     
+    # Peso registrado: lembretes de peso pendentes saem da lista de não lidas
+    await mark_read(db, user_id, {"type": "weight_update"})
+    
     logger.info(f"Weight recorded for user {user_id}: {record.weight}kg")
     
     # ==================== AVALIAÇÃO DE PROGRESSO ====================
@@ -1674,7 +1500,7 @@ async def record_weight(user_id: str, record: WeightRecordCreate):
         goal = user.get("goal", "manutencao")
         
         # Busca calorias atuais da dieta
-        current_diet = await db.diet_plans.find_one({"user_id": user_id})
+        current_diet = hydrate_diet(await db.diet_plans.find_one({"user_id": user_id}))
         current_diet_calories = current_diet.get("computed_calories", 0) if current_diet else 0
         
         # Calcula o TDEE do usuário usando BMR primeiro
@@ -1725,10 +1551,11 @@ async def record_weight(user_id: str, record: WeightRecordCreate):
                 # Salva dieta ajustada (overwrite)
                 adjusted_diet["adjusted_at"] = datetime.utcnow()
                 adjusted_diet["adjustment_reason"] = progress_eval["reason"]
+                adjusted_diet["revision"] = current_diet.get("revision", 0) + 1
                 
                 await db.diet_plans.replace_one(
                     {"_id": current_diet["_id"]},
-                    adjusted_diet,
+                    compact_diet(adjusted_diet),
                     upsert=True
                 )
                 
@@ -1753,11 +1580,10 @@ async def record_weight(user_id: str, record: WeightRecordCreate):
 @api_router.post("/user/{user_id}/switch-goal/{new_goal}")
 async def switch_goal(user_id: str, new_goal: str):
     """
-    Muda o objetivo do usuário e regenera a dieta.
+    Muda o objetivo do usuário e enfileira a regeneração da dieta
+    (acompanhe em GET /jobs/{job_id}).
     new_goal pode ser: 'cutting', 'bulking', 'manutencao', 'manter'
     """
-    from diet_service import generate_diet, calculate_tdee as diet_calculate_tdee
-    
     # Normaliza o objetivo
     valid_goals = ["cutting", "bulking", "manutencao", "manter"]
     if new_goal not in valid_goals:
@@ -1782,46 +1608,188 @@ async def switch_goal(user_id: str, new_goal: str):
             "new_goal": new_goal
         }
     
-    # Atualiza o objetivo
+    # Recalcula metas com as MESMAS fórmulas do perfil (diet/formulas.py)
+    targets = calculate_profile_targets(
+        weight=user.get("weight", 70),
+        height=user.get("height", 170),
+        age=user.get("age", 25),
+        sex=user.get("sex", "masculino"),
+        training_frequency=user.get("weekly_training_frequency", 4),
+        training_level=user.get("training_level", "intermediario"),
+        goal=new_goal,
+        cardio_minutos_semana=user.get("cardio_minutos_semana", 0),
+        intensidade_cardio=user.get("intensidade_cardio", "moderado")
+    )
+    
+    # Atualiza o objetivo (e as metas correspondentes)
     await db.user_profiles.update_one(
         {"_id": user_id},
-        {"$set": {"goal": new_goal, "updated_at": datetime.utcnow()}}
+        {"$set": {"goal": new_goal, **targets, **await sync_stamp(db, user_id)}}
     )
     
-    # Regenera a dieta para o novo objetivo
-    try:
-        # Calcula TDEE e macros para o novo objetivo
-        weight = user.get("weight", 70)
-        height = user.get("height", 170)
-        age = user.get("age", 25)
-        sex = user.get("sex", "masculino")
-        activity_level = user.get("activity_level", "moderado")
-        training_level = user.get("training_level", "intermediario")
-        cardio_minutos = user.get("cardio_minutos_semana", 0)
-        cardio_intensidade = user.get("intensidade_cardio", "moderado")
-        
-        tdee = diet_calculate_tdee(
-            weight, height, age, sex, activity_level, training_level,
-            cardio_minutos, cardio_intensidade
+    # Regenera a dieta para o novo objetivo em background
+    job = await enqueue(db, DIET_REGENERATION, user_id, {"source": "switch_goal", "previous_goal": current_goal})
+    
+    goal_names = {"cutting": "Cutting", "bulking": "Bulking", "manutencao": "Manutenção"}
+    logger.info(f"User {user_id} switched from {current_goal} to {new_goal}. Diet regeneration queued.")
+    
+    return {
+        "success": True,
+        "message": f"Objetivo alterado para {goal_names.get(new_goal, new_goal)}! Sua nova dieta está sendo gerada.",
+        "new_goal": new_goal,
+        "previous_goal": current_goal,
+        "new_calories": targets["target_calories"],
+        "new_macros": targets["macros"],
+        "job_id": job["job_id"],
+        "status": job["status"],
+    }
+
+
+# ==================== DIET REGENERATION JOBS ====================
+# Troca de objetivo (PUT /user/profile e switch-goal) só enfileira o job;
+# a nova dieta chega no GET /diet ou no próximo /sync (diet_etag muda).
+
+DIET_REGENERATION = "diet_regeneration"
+
+
+# Conta excluída enquanto o job esperava/rodava: nada a gerar
+_PROFILE_GONE = {"skipped": "perfil removido"}
+
+
+async def _save_regenerated_diet(user_id: str, diet_doc: Dict, trace: Dict) -> bool:
+    """
+    Troca a dieta do usuário pela regenerada (+ trace). A geração leva
+    segundos: se a conta foi excluída nesse meio-tempo não grava nada - e
+    desfaz a gravação se a exclusão correu junto com ela.
+    """
+    if not await db.user_profiles.find_one({"_id": user_id}, {"_id": 1}):
+        return False
+    trace["_id"] = diet_doc["_id"]
+    await db.diet_plans.delete_many({"user_id": user_id})
+    await asyncio.gather(
+        db.diet_plans.insert_one(compact_diet(diet_doc)),
+        save_trace(db, trace),
+    )
+    if not await db.user_profiles.find_one({"_id": user_id}, {"_id": 1}):
+        await asyncio.gather(
+            db.diet_plans.delete_many({"user_id": user_id}),
+            db[DIET_TRACES].delete_one({"_id": diet_doc["_id"]}),
         )
-        
-        # Ajusta calorias baseado no objetivo
-        if new_goal == "cutting":
-            target_calories = tdee - 500
-        elif new_goal == "bulking":
-            target_calories = tdee + 400
-        else:  # manutenção
-            target_calories = tdee
-        
-        # Calcula macros
-        protein = int(weight * 2.0)  # 2g/kg
-        fat = int(weight * 1.0)  # 1g/kg
-        remaining_cals = target_calories - (protein * 4) - (fat * 9)
-        carbs = max(100, int(remaining_cals / 4))
-        
-        # Gera dieta
-        user_foods_set = set(user.get("food_preferences", []))
-        meals_list = generate_diet(
+        return False
+    return True
+
+
+async def _regenerate_diet_from_profile(user_id: str) -> Dict:
+    """Regenera com o DietAIService (mesmo fluxo do /api/diet/generate)"""
+    from diet_service import DietAIService
+    
+    updated_profile_data = await db.user_profiles.find_one({"_id": user_id})
+    if not updated_profile_data:
+        return _PROFILE_GONE
+    
+    # Busca meal_count das settings ou usa o do perfil
+    user_settings = await db.user_settings.find_one({"user_id": user_id})
+    meal_count = 6  # Padrão
+    meal_times = None
+    
+    if user_settings and user_settings.get('meal_count') in [4, 5, 6]:
+        meal_count = user_settings.get('meal_count')
+        meal_times = user_settings.get('meal_times', None)
+    elif updated_profile_data.get('meal_count') and updated_profile_data.get('meal_count') in [4, 5, 6]:
+        meal_count = updated_profile_data.get('meal_count')
+    
+    diet_service = DietAIService()
+    trace = build_trace(
+        None, user_id, "plan", updated_profile_data,
+        target_calories=updated_profile_data.get('target_calories', 2000),
+        target_macros=updated_profile_data.get('macros', {"protein": 150, "carbs": 200, "fat": 60}),
+        meal_count=meal_count,
+        meal_times=meal_times
+    )
+    segment = diet_segment(updated_profile_data.get('dietary_restrictions'), meal_count)
+    with sample_tags(route="/api/user/profile/{user_id}", **segment):
+        diet_plan = await run_in_diet_executor(
+            diet_service.generate_diet_plan,
+            user_profile=dict(updated_profile_data),
+            target_calories=updated_profile_data.get('target_calories', 2000),
+            target_macros=updated_profile_data.get('macros', {"protein": 150, "carbs": 200, "fat": 60}),
+            meal_count=meal_count,
+            meal_times=meal_times
+        )
+    
+    # Calcula totais reais dos alimentos
+    computed_protein = sum(sum(f["protein"] for f in m.foods) for m in diet_plan.meals)
+    computed_carbs = sum(sum(f["carbs"] for f in m.foods) for m in diet_plan.meals)
+    computed_fat = sum(sum(f["fat"] for f in m.foods) for m in diet_plan.meals)
+    computed_calories = sum(sum(f["calories"] for f in m.foods) for m in diet_plan.meals)
+    
+    # Converte para formato de dicionário para salvar no MongoDB
+    meals_data = []
+    for meal in diet_plan.meals:
+        meal_dict = {
+            "id": str(uuid.uuid4()),
+            "name": meal.name,
+            "time": meal.time,
+            "foods": [dict(f) if hasattr(f, '__dict__') else f for f in meal.foods],
+            "total_calories": meal.total_calories,
+            "macros": meal.macros
+        }
+        meals_data.append(meal_dict)
+    
+    diet_id = str(uuid.uuid4())
+    diet_doc = {
+        "_id": diet_id,
+        "id": diet_id,
+        "user_id": user_id,
+        "diet_type": "training",
+        "target_calories": updated_profile_data.get('target_calories', 2000),
+        "target_macros": updated_profile_data.get('macros', {"protein": 150, "carbs": 200, "fat": 60}),
+        "computed_calories": computed_calories,
+        "computed_protein": computed_protein,
+        "computed_carbs": computed_carbs,
+        "computed_fat": computed_fat,
+        "meals": meals_data,
+        "version": 14,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+    
+    # Remove dieta antiga e salva nova (+ trace)
+    if not await _save_regenerated_diet(user_id, diet_doc, trace):
+        return _PROFILE_GONE
+    
+    target_cal = updated_profile_data.get('target_calories', 2000)
+    logger.info(f"DIETA REGENERADA - User: {user_id} | Goal: {updated_profile_data.get('goal')} | Target: {target_cal} | Computed: {computed_calories}")
+    return {"diet_id": diet_id, "computed_calories": computed_calories}
+
+
+async def _regenerate_diet_for_goal(user_id: str, previous_goal: Optional[str]) -> Dict:
+    """Regenera com diet_service.generate_diet a partir das metas já gravadas pelo switch-goal"""
+    from diet_service import generate_diet
+    
+    user = await db.user_profiles.find_one({"_id": user_id})
+    if not user:
+        return _PROFILE_GONE
+    
+    new_goal = user.get("goal", "manutencao")
+    target_calories = user.get("target_calories", 2000)
+    macros = user.get("macros") or {"protein": 150, "carbs": 200, "fat": 60}
+    protein = int(macros["protein"])
+    carbs = int(macros["carbs"])
+    fat = int(macros["fat"])
+    
+    # Gera dieta
+    user_foods_set = set(user.get("food_preferences", []))
+    trace = build_trace(
+        None, user_id, "meals", user,
+        target_calories=target_calories,
+        target_macros={"protein": protein, "carbs": carbs, "fat": fat},
+        meal_count=user.get("meal_count", 4)
+    )
+    segment = diet_segment(user.get("dietary_restrictions"), user.get("meal_count", 4))
+    with sample_tags(route="/api/user/{user_id}/switch-goal/{new_goal}", **segment):
+        meals_list = await run_in_diet_executor(
+            generate_diet,
             target_p=protein,
             target_c=carbs,
             target_f=fat,
@@ -1830,67 +1798,79 @@ async def switch_goal(user_id: str, new_goal: str):
             meal_count=user.get("meal_count", 4),
             goal=new_goal
         )
+    
+    # Calcula totais (soma direta dos alimentos já que generate_diet não retorna total_calories)
+    total_cals = 0
+    total_p = 0
+    total_c = 0
+    total_f = 0
+    
+    for meal in meals_list:
+        meal_cals = 0
+        meal_p = 0
+        meal_c = 0
+        meal_f = 0
         
-        # Calcula totais (soma direta dos alimentos já que generate_diet não retorna total_calories)
-        total_cals = 0
-        total_p = 0
-        total_c = 0
-        total_f = 0
-        
-        for meal in meals_list:
-            meal_cals = 0
-            meal_p = 0
-            meal_c = 0
-            meal_f = 0
-            
-            for food in meal.get("foods", []):
-                meal_cals += food.get("calories", 0)
-                meal_p += food.get("protein", 0)
-                meal_c += food.get("carbs", 0)
-                meal_f += food.get("fat", 0)
-            
-            # Adiciona total_calories à refeição
-            meal["total_calories"] = int(meal_cals)
-            meal["macros"] = {"protein": int(meal_p), "carbs": int(meal_c), "fat": int(meal_f)}
-            
-            total_cals += meal_cals
-            total_p += meal_p
-            total_c += meal_c
-            total_f += meal_f
-        
-        # Monta estrutura da dieta
-        new_diet = {
-            "id": str(uuid.uuid4()),
-            "user_id": user_id,
-            "meals": meals_list,
-            "target_calories": target_calories,
-            "target_macros": {"protein": protein, "carbs": carbs, "fat": fat},
-            "computed_calories": total_cals,
-            "computed_macros": {"protein": int(total_p), "carbs": int(total_c), "fat": int(total_f)},
-            "goal_changed_at": datetime.utcnow(),
-            "previous_goal": current_goal,
-            "created_at": datetime.utcnow()
-        }
-        new_diet["_id"] = new_diet["id"]
-        
-        # Remove dieta antiga e insere nova
-        await db.diet_plans.delete_many({"user_id": user_id})
-        await db.diet_plans.insert_one(new_diet)
+        for food in meal.get("foods", []):
+            meal_cals += food.get("calories", 0)
+            meal_p += food.get("protein", 0)
+            meal_c += food.get("carbs", 0)
+            meal_f += food.get("fat", 0)
         
-        goal_names = {"cutting": "Cutting", "bulking": "Bulking", "manutencao": "Manutenção"}
-        logger.info(f"User {user_id} switched from {current_goal} to {new_goal}. New diet generated.")
+        # Adiciona total_calories à refeição
+        meal["total_calories"] = int(meal_cals)
+        meal["macros"] = {"protein": int(meal_p), "carbs": int(meal_c), "fat": int(meal_f)}
         
-        return {
-            "success": True,
-            "message": f"Objetivo alterado para {goal_names.get(new_goal, new_goal)}! Nova dieta gerada.",
-            "new_goal": new_goal,
-            "previous_goal": current_goal,
-            "new_calories": new_diet.get("computed_calories"),
-            "new_macros": new_diet.get("computed_macros")
-        }
-    except Exception as e:
-        logger.error(f"Error generating diet for {user_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Erro ao gerar nova dieta: {str(e)}")
+        total_cals += meal_cals
+        total_p += meal_p
+        total_c += meal_c
+        total_f += meal_f
+    
+    # Monta estrutura da dieta
+    new_diet = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "meals": meals_list,
+        "target_calories": target_calories,
+        "target_macros": {"protein": protein, "carbs": carbs, "fat": fat},
+        "computed_calories": total_cals,
+        "computed_macros": {"protein": int(total_p), "carbs": int(total_c), "fat": int(total_f)},
+        "goal_changed_at": datetime.utcnow(),
+        "previous_goal": previous_goal,
+        "created_at": datetime.utcnow()
+    }
+    new_diet["_id"] = new_diet["id"]
+    
+    # Remove dieta antiga e insere nova (+ trace)
+    if not await _save_regenerated_diet(user_id, new_diet, trace):
+        return _PROFILE_GONE
+    
+    logger.info(f"User {user_id} diet regenerated for goal {new_goal}.")
+    return {
+        "diet_id": new_diet["id"],
+        "computed_calories": new_diet["computed_calories"],
+        "computed_macros": new_diet["computed_macros"],
+    }
+
+
+async def _diet_regeneration_job(job: Dict) -> Dict:
+    payload = job.get("payload") or {}
+    if payload.get("source") == "switch_goal":
+        return await _regenerate_diet_for_goal(job["user_id"], payload.get("previous_goal"))
+    return await _regenerate_diet_from_profile(job["user_id"])
+
+
+job_workers = JobWorkerPool(db, {DIET_REGENERATION: _diet_regeneration_job})
+
+
+@api_router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Status de um job em background: queued, running, done, failed ou cancelled"""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    job["job_id"] = job.pop("_id")
+    return job
 
 
 # Modelo para o check-in completo
@@ -1924,10 +1904,7 @@ async def biweekly_checkin(user_id: str, checkin: CheckInRequest):
     
     # Bloqueio de 14 dias
     block_days = 14
-    last_record = await db.weight_records.find_one(
-        {"user_id": user_id},
-        sort=[("recorded_at", -1)]
-    )
+    last_record = await weight_store.latest(user_id)
     
     if last_record:
         days_since_last = (datetime.utcnow() - last_record["recorded_at"]).days
@@ -1962,14 +1939,17 @@ async def biweekly_checkin(user_id: str, checkin: CheckInRequest):
         "questionnaire_average": questionnaire_avg,
     }
     weight_record["_id"] = weight_record["id"]
-    await db.weight_records.insert_one(weight_record)
+    await weight_store.insert(weight_record)
     
     # Atualiza peso no perfil
     await db.user_profiles.update_one(
         {"_id": user_id},
-        {"$set": {"weight": round(checkin.weight, 1), "updated_at": datetime.utcnow()}}
+        {"$set": {"weight": round(checkin.weight, 1), **await sync_stamp(db, user_id)}}
     )
     
+    # Peso registrado: lembretes de peso pendentes saem da lista de não lidas
+    await mark_read(db, user_id, {"type": "weight_update"})
+    
     logger.info(f"Check-in recorded for user {user_id}: {checkin.weight}kg, avg: {questionnaire_avg}")
     
     # ==================== AJUSTE DE DIETA ====================
@@ -1979,7 +1959,7 @@ async def biweekly_checkin(user_id: str, checkin: CheckInRequest):
     suggested_goal = None
     suggest_reason = None
     
-    current_diet = await db.diet_plans.find_one({"user_id": user_id})
+    current_diet = hydrate_diet(await db.diet_plans.find_one({"user_id": user_id}))
     
     if current_diet and last_record:
         previous_weight = last_record.get("weight", checkin.weight)
@@ -2034,10 +2014,11 @@ async def biweekly_checkin(user_id: str, checkin: CheckInRequest):
             
             adjusted_diet["adjusted_at"] = datetime.utcnow()
             adjusted_diet["adjustment_reason"] = progress_eval["reason"]
+            adjusted_diet["revision"] = current_diet.get("revision", 0) + 1
             
             await db.diet_plans.replace_one(
                 {"_id": current_diet["_id"]},
-                adjusted_diet,
+                compact_diet(adjusted_diet),
                 upsert=True
             )
             
@@ -2087,9 +2068,7 @@ async def get_weight_history(user_id: str, days: int = 365):
     # Busca registros dos últimos N dias
     from_date = datetime.utcnow() - timedelta(days=days)
     
-    records = await db.weight_records.find(
-        {"user_id": user_id, "recorded_at": {"$gte": from_date}}
-    ).sort("recorded_at", 1).to_list(length=365)
+    records = await weight_store.in_range(user_id, from_date, limit=365)
     
     # Formata resposta com dados completos
     history = []
@@ -2155,10 +2134,7 @@ async def get_weight_history(user_id: str, days: int = 365):
         }
     
     # Verifica se pode registrar novo peso
-    last_record = await db.weight_records.find_one(
-        {"user_id": user_id},
-        sort=[("recorded_at", -1)]
-    )
+    last_record = await weight_store.latest(user_id)
     
     can_record = True
     days_until_next = 0
@@ -2219,9 +2195,16 @@ async def delete_weight_record(record_id: str):
     """
     Deleta um registro de peso específico.
     """
-    result = await db.weight_records.delete_one({"_id": record_id})
+    try:
+        deleted = await weight_store.delete(record_id)
+    except WeightDeleteUnsupported as e:
+        logger.error(f"Delete de peso recusado pela time-series (MongoDB < 7.0): {e}")
+        raise HTTPException(
+            status_code=501,
+            detail="Exclusão de registro de peso indisponível nesta versão do banco"
+        )
     
-    if result.deleted_count == 0:
+    if deleted == 0:
         raise HTTPException(status_code=404, detail="Registro não encontrado")
     
     return {"message": "Registro deletado com sucesso"}
@@ -2283,11 +2266,7 @@ def calculate_adjusted_macros(base_calories: float, base_protein: float, base_ca
 
 def get_day_type_from_training_days(training_days: List[int], check_date_str: str = None) -> Dict:
     """
-    🎯 NOVA LÓGICA: Calcula se é dia de TREINO ou DESCANSO baseado nos dias selecionados pelo usuário.
-    
-    REGRA SIMPLES:
-    - Se o dia da semana atual está em training_days → "train"
-    - Senão → "rest"
+    🎯 Calcula se é dia de TREINO ou DESCANSO baseado nos dias selecionados pelo usuário.
     
     Args:
         training_days: Lista de dias da semana (0=Domingo, 1=Segunda, ..., 6=Sábado)
@@ -2296,110 +2275,65 @@ def get_day_type_from_training_days(training_days: List[int], check_date_str: st
     Returns:
         Dict com day_type ("train"/"rest"), weekday, etc.
     """
-    from datetime import datetime
-    
-    # Parse da data
-    check_date = datetime.strptime(check_date_str, "%Y-%m-%d").date() if check_date_str else datetime.now().date()
-    
-    # Pega o dia da semana (0=Segunda no Python, mas queremos 0=Domingo)
-    # Python: weekday() retorna 0=Segunda ... 6=Domingo
-    # Convertemos para 0=Domingo, 1=Segunda, ..., 6=Sábado
-    python_weekday = check_date.weekday()  # 0=Segunda ... 6=Domingo
-    weekday = (python_weekday + 1) % 7     # 0=Domingo, 1=Segunda ... 6=Sábado
-    
-    # Nomes dos dias
-    day_names = {0: 'Domingo', 1: 'Segunda', 2: 'Terça', 3: 'Quarta', 4: 'Quinta', 5: 'Sexta', 6: 'Sábado'}
-    
-    # Verifica se é dia de treino
-    is_training_day = weekday in training_days
-    day_type = "train" if is_training_day else "rest"
-    
-    return {
-        "day_type": day_type,
-        "weekday": weekday,
-        "weekday_name": day_names.get(weekday, ""),
-        "training_days": training_days,
-        "is_training_day": is_training_day,
-        "reason": f"{day_names.get(weekday, '')} - {'dia de treino' if is_training_day else 'dia de descanso'}"
-    }
+    schedule = build_weekly_schedule(training_days, len(training_days))
+    return resolve_day(schedule, None, check_date_str)
 
 
 def get_day_type_from_division(start_date_str: str, frequency: int, check_date_str: str = None) -> Dict:
     """
-    🎯 Calcula automaticamente se é dia de TREINO ou DESCANSO baseado no ciclo semanal.
-    NOTA: Esta função é usada como FALLBACK quando o usuário não tem training_days definidos.
+    🎯 Calcula se é dia de TREINO ou DESCANSO baseado no ciclo semanal.
+    NOTA: FALLBACK quando o usuário não tem training_days definidos.
     
     REGRAS:
     1. Dia 0 (startDate) = SEMPRE DESCANSO
-    2. A partir do dia 1, começa o ciclo de treino
-    3. Ciclo de 7 dias se repete
-    
-    Distribuição de dias de treino na semana:
-    - 2x: dias 1, 4 (treino nos dias 2 e 5 do ciclo)
-    - 3x: dias 1, 3, 5
-    - 4x: dias 1, 2, 4, 5
-    - 5x: dias 1, 2, 3, 4, 5
-    - 6x: dias 1, 2, 3, 4, 5, 6
-    
-    Args:
-        start_date_str: Data de início (YYYY-MM-DD) - primeiro dia do app
-        frequency: Frequência semanal (2-6)
-        check_date_str: Data para verificar (YYYY-MM-DD) - default: hoje
+    2. A partir do dia 1, começa o ciclo de 7 dias (ver DIVISION_TRAINING_DAYS)
     
     Returns:
         Dict com day_type ("train"/"rest"), day_number, cycle_day, etc.
     """
-    from datetime import datetime, timedelta
-    
-    # Parse das datas
-    start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-    check_date = datetime.strptime(check_date_str, "%Y-%m-%d").date() if check_date_str else datetime.now().date()
+    schedule = build_weekly_schedule(None, frequency)
+    return resolve_day(schedule, start_date_str, check_date_str)
+
+
+async def get_weekly_schedule(user_id: str, user: Optional[Dict]) -> Tuple[Dict, Dict]:
+    """
+    🗓️ Retorna (ciclo, agenda semanal) do usuário.
     
-    # Calcula quantos dias se passaram desde o início
-    days_elapsed = (check_date - start_date).days
+    A agenda é salva em training_cycles.weekly_schedule e só é remontada quando
+    training_days, frequência ou divisão mudam (chave diferente). Sem ciclo,
+    cria um começando hoje (mesmo comportamento do status do ciclo).
+    """
+    cycle_config = await db.training_cycles.find_one({"user_id": user_id})
+    user = user or {}
     
-    # Dia 0 = SEMPRE descanso
-    if days_elapsed == 0:
-        return {
-            "day_type": "rest",
-            "day_number": 0,
-            "cycle_day": 0,
-            "cycle_week": 0,
-            "is_first_day": True,
-            "reason": "Primeiro dia do app - descanso obrigatório"
+    if not cycle_config:
+        cycle_config = {
+            "user_id": user_id,
+            "start_date": get_today_date(),
+            "frequency": user.get("weekly_training_frequency", 4),
+            "created_at": datetime.utcnow()
         }
+        await db.training_cycles.update_one(
+            {"user_id": user_id},
+            {"$set": cycle_config},
+            upsert=True
+        )
     
-    # A partir do dia 1, calcula o ciclo de 7 dias
-    # Ciclo começa no dia 1, então ciclo_dia vai de 1 a 7
-    cycle_day = ((days_elapsed - 1) % 7) + 1  # 1-7
-    cycle_week = (days_elapsed - 1) // 7 + 1
-    
-    # Mapeamento de dias de treino por frequência
-    # O dia 7 (domingo) é SEMPRE descanso
-    training_days_by_frequency = {
-        2: [1, 4],           # Segunda, Quinta
-        3: [1, 3, 5],        # Segunda, Quarta, Sexta
-        4: [1, 2, 4, 5],     # Segunda, Terça, Quinta, Sexta
-        5: [1, 2, 3, 4, 5],  # Segunda a Sexta
-        6: [1, 2, 3, 4, 5, 6],  # Segunda a Sábado
-    }
-    
-    # Pega os dias de treino para a frequência (default: 4x)
-    training_days = training_days_by_frequency.get(frequency, [1, 2, 4, 5])
+    cycle_config.setdefault("start_date", get_today_date())
+    frequency = cycle_config.get("frequency", user.get("weekly_training_frequency", 4))
+    training_days = user.get("training_days", [])
+    training_split = user.get("training_split", "full_body")
     
-    # Verifica se o dia do ciclo é dia de treino
-    is_training_day = cycle_day in training_days
-    day_type = "train" if is_training_day else "rest"
+    schedule = cycle_config.get("weekly_schedule")
+    if not is_schedule_current(schedule, training_days, frequency, training_split):
+        schedule = build_weekly_schedule(training_days, frequency, training_split)
+        await db.training_cycles.update_one(
+            {"user_id": user_id},
+            {"$set": {"weekly_schedule": schedule, "schedule_key": schedule["key"]}}
+        )
+        cycle_config["weekly_schedule"] = schedule
     
-    return {
-        "day_type": day_type,
-        "day_number": days_elapsed,
-        "cycle_day": cycle_day,
-        "cycle_week": cycle_week,
-        "is_first_day": False,
-        "training_days_in_cycle": training_days,
-        "reason": f"Ciclo dia {cycle_day} - {'treino' if is_training_day else 'descanso'}"
-    }
+    return cycle_config, schedule
 
 
 class TrainingCycleSetup(BaseModel):
@@ -2433,12 +2367,17 @@ async def setup_training_cycle(user_id: str, setup: TrainingCycleSetup):
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
     today = get_today_date()
+    schedule = build_weekly_schedule(
+        user.get("training_days", []), setup.frequency, user.get("training_split", "full_body")
+    )
     
-    # Salva configuração do ciclo
+    # Salva configuração do ciclo (com a agenda semanal pré-calculada)
     cycle_config = {
         "user_id": user_id,
         "start_date": today,
         "frequency": setup.frequency,
+        "weekly_schedule": schedule,
+        "schedule_key": schedule["key"],
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     }
@@ -2453,11 +2392,11 @@ async def setup_training_cycle(user_id: str, setup: TrainingCycleSetup):
     # Também atualiza a frequência no perfil
     await db.user_profiles.update_one(
         {"_id": user_id},
-        {"$set": {"weekly_training_frequency": setup.frequency}}
+        {"$set": {"weekly_training_frequency": setup.frequency, **await sync_stamp(db, user_id)}}
     )
     
     # Calcula o status do primeiro dia
-    day_status = get_day_type_from_division(today, setup.frequency, today)
+    day_status = resolve_day(schedule, today, today)
     
     logger.info(f"Training cycle setup for user {user_id}: {setup.frequency}x/week, start_date={today}")
     
@@ -2491,80 +2430,14 @@ async def get_training_cycle_status(user_id: str, date: str = None):
     
     check_date = date or get_today_date()
     
-    # Busca configuração do ciclo
-    cycle_config = await db.training_cycles.find_one({"user_id": user_id})
-    
-    # Pega training_days do perfil do usuário (se existir)
+    # Ciclo + agenda semanal pré-calculada (auto-cria o ciclo se não existir)
+    cycle_config, schedule = await get_weekly_schedule(user_id, user)
+    start_date = cycle_config["start_date"]
+    frequency = schedule["frequency"]
     training_days = user.get("training_days", [])
     
-    if not cycle_config:
-        # Se não tem ciclo configurado, usa a frequência do perfil e hoje como início
-        frequency = user.get("weekly_training_frequency", 4)
-        start_date = get_today_date()
-        
-        # Auto-cria o ciclo
-        await db.training_cycles.update_one(
-            {"user_id": user_id},
-            {"$set": {
-                "user_id": user_id,
-                "start_date": start_date,
-                "frequency": frequency,
-                "created_at": datetime.utcnow()
-            }},
-            upsert=True
-        )
-        cycle_config = {"start_date": start_date, "frequency": frequency}
-    
-    start_date = cycle_config.get("start_date", get_today_date())
-    frequency = cycle_config.get("frequency", user.get("weekly_training_frequency", 4))
-    
-    # 🎯 NOVA LÓGICA: Usa training_days do perfil se disponível
-    if training_days and len(training_days) > 0:
-        # Usa os dias selecionados pelo usuário
-        from datetime import datetime as dt
-        check_dt = dt.strptime(check_date, "%Y-%m-%d").date()
-        # Python weekday: 0=Monday ... 6=Sunday
-        # Nosso formato: 0=Sunday, 1=Monday ... 6=Saturday
-        python_weekday = check_dt.weekday()
-        today_weekday = (python_weekday + 1) % 7  # Converte para nosso formato
-        
-        is_training_day = today_weekday in training_days
-        day_names = {0: 'Domingo', 1: 'Segunda', 2: 'Terça', 3: 'Quarta', 4: 'Quinta', 5: 'Sexta', 6: 'Sábado'}
-        
-        # ==================== LÓGICA DE TREINO DO DIA ====================
-        # Determina qual treino mostrar baseado na divisão e posição na semana
-        training_split = user.get("training_split", "full_body")
-        today_workout_name = None
-        today_workout_index = 0
-        
-        if is_training_day:
-            # Ordena os training_days para saber a posição do dia atual
-            sorted_training_days = sorted(training_days)
-            day_position = sorted_training_days.index(today_weekday)  # 0, 1, 2, ...
-            
-            if frequency == 6 or training_split == "ppl":
-                # PPL: Push, Pull, Legs, Push, Pull, Legs
-                ppl_sequence = ["Push", "Pull", "Legs", "Push", "Pull", "Legs"]
-                today_workout_index = day_position % len(ppl_sequence)
-                today_workout_name = ppl_sequence[today_workout_index]
-            else:
-                # Full Body ou outras divisões
-                today_workout_index = day_position
-                today_workout_name = "Full Body"
-        
-        day_status = {
-            "day_type": "train" if is_training_day else "rest",
-            "weekday": today_weekday,
-            "weekday_name": day_names.get(today_weekday, ""),
-            "training_days": training_days,
-            "training_split": training_split,
-            "today_workout_name": today_workout_name,
-            "today_workout_index": today_workout_index,
-            "reason": f"{day_names.get(today_weekday, '')} - {'dia de treino' if is_training_day else 'dia de descanso'}"
-        }
-    else:
-        # Fallback para o sistema antigo baseado em ciclo
-        day_status = get_day_type_from_division(start_date, frequency, check_date)
+    # 🎯 training_days do perfil quando disponível, senão ciclo por frequência
+    day_status = resolve_day(schedule, start_date, check_date)
     
     # Busca sessão de treino do dia
     training_session = await db.training_sessions.find_one({
@@ -2587,20 +2460,7 @@ async def get_training_cycle_status(user_id: str, date: str = None):
     #    → Dieta de DESCANSO (sem exceções, sem treino bônus)
     
     planned_day_type = day_status["day_type"]  # "train" ou "rest"
-    
-    if planned_day_type == "train":
-        # Dia planejado como TREINO → dieta de treino SEMPRE
-        diet_type = "training"
-        calorie_multiplier = 1.05
-        carb_multiplier = 1.15
-        diet_reason = "Dia de treino planejado"
-    else:
-        # Dia planejado como DESCANSO → dieta de descanso SEMPRE
-        # NÃO existe mais treino bônus - treino bloqueado em dias de descanso
-        diet_type = "rest"
-        calorie_multiplier = 0.95
-        carb_multiplier = 0.80
-        diet_reason = "Dia de descanso"
+    day_diet = DAY_TYPE_DIET[planned_day_type]
     
     # Status do treino
     # - train + não treinou → pending
@@ -2651,13 +2511,7 @@ async def get_training_cycle_status(user_id: str, date: str = None):
             "completed_at": training_session.get("completed_at") if training_session else None,
             "duration_seconds": training_session.get("duration_seconds") if training_session else None,
         } if training_session else None,
-        "diet": {
-            "type": diet_type,
-            "calorie_multiplier": calorie_multiplier,
-            "carb_multiplier": carb_multiplier,
-            "reason": diet_reason,
-            "info": "+5% cal, +15% carbs" if diet_type == "training" else "-5% cal, -20% carbs"
-        }
+        "diet": dict(day_diet)
     }
 
 
@@ -2680,10 +2534,7 @@ async def start_training_session(user_id: str, request: TrainingSessionStart = N
     # 🚫 VERIFICA SE É DIA DE DESCANSO - BLOQUEIA TREINO
     training_days = user.get("training_days", [])
     if training_days:
-        from datetime import datetime as dt
-        check_dt = dt.strptime(today, "%Y-%m-%d").date()
-        python_weekday = check_dt.weekday()
-        today_weekday = (python_weekday + 1) % 7  # 0=Domingo, 1=Segunda, ...
+        today_weekday = weekday_of(to_date(today))  # 0=Domingo, 1=Segunda, ...
         
         if today_weekday not in training_days:
             raise HTTPException(
@@ -2795,7 +2646,8 @@ async def finish_training_session(user_id: str, request: TrainingSessionFinish):
             "date": today,
             "trained": True,
             "completed_at": now.isoformat(),
-            "duration_seconds": request.duration_seconds
+            "duration_seconds": request.duration_seconds,
+            **await sync_stamp(db, user_id)
         }},
         upsert=True
     )
@@ -2883,54 +2735,105 @@ async def get_week_preview(user_id: str):
     """
     🎯 Retorna preview da semana com dias de treino e descanso.
     """
-    # Busca configuração do ciclo
-    cycle_config = await db.training_cycles.find_one({"user_id": user_id})
     user = await db.user_profiles.find_one({"_id": user_id})
-    
-    if not cycle_config:
-        frequency = user.get("weekly_training_frequency", 4) if user else 4
-        start_date = get_today_date()
-    else:
-        frequency = cycle_config.get("frequency", 4)
-        start_date = cycle_config.get("start_date", get_today_date())
+    cycle_config, schedule = await get_weekly_schedule(user_id, user)
+    start_date = cycle_config["start_date"]
     
     # Gera preview dos próximos 7 dias
     today = datetime.now().date()
-    week_preview = []
-    
-    day_names = {
-        0: "Segunda", 1: "Terça", 2: "Quarta", 
-        3: "Quinta", 4: "Sexta", 5: "Sábado", 6: "Domingo"
-    }
+    last_day = today + timedelta(days=6)
+    trained_dates = await get_completed_session_dates(user_id, today, last_day)
     
-    for i in range(7):
-        check_date = today + timedelta(days=i)
-        check_date_str = check_date.strftime("%Y-%m-%d")
-        
-        day_status = get_day_type_from_division(start_date, frequency, check_date_str)
-        
-        # Busca se já treinou nesse dia
-        session = await db.training_sessions.find_one({
-            "user_id": user_id,
-            "date": check_date_str
-        })
-        
+    week_preview = []
+    for i, day_status in enumerate(iter_schedule_range(schedule, start_date, today, last_day)):
         week_preview.append({
-            "date": check_date_str,
-            "day_name": day_names.get(check_date.weekday(), ""),
+            "date": day_status["date"],
+            "day_name": day_status["weekday_name"],
             "day_type": day_status["day_type"],
-            "cycle_day": day_status["cycle_day"],
+            "cycle_day": day_status.get("cycle_day", day_status["weekday"]),
             "is_today": i == 0,
-            "has_trained": session.get("completed", False) if session else False
+            "has_trained": day_status["date"] in trained_dates
         })
     
     return {
-        "frequency": frequency,
+        "frequency": schedule["frequency"],
         "start_date": start_date,
         "week_preview": week_preview
     }
 
 
+async def get_completed_session_dates(user_id: str, first_day, last_day) -> set:
+    """Datas (YYYY-MM-DD) com sessão de treino concluída no intervalo - uma única query"""
+    cursor = db.training_sessions.find(
+        {
+            "user_id": user_id,
+            "date": {"$gte": first_day.isoformat(), "$lte": last_day.isoformat()},
+            "completed": True
+        },
+        {"date": 1, "_id": 0}
+    )
+    return {session["date"] async for session in cursor}
+
+
+MAX_SCHEDULE_RANGE_DAYS = 366
+
+
+@api_router.get("/training-cycle/schedule/{user_id}")
+async def get_training_schedule_range(user_id: str, start: str, end: str):
+    """
+    🗓️ Agenda de treino/descanso para um intervalo de datas (visão de calendário).
+    
+    - start / end: YYYY-MM-DD (inclusive, máx. 366 dias)
+    - Cada dia traz tipo, treino do dia, multiplicadores de dieta e se já treinou
+    """
+    try:
+        first_day = to_date(start)
+        last_day = to_date(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Datas inválidas. Use o formato YYYY-MM-DD")
+    
+    if last_day < first_day:
+        raise HTTPException(status_code=400, detail="A data final deve ser igual ou posterior à inicial")
+    if (last_day - first_day).days >= MAX_SCHEDULE_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Intervalo máximo de {MAX_SCHEDULE_RANGE_DAYS} dias")
+    
+    user = await db.user_profiles.find_one({"_id": user_id})
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    
+    cycle_config, schedule = await get_weekly_schedule(user_id, user)
+    start_date = cycle_config["start_date"]
+    trained_dates = await get_completed_session_dates(user_id, first_day, last_day)
+    
+    days = []
+    for day_status in iter_schedule_range(schedule, start_date, first_day, last_day):
+        day_diet = DAY_TYPE_DIET[day_status["day_type"]]
+        days.append({
+            "date": day_status["date"],
+            "weekday": day_status["weekday"],
+            "weekday_name": day_status["weekday_name"],
+            "day_type": day_status["day_type"],
+            "workout_name": day_status.get("today_workout_name"),
+            "workout_index": day_status.get("today_workout_index", 0),
+            "cycle_day": day_status.get("cycle_day"),
+            "is_first_day": day_status.get("is_first_day", False),
+            "has_trained": day_status["date"] in trained_dates,
+            "diet_type": day_diet["type"],
+            "calorie_multiplier": day_diet["calorie_multiplier"],
+            "carb_multiplier": day_diet["carb_multiplier"]
+        })
+    
+    return {
+        "user_id": user_id,
+        "start": first_day.isoformat(),
+        "end": last_day.isoformat(),
+        "frequency": schedule["frequency"],
+        "start_date": start_date,
+        "mode": schedule["mode"],
+        "days": days
+    }
+
+
 @api_router.get("/workout/status/{user_id}")
 async def get_workout_status(user_id: str, date: str = None):
     """
@@ -2955,37 +2858,16 @@ async def get_workout_status(user_id: str, date: str = None):
     trained = workout_record.get("trained", False) if workout_record else False
     completed_at = workout_record.get("completed_at") if workout_record else None
     
-    # Verifica se é dia de treino baseado na frequência semanal do usuário
-    weekly_frequency = user.get("weekly_training_frequency", 4)
-    day_of_week = datetime.strptime(date, "%Y-%m-%d").weekday()  # 0=segunda, 6=domingo
-    
-    # Dias de treino padrão baseado na frequência
-    # Ex: 4x/semana = seg, ter, qui, sex (0, 1, 3, 4)
-    training_days_map = {
-        1: [0],  # Segunda
-        2: [0, 3],  # Segunda, Quinta
-        3: [0, 2, 4],  # Segunda, Quarta, Sexta
-        4: [0, 1, 3, 4],  # Segunda, Terça, Quinta, Sexta
-        5: [0, 1, 2, 3, 4],  # Segunda a Sexta
-        6: [0, 1, 2, 3, 4, 5],  # Segunda a Sábado
-        7: [0, 1, 2, 3, 4, 5, 6],  # Todos os dias
-    }
-    
-    scheduled_training_days = training_days_map.get(weekly_frequency, [0, 2, 4])
-    is_scheduled_training_day = day_of_week in scheduled_training_days
+    # Dia agendado vem da mesma agenda semanal do ciclo de treino
+    cycle_config, schedule = await get_weekly_schedule(user_id, user)
+    day_status = resolve_day(schedule, cycle_config["start_date"], date)
+    is_scheduled_training_day = day_status["day_type"] == "train"
     
     # Se já treinou, é dia de treino. Senão, usa o agendado.
     is_training_day = trained or is_scheduled_training_day
     
     # Determina o tipo de dieta
-    if trained:
-        diet_type = "training"
-        calorie_multiplier = 1.05
-        carb_multiplier = 1.15
-    else:
-        diet_type = "rest"
-        calorie_multiplier = 0.95
-        carb_multiplier = 0.80
+    day_diet = DAY_TYPE_DIET["train" if trained else "rest"]
     
     return {
         "date": date,
@@ -2993,13 +2875,38 @@ async def get_workout_status(user_id: str, date: str = None):
         "completed_at": completed_at,
         "is_scheduled_training_day": is_scheduled_training_day,
         "is_training_day": is_training_day,
-        "diet_type": diet_type,
-        "calorie_multiplier": calorie_multiplier,
-        "carb_multiplier": carb_multiplier,
-        "weekly_frequency": weekly_frequency,
-        "day_of_week": day_of_week
+        "diet_type": day_diet["type"],
+        "calorie_multiplier": day_diet["calorie_multiplier"],
+        "carb_multiplier": day_diet["carb_multiplier"],
+        "weekly_frequency": user.get("weekly_training_frequency", 4),
+        "day_of_week": day_status["weekday"]  # 0=Domingo
     }
 
+async def _mark_workout_finished(user_id: str, date: str) -> Optional[str]:
+    """Marca o dia como treinado. Retorna o completed_at, ou None se o dia já estava marcado."""
+    existing = await db.workout_tracking.find_one({"user_id": user_id, "date": date}, {"trained": 1})
+    if existing and existing.get("trained"):
+        return None
+    
+    completed_at = datetime.now().isoformat()
+    await db.workout_tracking.update_one(
+        {"user_id": user_id, "date": date},
+        {
+            "$set": {
+                "user_id": user_id,
+                "date": date,
+                "trained": True,
+                "completed_at": completed_at,
+                **await sync_stamp(db, user_id)
+            }
+        },
+        upsert=True
+    )
+    
+    logging.info(f"Workout finished for user {user_id} on {date}")
+    return completed_at
+
+
 @api_router.post("/workout/finish/{user_id}")
 async def finish_workout(user_id: str, request: FinishWorkoutRequest = None):
     """
@@ -3012,40 +2919,17 @@ async def finish_workout(user_id: str, request: FinishWorkoutRequest = None):
     date = request.date if request and request.date else get_today_date()
     
     # Verifica se usuário existe
-    user = await db.user_profiles.find_one({"_id": user_id})
+    user = await db.user_profiles.find_one({"_id": user_id}, {"_id": 1})
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
-    # Verifica se já foi marcado
-    existing = await db.workout_tracking.find_one({
-        "user_id": user_id,
-        "date": date
-    })
-    
-    if existing and existing.get("trained"):
+    completed_at = await _mark_workout_finished(user_id, date)
+    if completed_at is None:
         raise HTTPException(
             status_code=400, 
             detail="Treino já foi marcado como concluído para este dia"
         )
     
-    # Marca como concluído
-    completed_at = datetime.now().isoformat()
-    
-    await db.workout_tracking.update_one(
-        {"user_id": user_id, "date": date},
-        {
-            "$set": {
-                "user_id": user_id,
-                "date": date,
-                "trained": True,
-                "completed_at": completed_at
-            }
-        },
-        upsert=True
-    )
-    
-    logging.info(f"Workout finished for user {user_id} on {date}")
-    
     return {
         "success": True,
         "message": "Treino concluído com sucesso!",
@@ -3109,7 +2993,7 @@ async def get_adjusted_macros(user_id: str, date: str = None):
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
     # Busca dieta do usuário
-    diet = await db.diet_plans.find_one({"user_id": user_id})
+    diet = hydrate_diet(await db.diet_plans.find_one({"user_id": user_id}))
     if not diet:
         raise HTTPException(status_code=404, detail="Dieta não encontrada. Gere uma dieta primeiro.")
     
@@ -3135,98 +3019,229 @@ async def get_adjusted_macros(user_id: str, date: str = None):
     return adjusted
 
 
+# ==================== NUTRITION WEEK ====================
+# Semana inteira (macros + quantidades por refeição) numa resposta só.
+# Só existem dois ajustes (treino/descanso): cada variante do plano é
+# calculada uma vez e cacheada por (dieta, idioma); os 7 dias apenas
+# apontam para a variante do seu tipo na agenda semanal.
+
+NUTRITION_WEEK_DAYS = 7
+NUTRITION_WEEK_CACHE_SIZE = int(os.environ.get('NUTRITION_WEEK_CACHE_SIZE', '512'))
+_nutrition_week_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+
+def _diet_base_macros(diet: Dict) -> Tuple[float, float, float, float]:
+    """Macros base da dieta (mesmo fallback do adjusted-macros)"""
+    base_calories = diet.get("computed_calories", diet.get("target_calories", 2000))
+    base_macros = diet.get("computed_macros", diet.get("target_macros", {}))
+    return (
+        base_calories,
+        base_macros.get("protein", 150),
+        base_macros.get("carbs", 300),
+        base_macros.get("fat", 60),
+    )
+
+
+def _nutrition_variant(diet_plan: Dict, user_profile: Optional[Dict], day_type: str) -> Dict:
+    """Plano ajustado a um tipo de dia (LRU em memória; a chave muda junto com a dieta)"""
+    day = _diet_day_context(user_profile, day_type)
+    key = plan_etag(diet_plan, day_type, day["lang_code"])
+    cached = _nutrition_week_cache.get(key)
+    if cached is not None:
+        _nutrition_week_cache.move_to_end(key)
+        return cached
+    
+    presented = _present_diet(dict(diet_plan), day)
+    variant = {
+        "diet_type": day["diet_type"],
+        "adjustments": presented["adjustments"],
+        "targets": calculate_adjusted_macros(*_diet_base_macros(diet_plan), day["is_training_day"]),
+        "computed_calories": presented["computed_calories"],
+        "computed_protein": presented["computed_protein"],
+        "computed_carbs": presented["computed_carbs"],
+        "computed_fat": presented["computed_fat"],
+        "meals": presented["meals"],
+    }
+    _nutrition_week_cache[key] = variant
+    if len(_nutrition_week_cache) > NUTRITION_WEEK_CACHE_SIZE:
+        _nutrition_week_cache.popitem(last=False)
+    return variant
+
+
+@api_router.get("/nutrition/week/{user_id}")
+async def get_nutrition_week(user_id: str, request: Request, response: Response, start: str = None):
+    """
+    Macros ajustados e quantidades por refeição dos 7 dias a partir de `start`
+    (padrão: hoje), pela agenda semanal do ciclo de treino.
+    
+    - plans: dieta ajustada por tipo de dia ("training"/"rest")
+    - days: data, tipo do dia, treino e totais do dia (apontando para plans)
+    
+    📦 ETag (dieta + agenda + semana + idioma): If-None-Match → 304
+    """
+    try:
+        first_day = to_date(start)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Data inválida. Use o formato YYYY-MM-DD")
+    last_day = first_day + timedelta(days=NUTRITION_WEEK_DAYS - 1)
+    
+    user, diet_doc = await asyncio.gather(
+        db.user_profiles.find_one({"_id": user_id}),
+        db.diet_plans.find_one({"user_id": user_id}, sort=[("created_at", -1)]),
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    diet_plan = hydrate_diet(diet_doc)
+    if not diet_plan:
+        raise HTTPException(status_code=404, detail="Dieta não encontrada. Gere uma dieta primeiro.")
+    diet_plan["id"] = diet_plan["_id"]
+    
+    cycle_config, schedule = await get_weekly_schedule(user_id, user)
+    start_date = cycle_config["start_date"]
+    lang_code = _diet_day_context(user, "rest")["lang_code"]
+    
+    # 📦 GET condicional: nem a dieta nem a agenda mudaram → só o header
+    etag = plan_etag(diet_plan, schedule["key"], start_date, first_day.isoformat(), lang_code)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    
+    plans = {}
+    days = []
+    for day_status in iter_schedule_range(schedule, start_date, first_day, last_day):
+        day_type = day_status["day_type"]
+        diet_type = DAY_TYPE_DIET[day_type]["type"]
+        if diet_type not in plans:
+            plans[diet_type] = _nutrition_variant(diet_plan, user, day_type)
+        plan = plans[diet_type]
+        days.append({
+            "date": day_status["date"],
+            "weekday": day_status["weekday"],
+            "weekday_name": day_status["weekday_name"],
+            "day_type": day_type,
+            "diet_type": diet_type,
+            "workout_name": day_status.get("today_workout_name"),
+            "calories": plan["computed_calories"],
+            "protein": plan["computed_protein"],
+            "carbs": plan["computed_carbs"],
+            "fat": plan["computed_fat"],
+        })
+    
+    return json_response({
+        "user_id": user_id,
+        "diet_id": diet_plan["id"],
+        "start": first_day.isoformat(),
+        "end": last_day.isoformat(),
+        "plans": plans,
+        "days": days,
+    }, response)
+
+
 # ==================== NOTIFICATIONS ENDPOINTS ====================
 
+def _format_notification(n: Dict) -> Dict:
+    return {
+        "id": n["_id"],
+        "type": n.get("type", "general"),
+        "title": n.get("title", ""),
+        "message": n.get("message", ""),
+        "created_at": n.get("created_at", datetime.utcnow()).isoformat() if isinstance(n.get("created_at"), datetime) else n.get("created_at"),
+        "read": n.get("read", False),
+        "action_url": n.get("action_url"),
+        "priority": n.get("priority", "normal")
+    }
+
+
 @api_router.get("/notifications/{user_id}")
 async def get_user_notifications(user_id: str, unread_only: bool = False):
     """
     Retorna notificações/lembretes do usuário.
     
-    Inclui:
+    Inclui (materializados pelo agendador em background):
     - Lembretes de atualização de peso
-    - Alertas de Peak Week
+    - Alertas de água/sódio abaixo do mínimo (Peak Week)
     - Notificações gerais
+    
+    Uma busca indexada com projeção + o contador de não lidas.
     """
-    # Verifica se usuário existe
-    user = await db.user_profiles.find_one({"_id": user_id})
+    user, notifications, unread = await asyncio.gather(
+        db.user_profiles.find_one({"_id": user_id}, {"_id": 1}),
+        list_notifications(db, user_id, unread_only=unread_only),
+        unread_count(db, user_id),
+    )
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
-    # Busca notificações
-    query = {"user_id": user_id}
-    if unread_only:
-        query["read"] = False
-    
-    notifications = await db.notifications.find(query).sort("created_at", -1).to_list(50)
-    
-    # Gera notificações dinâmicas baseadas no contexto
-    dynamic_notifications = []
+    return {
+        "user_id": user_id,
+        "notifications": [_format_notification(n) for n in notifications],
+        "unread_count": unread
+    }
+
+
+class NotificationReadRequest(BaseModel):
+    """Leitura em lote: ids específicos e/ou tudo criado até `before`"""
+    ids: Optional[List[str]] = None
+    before: Optional[datetime] = None
+
+
+NOTIFICATION_READ_MAX_IDS = 500
+
+
+@api_router.put("/notifications/{notification_id}/read")
+async def mark_notification_read(notification_id: str):
+    """Marca uma notificação como lida"""
+    notification = await db.notifications.find_one({"_id": notification_id}, {"user_id": 1})
+    if not notification:
+        return {"success": False}
     
-    # 1. Verificar se precisa atualizar peso
-    last_weight = await db.weight_records.find_one(
-        {"user_id": user_id},
-        sort=[("recorded_at", -1)]
-    )
+    modified = await mark_read(db, notification["user_id"], {"_id": notification_id})
+    return {"success": modified > 0}
+
+
+@api_router.put("/notifications/user/{user_id}/read")
+async def mark_user_notifications_read(user_id: str, request: NotificationReadRequest):
+    """
+    Marca em lote (um update_many) as notificações do usuário:
+    os `ids` e/ou tudo criado até `before`.
+    """
+    if request.ids is None and request.before is None:
+        raise HTTPException(status_code=400, detail="Informe 'ids' e/ou 'before'")
+    if request.ids is not None and len(request.ids) > NOTIFICATION_READ_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {NOTIFICATION_READ_MAX_IDS} ids por requisição"
+        )
     
-    if last_weight:
-        days_since_last = (datetime.utcnow() - last_weight["recorded_at"]).days
-        if days_since_last >= 7:
-            dynamic_notifications.append({
-                "id": "weight_reminder",
-                "type": "weight_update",
-                "title": "📊 Hora de atualizar seu peso!",
-                "message": f"Já se passaram {days_since_last} dias desde seu último registro. Registre seu peso para acompanhar seu progresso.",
-                "created_at": datetime.utcnow().isoformat(),
-                "read": False,
-                "action_url": "/progress",
-                "priority": "high"
-            })
-        elif days_since_last >= 5:
-            dynamic_notifications.append({
-                "id": "weight_reminder_soon",
-                "type": "weight_update",
-                "title": "⏰ Atualização de peso em breve",
-                "message": f"Em {14 - days_since_last} dia(s) você poderá registrar seu novo peso.",
-                "created_at": datetime.utcnow().isoformat(),
-                "read": False,
-                "action_url": "/progress",
-                "priority": "low"
-            })
+    user = await db.user_profiles.find_one({"_id": user_id}, {"_id": 1})
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
-    # Formata notificações do banco
-    db_notifications = []
-    for n in notifications:
-        db_notifications.append({
-            "id": n["_id"],
-            "type": n.get("type", "general"),
-            "title": n.get("title", ""),
-            "message": n.get("message", ""),
-            "created_at": n.get("created_at", datetime.utcnow()).isoformat() if isinstance(n.get("created_at"), datetime) else n.get("created_at"),
-            "read": n.get("read", False),
-            "action_url": n.get("action_url"),
-            "priority": n.get("priority", "normal")
-        })
+    query = {}
+    if request.ids is not None:
+        query["_id"] = {"$in": request.ids}
+    if request.before is not None:
+        query["created_at"] = {"$lte": request.before}
     
+    marked = await mark_read(db, user_id, query)
     return {
-        "user_id": user_id,
-        "notifications": dynamic_notifications + db_notifications,
-        "unread_count": len([n for n in dynamic_notifications + db_notifications if not n.get("read", False)])
+        "success": True,
+        "marked": marked,
+        "unread_count": await unread_count(db, user_id)
     }
 
 
-@api_router.put("/notifications/{notification_id}/read")
-async def mark_notification_read(notification_id: str):
-    """Marca uma notificação como lida"""
-    result = await db.notifications.update_one(
-        {"_id": notification_id},
-        {"$set": {"read": True, "read_at": datetime.utcnow()}}
-    )
-    
-    return {"success": result.modified_count > 0}
+@api_router.get("/notifications/{user_id}/unread-count")
+async def get_unread_notifications_count(user_id: str):
+    """Badge de não lidas: lê o contador mantido com $inc (um documento)"""
+    return {"user_id": user_id, "unread_count": await unread_count(db, user_id)}
 
 
 # ==================== PERFORMANCE CHART ENDPOINT ====================
 
+PERFORMANCE_PROJECTION = {"recorded_at": 1, "weight": 1, "questionnaire_average": 1, "questionnaire": 1}
+
 @api_router.get("/progress/performance/{user_id}")
 async def get_performance_chart_data(user_id: str, days: int = 90):
     """
@@ -3235,19 +3250,19 @@ async def get_performance_chart_data(user_id: str, days: int = 90):
     Inclui:
     - Evolução do peso ao longo do tempo
     - Linha de desempenho (média do questionário)
-    - Tendências e projeções
+    - Tendências e projeções (tracking/trends.py)
+    
+    days <= 0 usa todo o histórico; o tamanho da resposta não cresce com ele.
     """
     # Verifica se usuário existe
     user = await db.user_profiles.find_one({"_id": user_id})
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
-    # Busca registros
-    from_date = datetime.utcnow() - timedelta(days=days)
+    # Busca registros (histórico inteiro do período; days <= 0 = desde o início)
+    from_date = datetime.utcnow() - timedelta(days=days) if days > 0 else None
     
-    records = await db.weight_records.find(
-        {"user_id": user_id, "recorded_at": {"$gte": from_date}}
-    ).sort("recorded_at", 1).to_list(length=100)
+    records = await weight_store.in_range(user_id, from_date, limit=None, projection=PERFORMANCE_PROJECTION)
     
     if not records:
         return {
@@ -3256,59 +3271,33 @@ async def get_performance_chart_data(user_id: str, days: int = 90):
             "message": "Nenhum registro encontrado no período"
         }
     
-    # Formata dados para gráfico
-    weight_data = []
-    performance_data = []
-    
-    for r in records:
-        date_str = r["recorded_at"].strftime("%Y-%m-%d")
-        
-        weight_data.append({
-            "date": date_str,
-            "value": r["weight"]
-        })
-        
-        if r.get("questionnaire_average"):
-            performance_data.append({
-                "date": date_str,
-                "value": r["questionnaire_average"],
-                "breakdown": r.get("questionnaire", {})
-            })
+    # Tendência (EWMA sem outliers), ritmo semanal por mínimos quadrados e projeção - tracking/trends.py
+    trend = weight_trend(records, user.get("target_weight"))
+    weight_change = trend["weight_change"]
+    weekly_rate = trend["weekly_rate"]
     
-    # Calcula tendências
-    if len(weight_data) >= 2:
-        first_weight = weight_data[0]["value"]
-        last_weight = weight_data[-1]["value"]
-        weight_change = last_weight - first_weight
-        days_elapsed = (records[-1]["recorded_at"] - records[0]["recorded_at"]).days
-        
-        if days_elapsed > 0:
-            weekly_rate = (weight_change / days_elapsed) * 7
-        else:
-            weekly_rate = 0
-    else:
-        weight_change = 0
-        weekly_rate = 0
+    # Desempenho (média do questionário): médias sobre tudo, gráfico reduzido por LTTB
+    scored = [r for r in records if r.get("questionnaire_average")]
+    performance_data = [
+        {
+            "date": scored[i]["recorded_at"].strftime("%Y-%m-%d"),
+            "value": scored[i]["questionnaire_average"],
+            "breakdown": scored[i].get("questionnaire", {})
+        }
+        for i in downsample(scored, "questionnaire_average")
+    ]
     
-    # Calcula média de desempenho
-    if performance_data:
-        avg_performance = sum(p["value"] for p in performance_data) / len(performance_data)
+    if scored:
+        avg_performance = float(np.mean([r["questionnaire_average"] for r in scored]))
         
         # Breakdown por categoria
-        category_totals = {"diet": 0, "training": 0, "cardio": 0, "sleep": 0, "hydration": 0}
-        category_count = 0
-        
-        for p in performance_data:
-            bd = p.get("breakdown", {})
-            if bd:
-                for key in category_totals:
-                    category_totals[key] += bd.get(key, 0)
-                category_count += 1
-        
-        if category_count > 0:
-            category_averages = {k: round(v / category_count, 1) for k, v in category_totals.items()}
+        categories = ["diet", "training", "cardio", "sleep", "hydration"]
+        breakdowns = [r["questionnaire"] for r in scored if r.get("questionnaire")]
+        if breakdowns:
+            scores = np.array([[bd.get(key, 0) for key in categories] for bd in breakdowns], dtype=float)
+            category_averages = {k: round(float(v), 1) for k, v in zip(categories, scores.mean(axis=0))}
         else:
-            category_averages = category_totals
+            category_averages = {k: 0 for k in categories}
     else:
         avg_performance = 0
         category_averages = {}
@@ -3329,11 +3318,11 @@ async def get_performance_chart_data(user_id: str, days: int = 90):
         "period_days": days,
         "total_records": len(records),
         
-        # Dados para gráficos
+        # Dados para gráficos (no máximo TREND_MAX_POINTS pontos cada)
         "weight_chart": {
-            "data": weight_data,
-            "min": min(d["value"] for d in weight_data) - 1,
-            "max": max(d["value"] for d in weight_data) + 1
+            "data": trend["points"],
+            "min": trend["min"] - 1,
+            "max": trend["max"] + 1
         },
         "performance_chart": {
             "data": performance_data,
@@ -3348,7 +3337,10 @@ async def get_performance_chart_data(user_id: str, days: int = 90):
             "category_averages": category_averages,
             "weakest_category": weakest_category,
             "target_weight": user.get("target_weight"),
-            "current_weight": user.get("weight")
+            "current_weight": user.get("weight"),
+            "trend_weight": round(trend["trend_weight"], 1),
+            "projected_goal_date": trend["projected_goal_date"],
+            "outliers": trend["outliers"]
         },
         
         # Sugestões
@@ -3477,15 +3469,11 @@ async def get_water_sodium_tracker(user_id: str, date: str = None):
     else:
         target_date = datetime.utcnow()
     
-    # Início e fim do dia
+    # Início do dia
     day_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    day_end = day_start + timedelta(days=1)
     
-    # Busca entrada do dia
-    entry = await db.water_sodium_tracker.find_one({
-        "user_id": user_id,
-        "date": {"$gte": day_start, "$lt": day_end}
-    })
+    # Busca o bucket do dia (chave user_id + day)
+    entry = await find_water_day(db, user_id, target_date)
     
     # Metas padrão
     water_target = 3000  # 3L em ml
@@ -3549,91 +3537,58 @@ async def get_water_sodium_tracker(user_id: str, date: str = None):
     }
 
 
+def _water_bucket_on_insert(user_id: str, moment: datetime, notes: Optional[str] = None) -> Dict:
+    """Campos fixos de um bucket novo (os totais vêm do $inc)"""
+    bucket = WaterSodiumEntry(user_id=user_id, date=day_start_of(moment), notes=notes).dict()
+    bucket["_id"] = bucket["id"]
+    for field in ("user_id", "water_ml", "sodium_mg", "water_below_minimum", "sodium_below_minimum"):
+        bucket.pop(field)
+    return bucket
+
+
+def _water_log_entry(moment: datetime, water_ml: Optional[int], sodium_mg: Optional[int], notes: Optional[str]) -> Dict:
+    return {
+        "time": moment.isoformat(),
+        "water_ml": water_ml or 0,
+        "sodium_mg": sodium_mg or 0,
+        "notes": notes
+    }
+
+
 @api_router.post("/tracker/water-sodium/{user_id}")
 async def add_water_sodium(user_id: str, entry: WaterSodiumEntryCreate):
     """
     Adiciona entrada de água/sódio.
     
-    Soma aos valores existentes do dia.
+    Soma aos valores existentes do dia (upsert atômico: $inc nos totais,
+    $push no log), então toques simultâneos não se perdem.
     
     SEGURANÇA:
     - Emite alerta se água < 2L no final do dia
     - Emite alerta se sódio < 500mg
     """
     # Verifica se usuário existe
-    user = await db.user_profiles.find_one({"_id": user_id})
+    user = await db.user_profiles.find_one({"_id": user_id}, {"_id": 1})
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
-    # Dia atual
     now = datetime.utcnow()
-    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    day_end = day_start + timedelta(days=1)
-    
-    # Busca entrada existente do dia
-    existing = await db.water_sodium_tracker.find_one({
-        "user_id": user_id,
-        "date": {"$gte": day_start, "$lt": day_end}
-    })
-    
-    # Prepara log de entrada
-    entry_log = {
-        "time": now.isoformat(),
-        "water_ml": entry.water_ml or 0,
-        "sodium_mg": entry.sodium_mg or 0,
-        "notes": entry.notes
-    }
-    
-    if existing:
-        # Atualiza entrada existente
-        new_water = existing.get("water_ml", 0) + (entry.water_ml or 0)
-        new_sodium = existing.get("sodium_mg", 0) + (entry.sodium_mg or 0)
-        
-        # Adiciona ao log
-        entries_log = existing.get("entries_log", [])
-        entries_log.append(entry_log)
-        
-        await db.water_sodium_tracker.update_one(
-            {"_id": existing["_id"]},
-            {"$set": {
-                "water_ml": new_water,
-                "sodium_mg": new_sodium,
-                "water_below_minimum": new_water < 2000,
-                "sodium_below_minimum": new_sodium < 500,
-                "entries_log": entries_log,
-                "updated_at": now
-            }}
-        )
-        
-        result_water = new_water
-        result_sodium = new_sodium
-    else:
-        # Cria nova entrada
-        new_entry = WaterSodiumEntry(
-            user_id=user_id,
-            date=day_start,
-            water_ml=entry.water_ml or 0,
-            sodium_mg=entry.sodium_mg or 0,
-            water_below_minimum=(entry.water_ml or 0) < 2000,
-            sodium_below_minimum=(entry.sodium_mg or 0) < 500,
-            notes=entry.notes
-        )
-        
-        entry_dict = new_entry.dict()
-        entry_dict["_id"] = entry_dict["id"]
-        entry_dict["entries_log"] = [entry_log]
-        entry_dict["created_at"] = now
-        
-        await db.water_sodium_tracker.insert_one(entry_dict)
-        
-        result_water = entry.water_ml or 0
-        result_sodium = entry.sodium_mg or 0
+    bucket = await add_water_entry(
+        db,
+        user_id,
+        _water_log_entry(now, entry.water_ml, entry.sodium_mg, entry.notes),
+        on_insert=_water_bucket_on_insert(user_id, now, entry.notes),
+        now=now,
+        stamp=await sync_stamp(db, user_id),
+    )
+    result_water = bucket.get("water_ml", 0)
+    result_sodium = bucket.get("sodium_mg", 0)
     
     # Verifica warnings
     warnings = []
-    if result_water < 2000:
+    if bucket["water_below_minimum"]:
         warnings.append("⚠️ Água abaixo de 2L. Continue hidratando!")
-    if result_sodium < 500:
+    if bucket["sodium_below_minimum"]:
         warnings.append("⚠️ Sódio abaixo do mínimo seguro (500mg)")
     
     return {
@@ -3647,6 +3602,62 @@ async def add_water_sodium(user_id: str, entry: WaterSodiumEntryCreate):
     }
 
 
+@api_router.post("/tracker/water-sodium/{user_id}/batch")
+async def add_water_sodium_batch(user_id: str, request: WaterSodiumBatchRequest):
+    """
+    Aplica várias entradas de uma vez (fila offline do app).
+    
+    Cada entrada cai no dia do seu recorded_at; tudo vai num único bulk_write
+    (um upsert por dia + recálculo das flags).
+    """
+    if not request.entries:
+        raise HTTPException(status_code=400, detail="Nenhuma entrada enviada")
+    if len(request.entries) > WATER_BATCH_MAX_ENTRIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {WATER_BATCH_MAX_ENTRIES} entradas por lote"
+        )
+    
+    user = await db.user_profiles.find_one({"_id": user_id}, {"_id": 1})
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    
+    now = datetime.utcnow()
+    log_entries = []
+    for item in request.entries:
+        moment = device_moment(item.recorded_at, now)
+        log_entries.append((moment, _water_log_entry(moment, item.water_ml, item.sodium_mg, item.notes)))
+    
+    days = await add_water_entries(
+        db,
+        user_id,
+        log_entries,
+        on_insert=lambda moment: _water_bucket_on_insert(user_id, moment),
+        now=now,
+        stamp=await sync_stamp(db, user_id),
+    )
+    
+    buckets = await db.water_sodium_tracker.find(
+        {"user_id": user_id, "day": {"$in": days}}, WATER_HISTORY_PROJECTION
+    ).sort("day", 1).to_list(length=len(days))
+    
+    return {
+        "success": True,
+        "applied": len(log_entries),
+        "days": [
+            {
+                "date": b["day"],
+                "water_ml": b.get("water_ml", 0),
+                "sodium_mg": b.get("sodium_mg", 0),
+                "water_below_minimum": b.get("water_below_minimum", False),
+                "sodium_below_minimum": b.get("sodium_below_minimum", False)
+            }
+            for b in buckets
+        ],
+        "message": f"{len(log_entries)} registros aplicados"
+    }
+
+
 @api_router.get("/tracker/water-sodium/{user_id}/history")
 async def get_water_sodium_history(user_id: str, days: int = 7):
     """
@@ -3662,10 +3673,8 @@ async def get_water_sodium_history(user_id: str, days: int = 7):
     # Período
     from_date = datetime.utcnow() - timedelta(days=days)
     
-    # Busca entradas
-    entries = await db.water_sodium_tracker.find(
-        {"user_id": user_id, "date": {"$gte": from_date}}
-    ).sort("date", 1).to_list(length=days)
+    # Busca os buckets do período (sem o log de entradas)
+    entries = await water_history(db, user_id, from_date, days)
     
     # Formata resposta
     history = []
@@ -3743,7 +3752,7 @@ async def generate_workout(user_id: str, force: bool = False):
         
         logger.info(f"Workout generated for user {user_id}")
         
-        return workout_plan
+        return json_response(workout_plan)
         
     except HTTPException:
         raise
@@ -3751,10 +3760,25 @@ async def generate_workout(user_id: str, force: bool = False):
         logger.error(f"Erro ao gerar treino: {e}")
         raise HTTPException(status_code=500, detail=f"Erro ao gerar treino: {str(e)}")
 
+def _workout_lang_code(user_profile: Optional[Dict]) -> str:
+    user_language = (user_profile.get('language', 'pt-BR') if user_profile else None) or 'pt-BR'
+    return user_language.split('-')[0]
+
+
+def _present_workout(workout_plan: Dict, lang_code: str) -> Dict:
+    """Treino como o app mostra (traduzido para en/es)"""
+    if lang_code in ['en', 'es']:
+        from workout.translations import translate_workout_plan
+        return translate_workout_plan(workout_plan, lang_code)
+    return workout_plan
+
+
 @api_router.get("/workout/{user_id}")
-async def get_user_workout(user_id: str):
+async def get_user_workout(user_id: str, request: Request, response: Response):
     """
     Busca as sugestões de exercícios mais recente do usuário
+    
+    📦 ETag (plano + revisão + idioma): If-None-Match → 304
     """
     workout_plan = await db.workout_plans.find_one(
         {"user_id": user_id},
@@ -3767,16 +3791,16 @@ async def get_user_workout(user_id: str):
     workout_plan["id"] = workout_plan["_id"]
     
     # Traduz baseado no idioma do perfil do usuário
-    user_profile = await db.user_profiles.find_one({"_id": user_id})
-    if user_profile:
-        user_language = user_profile.get('language', 'pt-BR')
-        lang_code = user_language.split('-')[0] if user_language else 'pt'
-        
-        if lang_code in ['en', 'es']:
-            from workout.translations import translate_workout_plan
-            return translate_workout_plan(workout_plan, lang_code)
+    user_profile = await db.user_profiles.find_one({"_id": user_id}, {"language": 1})
+    lang_code = _workout_lang_code(user_profile)
     
-    return workout_plan
+    etag = plan_etag(workout_plan, lang_code)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    
+    return json_response(_present_workout(workout_plan, lang_code), response)
 
 
 class ExerciseCompletionRequest(BaseModel):
@@ -3786,13 +3810,15 @@ class ExerciseCompletionRequest(BaseModel):
     completed: bool
 
 
-@api_router.put("/workout/{workout_id}/exercise/complete")
-async def toggle_exercise_completion(workout_id: str, request: ExerciseCompletionRequest):
-    """
-    Marca/desmarca um exercício como concluído.
-    """
+async def _set_exercise_completion(
+    workout_id: str, request: ExerciseCompletionRequest, user_id: Optional[str] = None
+) -> Dict:
+    """Marca/desmarca o exercício e devolve o treino atualizado (user_id: exige que o treino seja dele)"""
     # Busca treino
-    workout = await db.workout_plans.find_one({"_id": workout_id})
+    query = {"_id": workout_id}
+    if user_id is not None:
+        query["user_id"] = user_id
+    workout = await db.workout_plans.find_one(query)
     if not workout:
         raise HTTPException(status_code=404, detail="Treino não encontrado")
     
@@ -3821,7 +3847,7 @@ async def toggle_exercise_completion(workout_id: str, request: ExerciseCompletio
         {"$set": {
             "workout_days": workout_days,
             "updated_at": datetime.utcnow()
-        }}
+        }, "$inc": {"revision": 1}}
     )
     
     # Retorna treino atualizado
@@ -3831,6 +3857,14 @@ async def toggle_exercise_completion(workout_id: str, request: ExerciseCompletio
     return updated_workout
 
 
+@api_router.put("/workout/{workout_id}/exercise/complete")
+async def toggle_exercise_completion(workout_id: str, request: ExerciseCompletionRequest):
+    """
+    Marca/desmarca um exercício como concluído.
+    """
+    return await _set_exercise_completion(workout_id, request)
+
+
 @api_router.put("/workout/{workout_id}/reset")
 async def reset_workout_progress(workout_id: str):
     """
@@ -3855,7 +3889,7 @@ async def reset_workout_progress(workout_id: str):
         {"$set": {
             "workout_days": workout_days,
             "updated_at": datetime.utcnow()
-        }}
+        }, "$inc": {"revision": 1}}
     )
     
     # Retorna treino atualizado
@@ -4330,19 +4364,12 @@ async def get_cardio_history(user_id: str):
     }
 
 
-@api_router.post("/cardio/history/{user_id}")
-async def log_cardio_session(user_id: str, session: dict):
-    """
-    Registra uma sessão de cardio completada.
-    """
-    # Verifica se usuário existe
-    user = await db.user_profiles.find_one({"_id": user_id})
-    if not user:
-        raise HTTPException(status_code=404, detail="Usuário não encontrado")
-    
-    # Cria registro da sessão
+async def _insert_cardio_session(
+    user_id: str, session: dict, session_id: Optional[str] = None, completed_at: Optional[datetime] = None
+) -> Dict:
+    """Grava a sessão de cardio (session_id fixo torna o insert idempotente)"""
     session_record = {
-        "_id": str(uuid.uuid4()),
+        "_id": session_id or str(uuid.uuid4()),
         "user_id": user_id,
         "exercise_id": session.get("exercise_id"),
         "exercise_name": session.get("exercise_name"),
@@ -4350,10 +4377,28 @@ async def log_cardio_session(user_id: str, session: dict):
         "calories_burned": session.get("calories_burned", 0),
         "intensity": session.get("intensity", "moderate"),
         "notes": session.get("notes", ""),
-        "completed_at": datetime.utcnow()
+        "completed_at": completed_at or datetime.utcnow()
     }
+    session_record.update(await sync_stamp(db, user_id))
+    
+    try:
+        await db.cardio_sessions.insert_one(session_record)
+    except DuplicateKeyError:
+        return await db.cardio_sessions.find_one({"_id": session_record["_id"]})
+    return session_record
+
+
+@api_router.post("/cardio/history/{user_id}")
+async def log_cardio_session(user_id: str, session: dict):
+    """
+    Registra uma sessão de cardio completada.
+    """
+    # Verifica se usuário existe
+    user = await db.user_profiles.find_one({"_id": user_id}, {"_id": 1})
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
-    await db.cardio_sessions.insert_one(session_record)
+    session_record = await _insert_cardio_session(user_id, session)
     
     return {
         "success": True,
@@ -4361,6 +4406,195 @@ async def log_cardio_session(user_id: str, session: dict):
     }
 
 
+# ==================== SYNC (OFFLINE-FIRST) ====================
+
+class SyncMutation(BaseModel):
+    """Mutação enfileirada no app (id gerado no aparelho = chave de idempotência)"""
+    id: str
+    type: str  # "water" | "exercise_toggle" | "cardio_log" | "workout_finish"
+    recorded_at: Optional[datetime] = None
+    payload: Dict = Field(default_factory=dict)
+
+
+class SyncRequest(BaseModel):
+    """Lote de mutações offline"""
+    mutations: List[SyncMutation] = []
+
+
+SYNC_MAX_MUTATIONS = 200
+
+
+def _sync_payload(model, payload: Dict):
+    try:
+        return model(**payload)
+    except Exception:
+        raise HTTPException(status_code=422, detail="Dados da mutação inválidos")
+
+
+def _sync_moment(mutation: Dict) -> datetime:
+    return device_moment(mutation.get("recorded_at"), datetime.utcnow())
+
+
+async def _sync_water(user_id: str, mutation: Dict) -> Dict:
+    entry = _sync_payload(WaterSodiumEntryCreate, mutation["payload"])
+    moment = _sync_moment(mutation)
+    days = await add_water_entries(
+        db,
+        user_id,
+        [(moment, _water_log_entry(moment, entry.water_ml, entry.sodium_mg, entry.notes))],
+        on_insert=lambda day: _water_bucket_on_insert(user_id, day),
+        now=datetime.utcnow(),
+        stamp=await sync_stamp(db, user_id),
+    )
+    return {"date": days[0]}
+
+
+async def _sync_exercise_toggle(user_id: str, mutation: Dict) -> Dict:
+    workout_id = mutation["payload"].get("workout_id")
+    request = _sync_payload(ExerciseCompletionRequest, mutation["payload"])
+    workout = await _set_exercise_completion(workout_id, request, user_id=user_id)
+    return {"workout_id": workout_id, "revision": workout.get("revision")}
+
+
+async def _sync_cardio_log(user_id: str, mutation: Dict) -> Dict:
+    # O id da mutação vira o _id da sessão: reenvio não duplica
+    session = await _insert_cardio_session(
+        user_id, mutation["payload"], session_id=mutation["id"], completed_at=_sync_moment(mutation)
+    )
+    return {"session_id": session["_id"]}
+
+
+async def _sync_workout_finish(user_id: str, mutation: Dict) -> Dict:
+    date = mutation["payload"].get("date") or _sync_moment(mutation).strftime("%Y-%m-%d")
+    completed_at = await _mark_workout_finished(user_id, date)
+    return {"date": date, "already_finished": completed_at is None}
+
+
+SYNC_MUTATION_HANDLERS = {
+    "water": _sync_water,
+    "exercise_toggle": _sync_exercise_toggle,
+    "cardio_log": _sync_cardio_log,
+    "workout_finish": _sync_workout_finish,
+}
+
+
+def _sync_doc(doc: Dict) -> Dict:
+    """Documento para o app: _id → id, sem campos internos do sync"""
+    formatted = {k: v for k, v in doc.items() if k not in ("_id", "sync_seq")}
+    formatted["id"] = doc["_id"]
+    return formatted
+
+
+async def _sync(
+    user_id: str,
+    since: Optional[int],
+    diet_etag: Optional[str],
+    workout_etag: Optional[str],
+    mutations: List[SyncMutation],
+) -> Dict:
+    profile = await db.user_profiles.find_one({"_id": user_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    
+    # 1. Mutações offline primeiro: o delta já sai com o efeito delas
+    outcomes = []
+    if mutations:
+        outcomes = await apply_mutations(
+            db, user_id, [m.model_dump() for m in mutations], SYNC_MUTATION_HANDLERS
+        )
+    
+    # 2. Deltas (sync_seq > since) + planos mais recentes, em paralelo
+    (watermark, changes), diet_plan, workout_plan = await asyncio.gather(
+        collect_changes(db, user_id, since),
+        db.diet_plans.find_one({"user_id": user_id}, sort=[("created_at", -1)]),
+        db.workout_plans.find_one({"user_id": user_id}, sort=[("created_at", -1)]),
+    )
+    
+    result = {}
+    if "profile" in changes:
+        updated_profile = changes["profile"][0]
+        updated_profile["id"] = updated_profile["_id"]
+        result["profile"] = UserProfile(**updated_profile)
+    if "settings" in changes:
+        result["settings"] = UserSettings(**changes["settings"][0])
+    if "tracker" in changes:
+        result["tracker"] = [
+            {**_sync_doc(bucket), "date": bucket.get("day") or bucket["date"].strftime("%Y-%m-%d")}
+            for bucket in changes["tracker"]
+        ]
+    if "notifications" in changes:
+        result["notifications"] = [_format_notification(n) for n in changes["notifications"]]
+    if "workout_days" in changes:
+        result["workout_days"] = [_sync_doc(day) for day in changes["workout_days"]]
+    if "cardio" in changes:
+        result["cardio"] = [_sync_doc(session) for session in changes["cardio"]]
+    
+    # 3. Planos: vão só quando o ETag do app (o mesmo do GET) não bate mais
+    etags = {}
+    if diet_plan:
+        diet_plan = hydrate_diet(diet_plan)
+        diet_plan["id"] = diet_plan["_id"]
+        day = _diet_day_context(profile)
+        etags["diet"] = plan_etag(diet_plan, day["diet_type"], day["lang_code"])
+        if not etag_matches(diet_etag, etags["diet"]):
+            result["diet"] = _present_diet(diet_plan, day)
+    if workout_plan:
+        workout_plan["id"] = workout_plan["_id"]
+        lang_code = _workout_lang_code(profile)
+        etags["workout"] = plan_etag(workout_plan, lang_code)
+        if not etag_matches(workout_etag, etags["workout"]):
+            result["workout"] = _present_workout(workout_plan, lang_code)
+    
+    return {
+        "user_id": user_id,
+        "watermark": watermark,
+        "full": since is None,
+        "changes": result,
+        "etags": etags,
+        "mutations": outcomes,
+    }
+
+
+@api_router.get("/sync/{user_id}")
+async def sync_changes(
+    user_id: str,
+    since: Optional[int] = None,
+    diet_etag: Optional[str] = None,
+    workout_etag: Optional[str] = None,
+):
+    """
+    🔄 Sincronização de abertura do app em UMA requisição.
+    
+    - since: watermark do último sync (sem ele: snapshot completo)
+    - diet_etag / workout_etag: ETags que o app já tem dos planos
+    
+    Volta só o que mudou (perfil, settings, água, notificações, dias
+    treinados, cardio, dieta, treino) + o novo watermark.
+    """
+    return json_response(await _sync(user_id, since, diet_etag, workout_etag, []))
+
+
+@api_router.post("/sync/{user_id}")
+async def sync_with_mutations(
+    user_id: str,
+    request: SyncRequest,
+    since: Optional[int] = None,
+    diet_etag: Optional[str] = None,
+    workout_etag: Optional[str] = None,
+):
+    """
+    🔄 Igual ao GET, aplicando antes a fila offline do app (água, exercícios,
+    cardio, treino concluído). Cada mutação tem um id: reenviar o mesmo lote
+    não aplica nada duas vezes.
+    """
+    if len(request.mutations) > SYNC_MAX_MUTATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {SYNC_MAX_MUTATIONS} mutações por sync"
+        )
+    return json_response(await _sync(user_id, since, diet_etag, workout_etag, request.mutations))
+
+
 # ==================== SETTINGS ENDPOINTS ====================
 
 @api_router.get("/user/settings/{user_id}", response_model=UserSettings)
@@ -4380,6 +4614,7 @@ async def get_user_settings(user_id: str):
         # Cria settings padrão
         default_settings = UserSettings(user_id=user_id)
         settings_dict = default_settings.dict()
+        settings_dict.update(await sync_stamp(db, user_id))
         await db.user_settings.insert_one(settings_dict)
         return default_settings
     
@@ -4421,7 +4656,8 @@ async def update_user_settings(user_id: str, update_data: UserSettingsUpdate):
             else:
                 update_dict[k] = v
     
-    update_dict["updated_at"] = datetime.utcnow()
+    stamp = await sync_stamp(db, user_id)
+    update_dict.update(stamp)
     
     if settings:
         await db.user_settings.update_one(
@@ -4431,7 +4667,7 @@ async def update_user_settings(user_id: str, update_data: UserSettingsUpdate):
     else:
         # Cria novo settings com updates
         new_settings = UserSettings(user_id=user_id, **update_dict)
-        await db.user_settings.insert_one(new_settings.dict())
+        await db.user_settings.insert_one({**new_settings.dict(), **stamp})
     
     # Retorna settings atualizado
     updated = await db.user_settings.find_one({"user_id": user_id})
@@ -4496,7 +4732,10 @@ async def update_user_premium(request: IAPPurchaseRequest):
         if user_auth:
             await db.users_auth.update_one({"id": user_id}, {"$set": update_data})
         if user_profile:
-            await db.user_profiles.update_one({"id": user_id}, {"$set": update_data})
+            await db.user_profiles.update_one(
+                {"id": user_id},
+                {"$set": {**update_data, **await sync_stamp(db, user_id)}}
+            )
         
         logger.info(f"User {user_id} premium activated via IAP: {request.product_id} on {request.platform}")
         
@@ -4779,6 +5018,193 @@ async def create_premium_test_account(request: TestAccountRequest):
     }
 
 
+# ==================== RECÁLCULO EM MASSA DE METAS ====================
+
+ADMIN_API_TOKEN = os.environ.get('ADMIN_API_TOKEN')
+
+# Campos necessários para recalcular (e comparar) as metas de um perfil
+RECALC_PROFILE_FIELDS = {
+    "weight": 1, "height": 1, "age": 1, "sex": 1,
+    "weekly_training_frequency": 1, "training_level": 1, "goal": 1,
+    "cardio_minutos_semana": 1, "intensidade_cardio": 1,
+    "tdee": 1, "target_calories": 1, "macros": 1,
+}
+RECALC_REQUIRED_FIELDS = ("weight", "height", "age", "sex", "weekly_training_frequency")
+
+
+async def verify_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """
+    Protege endpoints administrativos destrutivos/caros com o header
+    X-Admin-Token. Falha fechado: sem ADMIN_API_TOKEN configurado eles ficam
+    desligados (503), nunca abertos.
+    """
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=503, detail="Endpoint administrativo desabilitado (ADMIN_API_TOKEN não configurado)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_API_TOKEN):
+        raise HTTPException(status_code=403, detail="Acesso administrativo negado")
+
+
+async def _recalculate_targets_chunk(profiles: List[Dict], dry_run: bool) -> Tuple[int, int]:
+    """
+    Recalcula um bloco de perfis de forma vetorizada e grava só o que mudou.
+    Retorna (alterados, gravados).
+    """
+    from diet.batch import calculate_targets_batch, profile_targets_from_batch
+    
+    result = calculate_targets_batch(
+        weight=[p["weight"] for p in profiles],
+        height=[p["height"] for p in profiles],
+        age=[p["age"] for p in profiles],
+        sex=[p["sex"] for p in profiles],
+        training_frequency=[p["weekly_training_frequency"] for p in profiles],
+        training_level=[p.get("training_level") for p in profiles],
+        goal=[p.get("goal") for p in profiles],
+        cardio_minutos_semana=[p.get("cardio_minutos_semana") or 0 for p in profiles],
+        intensidade_cardio=[p.get("intensidade_cardio") for p in profiles],
+    )
+    
+    now = datetime.utcnow()
+    changed = []
+    for i, profile in enumerate(profiles):
+        targets = profile_targets_from_batch(result, i)
+        unchanged = (
+            profile.get("tdee") == targets["tdee"]
+            and profile.get("target_calories") == targets["target_calories"]
+            and profile.get("macros") == targets["macros"]
+        )
+        if not unchanged:
+            changed.append((profile["_id"], targets))
+    
+    # 🔄 Carimbo do /sync: um $inc em lote nos contadores do chunk
+    seqs = await next_sync_seqs(db, [user_id for user_id, _ in changed]) if changed and not dry_run else {}
+    operations = [
+        UpdateOne(
+            {"_id": user_id},
+            {"$set": {**targets, "updated_at": now, "sync_seq": seqs.get(user_id)}}
+        )
+        for user_id, targets in changed
+    ]
+    
+    if operations and not dry_run:
+        write_result = await db.user_profiles.bulk_write(operations, ordered=False)
+        return len(operations), write_result.modified_count
+    return len(operations), 0
+
+
+@api_router.post("/admin/recalculate-targets")
+async def recalculate_all_targets(
+    chunk_size: int = 1000,
+    dry_run: bool = False,
+    _: None = Depends(verify_admin_token)
+):
+    """
+    🔁 Recalcula TDEE, calorias meta e macros de TODOS os perfis.
+    
+    Usado quando fatores ou regras de cálculo mudam. Os perfis são lidos em
+    streaming (apenas os campos necessários), recalculados em blocos com
+    NumPy e somente as metas alteradas são gravadas via bulk_write.
+    
+    - dry_run=true: apenas conta quantos perfis mudariam
+    """
+    chunk_size = max(100, min(chunk_size, 10000))
+    started = datetime.utcnow()
+    
+    scanned = skipped = changed = written = chunks = 0
+    chunk: List[Dict] = []
+    
+    cursor = db.user_profiles.find({}, RECALC_PROFILE_FIELDS, batch_size=chunk_size)
+    async for profile in cursor:
+        scanned += 1
+        if any(profile.get(field) is None for field in RECALC_REQUIRED_FIELDS):
+            skipped += 1
+            continue
+        chunk.append(profile)
+        if len(chunk) >= chunk_size:
+            chunk_changed, chunk_written = await _recalculate_targets_chunk(chunk, dry_run)
+            changed += chunk_changed
+            written += chunk_written
+            chunks += 1
+            chunk = []
+    
+    if chunk:
+        chunk_changed, chunk_written = await _recalculate_targets_chunk(chunk, dry_run)
+        changed += chunk_changed
+        written += chunk_written
+        chunks += 1
+    
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    logger.info(
+        f"[RECALC] scanned={scanned} skipped={skipped} changed={changed} "
+        f"written={written} chunks={chunks} dry_run={dry_run} em {elapsed:.2f}s"
+    )
+    
+    return {
+        "success": True,
+        "dry_run": dry_run,
+        "scanned": scanned,
+        "skipped": skipped,
+        "changed": changed,
+        "written": written,
+        "chunks": chunks,
+        "elapsed_seconds": round(elapsed, 2)
+    }
+
+
+# ==================== SAMPLING PROFILER (ADMIN) ====================
+
+@api_router.post("/admin/profiler/start")
+async def start_sampling_profiler(
+    seconds: float = 30,
+    interval_ms: float = 10,
+    _: None = Depends(verify_admin_token)
+):
+    """
+    🔬 Liga o profiler por amostragem NESTE worker por `seconds` segundos.
+    
+    As amostras são marcadas com a thread e, na geração de dieta, com a rota
+    e a classe do perfil (restrições, nº de refeições). Resultado em
+    GET /api/admin/profiler/result.
+    
+    interval_ms abaixo de 5 ms e seconds acima de 120 são limitados; a
+    resposta traz os valores efetivos.
+    """
+    session = start_sampling(seconds, interval_ms / 1000)
+    if session is None:
+        raise HTTPException(status_code=409, detail="Profiler já está em execução neste worker")
+    return {
+        "success": True,
+        "pid": os.getpid(),
+        "seconds": session.seconds,
+        "interval_ms": round(session.interval * 1000, 3),
+    }
+
+
+@api_router.post("/admin/profiler/stop")
+async def stop_sampling_profiler(_: None = Depends(verify_admin_token)):
+    """Encerra antes do prazo a sessão em andamento"""
+    stop_sampling()
+    return {"success": True, "pid": os.getpid()}
+
+
+@api_router.get("/admin/profiler/result")
+async def sampling_profiler_result(
+    format: str = "summary",
+    _: None = Depends(verify_admin_token)
+):
+    """
+    📊 Resultado da última sessão deste worker.
+    
+    - format=summary: funções mais quentes e amostras por tag
+    - format=collapsed: collapsed stacks (flamegraph.pl / speedscope)
+    """
+    session = current_sampling()
+    if session is None:
+        raise HTTPException(status_code=404, detail="Nenhuma sessão de profiler neste worker")
+    if format == "collapsed":
+        return Response(content=session.collapsed(), media_type="text/plain")
+    return session.summary()
+
+
 # Include router
 app.include_router(api_router)
 
@@ -4789,6 +5215,74 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def prewarm_workout_cache():
+    """Pré-gera os templates de treino quando WORKOUT_TEMPLATE_PREWARM=1"""
+    if os.environ.get('WORKOUT_TEMPLATE_PREWARM', '').lower() in ('1', 'true', 'yes'):
+        from workout_service import prewarm_workout_templates
+        cached = prewarm_workout_templates()
+        logger.info(f"Workout template cache prewarmed: {cached} templates")
+
+@app.on_event("startup")
+async def setup_tracking_collections():
+    """weight_series (time-series) e índice de dia do tracker de água"""
+    try:
+        await ensure_tracking_collections(db)
+    except Exception as e:
+        logger.warning(f"Não foi possível preparar as coleções de tracking: {e}")
+
+@app.on_event("startup")
+async def setup_sync_indexes():
+    """Índices (usuário, sync_seq) e TTL das mutações do /sync"""
+    try:
+        await ensure_sync_indexes(db)
+        await ensure_mutation_indexes(db)
+    except Exception as e:
+        logger.warning(f"Não foi possível criar os índices do sync: {e}")
+
+@app.on_event("startup")
+async def setup_diet_trace_indexes():
+    """Índice por usuário e TTL dos traces de geração de dieta"""
+    try:
+        await ensure_trace_indexes(db)
+    except Exception as e:
+        logger.warning(f"Não foi possível criar os índices dos traces de dieta: {e}")
+
+@app.on_event("startup")
+async def setup_deletion_indexes():
+    """TTL dos jobs de exclusão de conta"""
+    try:
+        await ensure_deletion_indexes(db)
+    except Exception as e:
+        logger.warning(f"Não foi possível criar os índices de exclusão de conta: {e}")
+
+@app.on_event("startup")
+async def start_notification_scheduler():
+    """Índices de notificações + agendador de lembretes"""
+    try:
+        await ensure_notification_indexes(db)
+    except Exception as e:
+        logger.warning(f"Não foi possível criar os índices de notificações: {e}")
+    notification_scheduler.start()
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Índices da fila de jobs + workers de regeneração de dieta"""
+    try:
+        await ensure_job_indexes(db)
+    except Exception as e:
+        logger.warning(f"Não foi possível criar os índices da fila de jobs: {e}")
+    job_workers.start()
+
+@app.on_event("startup")
+async def start_observability():
+    """Amostragem do lag do event loop para /metrics"""
+    start_event_loop_lag_monitor()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await notification_scheduler.stop()
+    await job_workers.stop()
+    await stop_event_loop_lag_monitor()
+    shutdown_diet_executor()
     client.close()
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Sync Module - Sincronização offline-first do app
+================================================
+- changes.py: contador de mudanças por usuário (sync_seq) e coleta de deltas
+- mutations.py: mutações enfileiradas no app aplicadas de forma idempotente
+"""
+
+from .changes import (
+    SYNC_COUNTERS,
+    SYNC_REPLAY_WINDOW,
+    SYNC_SOURCES,
+    SyncSource,
+    collect_changes,
+    current_sync_seq,
+    ensure_sync_indexes,
+    next_sync_seq,
+    next_sync_seqs,
+    sync_stamp,
+)
+
+from .mutations import SYNC_CLAIM_TIMEOUT_SECONDS, SYNC_MUTATIONS, apply_mutations, ensure_mutation_indexes
+
+__all__ = [
+    # Deltas
+    'SYNC_COUNTERS',
+    'SYNC_REPLAY_WINDOW',
+    'SYNC_SOURCES',
+    'SyncSource',
+    'collect_changes',
+    'current_sync_seq',
+    'ensure_sync_indexes',
+    'next_sync_seq',
+    'next_sync_seqs',
+    'sync_stamp',
+
+    # Mutações
+    'SYNC_CLAIM_TIMEOUT_SECONDS',
+    'SYNC_MUTATIONS',
+    'apply_mutations',
+    'ensure_mutation_indexes',
+]
@@ -0,0 +1,122 @@
+"""
+Contador de mudanças por usuário e coleta de deltas
+===================================================
+Cada escrita em dados sincronizados carimba o documento com `sync_seq` (um
+contador monotônico por usuário em `sync_counters`) e `updated_at`:
+
+    stamp = await sync_stamp(db, user_id)
+    await db.user_settings.update_one(..., {"$set": {..., **stamp}})
+
+O app guarda o `watermark` devolvido pelo /sync e manda de volta no próximo
+`since`: só os documentos com sync_seq maior voltam.
+
+Janela de replay: o seq é obtido antes da escrita chegar ao banco, então uma
+escrita lenta pode aparecer depois de um sync que já devolveu um seq maior.
+Por isso a busca reenvia as últimas SYNC_REPLAY_WINDOW mudanças; os
+documentos são completos e identificados por id, então reenviar é inofensivo.
+
+Planos (dieta/treino) não entram aqui: a representação deles muda com o dia
+e o idioma, então o /sync compara o ETag do GET condicional.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ReturnDocument, UpdateOne
+
+SYNC_COUNTERS = "sync_counters"
+
+SYNC_REPLAY_WINDOW = 8
+
+
+@dataclass(frozen=True)
+class SyncSource:
+    """Coleção sincronizada: campo do usuário, ordem e tamanho do snapshot"""
+    name: str
+    collection: str
+    user_field: str = "user_id"
+    sort: Optional[Tuple[str, int]] = None
+    snapshot_limit: int = 1
+
+
+SYNC_SOURCES = (
+    SyncSource("profile", "user_profiles", user_field="_id"),
+    SyncSource("settings", "user_settings"),
+    SyncSource("tracker", "water_sodium_tracker", sort=("date", -1), snapshot_limit=7),
+    SyncSource("notifications", "notifications", sort=("created_at", -1), snapshot_limit=50),
+    SyncSource("workout_days", "workout_tracking", sort=("date", -1), snapshot_limit=31),
+    SyncSource("cardio", "cardio_sessions", sort=("completed_at", -1), snapshot_limit=30),
+)
+
+
+# ==================== CONTADOR ====================
+
+async def next_sync_seq(db, user_id: str) -> int:
+    counter = await db[SYNC_COUNTERS].find_one_and_update(
+        {"_id": user_id},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter["seq"]
+
+
+async def next_sync_seqs(db, user_ids: List[str]) -> Dict[str, int]:
+    """next_sync_seq em lote (um bulk_write + uma leitura para N usuários)"""
+    await db[SYNC_COUNTERS].bulk_write(
+        [UpdateOne({"_id": user_id}, {"$inc": {"seq": 1}}, upsert=True) for user_id in user_ids],
+        ordered=False,
+    )
+    counters = db[SYNC_COUNTERS].find({"_id": {"$in": list(user_ids)}})
+    return {counter["_id"]: counter["seq"] async for counter in counters}
+
+
+async def current_sync_seq(db, user_id: str) -> int:
+    counter = await db[SYNC_COUNTERS].find_one({"_id": user_id})
+    return counter["seq"] if counter else 0
+
+
+async def sync_stamp(db, user_id: str) -> Dict:
+    """Campos para o $set de uma escrita sincronizada"""
+    return {"sync_seq": await next_sync_seq(db, user_id), "updated_at": datetime.utcnow()}
+
+
+# ==================== DELTAS ====================
+
+async def _source_changes(db, source: SyncSource, user_id: str, since: Optional[int]) -> List[Dict]:
+    query = {source.user_field: user_id}
+    if since is None:
+        # Snapshot completo (primeiro sync): os N mais recentes
+        limit = source.snapshot_limit
+    else:
+        query["sync_seq"] = {"$gt": since - SYNC_REPLAY_WINDOW}
+        limit = None
+
+    cursor = db[source.collection].find(query)
+    if source.sort:
+        cursor = cursor.sort(*source.sort)
+    return await cursor.to_list(length=limit)
+
+
+async def collect_changes(db, user_id: str, since: Optional[int]) -> Tuple[int, Dict[str, List[Dict]]]:
+    """
+    (watermark, {fonte: documentos}) desde `since` (None = snapshot).
+    O watermark é lido ANTES das buscas: o que mudar durante a coleta volta
+    no próximo sync.
+    """
+    watermark = await current_sync_seq(db, user_id)
+    results = await asyncio.gather(*[
+        _source_changes(db, source, user_id, since) for source in SYNC_SOURCES
+    ])
+    changes = {source.name: docs for source, docs in zip(SYNC_SOURCES, results) if docs}
+    return watermark, changes
+
+
+async def ensure_sync_indexes(db):
+    """Índices (usuário, sync_seq) das coleções sincronizadas"""
+    for source in SYNC_SOURCES:
+        # O perfil é buscado pelo _id (já indexado)
+        if source.user_field != "_id":
+            await db[source.collection].create_index([(source.user_field, 1), ("sync_seq", 1)])
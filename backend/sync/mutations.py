@@ -0,0 +1,121 @@
+"""
+Mutações enfileiradas no app (offline) aplicadas de forma idempotente
+=====================================================================
+Cada mutação traz um id gerado no aparelho. Antes de aplicar, o servidor
+"reserva" o id em `sync_mutations` (_id = "<user_id>:<id>"); um reenvio do
+mesmo lote encontra a reserva e devolve o resultado guardado em vez de
+aplicar de novo.
+
+Status devolvidos:
+- applied: aplicada agora
+- duplicate: já tinha sido aplicada (resultado original em `result`)
+- in_progress: outra requisição ainda está aplicando; o app deve reenviar
+- rejected: inválida (HTTPException 4xx); não adianta reenviar
+- failed: erro transitório; a reserva é liberada e o app pode reenviar
+
+Uma reserva "applying" mais velha que SYNC_CLAIM_TIMEOUT_SECONDS (processo
+morreu no meio) é assumida pelo próximo reenvio, que aplica de novo.
+As reservas expiram em SYNC_MUTATION_TTL_DAYS (índice TTL).
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+SYNC_MUTATIONS = "sync_mutations"
+SYNC_MUTATION_TTL_DAYS = 30
+SYNC_CLAIM_TIMEOUT_SECONDS = 120
+
+MutationHandler = Callable[[str, Dict], Awaitable[Dict]]
+
+
+def _claim_id(user_id: str, mutation_id: str) -> str:
+    return f"{user_id}:{mutation_id}"
+
+
+async def _take_over_stale_claim(registry, claim_id: str, now: datetime) -> bool:
+    """Assume uma reserva "applying" abandonada (sem claimed_at = anterior ao timeout)"""
+    cutoff = now - timedelta(seconds=SYNC_CLAIM_TIMEOUT_SECONDS)
+    taken = await registry.find_one_and_update(
+        {
+            "_id": claim_id,
+            "status": "applying",
+            "$or": [{"claimed_at": {"$lt": cutoff}}, {"claimed_at": {"$exists": False}}],
+        },
+        {"$set": {"claimed_at": now}},
+    )
+    return taken is not None
+
+
+async def apply_mutations(db, user_id: str, mutations: List[Dict], handlers: Dict[str, MutationHandler]) -> List[Dict]:
+    """
+    Aplica as mutações em ordem. `mutations`: dicts com id, type e o resto
+    repassado ao handler do tipo: handler(user_id, mutation) -> resultado.
+    """
+    registry = db[SYNC_MUTATIONS]
+    outcomes = []
+
+    for mutation in mutations:
+        claim_id = _claim_id(user_id, mutation["id"])
+        outcome = {"id": mutation["id"], "type": mutation["type"]}
+
+        handler = handlers.get(mutation["type"])
+        if handler is None:
+            outcomes.append({**outcome, "status": "rejected", "detail": "Tipo de mutação desconhecido"})
+            continue
+
+        now = datetime.utcnow()
+        try:
+            await registry.insert_one({
+                "_id": claim_id,
+                "user_id": user_id,
+                "type": mutation["type"],
+                "status": "applying",
+                "created_at": now,
+                "claimed_at": now,
+            })
+        except DuplicateKeyError:
+            previous = await registry.find_one({"_id": claim_id})
+            status = previous.get("status") if previous else None
+            if status == "rejected":
+                outcomes.append({**outcome, "status": "rejected", "detail": previous.get("detail")})
+                continue
+            if status == "applied":
+                outcomes.append({**outcome, "status": "duplicate", "result": previous.get("result")})
+                continue
+            # Ainda aplicando (ou a reserva acabou de ser liberada): reenviar depois
+            if not await _take_over_stale_claim(registry, claim_id, now):
+                outcomes.append({**outcome, "status": "in_progress"})
+                continue
+
+        try:
+            result = await handler(user_id, mutation)
+        except HTTPException as e:
+            if e.status_code >= 500:
+                await registry.delete_one({"_id": claim_id})
+                outcomes.append({**outcome, "status": "failed", "detail": e.detail})
+                continue
+            await registry.update_one({"_id": claim_id}, {"$set": {"status": "rejected", "detail": e.detail}})
+            outcomes.append({**outcome, "status": "rejected", "detail": e.detail})
+            continue
+        except Exception as e:
+            logger.error(f"Sync mutation {claim_id} failed: {e}")
+            await registry.delete_one({"_id": claim_id})
+            outcomes.append({**outcome, "status": "failed", "detail": "Erro ao aplicar mutação"})
+            continue
+
+        await registry.update_one({"_id": claim_id}, {"$set": {"status": "applied", "result": result}})
+        outcomes.append({**outcome, "status": "applied", "result": result})
+
+    return outcomes
+
+
+async def ensure_mutation_indexes(db):
+    await db[SYNC_MUTATIONS].create_index(
+        "created_at", expireAfterSeconds=SYNC_MUTATION_TTL_DAYS * 24 * 3600
+    )
@@ -0,0 +1,60 @@
+"""
+Tracking Module - Séries de peso e hidratação
+=============================================
+- weight.py: registros de peso em coleção time-series (leitura dupla com weight_records)
+- water.py: buckets diários de água/sódio com chave de dia
+- trends.py: tendência/projeção de peso vetorizada (NumPy) + downsampling LTTB
+- collections.py: criação de coleções e índices no startup
+"""
+
+from .collections import ensure_tracking_collections
+
+from .water import (
+    ENTRIES_LOG_LIMIT,
+    SODIUM_MIN_MG,
+    WATER_COLLECTION,
+    WATER_HISTORY_PROJECTION,
+    WATER_MIN_ML,
+    add_water_entries,
+    add_water_entry,
+    day_key,
+    day_start,
+    device_moment,
+    find_water_day,
+    water_history,
+)
+
+from .trends import TREND_MAX_POINTS, downsample, lttb, weight_trend
+
+from .weight import WEIGHT_LEGACY, WEIGHT_SERIES, WeightDeleteUnsupported, WeightStore
+
+__all__ = [
+    # Coleções
+    'ensure_tracking_collections',
+    
+    # Água/sódio
+    'ENTRIES_LOG_LIMIT',
+    'SODIUM_MIN_MG',
+    'WATER_COLLECTION',
+    'WATER_HISTORY_PROJECTION',
+    'WATER_MIN_ML',
+    'add_water_entries',
+    'add_water_entry',
+    'day_key',
+    'day_start',
+    'device_moment',
+    'find_water_day',
+    'water_history',
+    
+    # Tendência
+    'TREND_MAX_POINTS',
+    'downsample',
+    'lttb',
+    'weight_trend',
+    
+    # Peso
+    'WEIGHT_LEGACY',
+    'WEIGHT_SERIES',
+    'WeightDeleteUnsupported',
+    'WeightStore',
+]
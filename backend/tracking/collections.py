@@ -0,0 +1,64 @@
+"""
+Criação das coleções/índices de tracking (idempotente, chamada no startup)
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from .water import WATER_COLLECTION
+from .weight import WEIGHT_SERIES
+
+logger = logging.getLogger(__name__)
+
+WEIGHT_TIMESERIES_OPTIONS = {
+    "timeField": "recorded_at",
+    "metaField": "user_id",
+    "granularity": "hours",
+}
+
+# DELETE /progress/weight/{id} apaga por _id, o que numa time-series só
+# funciona a partir do 7.0 (5.0-6.x só aceitam filtro no metaField)
+TIMESERIES_MIN_VERSION = (7, 0)
+
+
+async def _server_version(db) -> Optional[Tuple[int, ...]]:
+    try:
+        info = await db.command("buildInfo")
+        return tuple(info["versionArray"][:2])
+    except Exception as e:
+        logger.warning(f"Não foi possível ler a versão do MongoDB: {e}")
+        return None
+
+
+async def ensure_weight_series(db):
+    """
+    weight_series como time-series no MongoDB 7.0+; em versões anteriores
+    (ou se a criação falhar) fica uma coleção comum com a mesma API.
+    """
+    existing = set(await db.list_collection_names())
+    if WEIGHT_SERIES not in existing:
+        version = await _server_version(db)
+        if version is not None and version < TIMESERIES_MIN_VERSION:
+            logger.warning(f"MongoDB {'.'.join(map(str, version))} < 7.0: weight_series como coleção comum")
+        else:
+            try:
+                await db.create_collection(WEIGHT_SERIES, timeseries=WEIGHT_TIMESERIES_OPTIONS)
+            except CollectionInvalid:
+                pass  # criada por outro worker ao mesmo tempo
+            except (OperationFailure, TypeError, NotImplementedError) as e:
+                logger.warning(f"weight_series sem time-series ({e}); usando coleção comum")
+    await db[WEIGHT_SERIES].create_index([("user_id", 1), ("recorded_at", -1)])
+
+
+async def ensure_tracking_collections(db):
+    """Coleções e índices de tracking (peso + água)"""
+    await ensure_weight_series(db)
+
+    # Índice parcial: documentos antigos sem `day` não entram até a migração
+    await db[WATER_COLLECTION].create_index(
+        [("user_id", 1), ("day", 1)],
+        unique=True,
+        partialFilterExpression={"day": {"$exists": True}},
+    )
@@ -0,0 +1,172 @@
+"""
+Tendência de peso vetorizada (NumPy) para o gráfico de desempenho
+=================================================================
+Roda sobre o histórico inteiro (sem o corte de 100 registros):
+
+- reject_outliers(): z-score robusto (mediana/MAD) dos resíduos de uma
+  reta ajustada - pesagem errada ou digitada com vírgula fora do lugar não
+  entra na tendência.
+- ewma(): média móvel exponencial com meia-vida em DIAS (pesagens com
+  intervalo irregular pesam pelo tempo, não pela posição).
+- weekly_rate(): inclinação por mínimos quadrados (kg/semana) em vez de
+  (último - primeiro) / dias.
+- project_goal_date(): quando o peso-alvo seria atingido no ritmo atual.
+- lttb(): Largest-Triangle-Three-Buckets - reduz a série a no máximo
+  TREND_MAX_POINTS pontos preservando a forma; a resposta tem tamanho
+  constante não importa há quanto tempo o usuário registra.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+TREND_HALF_LIFE_DAYS = 7.0
+TREND_MAX_POINTS = 120
+OUTLIER_Z = 3.5
+PROJECTION_MAX_WEEKS = 104
+MIN_WEEKLY_RATE = 0.05  # kg/semana: abaixo disso não há projeção
+
+_SECONDS_PER_DAY = 86400.0
+
+
+def to_days(moments: List[datetime]) -> np.ndarray:
+    """Datas -> dias (float) desde a primeira"""
+    if not moments:
+        return np.empty(0)
+    stamps = np.array([m.timestamp() for m in moments], dtype=np.float64)
+    return (stamps - stamps[0]) / _SECONDS_PER_DAY
+
+
+def reject_outliers(t: np.ndarray, y: np.ndarray, threshold: float = OUTLIER_Z) -> np.ndarray:
+    """Máscara dos pontos mantidos (True = válido)"""
+    keep = np.ones(y.shape, dtype=bool)
+    if y.size < 4 or np.ptp(t) == 0:
+        return keep
+    slope, intercept = np.polyfit(t, y, 1)
+    residuals = y - (slope * t + intercept)
+    deviation = np.abs(residuals - np.median(residuals))
+    mad = np.median(deviation)
+    if mad == 0:
+        return keep
+    return 0.6745 * deviation / mad <= threshold
+
+
+def ewma(t: np.ndarray, y: np.ndarray, half_life_days: float = TREND_HALF_LIFE_DAYS) -> np.ndarray:
+    """
+    EWMA em tempo contínuo: s_i = Σ y_j·e^(λ(t_j - t_i)) / Σ e^(λ(t_j - t_i)), j <= i.
+    Com os pesos relativos a t[0] vira duas somas acumuladas.
+    """
+    if y.size == 0:
+        return y.astype(np.float64)
+    rate = np.log(2.0) / half_life_days
+    exponent = rate * (t - t[0])
+    if exponent[-1] > 700:
+        # Histórico longo demais para e^x em float64: recursão equivalente
+        out = np.empty_like(y, dtype=np.float64)
+        out[0] = y[0]
+        decay = np.exp(-rate * np.diff(t))
+        norm = 1.0
+        for i in range(1, y.size):
+            norm = norm * decay[i - 1] + 1.0
+            out[i] = out[i - 1] + (y[i] - out[i - 1]) / norm
+        return out
+    weights = np.exp(exponent)
+    return np.cumsum(weights * y) / np.cumsum(weights)
+
+
+def weekly_rate(t: np.ndarray, y: np.ndarray) -> float:
+    """kg/semana por mínimos quadrados"""
+    if y.size < 2 or np.ptp(t) == 0:
+        return 0.0
+    slope = np.polyfit(t, y, 1)[0]
+    return float(slope * 7)
+
+
+def project_goal_date(current: float, target: Optional[float], rate: float, now: datetime) -> Optional[datetime]:
+    """Data estimada do peso-alvo; None se o ritmo não leva até ele"""
+    if not target or abs(rate) < MIN_WEEKLY_RATE:
+        return None
+    weeks = (target - current) / rate
+    if weeks < 0 or weeks > PROJECTION_MAX_WEEKS:
+        return None
+    return now + timedelta(weeks=float(weeks))
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Índices dos pontos escolhidos pelo LTTB (sempre inclui o primeiro e o último)"""
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Média do próximo bucket (ou o último ponto)
+        next_end = edges[i + 2] if i + 2 < edges.size else n
+        next_start = end if i + 2 < edges.size else n - 1
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def weight_trend(records: List[Dict], target_weight: Optional[float] = None,
+                 now: Optional[datetime] = None, max_points: int = TREND_MAX_POINTS) -> Dict:
+    """
+    Série de peso (ordem cronológica, campos recorded_at/weight) ->
+    pontos do gráfico (com a linha de tendência) + estatísticas.
+    """
+    now = now or datetime.utcnow()
+    moments = [r["recorded_at"] for r in records]
+    t = to_days(moments)
+    y = np.array([r["weight"] for r in records], dtype=np.float64)
+
+    keep = reject_outliers(t, y)
+    t_ok, y_ok = t[keep], y[keep]
+    trend = np.full(y.shape, np.nan)
+    trend[keep] = ewma(t_ok, y_ok)
+    # Outliers recebem a tendência do ponto válido anterior (linha contínua)
+    if y.size:
+        first_valid = int(np.argmax(keep))
+        trend = trend[np.maximum.accumulate(np.where(keep, np.arange(y.size), first_valid))]
+
+    rate = weekly_rate(t_ok, y_ok)
+    current = float(trend[-1]) if trend.size else None
+    change = float(trend[-1] - trend[0]) if trend.size >= 2 else 0.0
+    goal_date = project_goal_date(current, target_weight, rate, now) if current is not None else None
+
+    chosen = lttb(t, y, max_points)
+    points = [
+        {
+            "date": moments[i].strftime("%Y-%m-%d"),
+            "value": float(y[i]),
+            "trend": round(float(trend[i]), 2),
+            **({"outlier": True} if not keep[i] else {}),
+        }
+        for i in chosen
+    ]
+    return {
+        "points": points,
+        "min": float(y.min()) if y.size else None,
+        "max": float(y.max()) if y.size else None,
+        "weight_change": change,
+        "weekly_rate": rate,
+        "trend_weight": current,
+        "outliers": int((~keep).sum()),
+        "projected_goal_date": goal_date.strftime("%Y-%m-%d") if goal_date else None,
+    }
+
+
+def downsample(records: List[Dict], field: str, max_points: int = TREND_MAX_POINTS) -> List[int]:
+    """Índices LTTB de uma série qualquer (ex.: média do questionário)"""
+    t = to_days([r["recorded_at"] for r in records])
+    y = np.array([r[field] for r in records], dtype=np.float64)
+    return lttb(t, y, max_points).tolist()
@@ -0,0 +1,199 @@
+"""
+Tracker de água/sódio: um bucket por usuário e dia
+==================================================
+O tracker já é um esquema em buckets (um documento por dia com o log de
+entradas). O que faltava era uma chave de dia: a busca era por faixa de
+`date` sem índice. Agora cada documento tem `day` ("YYYY-MM-DD") com índice
+único (user_id, day):
+
+- o dia é uma busca pontual pelo índice
+- o histórico é uma faixa de `day` com projeção sem o entries_log
+
+Documentos antigos sem `day` continuam sendo lidos pela faixa de `date`
+(leitura dupla) até migrations/tracking_timeseries.py preencher o campo.
+
+Escritas atômicas: cada adição é um upsert em (user_id, day) com $inc nos
+totais e $push/$slice no log, seguido de um update em pipeline que recalcula
+as flags de mínimo a partir dos totais já gravados. Sem read-modify-write:
+dois toques rápidos no app não perdem água.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ReturnDocument, UpdateMany, UpdateOne
+
+WATER_COLLECTION = "water_sodium_tracker"
+
+# Mínimos seguros (flags *_below_minimum)
+WATER_MIN_ML = 2000
+SODIUM_MIN_MG = 500
+
+# Tamanho máximo do log de entradas de um dia (mantém as mais recentes)
+ENTRIES_LOG_LIMIT = 500
+
+# Recalcula as flags a partir dos totais gravados (update em pipeline)
+WATER_FLAGS_PIPELINE = [{"$set": {
+    "water_below_minimum": {"$lt": [{"$ifNull": ["$water_ml", 0]}, WATER_MIN_ML]},
+    "sodium_below_minimum": {"$lt": [{"$ifNull": ["$sodium_mg", 0]}, SODIUM_MIN_MG]},
+}}]
+
+# Campos do histórico (sem o log de entradas, que é o grosso do documento)
+WATER_HISTORY_PROJECTION = {
+    "date": 1, "day": 1, "water_ml": 1, "sodium_mg": 1,
+    "water_below_minimum": 1, "sodium_below_minimum": 1,
+}
+
+
+def device_moment(recorded_at: Optional[datetime], now: datetime) -> datetime:
+    """
+    Horário informado pelo aparelho em UTC naive (como o resto do tracker).
+    "...Z"/"+00:00" chega com fuso; horário no futuro (relógio adiantado) conta como agora.
+    """
+    if recorded_at is None:
+        return now
+    if recorded_at.tzinfo is not None:
+        recorded_at = recorded_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return min(recorded_at, now)
+
+
+def day_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d")
+
+
+def day_start(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+async def find_water_day(db, user_id: str, moment: datetime) -> Optional[Dict]:
+    """Bucket do dia (pela chave; cai para a faixa de datas em documentos antigos)"""
+    collection = db[WATER_COLLECTION]
+    entry = await collection.find_one({"user_id": user_id, "day": day_key(moment)})
+    if entry is None:
+        start = day_start(moment)
+        entry = await collection.find_one({
+            "user_id": user_id,
+            "day": {"$exists": False},
+            "date": {"$gte": start, "$lt": start + timedelta(days=1)},
+        })
+    return entry
+
+
+async def water_history(db, user_id: str, from_date: datetime, days: int) -> List[Dict]:
+    """Buckets a partir de from_date, em ordem cronológica, sem entries_log"""
+    collection = db[WATER_COLLECTION]
+    entries = await collection.find(
+        {"user_id": user_id, "day": {"$gte": day_key(from_date)}},
+        WATER_HISTORY_PROJECTION,
+    ).sort("day", 1).to_list(length=days + 1)
+
+    legacy = await collection.find(
+        {"user_id": user_id, "day": {"$exists": False}, "date": {"$gte": from_date}},
+        WATER_HISTORY_PROJECTION,
+    ).to_list(length=days + 1)
+    if legacy:
+        entries = sorted(entries + legacy, key=lambda e: e["date"])
+    return entries[-days:] if days > 0 else []
+
+
+# ==================== ESCRITA ATÔMICA ====================
+
+def _increment(
+    user_id: str, day: str, log: List[Dict], now: datetime, on_insert: Dict, stamp: Optional[Dict]
+) -> Tuple[Dict, Dict]:
+    """Filtro + update do upsert de um dia ($inc nos totais, $push/$slice no log)"""
+    update = {
+        "$inc": {
+            "water_ml": sum(e["water_ml"] for e in log),
+            "sodium_mg": sum(e["sodium_mg"] for e in log),
+        },
+        "$push": {"entries_log": {"$each": log, "$slice": -ENTRIES_LOG_LIMIT}},
+        "$set": {"updated_at": now, **(stamp or {})},
+        "$setOnInsert": {**on_insert, "created_at": now},
+    }
+    return {"user_id": user_id, "day": day}, update
+
+
+async def _adopt_legacy_bucket(db, user_id: str, bucket_id, moment: datetime) -> Optional[Dict]:
+    """
+    Bucket recém-criado pelo upsert: se houver um documento antigo (sem `day`)
+    do mesmo dia, soma-o no novo e apaga o antigo. Só roda na 1ª escrita do dia.
+    """
+    collection = db[WATER_COLLECTION]
+    start = day_start(moment)
+    legacy = await collection.find_one_and_delete({
+        "user_id": user_id,
+        "day": {"$exists": False},
+        "date": {"$gte": start, "$lt": start + timedelta(days=1)},
+    })
+    if not legacy:
+        return None
+    return await collection.find_one_and_update(
+        {"_id": bucket_id},
+        {
+            "$inc": {"water_ml": legacy.get("water_ml", 0), "sodium_mg": legacy.get("sodium_mg", 0)},
+            "$push": {"entries_log": {
+                "$each": legacy.get("entries_log", []), "$position": 0, "$slice": -ENTRIES_LOG_LIMIT,
+            }},
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def add_water_entry(
+    db, user_id: str, log_entry: Dict, on_insert: Dict, now: datetime, stamp: Optional[Dict] = None
+) -> Dict:
+    """Soma uma entrada no bucket de hoje; retorna o bucket atualizado (`stamp`: campos extras do $set)"""
+    collection = db[WATER_COLLECTION]
+    query, update = _increment(user_id, day_key(now), [log_entry], now, on_insert, stamp)
+    bucket = await collection.find_one_and_update(
+        query, update, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    if bucket["_id"] == on_insert.get("_id"):
+        bucket = await _adopt_legacy_bucket(db, user_id, bucket["_id"], now) or bucket
+
+    await collection.update_one({"_id": bucket["_id"]}, WATER_FLAGS_PIPELINE)
+    bucket["water_below_minimum"] = bucket.get("water_ml", 0) < WATER_MIN_ML
+    bucket["sodium_below_minimum"] = bucket.get("sodium_mg", 0) < SODIUM_MIN_MG
+    return bucket
+
+
+async def add_water_entries(
+    db,
+    user_id: str,
+    log_entries: Iterable[Tuple[datetime, Dict]],
+    on_insert: Callable[[datetime], Dict],
+    now: datetime,
+    stamp: Optional[Dict] = None,
+) -> List[str]:
+    """
+    Aplica várias entradas (fila offline do app) num único bulk_write:
+    um upsert por dia tocado + as flags de todos esses dias.
+    Retorna os dias afetados em ordem.
+    """
+    by_day: Dict[str, List[Dict]] = {}
+    moments: Dict[str, datetime] = {}
+    for moment, log_entry in log_entries:
+        key = day_key(moment)
+        by_day.setdefault(key, []).append(log_entry)
+        moments.setdefault(key, moment)
+    if not by_day:
+        return []
+
+    days = sorted(by_day)
+    inserts = {day: on_insert(moments[day]) for day in days}
+    operations = [
+        UpdateOne(*_increment(user_id, day, by_day[day], now, inserts[day], stamp), upsert=True)
+        for day in days
+    ]
+    operations.append(UpdateMany({"user_id": user_id, "day": {"$in": days}}, WATER_FLAGS_PIPELINE))
+    result = await db[WATER_COLLECTION].bulk_write(operations, ordered=True)
+
+    adopted = [
+        await _adopt_legacy_bucket(db, user_id, bucket_id, moments[days[index]])
+        for index, bucket_id in result.upserted_ids.items()
+    ]
+    adopted_ids = [bucket["_id"] for bucket in adopted if bucket]
+    if adopted_ids:
+        await db[WATER_COLLECTION].update_many({"_id": {"$in": adopted_ids}}, WATER_FLAGS_PIPELINE)
+    return days
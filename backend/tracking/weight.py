@@ -0,0 +1,103 @@
+"""
+Registros de peso em coleção time-series
+========================================
+`weight_series` é uma coleção time-series do MongoDB (timeField
+recorded_at, metaField user_id): o servidor agrupa os pontos de cada
+usuário em buckets por tempo, então varreduras por período e gráficos de
+histórico longo leem poucos blocos comprimidos em vez de um documento por
+registro.
+
+Período de leitura dupla: enquanto WEIGHT_LEGACY_READ estiver ligado
+(padrão), as leituras juntam `weight_series` com a coleção antiga
+`weight_records` (sem duplicar pelo _id). As escritas vão só para a
+time-series. Depois de rodar migrations/tracking_timeseries.py, desligue
+com WEIGHT_LEGACY_READ=0.
+
+Obs.: apagar por _id numa time-series exige MongoDB 7.0+, então a coleção
+só é criada como time-series a partir do 7.0 (tracking/collections.py); em
+5.0-6.x ela é uma coleção comum. Uma time-series criada antes dessa regra
+num servidor < 7.0 recusa o delete: WeightDeleteUnsupported.
+"""
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pymongo.errors import OperationFailure
+
+WEIGHT_SERIES = "weight_series"
+WEIGHT_LEGACY = "weight_records"
+
+WEIGHT_LEGACY_READ = os.environ.get("WEIGHT_LEGACY_READ", "1").lower() in ("1", "true", "yes")
+
+
+class WeightDeleteUnsupported(Exception):
+    """weight_series é time-series num MongoDB < 7.0: sem delete por _id"""
+
+
+class WeightStore:
+    """Leitura/escrita de registros de peso (time-series + leitura dupla)"""
+
+    def __init__(self, db, legacy_read: bool = WEIGHT_LEGACY_READ):
+        self.series = db[WEIGHT_SERIES]
+        self.legacy = db[WEIGHT_LEGACY]
+        self.legacy_read = legacy_read
+
+    async def insert(self, record: Dict):
+        await self.series.insert_one(record)
+
+    async def latest(self, user_id: str) -> Optional[Dict]:
+        """Registro mais recente do usuário"""
+        latest = await self.series.find_one({"user_id": user_id}, sort=[("recorded_at", -1)])
+        if self.legacy_read:
+            legacy = await self.legacy.find_one({"user_id": user_id}, sort=[("recorded_at", -1)])
+            if legacy and (not latest or legacy["recorded_at"] > latest["recorded_at"]):
+                return legacy
+        return latest
+
+    async def in_range(self, user_id: str, from_date: Optional[datetime], limit: Optional[int],
+                       projection: Optional[Dict] = None) -> List[Dict]:
+        """Registros desde from_date (None = todos) em ordem cronológica (até `limit`; None = sem limite)"""
+        query = {"user_id": user_id}
+        if from_date is not None:
+            query["recorded_at"] = {"$gte": from_date}
+        records = await self.series.find(query, projection).sort("recorded_at", 1).to_list(length=limit)
+        if not self.legacy_read:
+            return records
+
+        legacy = await self.legacy.find(query, projection).sort("recorded_at", 1).to_list(length=limit)
+        if not legacy:
+            return records
+        merged = {r["_id"]: r for r in legacy}
+        merged.update({r["_id"]: r for r in records})
+        return sorted(merged.values(), key=lambda r: r["recorded_at"])[:limit]
+
+    async def last_recorded_between(self, since: datetime, cutoff: datetime) -> Dict[str, datetime]:
+        """
+        {user_id: último registro} dos usuários cujo último peso está em
+        [since, cutoff]. O $match depois do $group descarta quem está inativo
+        há mais tempo que `since`; o limite superior é aplicado só depois de
+        juntar as duas coleções (um registro recente na outra coleção tira o
+        usuário da lista).
+        """
+        pipeline = [
+            {"$sort": {"user_id": 1, "recorded_at": -1}},
+            {"$group": {"_id": "$user_id", "last": {"$first": "$recorded_at"}}},
+            {"$match": {"last": {"$gte": since}}},
+        ]
+        latest: Dict[str, datetime] = {}
+        collections = [self.series, self.legacy] if self.legacy_read else [self.series]
+        for collection in collections:
+            async for row in collection.aggregate(pipeline):
+                if row["_id"] not in latest or row["last"] > latest[row["_id"]]:
+                    latest[row["_id"]] = row["last"]
+        return {user_id: last for user_id, last in latest.items() if last <= cutoff}
+
+    async def delete(self, record_id: str) -> int:
+        try:
+            deleted = (await self.series.delete_one({"_id": record_id})).deleted_count
+        except OperationFailure as e:
+            raise WeightDeleteUnsupported(str(e)) from e
+        if self.legacy_read:
+            deleted += (await self.legacy.delete_one({"_id": record_id})).deleted_count
+        return deleted
@@ -0,0 +1,27 @@
+"""
+Web Module - Camada HTTP
+========================
+- compression.py: middleware Brotli/GZip com tamanho mínimo
+- conditional.py: ETag forte de planos + GET condicional (304)
+- responses.py: respostas JSON com orjson (sem jsonable_encoder)
+"""
+
+from .compression import CompressionMiddleware
+
+from .conditional import etag_matches, not_modified, plan_etag
+
+from .responses import LafJSONResponse, json_response
+
+__all__ = [
+    # Compressão
+    'CompressionMiddleware',
+
+    # GET condicional
+    'etag_matches',
+    'not_modified',
+    'plan_etag',
+
+    # Respostas
+    'LafJSONResponse',
+    'json_response',
+]
@@ -0,0 +1,51 @@
+"""
+ETag e GET condicional
+======================
+plan_etag() gera um ETag FORTE a partir do que define a representação de
+um plano: id + revisão (e carimbos de atualização) + partes que variam por
+requisição (tipo do dia, idioma). Assim o ETag sai antes de montar a
+resposta e um 304 não custa o ajuste/tradução do plano.
+
+`revision` é incrementado a cada alteração do plano ($inc); os carimbos
+updated_at/adjusted_at entram também para cobrir planos antigos sem revisão.
+"""
+
+import hashlib
+from typing import Dict, Optional
+
+from starlette.responses import Response
+
+from .compression import ETAG_ENCODING_SUFFIXES
+
+PLAN_STAMP_FIELDS = ("revision", "created_at", "updated_at", "adjusted_at")
+
+
+def plan_etag(plan: Dict, *variant) -> str:
+    parts = [str(plan.get("_id"))]
+    parts.extend(str(plan.get(field, "")) for field in PLAN_STAMP_FIELDS)
+    parts.extend(str(part) for part in variant)
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ETAG_ENCODING_SUFFIXES:
+        if tag.endswith(f'{suffix}"'):
+            return tag[: -len(suffix) - 1] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110), ignorando o sufixo de codificação"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque(tag) == etag for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
@@ -0,0 +1,58 @@
+"""
+Respostas JSON com orjson
+=========================
+O caminho padrão do FastAPI passa todo retorno por jsonable_encoder (e, com
+response_model, valida o objeto DE NOVO) antes do json.dumps. Para planos
+de dieta/treino isso é a maior parte do custo da resposta.
+
+- LafJSONResponse: JSONResponse renderizada com orjson (datetime, UUID,
+  enum, numpy nativos; modelos Pydantic via model_dump)
+- json_response(): devolve o conteúdo direto como LafJSONResponse, sem
+  jsonable_encoder nem revalidação. Os headers já gravados no `response`
+  injetado pelo FastAPI (ETag, Server-Timing...) são copiados.
+
+benchmarks/serialization.py compara os dois caminhos por endpoint.
+"""
+
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+from starlette.responses import JSONResponse, Response
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class LafJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> LafJSONResponse:
+    """Resposta pronta (pula jsonable_encoder/response_model); herda headers de `response`"""
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    result = LafJSONResponse(content, status_code=status_code)
+    if response is not None:
+        for key, value in response.headers.items():
+            if key != "content-length":
+                result.headers.append(key, value)
+    return result
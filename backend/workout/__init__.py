@@ -14,6 +14,31 @@ from .exercises import (
     get_split_for_frequency,
 )
 
+from .catalog import (
+    CATALOG,
+    CANDIDATES_BY_LEVEL,
+    EXERCISES_BY_MUSCLE,
+    LEVEL_FILTERS,
+    MUSCLE_DISPLAY_NAMES,
+    CatalogExercise,
+    catalog_level,
+    exercise_id,
+    full_body_exercise_ids,
+    get_candidates,
+    muscle_exercise_ids,
+)
+
+from .schedule import (
+    DAY_TYPE_DIET,
+    DIVISION_TRAINING_DAYS,
+    WEEKDAY_NAMES,
+    build_weekly_schedule,
+    is_schedule_current,
+    iter_schedule_range,
+    resolve_day,
+    schedule_key,
+)
+
 from .config import (
     get_config_for_level,
     get_exercises_per_duration,
@@ -42,6 +67,29 @@ __all__ = [
     'COMPOUND_EXERCISES',
     'get_split_for_frequency',
     
+    # Catalog
+    'CATALOG',
+    'CANDIDATES_BY_LEVEL',
+    'EXERCISES_BY_MUSCLE',
+    'LEVEL_FILTERS',
+    'MUSCLE_DISPLAY_NAMES',
+    'CatalogExercise',
+    'catalog_level',
+    'exercise_id',
+    'full_body_exercise_ids',
+    'get_candidates',
+    'muscle_exercise_ids',
+    
+    # Schedule
+    'DAY_TYPE_DIET',
+    'DIVISION_TRAINING_DAYS',
+    'WEEKDAY_NAMES',
+    'build_weekly_schedule',
+    'is_schedule_current',
+    'iter_schedule_range',
+    'resolve_day',
+    'schedule_key',
+    
     # Config
     'get_config_for_level',
     'get_exercises_per_duration',
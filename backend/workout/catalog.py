@@ -0,0 +1,161 @@
+"""
+Workout Module - Indexed Exercise Catalog
+=========================================
+Compila EXERCISES (exercises.py) uma única vez em um catálogo indexado:
+ids estáveis, flags de equipamento/composto/bloqueio e listas de candidatos
+pré-calculadas por nível. A geração de treino seleciona por lookup em vez
+de refazer os filtros por substring a cada requisição.
+"""
+
+import re
+import unicodedata
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, NamedTuple, Optional, Tuple
+
+from .exercises import EXERCISES, COMPOUND_EXERCISES
+
+
+# Palavras que identificam máquinas/cabos (permitidos para novato e adaptação)
+MACHINE_KEYWORDS = ("máquina", "polia", "pulley", "leg press", "cadeira", "mesa", "cross", "smith")
+
+# Filtros por nível: (apenas máquinas, bloqueios aplicados)
+# Rosca direta com barra é sempre bloqueada fora do modo "apenas máquinas"
+LEVEL_FILTERS: Mapping[str, Tuple[bool, FrozenSet[str]]] = MappingProxyType({
+    "novato": (True, frozenset()),  # também usado na fase de adaptação
+    "iniciante": (False, frozenset({"supino_barra", "agachamento_livre", "stiff_livre", "rosca_direta_barra"})),
+    "intermediario": (False, frozenset({"rosca_direta_barra"})),
+    "avancado": (False, frozenset({"rosca_direta_barra"})),
+})
+
+# Nome exibido do grupo muscular (listas fixas como Full Body)
+MUSCLE_DISPLAY_NAMES = MappingProxyType({
+    "peito": "Peito", "costas": "Costas", "ombros": "Ombros",
+    "biceps": "Bíceps", "triceps": "Tríceps", "quadriceps": "Quadríceps",
+    "posterior": "Posterior", "panturrilha": "Panturrilha", "abdomen": "Abdômen",
+})
+
+
+class CatalogExercise(NamedTuple):
+    id: str
+    name: str
+    muscle: str
+    focus: Optional[str]
+    notes: str
+    machine: bool              # máquina ou cabo
+    compound: bool             # precisa de aquecimento
+    block_tags: FrozenSet[str]  # ex.: {"supino_barra"}
+    levels: FrozenSet[str]     # níveis em que o exercício é candidato
+
+
+def exercise_id(name: str) -> str:
+    """'Leg Press 45°' → 'leg_press_45'"""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "_", ascii_name.lower()).strip("_")
+
+
+def _block_tags(name_lower: str) -> FrozenSet[str]:
+    tags = set()
+    if "supino" in name_lower and "barra" in name_lower:
+        tags.add("supino_barra")
+    if "rosca" in name_lower and "barra" in name_lower and "direta" in name_lower:
+        tags.add("rosca_direta_barra")
+    if "agachamento" in name_lower and "livre" in name_lower:
+        tags.add("agachamento_livre")
+    if "stiff" in name_lower and "livre" in name_lower:
+        tags.add("stiff_livre")
+    return frozenset(tags)
+
+
+def _allowed_levels(machine: bool, block_tags: FrozenSet[str]) -> FrozenSet[str]:
+    allowed = set()
+    for level, (machine_only, blocked) in LEVEL_FILTERS.items():
+        if machine_only:
+            if machine:
+                allowed.add(level)
+        elif not (block_tags & blocked):
+            allowed.add(level)
+    return frozenset(allowed)
+
+
+def _compile_catalog():
+    catalog: Dict[str, CatalogExercise] = {}
+    by_muscle: Dict[str, Tuple[str, ...]] = {}
+
+    for muscle, exercises in EXERCISES.items():
+        ids = []
+        for ex in exercises:
+            name_lower = ex["name"].lower()
+            machine = any(keyword in name_lower for keyword in MACHINE_KEYWORDS)
+            block_tags = _block_tags(name_lower)
+            entry = CatalogExercise(
+                id=exercise_id(ex["name"]),
+                name=ex["name"],
+                muscle=muscle,
+                focus=ex.get("focus"),
+                notes=ex.get("notes", ""),
+                machine=machine,
+                compound=any(comp in name_lower for comp in COMPOUND_EXERCISES),
+                block_tags=block_tags,
+                levels=_allowed_levels(machine, block_tags),
+            )
+            if entry.id in catalog and catalog[entry.id].name != entry.name:
+                raise ValueError(f"Id de exercício duplicado: {entry.id}")
+            catalog[entry.id] = entry
+            ids.append(entry.id)
+        by_muscle[muscle] = tuple(ids)
+
+    candidates = {
+        level: MappingProxyType({
+            muscle: tuple(ex_id for ex_id in ids if level in catalog[ex_id].levels)
+            for muscle, ids in by_muscle.items()
+        })
+        for level in LEVEL_FILTERS
+    }
+    return MappingProxyType(catalog), MappingProxyType(by_muscle), MappingProxyType(candidates)
+
+
+CATALOG, EXERCISES_BY_MUSCLE, CANDIDATES_BY_LEVEL = _compile_catalog()
+
+
+# ==================== FULL BODY (1x/semana) ====================
+# 1 exercício por grupo muscular principal + extras conforme o tempo disponível
+FULL_BODY_BASE = (
+    "supino_reto_na_maquina",
+    "puxada_frontal_pegada_aberta",
+    "desenvolvimento_maquina",
+    "leg_press_45",
+    "mesa_flexora",
+    "rosca_scott_maquina",
+    "triceps_corda_polia_alta",
+)
+FULL_BODY_EXTRAS = (  # (duração mínima, exercício)
+    (60, "cadeira_extensora"),
+    (75, "panturrilha_em_pe_na_maquina"),
+    (90, "crucifixo_na_maquina_peck_deck"),
+)
+
+_missing = [ex_id for ex_id in FULL_BODY_BASE + tuple(e for _, e in FULL_BODY_EXTRAS) if ex_id not in CATALOG]
+if _missing:
+    raise ValueError(f"Full Body referencia exercícios fora do catálogo: {_missing}")
+
+
+def catalog_level(level: str, is_adaptation: bool = False) -> str:
+    """Mapeia o nível do usuário para o filtro do catálogo (desconhecido → avançado)"""
+    if is_adaptation:
+        return "novato"
+    return level if level in LEVEL_FILTERS else "avancado"
+
+
+def get_candidates(muscle: str, level: str) -> Tuple[str, ...]:
+    """Ids candidatos para o músculo no nível (ordem do catálogo)"""
+    return CANDIDATES_BY_LEVEL[level].get(muscle, ())
+
+
+def muscle_exercise_ids(muscle: str) -> Tuple[str, ...]:
+    """Todos os ids do músculo (fallback quando nenhum candidato passa no filtro)"""
+    return EXERCISES_BY_MUSCLE.get(muscle, ())
+
+
+def full_body_exercise_ids(duration: int) -> Tuple[str, ...]:
+    """Lista Full Body para a duração disponível"""
+    return FULL_BODY_BASE + tuple(ex_id for min_duration, ex_id in FULL_BODY_EXTRAS if duration >= min_duration)
@@ -10,6 +10,7 @@ All exercises organized by muscle group
 
 EXERCISES = {
     # ============ PEITO ============
+    # Inclui Elevação Lateral para trabalhar ombro no dia de peito
     "peito": [
         {
             "name": "Supino Reto na Máquina",
@@ -39,6 +40,7 @@ EXERCISES = {
     ],
     
     # ============ COSTAS ============
+    # Inclui Voador Invertido para trabalhar posterior de ombro
     "costas": [
         {
             "name": "Puxada Frontal Pegada Aberta",
@@ -48,31 +50,33 @@ EXERCISES = {
         {
             "name": "Puxada Pegada Neutra (Triângulo)",
             "focus": "Dorsal (Espessura)",
-            "notes": "Pegada neutra com triângulo. Puxe até o peito, focando em aproximar as escápulas. Ótimo para costas médias."
+            "notes": "Use o triângulo/pegada neutra. Puxe até o peito, apertando as escápulas. Foco em espessura das costas."
         },
         {
             "name": "Remada Máquina Pegada Neutra",
-            "focus": "Dorsal (Espessura)",
-            "notes": "Peito apoiado no banco. Puxe os cabos até contrair completamente as costas. Foco em espremer as escápulas."
+            "focus": "Dorsal Médio (Espessura)",
+            "notes": "Peito apoiado, pegada neutra. Puxe as manoplas em direção ao abdômen, contraindo as escápulas. Foco em espessura."
         },
         {
             "name": "Remada Máquina Pegada Pronada",
-            "focus": "Dorsal Superior",
-            "notes": "Pegada pronada (palmas para baixo). Cotovelos mais abertos para trabalhar costas superiores e trapézio."
+            "focus": "Trapézio/Romboides",
+            "notes": "Pegada pronada (palmas para baixo). Puxe com cotovelos mais altos. Foco em trapézio médio e romboides."
         },
         {
             "name": "Voador Invertido (Peck Deck)",
             "focus": "Deltóide Posterior",
-            "notes": "Sentado de frente para a máquina. Puxe os braços para trás em arco. Trabalha posterior de ombro junto com costas."
+            "notes": "Sente de frente para o encosto. Abra os braços para trás contraindo as escápulas. Retorne controlado. Trabalha posterior de ombro."
         },
         {
             "name": "Remada Baixa Polia (Triângulo)",
             "focus": "Dorsal Inferior",
-            "notes": "Sente com pernas levemente flexionadas. Puxe o triângulo até o abdômen baixo. Costas retas durante todo o movimento."
+            "notes": "Sente com pernas levemente flexionadas. Puxe o triângulo até o abdômen baixo. Mantenha costas retas."
         },
     ],
     
     # ============ OMBROS ============
+    # Para Full Upper e dias com ombro: Desenvolvimento + Elevação Lateral
+    # (Voador vai em costas, Elevação Lateral Halteres vai em peito)
     "ombros": [
         {
             "name": "Desenvolvimento Máquina",
@@ -82,55 +86,57 @@ EXERCISES = {
         {
             "name": "Elevação Lateral Máquina",
             "focus": "Deltóide Lateral",
-            "notes": "Cotovelos apoiados nas almofadas. Eleve até altura dos ombros. Controle a descida - não deixe os pesos baterem."
+            "notes": "Cotovelos apoiados nas almofadas. Eleve até altura dos ombros. Desça controlado."
         },
     ],
     
     # ============ BÍCEPS ============
+    # Focos diferentes para garantir variedade
     "biceps": [
         {
             "name": "Rosca Direta Barra",
             "focus": "Bíceps Completo",
-            "notes": "Cotovelos fixos ao lado do corpo. Suba a barra até a altura dos ombros. Evite balançar o corpo."
+            "notes": "Cotovelos fixos ao lado do corpo. Suba a barra até a altura dos ombros. Desça controlado."
         },
         {
             "name": "Rosca Martelo Halteres",
-            "focus": "Braquial",
-            "notes": "Pegada neutra (polegares para cima). Suba alternadamente. Excelente para espessura do braço."
+            "focus": "Braquial/Braquiorradial",
+            "notes": "Pegada neutra (palmas para dentro). Cotovelos fixos. Trabalha braquial e antebraço."
         },
         {
             "name": "Rosca Alternada Halteres",
-            "focus": "Bíceps com Supinação",
-            "notes": "Comece com pegada neutra. Durante a subida, gire o punho (supinação). Maximiza contração do bíceps."
+            "focus": "Bíceps (Cabeça Longa)",
+            "notes": "Sentado com costas apoiadas. Alterne os braços. Gire o punho (supinação) durante a subida."
         },
         {
             "name": "Rosca Scott Máquina",
-            "focus": "Bíceps Curto",
-            "notes": "Braços apoiados no banco Scott. Isola completamente o bíceps. Não estenda totalmente para proteger cotovelos."
+            "focus": "Bíceps (Cabeça Curta/Pico)",
+            "notes": "Braços apoiados no suporte. Isola o bíceps eliminando impulso. Foco no pico."
         },
     ],
     
     # ============ TRÍCEPS ============
+    # Focos diferentes para garantir variedade
     "triceps": [
         {
             "name": "Tríceps Corda (Polia Alta)",
-            "focus": "Tríceps Completo",
-            "notes": "Cotovelos fixos ao lado do corpo. Estenda completamente e separe as pontas da corda no final."
+            "focus": "Cabeça Lateral",
+            "notes": "Cotovelos fixos ao lado do corpo. Estenda completamente, abrindo a corda no final."
         },
         {
             "name": "Tríceps Francês Halter",
             "focus": "Cabeça Longa",
-            "notes": "Deitado ou sentado. Halter atrás da cabeça. Estenda apenas o antebraço, mantendo cotovelos fixos."
+            "notes": "Sentado. Halter acima da cabeça. Desça atrás da cabeça. Estenda sem mover cotovelos."
         },
         {
             "name": "Tríceps Barra Reta (Polia Alta)",
-            "focus": "Tríceps Lateral",
-            "notes": "Similar à corda mas com barra reta. Pegada pronada. Foco na cabeça lateral do tríceps."
+            "focus": "Cabeça Medial",
+            "notes": "Pegada pronada. Cotovelos fixos. Empurre a barra até extensão completa."
         },
         {
             "name": "Tríceps Máquina",
-            "focus": "Tríceps Completo",
-            "notes": "Sentado na máquina. Empurre até extensão completa. Máquina guiada = execução mais segura."
+            "focus": "Tríceps Geral",
+            "notes": "Costas apoiadas. Empurre as manoplas estendendo cotovelos. Retorne controlado."
         },
     ],
     
@@ -139,22 +145,22 @@ EXERCISES = {
         {
             "name": "Leg Press 45°",
             "focus": "Quadríceps Completo",
-            "notes": "Pés na largura dos ombros. Desça até 90° de flexão do joelho. NÃO trave os joelhos na subida."
+            "notes": "Pés no centro da plataforma na largura dos ombros. Desça até 90° nos joelhos. Empurre sem travar os joelhos no topo."
         },
         {
             "name": "Cadeira Extensora",
-            "focus": "Quadríceps (Isolamento)",
-            "notes": "Ajuste o encosto para costas apoiadas. Estenda até quase travar, segure 1s no topo. Desça controlado."
+            "focus": "Vasto Lateral/Medial",
+            "notes": "Ajuste o encosto para joelhos alinhados com o eixo. Estenda as pernas completamente, contraindo no topo. Desça controlado."
         },
         {
             "name": "Agachamento no Smith Machine",
             "focus": "Quadríceps/Glúteos",
-            "notes": "Pés ligeiramente à frente da barra. Desça até coxas paralelas ao chão. Smith garante estabilidade."
+            "notes": "Pés ligeiramente à frente da barra. Desça até coxas paralelas ao chão. Suba empurrando pelos calcanhares. Joelhos alinhados com os pés."
         },
         {
-            "name": "Leg Press Horizontal",
-            "focus": "Quadríceps",
-            "notes": "Variação mais suave que 45°. Bom para quem tem dor lombar. Mesma técnica do Leg Press normal."
+            "name": "Hack Machine",
+            "focus": "Vasto Lateral",
+            "notes": "Costas apoiadas, ombros sob as almofadas. Pés na largura dos ombros. Desça controlado até 90°. Empurre sem travar joelhos."
         },
     ],
     
@@ -162,70 +168,56 @@ EXERCISES = {
     "posterior": [
         {
             "name": "Mesa Flexora",
-            "focus": "Posterior de Coxa",
-            "notes": "Deitado de bruços. Flexione até ~90°, segure no topo. Não levante o quadril do banco."
+            "focus": "Posterior (Deitado)",
+            "notes": "Deite de bruços com joelhos alinhados ao eixo da máquina. Flexione as pernas trazendo os calcanhares em direção aos glúteos. Desça controlado."
         },
         {
             "name": "Cadeira Flexora (Sentado)",
-            "focus": "Posterior de Coxa",
-            "notes": "Sentado com coxas apoiadas. Flexione puxando os calcanhares para baixo do banco."
+            "focus": "Posterior (Sentado)",
+            "notes": "Sente com coxas apoiadas. Flexione as pernas para baixo e para trás. Contraia no final do movimento. Retorne controlado."
         },
         {
             "name": "Stiff na Máquina Smith",
-            "focus": "Posterior + Glúteos",
-            "notes": "Joelhos levemente flexionados (nunca travados). Desça até sentir alongamento. Costas SEMPRE retas."
+            "focus": "Posterior/Glúteos",
+            "notes": "Pernas semi-estendidas, pés na largura do quadril. Desça a barra deslizando próximo às coxas até sentir alongamento. Suba contraindo glúteos."
         },
         {
             "name": "Glúteo na Máquina (Kick Back)",
             "focus": "Glúteo Máximo",
-            "notes": "Apoie um joelho. Empurre a plataforma para trás. Não hiperextenda a lombar."
+            "notes": "Apoie o pé na plataforma. Empurre para trás estendendo o quadril. Contraia o glúteo no topo. Retorne controlado sem deixar peso bater."
         },
     ],
     
     # ============ PANTURRILHA ============
     "panturrilha": [
-        {
-            "name": "Panturrilha no Leg Press",
-            "focus": "Gastrocnêmio",
-            "notes": "Apenas pontas dos pés na plataforma. Estenda tornozelo completamente. Amplitude completa."
-        },
         {
             "name": "Panturrilha Sentado na Máquina",
             "focus": "Sóleo",
-            "notes": "Sentado isola mais o sóleo (músculo profundo). Faça com controle, sem quicar."
+            "notes": "Joelhos a 90° sob as almofadas. Eleve os calcanhares o máximo possível. Desça controlado até sentir alongamento completo."
         },
         {
             "name": "Panturrilha em Pé na Máquina",
             "focus": "Gastrocnêmio",
-            "notes": "Ombros sob as almofadas. Eleve-se nas pontas dos pés. Desça alongando completamente."
+            "notes": "Ombros sob as almofadas. Eleve nos dedos o máximo possível, contraindo no topo. Desça alongando completamente."
         },
     ],
     
     # ============ ABDÔMEN ============
     "abdomen": [
-        {
-            "name": "Abdominal na Máquina",
-            "focus": "Reto Abdominal",
-            "notes": "Segure as manoplas acima. Flexione o tronco para baixo contraindo o abdômen. Não puxe com os braços."
-        },
         {
             "name": "Abdominal na Polia Alta (Corda)",
             "focus": "Reto Abdominal",
-            "notes": "Ajoelhado. Segure a corda atrás da cabeça. Flexione o tronco trazendo cotovelos aos joelhos."
-        },
-        {
-            "name": "Prancha Isométrica",
-            "focus": "Core Completo",
-            "notes": "Apoio em antebraços e pontas dos pés. Corpo reto da cabeça aos calcanhares. Contraia abdômen e glúteos."
+            "notes": "Ajoelhe de costas para a polia. Segure a corda atrás da cabeça. Flexione o tronco em direção ao chão. Retorne controlado."
         },
         {
             "name": "Elevação de Pernas no Apoio",
             "focus": "Abdômen Inferior",
-            "notes": "Apoie-se nos braços. Eleve as pernas estendidas ou flexionadas (mais fácil). Não balance."
+            "notes": "Costas apoiadas no suporte, braços nos apoios. Eleve as pernas estendidas até 90°. Desça controlado sem balançar o corpo."
         },
     ],
 }
 
+
 # ==================== UPPER BODY ESPECÍFICO ====================
 # Configuração fixa para treino Upper (2x/semana)
 
@@ -261,8 +253,10 @@ DAYS = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado", "Domingo"]
 
 # ==================== SPLITS DE TREINO ====================
 SPLITS = {
-    1: [{"name": "Full Body", "muscles": ["peito", "costas", "quadriceps", "ombros", "biceps", "triceps"]}],
+    1: [{"name": "Full Body", "muscles": ["peito", "costas", "ombros", "quadriceps", "posterior", "biceps", "triceps"]}],
     2: [
+        # Upper/Lower com distribuição específica
+        # Upper: 2 peito, 2 costas, 2 ombro, 1 biceps, 1 triceps, 1 abdomen = 9 exercícios
         {"name": "Upper", "muscles": ["peito", "costas", "ombros", "biceps", "triceps", "abdomen"], "is_upper_lower": True},
         {"name": "Lower", "muscles": ["quadriceps", "posterior", "panturrilha"]},
     ],
@@ -272,6 +266,7 @@ SPLITS = {
         {"name": "C - Legs", "muscles": ["quadriceps", "posterior", "panturrilha"]},
     ],
     4: [
+        # ABCD: Ombro + Abdômen junto (permitido)
         {"name": "A - Peito/Tríceps", "muscles": ["peito", "triceps"]},
         {"name": "B - Costas/Bíceps", "muscles": ["costas", "biceps"]},
         {"name": "C - Pernas", "muscles": ["quadriceps", "posterior", "panturrilha"]},
@@ -296,6 +291,7 @@ SPLITS = {
         {"name": "F - Legs", "muscles": ["quadriceps", "posterior", "panturrilha"]},
     ],
     7: [
+        # 7x: Ombro junto com outro grupo
         {"name": "A - Peito", "muscles": ["peito"]},
         {"name": "B - Costas", "muscles": ["costas"]},
         {"name": "C - Ombros/Peito", "muscles": ["ombros", "peito"]},
@@ -0,0 +1,210 @@
+"""
+Workout Module - Weekly Training Schedule
+=========================================
+Agenda semanal pré-calculada por usuário (dia de treino/descanso, treino do
+dia e multiplicadores de dieta). É montada uma única vez a partir de
+training_days / frequência / divisão e salva junto do ciclo de treino
+(training_cycles.weekly_schedule). Os endpoints de ciclo apenas resolvem a
+data contra a agenda, sem refazer mapeamento de dia da semana, ordenação ou
+posição PPL a cada chamada.
+
+Convenção de dia da semana: 0=Domingo, 1=Segunda, ..., 6=Sábado.
+"""
+
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+SCHEDULE_VERSION = 1
+
+WEEKDAY_NAMES = ("Domingo", "Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado")
+
+# Fallback sem training_days: dias do ciclo (1-7) com treino por frequência.
+# O dia 7 é SEMPRE descanso; o dia 0 (startDate) também.
+DIVISION_TRAINING_DAYS = MappingProxyType({
+    2: (1, 4),
+    3: (1, 3, 5),
+    4: (1, 2, 4, 5),
+    5: (1, 2, 3, 4, 5),
+    6: (1, 2, 3, 4, 5, 6),
+})
+DEFAULT_DIVISION_DAYS = DIVISION_TRAINING_DAYS[4]
+
+PPL_SEQUENCE = ("Push", "Pull", "Legs", "Push", "Pull", "Legs")
+
+# Ajuste de dieta por tipo de dia: proteína e gordura não mudam
+DAY_TYPE_DIET = MappingProxyType({
+    "train": MappingProxyType({
+        "type": "training",
+        "calorie_multiplier": 1.05,
+        "carb_multiplier": 1.15,
+        "reason": "Dia de treino planejado",
+        "info": "+5% cal, +15% carbs",
+    }),
+    "rest": MappingProxyType({
+        "type": "rest",
+        "calorie_multiplier": 0.95,
+        "carb_multiplier": 0.80,
+        "reason": "Dia de descanso",
+        "info": "-5% cal, -20% carbs",
+    }),
+})
+
+DateLike = Union[str, date, None]
+
+
+def to_date(value: DateLike) -> date:
+    """'YYYY-MM-DD' | date | None (hoje) → date"""
+    if value is None:
+        return datetime.now().date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def weekday_of(day: date) -> int:
+    """Dia da semana no formato do app (0=Domingo)"""
+    return (day.weekday() + 1) % 7
+
+
+def schedule_key(training_days: Optional[Sequence[int]], frequency: int, training_split: Optional[str]) -> str:
+    """Chave que identifica as entradas da agenda (muda → agenda obsoleta)"""
+    days = ",".join(str(d) for d in sorted(training_days or []))
+    return f"v{SCHEDULE_VERSION}|{days}|{frequency}|{training_split or 'full_body'}"
+
+
+def build_weekly_schedule(
+    training_days: Optional[Sequence[int]],
+    frequency: int,
+    training_split: Optional[str] = None,
+) -> Dict:
+    """
+    🎯 Monta a agenda semanal (documento salvo no ciclo de treino).
+
+    - Com training_days: 7 posições indexadas pelo dia da semana (0=Domingo),
+      com o treino do dia (PPL quando frequência 6 ou divisão "ppl").
+    - Sem training_days: 7 posições indexadas pelo dia do ciclo (1-7) a partir
+      do startDate (fallback antigo por frequência).
+    """
+    training_split = training_split or "full_body"
+    days: List[Dict] = []
+
+    if training_days:
+        mode = "training_days"
+        sorted_days = sorted(training_days)
+        use_ppl = frequency == 6 or training_split == "ppl"
+        for weekday in range(7):
+            is_training_day = weekday in sorted_days
+            workout_name = None
+            workout_index = 0
+            if is_training_day:
+                position = sorted_days.index(weekday)
+                if use_ppl:
+                    workout_index = position % len(PPL_SEQUENCE)
+                    workout_name = PPL_SEQUENCE[workout_index]
+                else:
+                    workout_index = position
+                    workout_name = "Full Body"
+            days.append({
+                "day_type": "train" if is_training_day else "rest",
+                "workout_name": workout_name,
+                "workout_index": workout_index,
+            })
+        cycle_training_days = []
+    else:
+        mode = "division"
+        cycle_training_days = list(DIVISION_TRAINING_DAYS.get(frequency, DEFAULT_DIVISION_DAYS))
+        for cycle_day in range(1, 8):
+            days.append({
+                "day_type": "train" if cycle_day in cycle_training_days else "rest",
+                "workout_name": None,
+                "workout_index": 0,
+            })
+
+    return {
+        "version": SCHEDULE_VERSION,
+        "key": schedule_key(training_days, frequency, training_split),
+        "mode": mode,
+        "frequency": frequency,
+        "training_split": training_split,
+        "training_days": list(training_days or []),
+        "cycle_training_days": cycle_training_days,
+        "days": days,
+    }
+
+
+def is_schedule_current(
+    schedule: Optional[Dict],
+    training_days: Optional[Sequence[int]],
+    frequency: int,
+    training_split: Optional[str],
+) -> bool:
+    return bool(schedule) and schedule.get("key") == schedule_key(training_days, frequency, training_split)
+
+
+def resolve_day(schedule: Dict, start_date: DateLike, check_date: DateLike = None) -> Dict:
+    """
+    Resolve uma data contra a agenda.
+
+    Retorna o mesmo formato dos antigos get_day_type_from_training_days /
+    get_day_type_from_division (day_type, weekday, cycle_day, reason, ...).
+    """
+    check = to_date(check_date)
+    weekday = weekday_of(check)
+    weekday_name = WEEKDAY_NAMES[weekday]
+
+    if schedule["mode"] == "training_days":
+        entry = schedule["days"][weekday]
+        is_training_day = entry["day_type"] == "train"
+        return {
+            "day_type": entry["day_type"],
+            "weekday": weekday,
+            "weekday_name": weekday_name,
+            "training_days": schedule["training_days"],
+            "training_split": schedule["training_split"],
+            "is_training_day": is_training_day,
+            "today_workout_name": entry["workout_name"],
+            "today_workout_index": entry["workout_index"],
+            "reason": f"{weekday_name} - {'dia de treino' if is_training_day else 'dia de descanso'}",
+        }
+
+    days_elapsed = (check - to_date(start_date)).days
+
+    # Dia 0 = SEMPRE descanso
+    if days_elapsed == 0:
+        return {
+            "day_type": "rest",
+            "day_number": 0,
+            "cycle_day": 0,
+            "cycle_week": 0,
+            "is_first_day": True,
+            "weekday": weekday,
+            "weekday_name": weekday_name,
+            "reason": "Primeiro dia do app - descanso obrigatório",
+        }
+
+    cycle_day = ((days_elapsed - 1) % 7) + 1  # 1-7
+    entry = schedule["days"][cycle_day - 1]
+    is_training_day = entry["day_type"] == "train"
+    return {
+        "day_type": entry["day_type"],
+        "day_number": days_elapsed,
+        "cycle_day": cycle_day,
+        "cycle_week": (days_elapsed - 1) // 7 + 1,
+        "is_first_day": False,
+        "weekday": weekday,
+        "weekday_name": weekday_name,
+        "training_days_in_cycle": schedule["cycle_training_days"],
+        "reason": f"Ciclo dia {cycle_day} - {'treino' if is_training_day else 'descanso'}",
+    }
+
+
+def iter_schedule_range(schedule: Dict, start_date: DateLike, first: date, last: date) -> Iterator[Dict]:
+    """Resolve cada dia de [first, last] (inclusive) contra a agenda"""
+    start = to_date(start_date)
+    day = first
+    while day <= last:
+        status = resolve_day(schedule, start, day)
+        status["date"] = day.isoformat()
+        yield status
+        day += timedelta(days=1)
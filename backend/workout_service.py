@@ -10,7 +10,9 @@ REGRAS DE SEGURANÇA:
 ===============================================
 """
 import os
-from typing import List, Dict, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Optional, Mapping, NamedTuple, Tuple
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
@@ -55,304 +57,17 @@ class WorkoutGenerateRequest(BaseModel):
     user_id: str
 
 
-# ==================== EXERCÍCIOS SEGUROS (MÁQUINAS + CABOS + HALTERES) ====================
-# REGRA: Priorizar máquinas e cabos. Halteres apenas quando necessário.
-# SEM: Barras, levantamentos olímpicos, movimentos instáveis
-
-EXERCISES = {
-    # ============ PEITO ============
-    # Inclui Elevação Lateral para trabalhar ombro no dia de peito
-    "peito": [
-        {
-            "name": "Supino Reto na Máquina",
-            "focus": "Peitoral Médio",
-            "notes": "Sente com costas apoiadas. Empurre as manoplas para frente até extensão quase completa. Retorne controlado sem bater os pesos."
-        },
-        {
-            "name": "Supino Inclinado na Máquina",
-            "focus": "Peitoral Superior",
-            "notes": "Banco ajustado para inclinação. Empurre para cima e para frente. Foco no peitoral superior. Desça controlado."
-        },
-        {
-            "name": "Crucifixo na Máquina (Peck Deck)",
-            "focus": "Peitoral Médio - Adução",
-            "notes": "Cotovelos na altura dos ombros. Junte os braços à frente contraindo o peitoral. Abra controlado até sentir leve alongamento."
-        },
-        {
-            "name": "Cross Over Polia Alta",
-            "focus": "Peitoral Inferior",
-            "notes": "Cabos na posição alta. Dê um passo à frente. Puxe os cabos para baixo e para frente, cruzando na frente do corpo."
-        },
-        {
-            "name": "Elevação Lateral Halteres",
-            "focus": "Deltóide Lateral",
-            "notes": "Sentado para mais estabilidade. Cotovelos levemente flexionados. Eleve até altura dos ombros. Desça controlado."
-        },
-    ],
-    
-    # ============ COSTAS ============
-    # Inclui Voador Invertido para trabalhar posterior de ombro
-    "costas": [
-        {
-            "name": "Puxada Frontal Pegada Aberta",
-            "focus": "Dorsal (Largura)",
-            "notes": "Pegada pronada mais larga que os ombros. Puxe a barra até o queixo, cotovelos para baixo e para trás. Foco em abrir as costas."
-        },
-        {
-            "name": "Puxada Pegada Neutra (Triângulo)",
-            "focus": "Dorsal (Espessura)",
-            "notes": "Use o triângulo/pegada neutra. Puxe até o peito, apertando as escápulas. Foco em espessura das costas."
-        },
-        {
-            "name": "Remada Máquina Pegada Neutra",
-            "focus": "Dorsal Médio (Espessura)",
-            "notes": "Peito apoiado, pegada neutra. Puxe as manoplas em direção ao abdômen, contraindo as escápulas. Foco em espessura."
-        },
-        {
-            "name": "Remada Máquina Pegada Pronada",
-            "focus": "Trapézio/Romboides",
-            "notes": "Pegada pronada (palmas para baixo). Puxe com cotovelos mais altos. Foco em trapézio médio e romboides."
-        },
-        {
-            "name": "Voador Invertido (Peck Deck)",
-            "focus": "Deltóide Posterior",
-            "notes": "Sente de frente para o encosto. Abra os braços para trás contraindo as escápulas. Retorne controlado. Trabalha posterior de ombro."
-        },
-        {
-            "name": "Remada Baixa Polia (Triângulo)",
-            "focus": "Dorsal Inferior",
-            "notes": "Sente com pernas levemente flexionadas. Puxe o triângulo até o abdômen baixo. Mantenha costas retas."
-        },
-    ],
-    
-    # ============ OMBROS ============
-    # Para Full Upper e dias com ombro: Desenvolvimento + Elevação Lateral
-    # (Voador vai em costas, Elevação Lateral Halteres vai em peito)
-    "ombros": [
-        {
-            "name": "Desenvolvimento Máquina",
-            "focus": "Deltóide Anterior/Médio",
-            "notes": "Costas totalmente apoiadas. Empurre até quase estender os cotovelos. Desça até altura das orelhas."
-        },
-        {
-            "name": "Elevação Lateral Máquina",
-            "focus": "Deltóide Lateral",
-            "notes": "Cotovelos apoiados nas almofadas. Eleve até altura dos ombros. Desça controlado."
-        },
-    ],
-    
-    # ============ BÍCEPS ============
-    # Focos diferentes para garantir variedade
-    "biceps": [
-        {
-            "name": "Rosca Direta Barra",
-            "focus": "Bíceps Completo",
-            "notes": "Cotovelos fixos ao lado do corpo. Suba a barra até a altura dos ombros. Desça controlado."
-        },
-        {
-            "name": "Rosca Martelo Halteres",
-            "focus": "Braquial/Braquiorradial",
-            "notes": "Pegada neutra (palmas para dentro). Cotovelos fixos. Trabalha braquial e antebraço."
-        },
-        {
-            "name": "Rosca Alternada Halteres",
-            "focus": "Bíceps (Cabeça Longa)",
-            "notes": "Sentado com costas apoiadas. Alterne os braços. Gire o punho (supinação) durante a subida."
-        },
-        {
-            "name": "Rosca Scott Máquina",
-            "focus": "Bíceps (Cabeça Curta/Pico)",
-            "notes": "Braços apoiados no suporte. Isola o bíceps eliminando impulso. Foco no pico."
-        },
-    ],
-    
-    # ============ TRÍCEPS ============
-    # Focos diferentes para garantir variedade
-    "triceps": [
-        {
-            "name": "Tríceps Corda (Polia Alta)",
-            "focus": "Cabeça Lateral",
-            "notes": "Cotovelos fixos ao lado do corpo. Estenda completamente, abrindo a corda no final."
-        },
-        {
-            "name": "Tríceps Francês Halter",
-            "focus": "Cabeça Longa",
-            "notes": "Sentado. Halter acima da cabeça. Desça atrás da cabeça. Estenda sem mover cotovelos."
-        },
-        {
-            "name": "Tríceps Barra Reta (Polia Alta)",
-            "focus": "Cabeça Medial",
-            "notes": "Pegada pronada. Cotovelos fixos. Empurre a barra até extensão completa."
-        },
-        {
-            "name": "Tríceps Máquina",
-            "focus": "Tríceps Geral",
-            "notes": "Costas apoiadas. Empurre as manoplas estendendo cotovelos. Retorne controlado."
-        },
-    ],
-    
-    # ============ QUADRÍCEPS ============
-    "quadriceps": [
-        {
-            "name": "Leg Press 45°",
-            "focus": "Quadríceps Completo",
-            "notes": "Pés no centro da plataforma na largura dos ombros. Desça até 90° nos joelhos. Empurre sem travar os joelhos no topo."
-        },
-        {
-            "name": "Cadeira Extensora",
-            "focus": "Vasto Lateral/Medial",
-            "notes": "Ajuste o encosto para joelhos alinhados com o eixo. Estenda as pernas completamente, contraindo no topo. Desça controlado."
-        },
-        {
-            "name": "Agachamento no Smith Machine",
-            "focus": "Quadríceps/Glúteos",
-            "notes": "Pés ligeiramente à frente da barra. Desça até coxas paralelas ao chão. Suba empurrando pelos calcanhares. Joelhos alinhados com os pés."
-        },
-        {
-            "name": "Hack Machine",
-            "focus": "Vasto Lateral",
-            "notes": "Costas apoiadas, ombros sob as almofadas. Pés na largura dos ombros. Desça controlado até 90°. Empurre sem travar joelhos."
-        },
-    ],
-    
-    # ============ POSTERIOR DE COXA ============
-    "posterior": [
-        {
-            "name": "Mesa Flexora",
-            "focus": "Posterior (Deitado)",
-            "notes": "Deite de bruços com joelhos alinhados ao eixo da máquina. Flexione as pernas trazendo os calcanhares em direção aos glúteos. Desça controlado."
-        },
-        {
-            "name": "Cadeira Flexora (Sentado)",
-            "focus": "Posterior (Sentado)",
-            "notes": "Sente com coxas apoiadas. Flexione as pernas para baixo e para trás. Contraia no final do movimento. Retorne controlado."
-        },
-        {
-            "name": "Stiff na Máquina Smith",
-            "focus": "Posterior/Glúteos",
-            "notes": "Pernas semi-estendidas, pés na largura do quadril. Desça a barra deslizando próximo às coxas até sentir alongamento. Suba contraindo glúteos."
-        },
-        {
-            "name": "Glúteo na Máquina (Kick Back)",
-            "focus": "Glúteo Máximo",
-            "notes": "Apoie o pé na plataforma. Empurre para trás estendendo o quadril. Contraia o glúteo no topo. Retorne controlado sem deixar peso bater."
-        },
-    ],
-    
-    # ============ PANTURRILHA ============
-    "panturrilha": [
-        {
-            "name": "Panturrilha Sentado na Máquina",
-            "focus": "Sóleo",
-            "notes": "Joelhos a 90° sob as almofadas. Eleve os calcanhares o máximo possível. Desça controlado até sentir alongamento completo."
-        },
-        {
-            "name": "Panturrilha em Pé na Máquina",
-            "focus": "Gastrocnêmio",
-            "notes": "Ombros sob as almofadas. Eleve nos dedos o máximo possível, contraindo no topo. Desça alongando completamente."
-        },
-    ],
-    
-    # ============ ABDÔMEN ============
-    "abdomen": [
-        {
-            "name": "Abdominal na Polia Alta (Corda)",
-            "focus": "Reto Abdominal",
-            "notes": "Ajoelhe de costas para a polia. Segure a corda atrás da cabeça. Flexione o tronco em direção ao chão. Retorne controlado."
-        },
-        {
-            "name": "Elevação de Pernas no Apoio",
-            "focus": "Abdômen Inferior",
-            "notes": "Costas apoiadas no suporte, braços nos apoios. Eleve as pernas estendidas até 90°. Desça controlado sem balançar o corpo."
-        },
-    ],
-}
-
-DAYS = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado", "Domingo"]
-
-# ==================== SPLITS ====================
-
-def get_split_for_frequency(freq: int) -> List[Dict]:
-    splits = {
-        1: [{"name": "Full Body", "muscles": ["peito", "costas", "ombros", "quadriceps", "posterior", "biceps", "triceps"]}],
-        2: [
-            # Upper/Lower com distribuição específica
-            # Upper: 2 peito, 2 costas, 2 ombro, 1 biceps, 1 triceps, 1 abdomen = 9 exercícios
-            {"name": "Upper", "muscles": ["peito", "costas", "ombros", "biceps", "triceps", "abdomen"], "is_upper_lower": True},
-            {"name": "Lower", "muscles": ["quadriceps", "posterior", "panturrilha"]},
-        ],
-        3: [
-            {"name": "A - Push", "muscles": ["peito", "ombros", "triceps"]},
-            {"name": "B - Pull", "muscles": ["costas", "biceps", "abdomen"]},
-            {"name": "C - Legs", "muscles": ["quadriceps", "posterior", "panturrilha"]},
-        ],
-        4: [
-            # ABCD: Ombro + Abdômen junto (permitido)
-            {"name": "A - Peito/Tríceps", "muscles": ["peito", "triceps"]},
-            {"name": "B - Costas/Bíceps", "muscles": ["costas", "biceps"]},
-            {"name": "C - Pernas", "muscles": ["quadriceps", "posterior", "panturrilha"]},
-            {"name": "D - Ombros/Abdômen", "muscles": ["ombros", "abdomen"]},
-        ],
-        5: [
-            # ABCDE: Nunca treino só de ombros - D é Full Upper
-            # C - Pernas Quad: foco quadríceps + 1 posterior para estímulo
-            # E - Pernas Post: foco posteriores + 1 quadríceps para estímulo
-            {"name": "A - Peito", "muscles": ["peito", "triceps"]},
-            {"name": "B - Costas", "muscles": ["costas", "biceps"]},
-            {"name": "C - Pernas Quad", "muscles": ["quadriceps", "posterior", "panturrilha"]},
-            {"name": "D - Full Upper", "muscles": ["ombros", "peito", "costas"]},
-            {"name": "E - Pernas Post", "muscles": ["posterior", "quadriceps", "abdomen"]},
-        ],
-        6: [
-            {"name": "A - Push", "muscles": ["peito", "ombros", "triceps"]},
-            {"name": "B - Pull", "muscles": ["costas", "biceps"]},
-            {"name": "C - Legs", "muscles": ["quadriceps", "posterior", "panturrilha"]},
-            {"name": "D - Push", "muscles": ["peito", "ombros", "triceps"]},
-            {"name": "E - Pull", "muscles": ["costas", "biceps", "abdomen"]},
-            {"name": "F - Legs", "muscles": ["quadriceps", "posterior", "panturrilha"]},
-        ],
-        7: [
-            # 7x: Ombro junto com outro grupo
-            {"name": "A - Peito", "muscles": ["peito"]},
-            {"name": "B - Costas", "muscles": ["costas"]},
-            {"name": "C - Ombros/Peito", "muscles": ["ombros", "peito"]},
-            {"name": "D - Braços", "muscles": ["biceps", "triceps"]},
-            {"name": "E - Quadríceps", "muscles": ["quadriceps", "panturrilha"]},
-            {"name": "F - Posterior", "muscles": ["posterior"]},
-            {"name": "G - Core", "muscles": ["abdomen"]},
-        ],
-    }
-    return splits.get(freq, splits[3])
-
-# ==================== UPPER BODY ESPECÍFICO ====================
-# Configuração fixa para treino Upper (2x/semana)
-
-UPPER_BODY_EXERCISES = [
-    # 2 de Peito
-    {"name": "Supino Reto na Máquina", "muscle_group": "Peito", "focus": "Peitoral Médio", 
-     "notes": "Sente com costas apoiadas. Empurre as manoplas para frente até extensão quase completa."},
-    {"name": "Crucifixo na Máquina (Peck Deck)", "muscle_group": "Peito", "focus": "Peitoral Médio - Adução",
-     "notes": "Cotovelos na altura dos ombros. Junte os braços à frente contraindo o peitoral."},
-    # 2 de Costas
-    {"name": "Puxada Frontal Pegada Aberta", "muscle_group": "Costas", "focus": "Dorsal (Largura)",
-     "notes": "Pegada pronada mais larga que os ombros. Puxe a barra até o queixo."},
-    {"name": "Remada Baixa Polia (Triângulo)", "muscle_group": "Costas", "focus": "Dorsal Inferior",
-     "notes": "Sente com pernas levemente flexionadas. Puxe o triângulo até o abdômen baixo."},
-    # 2 de Ombro
-    {"name": "Desenvolvimento Máquina", "muscle_group": "Ombros", "focus": "Deltóide Anterior/Médio",
-     "notes": "Costas totalmente apoiadas. Empurre até quase estender os cotovelos."},
-    {"name": "Elevação Lateral Máquina", "muscle_group": "Ombros", "focus": "Deltóide Lateral",
-     "notes": "Cotovelos apoiados nas almofadas. Eleve até altura dos ombros."},
-    # 1 de Bíceps
-    {"name": "Rosca Direta Barra", "muscle_group": "Bíceps", "focus": "Bíceps Completo",
-     "notes": "Cotovelos fixos ao lado do corpo. Suba a barra até a altura dos ombros."},
-    # 1 de Tríceps
-    {"name": "Tríceps Corda (Polia Alta)", "muscle_group": "Tríceps", "focus": "Tríceps Completo",
-     "notes": "Cotovelos fixos ao lado do corpo. Estenda completamente e separe as pontas da corda."},
-    # 1 de Abdômen
-    {"name": "Abdominal Máquina", "muscle_group": "Abdômen", "focus": "Reto Abdominal",
-     "notes": "Segure as manoplas, flexione o tronco para baixo contraindo o abdômen."},
-]
+# ==================== EXERCÍCIOS / SPLITS ====================
+# Catálogo único em workout/ (exercises.py = dados, catalog.py = índices)
+from workout.exercises import UPPER_BODY_EXERCISES, DAYS, SMALL_MUSCLES, get_split_for_frequency
+from workout.catalog import (
+    CATALOG,
+    MUSCLE_DISPLAY_NAMES,
+    catalog_level,
+    full_body_exercise_ids,
+    get_candidates,
+    muscle_exercise_ids,
+)
 
 
 def parse_rest_seconds(rest_str: str) -> int:
@@ -436,21 +151,20 @@ class WorkoutAIService:
         return 4
     
     def _generate_workout(self, user_id: str, frequency: int, level: str, goal: str, duration: int, completed_workouts: int) -> WorkoutPlan:
+        """
+        Busca o template (memoizado) e apenas carimba ids, user_id e objetivo.
+        """
+        frequency = effective_frequency(level, frequency)
+        template = get_workout_template(frequency, level, duration, is_adaptation_phase(level, completed_workouts))
+        return stamp_workout_template(template, user_id, goal, completed_workouts)
+    
+    def _build_workout_template(self, frequency: int, level: str, duration: int, is_adaptation: bool) -> "WorkoutTemplate":
+        """
+        Monta o treino completo para a chave (frequência, nível, duração, adaptação).
+        Resultado é imutável e independe do usuário - ver get_workout_template.
+        """
         split = get_split_for_frequency(frequency)
         
-        # ==================== VALIDAÇÃO DE DIAS POR NÍVEL ====================
-        # Novato: ideal 2-3 dias
-        # 6+ dias: apenas para Intermediário e Avançado
-        if level == 'novato' and frequency > 3:
-            frequency = 3  # Limita novato a 3 dias
-            split = get_split_for_frequency(frequency)
-        elif level == 'iniciante' and frequency > 5:
-            frequency = 5  # Limita iniciante a 5 dias
-            split = get_split_for_frequency(frequency)
-        
-        # NOVATO: Treino de adaptação nas primeiras 30 sessões
-        is_adaptation = level == 'novato' and completed_workouts < 30
-        
         # ==================== CONFIGURAÇÕES POR NÍVEL ====================
         # NOVATO = nunca treinou (treinos simples, exercícios seguros, menor volume)
         # INICIANTE = 6 meses - 2 anos (volume moderado, compostos + acessórios leves)
@@ -467,7 +181,6 @@ class WorkoutAIService:
                 "reps": "12-15",
                 "rest": "90-120s",
                 "ex_per_muscle": 1,
-                "machine_only": True,
                 "notes_prefix": "⚠️ ADAPTAÇÃO - CARGA LEVE! ",
                 "general_note": "FASE DE ADAPTAÇÃO: Foco 100% na execução correta. Técnica acima de carga."
             }
@@ -478,7 +191,6 @@ class WorkoutAIService:
                 "reps": "12-15",
                 "rest": "90-120s",
                 "ex_per_muscle": 1,  # Menos exercícios por músculo
-                "machine_only": True,
                 "notes_prefix": "",
                 "general_note": "Foco 100% na execução correta. Evite cargas pesadas."
             }
@@ -489,9 +201,6 @@ class WorkoutAIService:
                 "reps": "10-12",
                 "rest": "75-90s",
                 "ex_per_muscle": 2,
-                "machine_only": False,
-                "allow_free_weights": ["elevacao_lateral", "rosca_alternada", "triceps_frances"],
-                "block_exercises": ["supino_barra", "agachamento_livre", "stiff_livre"],
                 "notes_prefix": "",
                 "general_note": "Progressão simples. Aumente cargas gradualmente."
             }
@@ -502,9 +211,6 @@ class WorkoutAIService:
                 "reps": "8-12",
                 "rest": "75-90s",
                 "ex_per_muscle": 2,
-                "machine_only": False,
-                "allow_free_weights": True,
-                "block_exercises": [],
                 "notes_prefix": "💪 Chegue PERTO DA FALHA em pelo menos 1 série. ",
                 "general_note": "Controle de descanso. Pode usar técnicas como bi-set e pirâmide."
             }
@@ -515,9 +221,6 @@ class WorkoutAIService:
                 "reps": "6-10",  # AVANÇADO: 6-10 reps (baixo volume, alta intensidade)
                 "rest": "90-120s",
                 "ex_per_muscle": 3,  # MAIS exercícios que intermediário
-                "machine_only": False,
-                "allow_free_weights": True,
-                "block_exercises": [],
                 "notes_prefix": "🔥 ATÉ A FALHA! ",
                 "general_note": "AVANÇADO: Pode usar drop set, rest pause, bi-set. Técnica impecável."
             }
@@ -525,14 +228,8 @@ class WorkoutAIService:
         # ==================== MÁXIMO DE EXERCÍCIOS (REGRA DURA: 10) ====================
         max_exercises = self._get_exercises_per_duration(duration, level)
         
-        # Exercícios compostos que sempre precisam de aquecimento
-        COMPOUND_EXERCISES = [
-            "agachamento", "stiff", "levantamento", "supino", "desenvolvimento",
-            "remada", "puxada", "leg press", "hack"
-        ]
-        
-        # Músculos pequenos: máximo 2 exercícios
-        SMALL_MUSCLES = ["ombros", "triceps", "biceps", "panturrilha", "abdomen"]
+        # Filtro do catálogo por nível (apenas máquinas / bloqueios): workout/catalog.py
+        exercise_level = catalog_level(level, is_adaptation)
         
         workout_days = []
         
@@ -545,39 +242,8 @@ class WorkoutAIService:
             # ==================== TRATAMENTO ESPECIAL: FULL BODY (1x/semana) ====================
             # Garante 1 exercício por grupo muscular principal
             if template["name"] == "Full Body" and frequency == 1:
-                full_body_exercises = [
-                    {"name": "Supino Reto na Máquina", "muscle_group": "Peito", "focus": "Peitoral Médio",
-                     "notes": "Sente com costas apoiadas. Empurre as manoplas para frente até extensão quase completa."},
-                    {"name": "Puxada Frontal Pegada Aberta", "muscle_group": "Costas", "focus": "Dorsal (Largura)",
-                     "notes": "Pegada pronada mais larga que os ombros. Puxe a barra até o queixo."},
-                    {"name": "Desenvolvimento Máquina", "muscle_group": "Ombros", "focus": "Deltóide Anterior/Médio",
-                     "notes": "Costas totalmente apoiadas. Empurre até quase estender os cotovelos."},
-                    {"name": "Leg Press 45°", "muscle_group": "Quadríceps", "focus": "Quadríceps Completo",
-                     "notes": "Pés no centro da plataforma na largura dos ombros. Desça até 90° nos joelhos."},
-                    {"name": "Mesa Flexora", "muscle_group": "Posterior", "focus": "Posterior de Coxa",
-                     "notes": "Deite de bruços com joelhos alinhados ao eixo da máquina. Flexione trazendo calcanhares aos glúteos."},
-                    {"name": "Rosca Scott Máquina", "muscle_group": "Bíceps", "focus": "Bíceps (Pico)",
-                     "notes": "Braços apoiados no suporte. Isola o bíceps eliminando impulso."},
-                    {"name": "Tríceps Corda (Polia Alta)", "muscle_group": "Tríceps", "focus": "Cabeça Lateral",
-                     "notes": "Cotovelos fixos ao lado do corpo. Estenda completamente, abrindo a corda no final."},
-                ]
-                
-                # Adiciona exercícios extras se tiver tempo
-                if duration >= 60:
-                    full_body_exercises.append(
-                        {"name": "Cadeira Extensora", "muscle_group": "Quadríceps", "focus": "Vasto Lateral/Medial",
-                         "notes": "Ajuste o encosto para joelhos alinhados com o eixo. Estenda as pernas completamente."}
-                    )
-                if duration >= 75:
-                    full_body_exercises.append(
-                        {"name": "Panturrilha em Pé na Máquina", "muscle_group": "Panturrilha", "focus": "Gastrocnêmio",
-                         "notes": "Ombros sob as almofadas. Eleve nos dedos o máximo possível, contraindo no topo."}
-                    )
-                if duration >= 90:
-                    full_body_exercises.append(
-                        {"name": "Crucifixo na Máquina (Peck Deck)", "muscle_group": "Peito", "focus": "Peitoral - Adução",
-                         "notes": "Cotovelos na altura dos ombros. Junte os braços à frente contraindo o peitoral."}
-                    )
+                # Lista base + extras por tempo vem do catálogo
+                full_body_exercises = [CATALOG[ex_id] for ex_id in full_body_exercise_ids(duration)]
                 
                 # Usa todos os exercícios base (7) + extras baseado no tempo
                 # Para Full Body, garantimos mínimo de 7 exercícios (1 por grupo muscular)
@@ -585,7 +251,7 @@ class WorkoutAIService:
                 exercises_to_use = full_body_exercises
                 
                 for ex_data in exercises_to_use[:full_body_max]:
-                    execution_notes = ex_data.get("notes", "")
+                    execution_notes = ex_data.notes
                     sets_count = config["sets"]
                     
                     if level == 'avancado':
@@ -596,9 +262,9 @@ class WorkoutAIService:
                         notes = f"🎯 {execution_notes}"
                     
                     exercises.append(Exercise(
-                        name=ex_data["name"],
-                        muscle_group=ex_data["muscle_group"],
-                        focus=ex_data.get("focus"),
+                        name=ex_data.name,
+                        muscle_group=MUSCLE_DISPLAY_NAMES[ex_data.muscle],
+                        focus=ex_data.focus,
                         sets=sets_count,
                         reps=config["reps"],
                         rest=config["rest"],
@@ -708,38 +374,12 @@ class WorkoutAIService:
                 else:
                     max_for_muscle = config["ex_per_muscle"]
                     
-                available = EXERCISES.get(muscle, [])
-                
-                # Filtra exercícios baseado no nível
-                filtered = []
-                for ex in available:
-                    ex_name_lower = ex["name"].lower()
-                    
-                    # Novatos e adaptação: apenas máquinas
-                    if config.get("machine_only"):
-                        if "máquina" in ex_name_lower or "polia" in ex_name_lower or "pulley" in ex_name_lower or "leg press" in ex_name_lower or "cadeira" in ex_name_lower or "mesa" in ex_name_lower or "cross" in ex_name_lower or "smith" in ex_name_lower:
-                            filtered.append(ex)
-                    else:
-                        # Verifica exercícios bloqueados
-                        blocked = config.get("block_exercises", [])
-                        is_blocked = False
-                        
-                        # Bloqueios específicos
-                        if "supino" in ex_name_lower and "barra" in ex_name_lower and "supino_barra" in blocked:
-                            is_blocked = True
-                        if "rosca" in ex_name_lower and "barra" in ex_name_lower and "direta" in ex_name_lower:
-                            is_blocked = True
-                        if "agachamento" in ex_name_lower and "livre" in ex_name_lower and "agachamento_livre" in blocked:
-                            is_blocked = True
-                        if "stiff" in ex_name_lower and "livre" in ex_name_lower and "stiff_livre" in blocked:
-                            is_blocked = True
-                        
-                        if not is_blocked:
-                            filtered.append(ex)
+                # Candidatos pré-filtrados por nível (máquinas / bloqueios) no catálogo
+                filtered = [CATALOG[ex_id] for ex_id in get_candidates(muscle, exercise_level)]
                 
                 # Se não encontrou exercícios filtrados, usa os disponíveis (fallback)
                 if not filtered:
-                    filtered = available[:config["ex_per_muscle"]]
+                    filtered = [CATALOG[ex_id] for ex_id in muscle_exercise_ids(muscle)[:config["ex_per_muscle"]]]
                 
                 # ==================== EVITAR FOCOS REPETIDOS ====================
                 # Seleciona exercícios garantindo que cada um tenha um foco diferente
@@ -750,7 +390,7 @@ class WorkoutAIService:
                     if len(selected_exercises) >= max_for_muscle:
                         break
                     
-                    ex_focus = ex.get("focus", "")
+                    ex_focus = ex.focus
                     
                     # Se o foco já foi usado, pula este exercício
                     if ex_focus and ex_focus in used_focuses:
@@ -773,17 +413,16 @@ class WorkoutAIService:
                     if exercises_added >= max_exercises:
                         break
                     
-                    ex_name_lower = ex_data["name"].lower()
                     rest_str = config["rest"]
                     
                     # Foco muscular específico
-                    exercise_focus = ex_data.get("focus", None)
+                    exercise_focus = ex_data.focus
                     
                     # Instruções de EXECUÇÃO do exercício (separadas)
-                    execution_notes = ex_data.get("notes", "")
+                    execution_notes = ex_data.notes
                     
                     # Verifica se é exercício composto
-                    is_compound = any(comp in ex_name_lower for comp in COMPOUND_EXERCISES)
+                    is_compound = ex_data.compound
                     
                     # Verifica se precisa aquecer (APENAS primeiro exercício do músculo)
                     needs_warmup = muscle not in muscles_warmed_up
@@ -886,7 +525,7 @@ class WorkoutAIService:
                         notes = f"{series_instruction}\n\n🎯 {execution_notes}" if execution_notes and series_instruction else (f"🎯 {execution_notes}" if execution_notes else series_instruction)
                     
                     exercises.append(Exercise(
-                        name=ex_data["name"],
+                        name=ex_data.name,
                         muscle_group=muscle.capitalize(),
                         focus=exercise_focus,
                         sets=sets_count,
@@ -929,10 +568,9 @@ class WorkoutAIService:
         # Nota geral do treino baseada no nível
         general_note = config.get("general_note", "")
         
-        # Nota especial para novatos em adaptação
+        # Nota especial para novatos em adaptação (restantes são carimbados por usuário)
         if is_adaptation:
-            remaining = 30 - completed_workouts
-            notes = f"🔰 FASE DE ADAPTAÇÃO ({remaining} treinos restantes)\n{general_note}\n{split_name} | {frequency}x/semana | ~{duration}min"
+            notes = f"🔰 FASE DE ADAPTAÇÃO ({REMAINING_WORKOUTS_PLACEHOLDER} treinos restantes)\n{general_note}\n{split_name} | {frequency}x/semana | ~{duration}min"
         elif level == 'avancado':
             notes = f"🏆 {level_name} | {split_name} | {frequency}x/semana | ~{duration}min\n{general_note}"
         elif level == 'intermediario':
@@ -940,11 +578,103 @@ class WorkoutAIService:
         else:
             notes = f"{split_name} | {level_name} | {frequency}x/semana | ~{duration}min"
         
-        return WorkoutPlan(
-            user_id=user_id,
+        return WorkoutTemplate(
             training_level=level,
-            goal=goal,
             weekly_frequency=frequency,
-            workout_days=workout_days,
+            is_adaptation=is_adaptation,
+            days=tuple(
+                (
+                    MappingProxyType(day.dict(exclude={"id", "exercises"})),
+                    tuple(MappingProxyType(ex.dict(exclude={"id"})) for ex in day.exercises),
+                )
+                for day in workout_days
+            ),
             notes=notes
         )
+
+
+# ==================== CACHE DE TEMPLATES ====================
+# O treino gerado depende apenas de (frequência efetiva, nível, duração, fase de
+# adaptação). O objetivo não altera exercícios e é só carimbado no plano.
+
+ADAPTATION_WORKOUTS = 30  # Novato: treinos de adaptação antes do treino normal
+REMAINING_WORKOUTS_PLACEHOLDER = "{remaining}"
+WORKOUT_TEMPLATE_CACHE_SIZE = 1024
+
+# Combinações oferecidas no app (onboarding/configurações) para pré-aquecimento
+PREWARM_FREQUENCIES = range(1, 8)
+PREWARM_LEVELS = ("novato", "iniciante", "intermediario", "avancado")
+PREWARM_DURATIONS = (30, 45, 60, 75, 90, 120)
+
+
+class WorkoutTemplate(NamedTuple):
+    """Treino pronto e imutável, sem ids nem dados do usuário"""
+    training_level: str
+    weekly_frequency: int
+    is_adaptation: bool
+    days: Tuple[Tuple[Mapping, Tuple[Mapping, ...]], ...]  # (campos do dia, exercícios)
+    notes: str
+
+
+def effective_frequency(level: str, frequency: int) -> int:
+    """Novato: máximo 3 dias. Iniciante: máximo 5 dias. 6+ só intermediário/avançado."""
+    if level == 'novato' and frequency > 3:
+        return 3
+    if level == 'iniciante' and frequency > 5:
+        return 5
+    return frequency
+
+
+def is_adaptation_phase(level: str, completed_workouts: int) -> bool:
+    """NOVATO: Treino de adaptação nas primeiras 30 sessões"""
+    return level == 'novato' and (completed_workouts or 0) < ADAPTATION_WORKOUTS
+
+
+@lru_cache(maxsize=WORKOUT_TEMPLATE_CACHE_SIZE)
+def get_workout_template(frequency: int, level: str, duration: int, is_adaptation: bool) -> WorkoutTemplate:
+    """Template memoizado em processo (frequência já deve estar limitada pelo nível)"""
+    return WorkoutAIService()._build_workout_template(frequency, level, duration, is_adaptation)
+
+
+def stamp_workout_template(template: WorkoutTemplate, user_id: str, goal: str,
+                           completed_workouts: int = 0) -> WorkoutPlan:
+    """
+    Cria o WorkoutPlan do usuário a partir do template: ids novos, user_id,
+    objetivo e treinos restantes da adaptação. Os campos já foram validados
+    na montagem do template, então os modelos são construídos sem revalidar.
+    """
+    notes = template.notes
+    if template.is_adaptation:
+        remaining = ADAPTATION_WORKOUTS - (completed_workouts or 0)
+        notes = notes.replace(REMAINING_WORKOUTS_PLACEHOLDER, str(remaining))
+    
+    workout_days = [
+        WorkoutDay.model_construct(
+            id=str(uuid.uuid4()),
+            exercises=[Exercise.model_construct(id=str(uuid.uuid4()), **ex) for ex in exercises],
+            **day
+        )
+        for day, exercises in template.days
+    ]
+    return WorkoutPlan.model_construct(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        created_at=datetime.utcnow(),
+        training_level=template.training_level,
+        goal=goal,
+        weekly_frequency=template.weekly_frequency,
+        workout_days=workout_days,
+        notes=notes
+    )
+
+
+def prewarm_workout_templates() -> int:
+    """Gera antecipadamente todas as combinações comuns. Retorna quantas estão em cache."""
+    for level in PREWARM_LEVELS:
+        phases = (True, False) if level == 'novato' else (False,)
+        for frequency in PREWARM_FREQUENCIES:
+            frequency = effective_frequency(level, frequency)
+            for duration in PREWARM_DURATIONS:
+                for is_adaptation in phases:
+                    get_workout_template(frequency, level, duration, is_adaptation)
+    return get_workout_template.cache_info().currsize
@@ -0,0 +1,31 @@
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+import mongomock_motor
+import pytest
+
+# Os módulos do backend são importados sem pacote (ex.: `from diet_service import ...`)
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def mongo_db():
+    """Banco Mongo em memória (mongomock-motor), novo a cada teste"""
+    return mongomock_motor.AsyncMongoMockClient()["laf_test"]
+
+
+@asynccontextmanager
+async def _api_client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def api_client():
+    """Cliente HTTP in-process para um app ASGI: `async with api_client(app) as client:`"""
+    return _api_client
@@ -0,0 +1,163 @@
+"""
+Referência congelada das fórmulas nutricionais ANTES da consolidação
+em backend/diet/formulas.py (cópia de server.py, sem os prints).
+
+Não alterar: serve de oráculo para os testes de paridade.
+"""
+
+from typing import Dict
+
+
+def normalize_goal(goal: str) -> str:
+    if not goal:
+        return "manutencao"
+
+    goal = goal.lower().strip()
+
+    if goal in ["ganho_muscular", "bulking", "hipertrofia", "ganho", "massa"]:
+        return "bulking"
+
+    if goal in ["cutting", "definicao", "definição", "emagrecimento", "emagrecer"]:
+        return "cutting"
+
+    if goal in ["manutencao", "manutenção", "maintenance", "manter"]:
+        return "manutencao"
+
+    return "manutencao"
+
+
+def calculate_bmr(weight: float, height: float, age: int, sex: str) -> float:
+    if sex.lower() == "masculino":
+        bmr = (10 * weight) + (6.25 * height) - (5 * age) + 5
+    else:
+        bmr = (10 * weight) + (6.25 * height) - (5 * age) - 161
+    return bmr
+
+
+def calculate_cardio_burn(cardio_minutos_semana: int, intensidade_cardio: str) -> int:
+    if not cardio_minutos_semana or cardio_minutos_semana <= 0:
+        return 0
+
+    kcal_por_min = {
+        'leve': 5,
+        'light': 5,
+        'moderado': 8,
+        'moderate': 8,
+        'intenso': 11,
+        'intense': 11,
+        'high': 11
+    }
+
+    intensidade = intensidade_cardio.lower() if intensidade_cardio else 'moderado'
+    kcal_min = kcal_por_min.get(intensidade, 8)
+
+    return cardio_minutos_semana * kcal_min
+
+
+def calculate_tdee(bmr: float, training_frequency: int, training_level: str,
+                   cardio_minutos_semana: int = 0, intensidade_cardio: str = 'moderado') -> float:
+    if training_frequency <= 1:
+        factor = 1.2
+    elif training_frequency <= 3:
+        factor = 1.375
+    elif training_frequency <= 5:
+        factor = 1.55
+    else:
+        factor = 1.725
+
+    training_bonus = {
+        'beginner': 0, 'iniciante': 0, 'novato': 0,
+        'intermediate': 50, 'intermediario': 50,
+        'advanced': 100, 'avancado': 100
+    }
+    bonus = training_bonus.get(training_level.lower(), 0)
+
+    tdee_base = bmr * factor + bonus
+
+    cardio_semanal = calculate_cardio_burn(cardio_minutos_semana, intensidade_cardio)
+
+    if cardio_semanal > 0:
+        cardio_diario = cardio_semanal / 7
+        return tdee_base + cardio_diario
+    return tdee_base
+
+
+def calculate_target_calories(tdee: float, goal: str, weight: float, training_level: str = 'intermediario') -> float:
+    goal = normalize_goal(goal)
+    level = training_level.lower() if training_level else 'intermediario'
+
+    is_recomp = level in ['novato', 'iniciante', 'beginner']
+
+    if is_recomp and goal in ['cutting', 'bulking']:
+        delta = 0
+    elif goal == "cutting":
+        delta = -300
+    elif goal == "bulking":
+        delta = 200
+    else:
+        delta = 0
+
+    MAX_SURPLUS = 400
+    MAX_DEFICIT = -600
+
+    if delta > MAX_SURPLUS:
+        delta = MAX_SURPLUS
+    elif delta < MAX_DEFICIT:
+        delta = MAX_DEFICIT
+
+    return tdee + delta
+
+
+def calculate_macros(target_calories: float, weight: float, goal: str) -> Dict[str, float]:
+    goal = normalize_goal(goal)
+
+    protein_g = weight * 2.0
+    protein_min = weight * 1.8
+    protein_max = weight * 2.3
+    protein_g = max(protein_min, min(protein_max, protein_g))
+
+    fat_g = weight * 0.9
+    fat_min = weight * 0.7
+    fat_max = weight * 1.0
+    fat_g = max(fat_min, min(fat_max, fat_g))
+
+    if goal == "cutting":
+        carb_min = weight * 2.0
+    elif goal == "bulking":
+        carb_min = weight * 4.5
+    else:
+        carb_min = weight * 3.0
+
+    protein_cal = protein_g * 4
+    fat_cal = fat_g * 9
+
+    carb_cal = target_calories - protein_cal - fat_cal
+    carb_g = carb_cal / 4
+
+    carb_g = max(carb_min, carb_g)
+
+    total_cal = (protein_g * 4) + (carb_g * 4) + (fat_g * 9)
+    cal_diff_pct = abs(total_cal - target_calories) / target_calories * 100
+
+    if cal_diff_pct > 5:
+        carb_cal_needed = target_calories - protein_cal - fat_cal
+        carb_g_adjusted = carb_cal_needed / 4
+        carb_g = max(carb_min, carb_g_adjusted)
+
+    return {
+        "protein": round(protein_g, 1),
+        "carbs": round(carb_g, 1),
+        "fat": round(fat_g, 1)
+    }
+
+
+def profile_targets(weight, height, age, sex, frequency, level, goal, cardio_min, cardio_intensity) -> Dict:
+    """Fluxo de POST /user/profile com as fórmulas antigas."""
+    bmr = calculate_bmr(weight, height, age, sex)
+    tdee = calculate_tdee(bmr, frequency, level, cardio_min, cardio_intensity)
+    target = calculate_target_calories(tdee, goal, weight, level)
+    return {
+        "tdee": round(tdee, 0),
+        "target_calories": round(target, 0),
+        "macros": calculate_macros(target, weight, goal),
+    }
@@ -0,0 +1,171 @@
+"""
+Exclusão de conta em cascata (backend/accounts).
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from accounts import (
+    DELETION_JOB_STALE_SECONDS,
+    DELETION_JOBS,
+    USER_COLLECTIONS,
+    AccountDeletionError,
+    delete_user_data,
+    get_deletion_job,
+    owner_filter,
+    run_deletion_job,
+    start_deletion_job,
+)
+
+
+async def seed(db, user_id):
+    now = datetime(2026, 6, 10)
+    await db.users_auth.insert_one({"_id": user_id, "id": user_id, "email": f"{user_id}@x.com"})
+    await db.user_profiles.insert_one({"_id": user_id, "name": user_id})
+    await db.weight_series.insert_one({"user_id": user_id, "weight": 80, "recorded_at": now})
+    await db.water_sodium_tracker.insert_one({"user_id": user_id, "day": "2026-06-10", "water_ml": 500})
+    await db.notifications.insert_many([{"user_id": user_id, "title": "a"}, {"user_id": user_id, "title": "b"}])
+    await db.notification_counters.insert_one({"_id": user_id, "unread": 2})
+    await db.sync_counters.insert_one({"_id": user_id, "seq": 3})
+    await db.meal_logs.insert_one({"id": user_id})
+
+
+def test_owner_filter_uses_or_only_for_multiple_keys():
+    assert owner_filter("u1", ("user_id",)) == {"user_id": "u1"}
+    assert owner_filter("u1", ("_id", "id")) == {"$or": [{"_id": "u1"}, {"id": "u1"}]}
+    names = [c.name for c in USER_COLLECTIONS]
+    assert len(names) == len(set(names))
+    assert {"weight_records", "weight_series", "water_sodium_tracker", "notifications", "workout_plans"} <= set(names)
+
+
+def test_delete_user_data_spares_other_users(mongo_db):
+    async def run(db):
+        await seed(db, "gone")
+        await seed(db, "kept")
+        deleted = await delete_user_data(db, "gone")
+        left = {c.name: await db[c.name].count_documents(owner_filter("kept", c.keys)) for c in USER_COLLECTIONS}
+        return deleted, left
+
+    deleted, left = asyncio.run(run(mongo_db))
+    assert deleted["notifications"] == 2
+    assert deleted["users_auth"] == 1 and deleted["weight_series"] == 1 and deleted["meal_logs"] == 1
+    assert sum(left.values()) == 9
+
+
+def test_background_job_reports_status(mongo_db):
+    async def run(db):
+        await seed(db, "gone")
+        job_id = await start_deletion_job(db, "gone")
+        for _ in range(50):
+            job = await get_deletion_job(db, job_id)
+            if job["status"] == "done":
+                break
+            await asyncio.sleep(0.01)
+        return job, await db.user_profiles.count_documents({})
+
+    job, profiles = asyncio.run(run(mongo_db))
+    assert job["status"] == "done" and job["deleted_data"]["user_profiles"] == 1
+    assert profiles == 0
+
+
+class BrokenCollection:
+    async def delete_many(self, query):
+        raise RuntimeError("primary indisponível")
+
+
+class PartlyBrokenDb:
+    """Banco em que algumas coleções sempre falham no delete"""
+
+    def __init__(self, db, broken):
+        self.db, self.broken = db, broken
+
+    def __getitem__(self, name):
+        return BrokenCollection() if name in self.broken else self.db[name]
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+def test_failed_collection_fails_the_job_and_keeps_credentials(monkeypatch, mongo_db):
+    from accounts import deletion
+
+    monkeypatch.setattr(deletion, "PURGE_RETRY_DELAY", 0)
+
+    async def run(db):
+        await seed(db, "gone")
+        broken = PartlyBrokenDb(db, {"notifications"})
+        job_id = str(uuid.uuid4())
+        await db.account_deletion_jobs.insert_one({"_id": job_id, "user_id": "gone", "status": "pending"})
+        with pytest.raises(AccountDeletionError) as error:
+            await run_deletion_job(broken, job_id, "gone")
+        job = await get_deletion_job(db, job_id)
+        left = await db.users_auth.count_documents({}), await db.user_profiles.count_documents({})
+        # Reenvio depois que o banco voltou
+        retried = await delete_user_data(db, "gone")
+        return error.value, job, left, retried
+
+    error, job, left, retried = asyncio.run(run(mongo_db))
+    assert set(error.failed) == {"notifications"} and error.deleted["user_profiles"] == 1
+    assert job["status"] == "failed" and "notifications" in job["failed_collections"]
+    assert left == (1, 0)
+    assert retried == {"notifications": 2, "users_auth": 1}
+
+
+def test_failed_background_job_leaves_no_unretrieved_exception(monkeypatch, mongo_db):
+    from accounts import deletion
+
+    monkeypatch.setattr(deletion, "PURGE_RETRY_DELAY", 0)
+
+    async def run(db):
+        await seed(db, "gone")
+        job_id = await start_deletion_job(PartlyBrokenDb(db, {"notifications"}), "gone")
+        tasks = list(deletion._running)
+        await asyncio.gather(*tasks)
+        return [t.exception() for t in tasks], await get_deletion_job(db, job_id)
+
+    errors, job = asyncio.run(run(mongo_db))
+    assert errors == [None]
+    assert job["status"] == "failed" and "notifications" in job["failed_collections"]
+
+
+def test_stuck_job_is_reported_as_failed(mongo_db):
+    async def run(db):
+        now = datetime.utcnow()
+        old = now - timedelta(seconds=DELETION_JOB_STALE_SECONDS + 1)
+        await db[DELETION_JOBS].insert_many([
+            {"_id": "crashed", "user_id": "u1", "status": "running", "created_at": old, "started_at": old},
+            {"_id": "never-started", "user_id": "u2", "status": "pending", "created_at": old},
+            {"_id": "busy", "user_id": "u3", "status": "running", "created_at": now, "started_at": now},
+        ])
+        reported = {job_id: (await get_deletion_job(db, job_id))["status"] for job_id in ("crashed", "never-started", "busy")}
+        stored = await db[DELETION_JOBS].find_one({"_id": "crashed"})
+        return reported, stored
+
+    reported, stored = asyncio.run(run(mongo_db))
+    assert reported == {"crashed": "failed", "never-started": "failed", "busy": "running"}
+    assert stored["status"] == "failed" and stored["error"] == "Job interrompido"
+
+
+def test_generate_saves_trace_that_replays_and_is_deleted_with_the_account(mongo_db, api_client):
+    from benchmarks.load_test import bind_app
+    from diet.trace import DIET_TRACES, diff_meals, replay
+
+    async def run(db):
+        app = bind_app(db)
+        await db.user_profiles.insert_one({
+            "_id": "u1", "goal": "cutting", "weight": 80, "target_calories": 2000,
+            "macros": {"protein": 160, "carbs": 180, "fat": 60}, "food_preferences": [], "dietary_restrictions": [],
+        })
+        async with api_client(app) as client:
+            diet = (await client.post("/api/diet/generate?user_id=u1")).json()
+        trace = await db[DIET_TRACES].find_one({"_id": diet["id"]})
+        await delete_user_data(db, "u1")
+        return diet, trace, await db[DIET_TRACES].count_documents({})
+
+    diet, trace, remaining = asyncio.run(run(mongo_db))
+    assert trace["user_id"] == "u1" and trace["entry"] == "plan"
+    assert diff_meals(diet["meals"], replay(trace)) == []
+    assert remaining == 0
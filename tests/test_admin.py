@@ -0,0 +1,58 @@
+"""
+Guarda dos endpoints /admin (X-Admin-Token, falha fechado).
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def server(mongo_db):
+    from benchmarks.load_test import bind_app
+
+    bind_app(mongo_db)
+    asyncio.run(mongo_db.user_profiles.insert_one({"_id": "u1", "weight": 80}))
+    import server
+
+    return server
+
+
+@pytest.fixture
+def call(server, mongo_db, api_client):
+    def post(path, token=None, **params):
+        async def run():
+            headers = {"X-Admin-Token": token} if token else {}
+            async with api_client(server.app) as client:
+                response = await client.post(path, params=params, headers=headers)
+            return response, await mongo_db.user_profiles.find_one({"_id": "u1"})
+
+        return asyncio.run(run())
+
+    return post
+
+
+def test_recalculate_targets_is_closed_without_configured_token(monkeypatch, server, call):
+    monkeypatch.setattr(server, "ADMIN_API_TOKEN", None)
+    response, _ = call("/api/admin/recalculate-targets")
+    assert response.status_code == 503
+
+    monkeypatch.setattr(server, "ADMIN_API_TOKEN", "segredo")
+    assert call("/api/admin/recalculate-targets")[0].status_code == 403
+    assert call("/api/admin/recalculate-targets", token="errado")[0].status_code == 403
+    response, profile = call("/api/admin/recalculate-targets", token="segredo", dry_run="true")
+    assert response.status_code == 200 and response.json()["scanned"] == 1
+    assert profile == {"_id": "u1", "weight": 80}
+
+
+def test_profiler_requires_token_and_clamps_interval(monkeypatch, server, call):
+    monkeypatch.setattr(server, "ADMIN_API_TOKEN", None)
+    assert call("/api/admin/profiler/start", interval_ms=1)[0].status_code == 503
+
+    monkeypatch.setattr(server, "ADMIN_API_TOKEN", "segredo")
+    try:
+        response, _ = call("/api/admin/profiler/start", token="segredo", seconds=600, interval_ms=0.01)
+        assert response.status_code == 200
+        assert response.json()["interval_ms"] == 5 and response.json()["seconds"] == 120
+    finally:
+        call("/api/admin/profiler/stop", token="segredo")
@@ -0,0 +1,98 @@
+"""
+Smoke test da suíte offline do motor de dieta (backend/benchmarks).
+
+O gate de regressão completo roda via CLI (`python -m benchmarks.diet_engine
+--baseline ...`); aqui só garantimos que o corpus cobre as classes pedidas e
+que a comparação com o baseline detecta pioras.
+"""
+
+import copy
+
+from benchmarks.corpus import BODY_SIZES, GOALS, MEAL_COUNTS, RESTRICTIONS, diet_corpus
+from benchmarks.diet_engine import compare_reports, run_diet_benchmark
+
+
+def test_corpus_covers_every_class():
+    cases = diet_corpus()
+    assert len(cases) == len(RESTRICTIONS) * len(MEAL_COUNTS) * len(GOALS) * len(BODY_SIZES)
+    assert len({case.case_id for case in cases}) == len(cases)
+    tiny = [c for c in cases if c.classes["size"] == "tiny"]
+    huge = [c for c in cases if c.classes["size"] == "huge"]
+    assert max(c.target_calories for c in tiny) < min(c.target_calories for c in huge)
+
+
+def test_benchmark_report_and_regression_gate():
+    cases = [c for c in diet_corpus() if c.classes["meals"] == "5" and c.classes["size"] == "medium"]
+    report = run_diet_benchmark(repeat=1, warmup=0, cases=cases)
+
+    assert report["meta"]["cases"] == len(cases)
+    for name in ("overall", "restriction:vegano", "restriction:sem_lactose", "goal:cutting"):
+        summary = report["classes"][name]
+        assert summary["p50_ms"] > 0 and summary["p99_ms"] >= summary["p50_ms"]
+        assert summary["peak_kib"] > 0
+        assert summary["macro_error_pct"] >= 0
+
+    assert compare_reports(report, report) == []
+
+    slower = copy.deepcopy(report)
+    for summary in slower["classes"].values():
+        summary["p99_ms"] = summary["p99_ms"] * 3 + 10
+        summary["macro_error_pct"] += 5
+    regressions = compare_reports(slower, report)
+    assert any("overall: p99_ms" in line for line in regressions)
+    assert any("macro_error_pct" in line for line in regressions)
+
+
+def test_trace_replay_matches_and_feeds_the_corpus(tmp_path):
+    import json
+
+    from benchmarks.corpus import trace_corpus
+    from diet.trace import anonymize, build_trace, diff_meals, replay
+
+    case = next(c for c in diet_corpus() if c.case_id == "vegetariano-5m-cutting-medium")
+    trace = build_trace("d1", "u1", "plan", case.profile, case.target_calories, case.target_macros, case.meal_count)
+    first, second = replay(trace), replay(trace)
+    assert first and diff_meals(first, second) == []
+
+    changed = json.loads(json.dumps(first))
+    changed[0]["foods"][0]["grams"] += 10
+    assert len(diff_meals(first, changed)) == 1
+
+    item = anonymize(trace)
+    assert "user_id" not in item and "_id" not in item
+    path = tmp_path / "corpus.json"
+    path.write_text(json.dumps([item, anonymize({**trace, "entry": "meals"})]))
+    cases = trace_corpus(str(path))
+    assert [c.classes for c in cases] == [
+        {"restriction": "vegetariano", "meals": "5", "goal": "cutting", "source": "trace"}
+    ]
+    report = run_diet_benchmark(repeat=1, warmup=0, cases=cases)
+    assert report["classes"]["source:trace"]["samples"] == 1
+
+
+def test_engine_output_does_not_depend_on_hash_seed():
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "import json\n"
+        "from benchmarks.corpus import diet_corpus\n"
+        "from diet.trace import build_trace, replay\n"
+        "out = []\n"
+        "for c in diet_corpus()[::9]:\n"
+        "    for entry in ('plan', 'meals'):\n"
+        "        t = build_trace('d', 'u', entry, c.profile, c.target_calories, c.target_macros, c.meal_count)\n"
+        "        out.append([[f['key'], f['grams']] for m in replay(t) for f in m['foods']])\n"
+        "print(json.dumps(out))\n"
+    )
+    backend = Path(__file__).resolve().parent.parent / "backend"
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=backend, capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("0", "1", "2")
+    }
+    assert len(outputs) == 1
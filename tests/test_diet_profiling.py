@@ -0,0 +1,51 @@
+"""
+Profiler por etapa da geração de dieta (diet/profiling.py).
+"""
+
+import contextlib
+import io
+
+from benchmarks.corpus import diet_corpus
+from prometheus_client import REGISTRY
+
+from diet.profiling import FINE_TUNE_ITERATIONS, current_profile, diet_profile, macro_error_pct
+from diet_service import DietAIService, calc_food
+
+PIPELINE_STAGES = ("validate_user_foods", "generate_diet", "fine_tune_diet", "validate_and_fix_diet",
+                   "apply_global_limits", "validate_food_frequency")
+
+
+def test_generation_records_stages_counters_and_macro_error():
+    case = diet_corpus()[0]
+    observed = REGISTRY.get_sample_value("laf_diet_fine_tune_iterations_sum") or 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        with diet_profile() as profile:
+            plan = DietAIService().generate_diet_plan(
+                case.profile, case.target_calories, case.target_macros, case.meal_count)
+
+    assert current_profile() is None
+    assert set(PIPELINE_STAGES) <= set(profile.stages)
+    assert profile.total_seconds >= max(profile.stages.values())
+    assert profile.counters["calc_food"] > 0
+    assert profile.counters["fine_tune_diet_calls"] >= 1
+    # O histograma conta as passadas do loop de ajuste, não as chamadas
+    assert profile.counters[FINE_TUNE_ITERATIONS] >= profile.counters["fine_tune_diet_calls"]
+    assert REGISTRY.get_sample_value("laf_diet_fine_tune_iterations_sum") - observed == profile.counters[FINE_TUNE_ITERATIONS]
+    assert profile.macro_error_pct == round(macro_error_pct(plan.computed_macros, plan.target_macros), 2)
+
+    header = profile.server_timing()
+    assert "fine_tune_diet;dur=" in header and "total;dur=" in header
+
+
+def test_profiling_is_noop_without_active_profile():
+    assert current_profile() is None
+    assert calc_food("arroz_branco", 100) == calc_food("arroz_branco", 100)
+    assert current_profile() is None
+
+
+def test_nested_profile_reuses_outer():
+    with diet_profile() as outer:
+        with diet_profile() as inner:
+            calc_food("frango", 150)
+        assert inner is outer
+    assert outer.counters["calc_food"] == 1
@@ -0,0 +1,87 @@
+"""
+Formato compacto de diet_plans (backend/diet/storage.py) e sua migração.
+"""
+
+import asyncio
+import contextlib
+import io
+
+import bson
+
+from benchmarks.corpus import diet_corpus
+from diet.storage import STORAGE_VERSION, compact_diet, hydrate_diet
+from diet_service import DietAIService, calc_food
+
+
+def generated_diet(case_id="nenhuma-5m-cutting-medium"):
+    case = next(c for c in diet_corpus() if c.case_id == case_id)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plan = DietAIService().generate_diet_plan(
+            user_profile=dict(case.profile),
+            target_calories=case.target_calories,
+            target_macros=dict(case.target_macros),
+            meal_count=case.meal_count,
+        )
+    diet = plan.model_dump()
+    diet["_id"] = diet["id"]
+    return diet
+
+
+def test_compact_roundtrip_is_lossless_and_smaller():
+    diet = generated_diet()
+    compact = compact_diet(diet)
+
+    assert compact["storage_version"] == STORAGE_VERSION
+    assert all(isinstance(food, list) for meal in compact["meals"] for food in meal["foods"])
+    assert "total_calories" not in compact["meals"][0]
+    assert hydrate_diet(compact) == diet
+    assert len(bson.encode(compact)) * 2 < len(bson.encode(diet))
+
+
+def test_non_derivable_fields_are_kept():
+    tweaked = calc_food("frango", 150)
+    tweaked["protein"] += 5
+    custom = {"key": "receita_da_vo", "name": "Receita da vó", "grams": 200, "calories": 300}
+    diet = {
+        "_id": "d1",
+        "meals": [{
+            "id": "m1", "name": "Pré-treino", "time": "17:00",
+            "foods": [calc_food("arroz_branco", 120), tweaked, custom],
+            "total_calories": 999, "macros": {"protein": 1, "carbs": 2, "fat": 3},
+        }],
+    }
+    compact = compact_diet(diet)
+    meal = compact["meals"][0]
+
+    assert meal["name"] == "Pré-treino" and "meal_type" not in meal
+    assert meal["foods"][0] == ["arroz_branco", 120]
+    assert meal["foods"][1] == tweaked and meal["foods"][2] == custom
+    assert meal["total_calories"] == 999
+    assert hydrate_diet(compact) == diet
+
+
+def test_legacy_documents_are_read_unchanged():
+    diet = generated_diet()
+    assert hydrate_diet(diet) is diet
+    assert hydrate_diet(None) is None
+
+
+def test_migration_compacts_existing_documents(mongo_db):
+    from migrations.compact_diet_plans import migrate_diet_plans
+
+    async def run(db):
+        legacy = generated_diet()
+        await db.diet_plans.insert_one(legacy)
+        await db.diet_plans.insert_one(compact_diet({**generated_diet(), "_id": "already-compact"}))
+
+        report = await migrate_diet_plans(db, batch_size=1)
+        again = await migrate_diet_plans(db, batch_size=1)
+        stored = await db.diet_plans.find_one({"_id": legacy["_id"]})
+        return legacy, report, again, stored
+
+    legacy, report, again, stored = asyncio.run(run(mongo_db))
+    assert report["scanned"] == 1 and report["replaced"] == 1
+    assert again["scanned"] == 0
+    assert stored["storage_version"] == STORAGE_VERSION
+    # Mongo guarda datas com precisão de milissegundos
+    assert hydrate_diet(stored)["meals"] == legacy["meals"]
@@ -0,0 +1,102 @@
+"""
+Fila de jobs com coalescing por usuário (backend/jobs).
+"""
+
+import asyncio
+
+from jobs import JOBS, JobWorkerPool, enqueue, get_job
+
+
+def test_enqueue_coalesces_waiting_jobs_per_user(mongo_db):
+    seen = []
+
+    async def regenerate(job):
+        seen.append((job["user_id"], job["payload"]["goal"]))
+        return {"goal": job["payload"]["goal"]}
+
+    async def run(db):
+        first = await enqueue(db, "regen", "u1", {"goal": "cutting"})
+        second = await enqueue(db, "regen", "u1", {"goal": "bulking"})
+        other = await enqueue(db, "regen", "u2", {"goal": "cutting"})
+        processed = await JobWorkerPool(db, {"regen": regenerate}).run_pending()
+        return first, second, other, processed, await get_job(db, first["job_id"])
+
+    first, second, other, processed, job = asyncio.run(run(mongo_db))
+    assert not first["coalesced"] and second["coalesced"]
+    assert second["job_id"] == first["job_id"] != other["job_id"]
+    assert processed == 2
+    assert sorted(seen) == [("u1", "bulking"), ("u2", "cutting")]
+    assert job["status"] == "done" and job["result"] == {"goal": "bulking"}
+
+
+def test_running_job_is_not_coalesced_and_blocks_the_next_one(mongo_db):
+    async def run(db):
+        pool = JobWorkerPool(db, {"regen": lambda job: asyncio.sleep(0)})
+        first = await enqueue(db, "regen", "u1")
+        claimed = await pool.claim()
+        second = await enqueue(db, "regen", "u1")
+        blocked = await pool.claim()
+        await pool.run_job(claimed)
+        return first, claimed, second, blocked, await pool.claim()
+
+    first, claimed, second, blocked, after = asyncio.run(run(mongo_db))
+    assert claimed["_id"] == first["job_id"]
+    assert not second["coalesced"] and second["job_id"] != first["job_id"]
+    assert blocked is None
+    assert after["_id"] == second["job_id"]
+
+
+def test_failed_job_is_retried_then_marked_failed(mongo_db):
+    async def boom(job):
+        raise RuntimeError("gerador falhou")
+
+    async def run(db):
+        pool = JobWorkerPool(db, {"regen": boom})
+        queued = await enqueue(db, "regen", "u1")
+        job = await pool.claim()
+        await pool.run_job(job)
+        retry = await db[JOBS].find_one({"_id": queued["job_id"]})
+        await db[JOBS].update_one({"_id": queued["job_id"]}, {"$set": {"attempts": 3}})
+        await pool.run_job({**job, "attempts": 3})
+        return retry, await get_job(db, queued["job_id"])
+
+    retry, final = asyncio.run(run(mongo_db))
+    assert retry["status"] == "queued" and retry["run_after"] > retry["created_at"]
+    assert final["status"] == "failed" and "gerador falhou" in final["error"]
+
+
+def test_account_deletion_cancels_queued_jobs_and_running_job_does_not_resurrect_the_diet(monkeypatch, mongo_db):
+    from accounts import delete_user_data
+    from benchmarks.load_test import bind_app
+    from diet.trace import DIET_TRACES
+    import server
+
+    profile = {
+        "_id": "u1", "goal": "cutting", "weight": 80, "target_calories": 2000, "meal_count": 4,
+        "macros": {"protein": 160, "carbs": 180, "fat": 60}, "food_preferences": [], "dietary_restrictions": [],
+    }
+
+    async def run(db):
+        bind_app(db)
+        await db.user_profiles.insert_one(profile)
+        queued = await enqueue(db, server.DIET_REGENERATION, "u1", {"source": "switch_goal"})
+        await delete_user_data(db, "u1")
+        left_in_queue = await server.job_workers.claim()
+
+        # Conta excluída enquanto a geração roda no executor
+        await db.user_profiles.insert_one(profile)
+        generate = server.run_in_diet_executor
+
+        async def delete_midway(fn, *args, **kwargs):
+            await delete_user_data(db, "u1")
+            return await generate(fn, *args, **kwargs)
+
+        monkeypatch.setattr(server, "run_in_diet_executor", delete_midway)
+        result = await server._diet_regeneration_job({"user_id": "u1", "payload": {"source": "switch_goal"}})
+        leftovers = await db.diet_plans.count_documents({}) + await db[DIET_TRACES].count_documents({})
+        return queued, left_in_queue, await db[JOBS].count_documents({}), result, leftovers
+
+    queued, left_in_queue, jobs, result, leftovers = asyncio.run(run(mongo_db))
+    assert queued["status"] == "queued" and left_in_queue is None and jobs == 0
+    assert result == {"skipped": "perfil removido"}
+    assert leftovers == 0
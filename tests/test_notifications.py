@@ -0,0 +1,140 @@
+"""
+Lembretes materializados com dedupe_key e contador de não lidas (backend/notifications).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from notifications import NotificationScheduler, list_notifications, mark_read, unread_count
+from tracking import WeightStore
+
+NOW = datetime(2026, 6, 10, 12)
+
+
+async def seed(db):
+    await db.weight_series.insert_many([
+        {"_id": "w1", "user_id": "late", "weight": 80, "recorded_at": NOW - timedelta(days=9)},
+        {"_id": "w2", "user_id": "soon", "weight": 70, "recorded_at": NOW - timedelta(days=5, hours=2)},
+        {"_id": "w3", "user_id": "fresh", "weight": 60, "recorded_at": NOW - timedelta(days=1)},
+    ])
+    await db.water_sodium_tracker.insert_one({
+        "_id": "b1", "user_id": "fresh", "day": "2026-06-09", "date": datetime(2026, 6, 9),
+        "water_ml": 1200, "sodium_mg": 900, "water_below_minimum": True, "sodium_below_minimum": False,
+    })
+
+
+def test_scan_materializes_reminders_once(mongo_db):
+    async def run(db):
+        await seed(db)
+        scheduler = NotificationScheduler(db, WeightStore(db, legacy_read=False), interval=60)
+        first = await scheduler.run_once(NOW)
+        second = await scheduler.run_once(NOW + timedelta(minutes=15))
+        counts = {user: await unread_count(db, user) for user in ("late", "soon", "fresh")}
+        fresh = await list_notifications(db, "fresh")
+        return first, second, counts, fresh
+
+    first, second, counts, fresh = asyncio.run(run(mongo_db))
+    assert first == {"candidates": 3, "created": 3}
+    assert second["created"] == 0
+    assert counts == {"late": 1, "soon": 1, "fresh": 1}
+    assert fresh[0]["type"] == "water_minimum" and "1200ml" in fresh[0]["message"]
+    assert "dedupe_key" not in fresh[0]
+
+
+def test_weight_scan_only_considers_recent_cycles(mongo_db):
+    async def run(db):
+        await seed(db)
+        await db.weight_series.insert_many([
+            {"_id": "w4", "user_id": "gone", "weight": 90, "recorded_at": NOW - timedelta(days=400)},
+            {"_id": "w5", "user_id": "moved", "weight": 75, "recorded_at": NOW - timedelta(days=2)},
+        ])
+        await db.weight_records.insert_many([
+            {"_id": "r1", "user_id": "legacy", "weight": 85, "recorded_at": NOW - timedelta(days=8)},
+            {"_id": "r2", "user_id": "moved", "weight": 76, "recorded_at": NOW - timedelta(days=8)},
+        ])
+        scheduler = NotificationScheduler(db, WeightStore(db, legacy_read=True), interval=60)
+        await scheduler.run_once(NOW)
+        return {user: await unread_count(db, user) for user in ("late", "gone", "legacy", "moved")}
+
+    assert asyncio.run(run(mongo_db)) == {"late": 1, "gone": 0, "legacy": 1, "moved": 0}
+
+
+def test_due_reminder_supersedes_soon_and_reads_update_counter(mongo_db):
+    async def run(db):
+        await seed(db)
+        scheduler = NotificationScheduler(db, WeightStore(db, legacy_read=False), interval=60)
+        await scheduler.run_once(NOW)
+        await scheduler.run_once(NOW + timedelta(days=2))  # "soon" vence
+        soon = await list_notifications(db, "soon")
+        after_due = await unread_count(db, "soon")
+        marked = await mark_read(db, "soon")
+        return soon, after_due, marked, await unread_count(db, "soon")
+
+    soon, after_due, marked, final = asyncio.run(run(mongo_db))
+    assert [(n["priority"], n["read"]) for n in soon] == [("high", False), ("low", True)]
+    assert after_due == 1
+    assert marked == 1 and final == 0
+
+
+def test_only_one_worker_holds_the_lease(mongo_db):
+    async def run(db):
+        a = NotificationScheduler(db, interval=60)
+        b = NotificationScheduler(db, interval=60)
+        b.owner = "outro-worker"
+        return (
+            await a._acquire_lease(NOW),
+            await b._acquire_lease(NOW),
+            await a._acquire_lease(NOW + timedelta(seconds=30)),
+            await b._acquire_lease(NOW + timedelta(seconds=61)),
+        )
+
+    assert asyncio.run(run(mongo_db)) == (True, False, True, False)
+
+
+def test_bulk_read_and_unread_count_endpoints(mongo_db, api_client):
+    from benchmarks.load_test import bind_app
+    from notifications import publish
+
+    async def run(db):
+        app = bind_app(db)
+        await db.user_profiles.insert_one({"_id": "u1"})
+        await publish(db, [
+            {"_id": f"n{i}", "user_id": "u1", "dedupe_key": f"k{i}", "type": "general",
+             "title": f"Aviso {i}", "created_at": NOW + timedelta(hours=i)}
+            for i in range(5)
+        ])
+        async with api_client(app) as client:
+            badge = (await client.get("/api/notifications/u1/unread-count")).json()
+            by_ids = (await client.put("/api/notifications/user/u1/read", json={"ids": ["n0", "n4", "n4"]})).json()
+            before = (await client.put(
+                "/api/notifications/user/u1/read", json={"before": (NOW + timedelta(hours=2)).isoformat()}
+            )).json()
+            single = (await client.put("/api/notifications/n3/read", json={})).json()
+            empty = await client.put("/api/notifications/user/u1/read", json={})
+            unknown = await client.put("/api/notifications/user/ninguem/read", json={"ids": ["n1"]})
+            final = (await client.get("/api/notifications/u1/unread-count")).json()
+        return badge, by_ids, before, single, empty, unknown, final
+
+    badge, by_ids, before, single, empty, unknown, final = asyncio.run(run(mongo_db))
+    assert badge["unread_count"] == 5
+    assert (by_ids["marked"], by_ids["unread_count"]) == (2, 3)
+    assert (before["marked"], before["unread_count"]) == (2, 1)
+    assert single == {"success": True}
+    assert empty.status_code == 400 and unknown.status_code == 404
+    assert final["unread_count"] == 0
+
+
+def test_legacy_users_without_counter_are_recounted(mongo_db):
+    async def run(db):
+        await db.notifications.insert_many([
+            {"_id": f"{user}{i}", "user_id": user, "title": "antigo", "read": False, "created_at": NOW}
+            for user in ("a", "b") for i in range(5)
+        ])
+        from notifications import publish
+
+        marked = await mark_read(db, "a", {"_id": "a0"})
+        await publish(db, [{"_id": "novo", "user_id": "b", "dedupe_key": "k", "title": "novo", "created_at": NOW}])
+        await publish(db, [{"_id": "novo2", "user_id": "b", "dedupe_key": "k2", "title": "novo", "created_at": NOW}])
+        return marked, await unread_count(db, "a"), await unread_count(db, "b")
+
+    assert asyncio.run(run(mongo_db)) == (1, 4, 7)
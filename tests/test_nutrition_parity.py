@@ -0,0 +1,114 @@
+"""
+Paridade das fórmulas nutricionais consolidadas (diet/formulas.py e
+diet/batch.py) contra a implementação antiga (tests/legacy_nutrition.py).
+
+Perfis aleatórios reprodutíveis, com valores de borda injetados. O volume
+é controlado por LAF_PARITY_PROFILES (padrão 100k; use milhões antes de
+mexer nas fórmulas) e a semente por LAF_PARITY_SEED.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from diet import formulas
+from diet.batch import calculate_targets_batch, profile_targets_from_batch
+
+from . import legacy_nutrition as legacy
+
+PARITY_PROFILES = int(os.environ.get("LAF_PARITY_PROFILES", "100000"))
+PARITY_SEED = int(os.environ.get("LAF_PARITY_SEED", "20260101"))
+CHUNK = 50_000
+
+SEXES = ["masculino", "feminino", "Masculino", "FEMININO", "male", "m", "outro"]
+LEVELS = ["novato", "iniciante", "intermediario", "avancado", "beginner",
+          "intermediate", "advanced", "Avancado", "INICIANTE", "elite"]
+GOALS = ["cutting", "bulking", "manutencao", "manter", "hipertrofia", "definição",
+         "Emagrecimento", " massa ", "maintenance", "ganho_muscular", "recomp", "", None]
+INTENSITIES = ["leve", "light", "moderado", "moderate", "intenso", "intense",
+               "high", "HIGH", "extremo", "", None]
+FREQUENCIES = [0, 1, 1.5, 2, 3, 3.0001, 4, 5, 5.5, 6, 7]
+CARDIO_MINUTES = [0, 0, 0, -30, 1, 30, 60, 90, 150, 300, 600]
+
+
+def random_profiles(n: int, seed: int):
+    """Gera colunas de perfis aleatórios (mistura contínua + valores de borda)."""
+    rng = np.random.default_rng(seed)
+    pick = lambda options: [options[i] for i in rng.integers(0, len(options), n)]
+
+    weight = np.round(rng.uniform(35, 200, n), 1)
+    weight[:3] = [35.0, 120.0, 200.0]
+    return {
+        "weight": weight.tolist(),
+        "height": np.round(rng.uniform(130, 220, n), 1).tolist(),
+        "age": rng.integers(12, 90, n).tolist(),
+        "sex": pick(SEXES),
+        "frequency": pick(FREQUENCIES),
+        "level": pick(LEVELS),
+        "goal": pick(GOALS),
+        "cardio_min": pick(CARDIO_MINUTES),
+        "intensity": pick(INTENSITIES),
+    }
+
+
+def iter_chunks(total: int):
+    for start in range(0, total, CHUNK):
+        yield start, min(CHUNK, total - start)
+
+
+def row(cols, i):
+    return (cols["weight"][i], cols["height"][i], cols["age"][i], cols["sex"][i],
+            cols["frequency"][i], cols["level"][i], cols["goal"][i],
+            cols["cardio_min"][i], cols["intensity"][i])
+
+
+def test_normalize_goal_matches_legacy():
+    rng = np.random.default_rng(PARITY_SEED)
+    alphabet = list("abcdefghijklmnopqrstuvwxyzçã_ ")
+    samples = [g for g in GOALS] + list(legacy_aliases())
+    samples += ["".join(rng.choice(alphabet, rng.integers(1, 14))) for _ in range(5000)]
+    for goal in samples:
+        variants = [goal] if goal is None else [goal, goal.upper(), f"  {goal}\t"]
+        for value in variants:
+            assert formulas.normalize_goal(value) == legacy.normalize_goal(value), value
+
+
+def legacy_aliases():
+    return ["ganho_muscular", "bulking", "hipertrofia", "ganho", "massa",
+            "cutting", "definicao", "definição", "emagrecimento", "emagrecer",
+            "manutencao", "manutenção", "maintenance", "manter"]
+
+
+def test_cardio_burn_matches_legacy():
+    for minutes in CARDIO_MINUTES + [None, 45.5]:
+        for intensity in INTENSITIES:
+            assert formulas.calculate_cardio_burn(minutes, intensity) == \
+                legacy.calculate_cardio_burn(minutes, intensity)
+
+
+@pytest.mark.parametrize("frequency", [x / 4 for x in range(-4, 40)])
+def test_activity_factor_boundaries(frequency):
+    assert formulas.calculate_tdee(1500, frequency, "intermediario") == \
+        legacy.calculate_tdee(1500, frequency, "intermediario")
+
+
+def test_scalar_pipeline_matches_legacy():
+    for offset, size in iter_chunks(PARITY_PROFILES):
+        cols = random_profiles(size, PARITY_SEED + offset)
+        for i in range(size):
+            args = row(cols, i)
+            assert formulas.calculate_profile_targets(*args) == legacy.profile_targets(*args), args
+
+
+def test_batch_pipeline_matches_legacy():
+    for offset, size in iter_chunks(PARITY_PROFILES):
+        cols = random_profiles(size, PARITY_SEED + 7919 + offset)
+        result = calculate_targets_batch(
+            weight=cols["weight"], height=cols["height"], age=cols["age"], sex=cols["sex"],
+            training_frequency=cols["frequency"], training_level=cols["level"], goal=cols["goal"],
+            cardio_minutos_semana=cols["cardio_min"], intensidade_cardio=cols["intensity"],
+        )
+        for i in range(size):
+            args = row(cols, i)
+            assert profile_targets_from_batch(result, i) == legacy.profile_targets(*args), args
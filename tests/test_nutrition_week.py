@@ -0,0 +1,52 @@
+"""
+Semana de nutrição (GET /api/nutrition/week): variantes treino/descanso e ETag.
+"""
+
+import asyncio
+from datetime import datetime
+
+
+DIET = {
+    "_id": "d1", "user_id": "u1", "created_at": datetime(2026, 5, 1),
+    "computed_calories": 2000, "target_macros": {"protein": 150, "carbs": 200, "fat": 60},
+    "meals": [{"name": "Almoço", "time": "12:00", "foods": [
+        {"key": "arroz_branco", "name": "Arroz", "grams": 200, "calories": 260, "protein": 5, "carbs": 56, "fat": 0.6},
+        {"key": "frango_grelhado", "name": "Frango", "grams": 150, "calories": 240, "protein": 45, "carbs": 0, "fat": 5},
+    ]}],
+}
+
+
+def test_week_returns_seven_days_backed_by_two_cached_variants(mongo_db, api_client):
+    from benchmarks.load_test import bind_app
+    import server
+
+    async def run(db):
+        app = bind_app(db)
+        # Segunda (1) e quinta (4) no formato do app (0=Domingo)
+        await db.user_profiles.insert_one({"_id": "u1", "training_days": [1, 4], "weekly_training_frequency": 2})
+        await db.diet_plans.insert_one(DIET)
+        server._nutrition_week_cache.clear()
+        async with api_client(app) as client:
+            week = await client.get("/api/nutrition/week/u1?start=2026-06-07")  # domingo
+            again = await client.get("/api/nutrition/week/u1?start=2026-06-07",
+                                     headers={"If-None-Match": week.headers["etag"]})
+            single = (await client.get("/api/diet/u1")).json()
+            bad = await client.get("/api/nutrition/week/u1?start=ontem")
+        return week, again, single, bad, len(server._nutrition_week_cache)
+
+    week, again, single, bad, cached = asyncio.run(run(mongo_db))
+    body = week.json()
+    assert [d["date"] for d in body["days"]][::6] == ["2026-06-07", "2026-06-13"]
+    assert [d["day_type"] for d in body["days"]] == ["rest", "train", "rest", "rest", "train", "rest", "rest"]
+    assert set(body["plans"]) == {"training", "rest"} and cached == 2
+
+    training, rest = body["plans"]["training"], body["plans"]["rest"]
+    assert [f["grams"] for f in training["meals"][0]["foods"]] == [230, 150]
+    assert [f["grams"] for f in rest["meals"][0]["foods"]] == [160, 150]
+    assert training["targets"]["adjusted_calories"] == 2100 and rest["targets"]["adjusted_calories"] == 1900
+    assert body["days"][1]["calories"] == training["computed_calories"]
+    # Mesmo ajuste do GET /diet para o tipo do dia de hoje
+    assert single["meals"][0]["foods"] == body["plans"][single["diet_type"]]["meals"][0]["foods"]
+
+    assert again.status_code == 304
+    assert bad.status_code == 400
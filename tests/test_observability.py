@@ -0,0 +1,160 @@
+"""
+Middleware de métricas e listener de comandos do Mongo (backend/observability).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from observability import MetricsMiddleware, MongoCommandMetrics, PoolUsage, ReadinessProbe, metrics_response
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def build_app():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/api/items/{item_id}")
+    async def read_item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/metrics")
+    async def metrics():
+        return metrics_response()
+
+    return app
+
+
+def test_requests_are_labelled_by_route_template(api_client):
+    labels = {"method": "GET", "route": "/api/items/{item_id}", "status": "200"}
+    before = sample("laf_http_requests_total", **labels)
+    unmatched_before = sample("laf_http_requests_total", method="GET", route="<unmatched>", status="404")
+
+    async def run():
+        async with api_client(build_app()) as client:
+            await client.get("/api/items/a")
+            await client.get("/api/items/b")
+            await client.get("/missing")
+            return await client.get("/metrics")
+
+    response = asyncio.run(run())
+    assert sample("laf_http_requests_total", **labels) == before + 2
+    assert sample("laf_http_requests_total", method="GET", route="<unmatched>", status="404") == unmatched_before + 1
+    assert 'route="/api/items/{item_id}"' in response.text
+    assert 'route="/metrics"' not in response.text
+
+
+def test_mongo_listener_groups_by_collection_and_command():
+    listener = MongoCommandMetrics()
+    before = sample("laf_mongo_command_duration_seconds_count", collection="diet_plans", command="find")
+    failures_before = sample("laf_mongo_command_failures_total", collection="-", command="ping")
+
+    started = SimpleNamespace(connection_id=("db", 27017), request_id=1,
+                              command_name="find", command={"find": "diet_plans"})
+    listener.started(started)
+    listener.succeeded(SimpleNamespace(connection_id=("db", 27017), request_id=1,
+                                       command_name="find", duration_micros=1500))
+
+    listener.started(SimpleNamespace(connection_id=("db", 27017), request_id=2,
+                                     command_name="ping", command={"ping": 1}))
+    listener.failed(SimpleNamespace(connection_id=("db", 27017), request_id=2,
+                                    command_name="ping", duration_micros=10))
+
+    assert sample("laf_mongo_command_duration_seconds_count", collection="diet_plans", command="find") == before + 1
+    assert sample("laf_mongo_command_failures_total", collection="-", command="ping") == failures_before + 1
+    assert listener._pending == {}
+
+
+class FakeDb:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.pings = 0
+
+    async def command(self, name):
+        self.pings += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"ok": 1}
+
+
+def build_probe(db, lag=0.0, queue=0):
+    return ReadinessProbe(db, PoolUsage(), max_pool_size=10,
+                          loop_lag=lambda: lag, diet_queue_depth=lambda: queue)
+
+
+def test_readiness_probe_reports_each_check_and_caches():
+    db = FakeDb()
+    probe = build_probe(db)
+
+    async def run():
+        return await probe.check(), await probe.check()
+
+    (ready, checks), (ready_again, _) = asyncio.run(run())
+    assert ready and ready_again
+    assert set(checks) == {"mongo", "mongo_pool", "event_loop", "diet_executor"}
+    assert db.pings == 1
+
+
+def test_readiness_probe_fails_on_mongo_error_lag_or_queue():
+    ready, checks = asyncio.run(build_probe(FakeDb(error=RuntimeError("down"))).check())
+    assert not ready and not checks["mongo"]["ok"]
+
+    ready, checks = asyncio.run(build_probe(FakeDb(), lag=5.0).check())
+    assert not ready and not checks["event_loop"]["ok"]
+
+    ready, checks = asyncio.run(build_probe(FakeDb(), queue=1000).check())
+    assert not ready and not checks["diet_executor"]["ok"]
+
+
+def test_pool_usage_tracks_checked_out_connections():
+    pool = PoolUsage()
+    address = ("localhost", 27017)
+    event = SimpleNamespace(address=address)
+    for _ in range(3):
+        pool.connection_check_out_started(event)
+        pool.connection_checked_out(event)
+    pool.connection_checked_in(event)
+    assert pool.snapshot() == (2, 0)
+
+
+def test_sampling_profiler_tags_samples_from_worker_threads():
+    import threading
+    import time
+
+    from observability import SamplingProfiler, publish_thread_tags, sample_tags
+
+    def burn():
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            sum(range(200))
+
+    def tagged_worker():
+        with publish_thread_tags():
+            burn()
+
+    profiler = SamplingProfiler(seconds=5, interval=0.002)
+    profiler.start()
+    with sample_tags(restrictions="vegetariano", meal_count=5):
+        import contextvars
+        ctx = contextvars.copy_context()
+        worker = threading.Thread(target=ctx.run, args=(tagged_worker,), name="diet-engine_0")
+        worker.start()
+        worker.join()
+    profiler.stop()
+
+    collapsed = profiler.collapsed()
+    assert profiler.samples > 0
+    assert any(
+        line.startswith("thread=diet-engine_0;meal_count=5;restrictions=vegetariano;")
+        for line in collapsed.splitlines()
+    )
+    summary = profiler.summary()
+    assert summary["by_tag"]["restrictions=vegetariano"] > 0
+    assert not summary["running"]
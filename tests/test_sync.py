@@ -0,0 +1,165 @@
+"""
+Sync offline-first: contador por usuário, deltas e mutações idempotentes (backend/sync).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from sync import (
+    SYNC_CLAIM_TIMEOUT_SECONDS,
+    SYNC_MUTATIONS,
+    SYNC_REPLAY_WINDOW,
+    apply_mutations,
+    collect_changes,
+    sync_stamp,
+)
+
+
+def test_changes_since_watermark(mongo_db):
+    async def run(db):
+        await db.user_profiles.insert_one({"_id": "u1", "name": "Ana", **await sync_stamp(db, "u1")})
+        await db.user_settings.insert_one({"user_id": "u1", "theme_preference": "dark"})  # legado, sem seq
+        snapshot = await collect_changes(db, "u1", None)
+
+        # Mudanças suficientes para sair da janela de replay
+        for i in range(SYNC_REPLAY_WINDOW + 1):
+            await db.user_profiles.update_one({"_id": "u1"}, {"$set": {"name": f"Ana {i}"}})
+            await sync_stamp(db, "u1")
+        watermark = snapshot[0] + SYNC_REPLAY_WINDOW + 1
+        await db.user_settings.update_one(
+            {"user_id": "u1"}, {"$set": {"theme_preference": "light", **await sync_stamp(db, "u1")}}
+        )
+        delta = await collect_changes(db, "u1", watermark)
+        return snapshot, delta
+
+    (first_mark, first), (second_mark, second) = asyncio.run(run(mongo_db))
+    assert first_mark == 1
+    assert set(first) == {"profile", "settings"}
+    assert second_mark == SYNC_REPLAY_WINDOW + 3
+    assert set(second) == {"settings"}
+    assert second["settings"][0]["theme_preference"] == "light"
+
+
+def test_mutations_are_applied_once(mongo_db):
+    calls = []
+
+    async def add(user_id, mutation):
+        calls.append(mutation["id"])
+        return {"total": len(calls)}
+
+    async def reject(user_id, mutation):
+        raise HTTPException(status_code=404, detail="Treino não encontrado")
+
+    async def crash(user_id, mutation):
+        raise RuntimeError("mongo caiu")
+
+    handlers = {"add": add, "reject": reject, "crash": crash}
+    batch = [
+        {"id": "m1", "type": "add"},
+        {"id": "m2", "type": "reject"},
+        {"id": "m3", "type": "crash"},
+        {"id": "m4", "type": "desconhecido"},
+    ]
+
+    async def run(db):
+        first = await apply_mutations(db, "u1", batch, handlers)
+        retry = await apply_mutations(db, "u1", batch, handlers)
+        return first, retry
+
+    first, retry = asyncio.run(run(mongo_db))
+    assert [o["status"] for o in first] == ["applied", "rejected", "failed", "rejected"]
+    # Reenvio: m1 não roda de novo, m3 (falha transitória) roda
+    assert [o["status"] for o in retry] == ["duplicate", "rejected", "failed", "rejected"]
+    assert retry[0]["result"] == {"total": 1}
+    assert calls == ["m1"]
+
+
+def test_claim_still_applying_is_not_acknowledged(mongo_db):
+    calls = []
+
+    async def add(user_id, mutation):
+        calls.append(mutation["id"])
+        return {"total": len(calls)}
+
+    async def run(db):
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=SYNC_CLAIM_TIMEOUT_SECONDS + 1)
+        await db[SYNC_MUTATIONS].insert_many([
+            # Primeira tentativa ainda rodando
+            {"_id": "u1:m1", "user_id": "u1", "type": "add", "status": "applying", "created_at": now, "claimed_at": now},
+            # Processo morreu entre a reserva e o handler
+            {"_id": "u1:m2", "user_id": "u1", "type": "add", "status": "applying", "created_at": stale, "claimed_at": stale},
+        ])
+        batch = [{"id": "m1", "type": "add"}, {"id": "m2", "type": "add"}]
+        first = await apply_mutations(db, "u1", batch, {"add": add})
+        retry = await apply_mutations(db, "u1", batch, {"add": add})
+        return first, retry, await db[SYNC_MUTATIONS].find_one({"_id": "u1:m2"})
+
+    first, retry, claim = asyncio.run(run(mongo_db))
+    assert [o["status"] for o in first] == ["in_progress", "applied"]
+    assert "result" not in first[0]
+    assert [o["status"] for o in retry] == ["in_progress", "duplicate"]
+    assert calls == ["m2"]
+    assert claim["status"] == "applied" and claim["result"] == {"total": 1}
+
+
+def test_sync_endpoint_applies_offline_queue_and_returns_delta(mongo_db, api_client):
+    from benchmarks.load_test import bind_app
+
+    async def run(db):
+        app = bind_app(db)
+        await db.user_profiles.insert_one({
+            "_id": "u1", "name": "Ana", "age": 30, "sex": "feminino", "height": 165, "weight": 62,
+            "goal": "manutencao", "weekly_training_frequency": 4, "training_level": "intermediario",
+            "available_time_per_session": 60,
+        })
+        async with api_client(app) as client:
+            snapshot = (await client.get("/api/sync/u1")).json()
+            queue = {"mutations": [
+                {"id": "w1", "type": "water", "recorded_at": datetime(2026, 5, 1, 9).isoformat(),
+                 "payload": {"water_ml": 500}},
+                {"id": "w2", "type": "water", "recorded_at": "2026-05-01T10:00:00Z", "payload": {"water_ml": 250}},
+                {"id": "c1", "type": "cardio_log", "recorded_at": "2026-05-01T11:00:00+00:00", "payload": {"exercise_name": "Bike", "duration_minutes": 20}},
+                {"id": "f1", "type": "workout_finish", "payload": {"date": "2026-05-01"}},
+            ]}
+            synced = (await client.post(f"/api/sync/u1?since={snapshot['watermark']}", json=queue)).json()
+            resent = (await client.post(f"/api/sync/u1?since={synced['watermark']}", json=queue)).json()
+        water = await db.water_sodium_tracker.find_one({"user_id": "u1"})
+        cardio = await db.cardio_sessions.count_documents({"user_id": "u1"})
+        return snapshot, synced, resent, water, cardio
+
+    snapshot, synced, resent, water, cardio = asyncio.run(run(mongo_db))
+    assert snapshot["full"] is True and snapshot["changes"]["profile"]["name"] == "Ana"
+    assert [m["status"] for m in synced["mutations"]] == ["applied"] * 4
+    assert set(synced["changes"]) == {"tracker", "cardio", "workout_days"}
+    assert synced["changes"]["tracker"][0]["date"] == "2026-05-01"
+    assert [m["status"] for m in resent["mutations"]] == ["duplicate"] * 4
+    assert water["water_ml"] == 750 and cardio == 1
+
+
+def test_onboarding_profile_write_stamps_profile_settings_and_auth_together(mongo_db, api_client):
+    from benchmarks.load_test import bind_app
+
+    async def run(db):
+        app = bind_app(db)
+        await db.users_auth.insert_one({"_id": "u1", "id": "u1", "email": "ana@x.com"})
+        async with api_client(app) as client:
+            resp = await client.post("/api/user/profile", json={
+                "id": "u1", "name": "Ana", "age": 30, "sex": "feminino", "height": 165, "weight": 62,
+                "goal": "manutencao", "weekly_training_frequency": 4, "training_level": "intermediario",
+                "available_time_per_session": 60, "meal_count": 3,
+            })
+        return (
+            resp,
+            await db.user_profiles.find_one({"_id": "u1"}),
+            await db.user_settings.find_one({"user_id": "u1"}),
+            await db.users_auth.find_one({"_id": "u1"}),
+        )
+
+    resp, profile, settings, auth = asyncio.run(run(mongo_db))
+    assert resp.status_code == 200
+    assert profile["meal_count"] == settings["meal_count"] == 6
+    assert profile["sync_seq"] == settings["sync_seq"] == 1
+    assert auth["profile_id"] == "u1"
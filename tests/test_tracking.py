@@ -0,0 +1,228 @@
+"""
+Peso em time-series com leitura dupla e buckets de água por dia (backend/tracking).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from tracking import WeightStore, find_water_day, water_history
+
+
+def test_weight_store_reads_both_collections(mongo_db):
+    async def run(db):
+        base = datetime(2026, 1, 1)
+        await db.weight_records.insert_many([
+            {"_id": "old-1", "user_id": "u1", "weight": 80.0, "recorded_at": base},
+            {"_id": "old-2", "user_id": "u1", "weight": 79.0, "recorded_at": base + timedelta(days=7)},
+        ])
+        store = WeightStore(db, legacy_read=True)
+        await store.insert({"_id": "new-1", "user_id": "u1", "weight": 78.5, "recorded_at": base + timedelta(days=14)})
+        # Já copiado pela migração: aparece uma vez só
+        await store.insert({"_id": "old-2", "user_id": "u1", "weight": 79.0, "recorded_at": base + timedelta(days=7)})
+
+        latest = await store.latest("u1")
+        records = await store.in_range("u1", base, limit=10)
+        series_only = await WeightStore(db, legacy_read=False).in_range("u1", base, limit=10)
+        deleted = await store.delete("old-2")
+        return latest, records, series_only, deleted
+
+    latest, records, series_only, deleted = asyncio.run(run(mongo_db))
+    assert latest["_id"] == "new-1"
+    assert [r["_id"] for r in records] == ["old-1", "old-2", "new-1"]
+    assert [r["_id"] for r in series_only] == ["old-2", "new-1"]
+    assert deleted == 2
+
+
+def test_water_day_lookup_falls_back_to_legacy_buckets(mongo_db):
+    async def run(db):
+        today = datetime(2026, 3, 10, 15, 30)
+        await db.water_sodium_tracker.insert_many([
+            {"_id": "legacy", "user_id": "u1", "date": today.replace(hour=8), "water_ml": 500, "sodium_mg": 100},
+            {"_id": "keyed", "user_id": "u1", "day": "2026-03-09", "date": datetime(2026, 3, 9, 9),
+             "water_ml": 2500, "sodium_mg": 800, "entries_log": [{"water_ml": 2500}]},
+        ])
+        day = await find_water_day(db, "u1", today)
+        missing = await find_water_day(db, "u1", today + timedelta(days=1))
+        history = await water_history(db, "u1", datetime(2026, 3, 1), days=7)
+        return day, missing, history
+
+    day, missing, history = asyncio.run(run(mongo_db))
+    assert day["_id"] == "legacy"
+    assert missing is None
+    assert [h["_id"] for h in history] == ["keyed", "legacy"]
+    assert all("entries_log" not in h for h in history)
+
+
+def test_migration_copies_weights_and_merges_water_days(mongo_db):
+    from migrations.tracking_timeseries import migrate_tracking
+
+    async def run(db):
+        base = datetime(2026, 2, 1, 7)
+        await db.weight_records.insert_many([
+            {"_id": f"w{i}", "user_id": "u1", "weight": 80 - i, "recorded_at": base + timedelta(days=i)}
+            for i in range(3)
+        ])
+        await db.weight_series.insert_one(
+            {"_id": "w0", "user_id": "u1", "weight": 80, "recorded_at": base}
+        )
+        await db.water_sodium_tracker.insert_many([
+            {"_id": "a", "user_id": "u1", "date": base, "water_ml": 1500, "sodium_mg": 300,
+             "water_below_minimum": True, "sodium_below_minimum": True, "entries_log": [{"water_ml": 1500}]},
+            {"_id": "b", "user_id": "u1", "date": base + timedelta(hours=5), "water_ml": 1000, "sodium_mg": 400,
+             "water_below_minimum": True, "sodium_below_minimum": True, "entries_log": [{"water_ml": 1000}]},
+        ])
+        report = await migrate_tracking(db, batch_size=2)
+        again = await migrate_tracking(db, batch_size=2)
+        water = await db.water_sodium_tracker.find({}).to_list(length=10)
+        series = await db.weight_series.count_documents({})
+        return report, again, water, series
+
+    report, again, water, series = asyncio.run(run(mongo_db))
+    assert report["weight"] == {"scanned": 3, "copied": 2}
+    assert again["weight"]["copied"] == 0 and again["water"] == {"keyed": 0, "merged": 0}
+    assert series == 3
+    assert report["water"] == {"keyed": 1, "merged": 1}
+    assert len(water) == 1
+    bucket = water[0]
+    assert bucket["day"] == "2026-02-01"
+    assert (bucket["water_ml"], bucket["sodium_mg"]) == (2500, 700)
+    assert len(bucket["entries_log"]) == 2
+    assert not bucket["water_below_minimum"] and not bucket["sodium_below_minimum"]
+
+
+def on_insert(moment, bucket_id=None):
+    return {"_id": bucket_id or f"b-{moment:%Y%m%d}", "date": moment.replace(hour=0, minute=0), "water_target_ml": 3000}
+
+
+def log(moment, water=0, sodium=0):
+    return {"time": moment.isoformat(), "water_ml": water, "sodium_mg": sodium, "notes": None}
+
+
+def test_concurrent_adds_do_not_lose_water(mongo_db):
+    from tracking import add_water_entry
+
+    async def run(db):
+        now = datetime(2026, 4, 2, 12)
+        await asyncio.gather(*[
+            add_water_entry(db, "u1", log(now, water=250, sodium=50), on_insert(now, f"b{i}"), now)
+            for i in range(12)
+        ])
+        return await db.water_sodium_tracker.find({}).to_list(length=20)
+
+    buckets = asyncio.run(run(mongo_db))
+    assert len(buckets) == 1
+    bucket = buckets[0]
+    assert (bucket["water_ml"], bucket["sodium_mg"]) == (3000, 600)
+    assert len(bucket["entries_log"]) == 12
+    assert bucket["water_below_minimum"] is False and bucket["sodium_below_minimum"] is False
+
+
+def test_first_write_of_the_day_adopts_legacy_bucket(mongo_db):
+    from tracking import add_water_entry
+
+    async def run(db):
+        now = datetime(2026, 4, 2, 18)
+        await db.water_sodium_tracker.insert_one({
+            "_id": "legacy", "user_id": "u1", "date": datetime(2026, 4, 2),
+            "water_ml": 1200, "sodium_mg": 200, "entries_log": [log(now.replace(hour=9), 1200, 200)],
+        })
+        bucket = await add_water_entry(db, "u1", log(now, water=300), on_insert(now), now)
+        return bucket, await db.water_sodium_tracker.count_documents({})
+
+    bucket, count = asyncio.run(run(mongo_db))
+    assert count == 1
+    assert bucket["day"] == "2026-04-02" and bucket["water_ml"] == 1500
+    assert [e["water_ml"] for e in bucket["entries_log"]] == [1200, 300]
+    assert bucket["water_below_minimum"] is True
+
+
+def test_offline_batch_is_grouped_by_day(mongo_db):
+    from tracking import add_water_entries
+
+    async def run(db):
+        now = datetime(2026, 4, 3, 8)
+        yesterday = now - timedelta(days=1)
+        entries = [(yesterday, log(yesterday, 1500)), (yesterday, log(yesterday, 800, 600)), (now, log(now, 200))]
+        days = await add_water_entries(db, "u1", entries, on_insert, now)
+        stored = await db.water_sodium_tracker.find({}).sort("day", 1).to_list(length=10)
+        return days, stored
+
+    days, stored = asyncio.run(run(mongo_db))
+    assert days == ["2026-04-02", "2026-04-03"]
+    assert [(b["water_ml"], b["water_below_minimum"]) for b in stored] == [(2300, False), (200, True)]
+    assert stored[0]["sodium_below_minimum"] is False and len(stored[0]["entries_log"]) == 2
+
+
+def test_batch_endpoint_accepts_utc_offsets(mongo_db, api_client):
+    from benchmarks.load_test import bind_app
+
+    async def run(db):
+        app = bind_app(db)
+        await db.user_profiles.insert_one({"_id": "u1"})
+        entries = [
+            {"water_ml": 300, "recorded_at": "2026-04-02T10:00:00Z"},
+            {"water_ml": 200, "recorded_at": "2026-04-02T23:30:00-03:00"},  # 02:30 UTC do dia 3
+            {"water_ml": 100, "recorded_at": "2999-01-01T00:00:00+00:00"},  # relógio adiantado
+        ]
+        async with api_client(app) as client:
+            response = await client.post("/api/tracker/water-sodium/u1/batch", json={"entries": entries})
+        stored = await db.water_sodium_tracker.find({}).sort("day", 1).to_list(length=10)
+        return response, stored
+
+    response, stored = asyncio.run(run(mongo_db))
+    assert response.status_code == 200 and response.json()["applied"] == 3
+    assert [(b["day"], b["water_ml"]) for b in stored][:2] == [("2026-04-02", 300), ("2026-04-03", 200)]
+    assert stored[-1]["day"] <= datetime.utcnow().strftime("%Y-%m-%d")
+
+
+class VersionedDb:
+    """Banco mock que se apresenta como outra versão do MongoDB e registra create_collection"""
+
+    def __init__(self, db, version):
+        self.db, self.version, self.created = db, version, []
+
+    async def command(self, name):
+        return {"ok": 1.0, "versionArray": list(self.version)}
+
+    async def create_collection(self, name, **options):
+        self.created.append((name, options))
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+    def __getitem__(self, name):
+        return self.db[name]
+
+
+def test_weight_series_is_timeseries_only_on_mongodb_7(mongo_db):
+    from tracking.collections import ensure_weight_series
+
+    async def run():
+        old, new = VersionedDb(mongo_db, (6, 0, 14)), VersionedDb(mongo_db, (7, 0, 2))
+        await ensure_weight_series(old)
+        await mongo_db.drop_collection("weight_series")  # o índice criou a coleção comum
+        await ensure_weight_series(new)
+        return old.created, new.created
+
+    old, new = asyncio.run(run())
+    assert old == []
+    assert new[0][0] == "weight_series" and new[0][1]["timeseries"]["metaField"] == "user_id"
+
+
+def test_delete_refused_by_timeseries_returns_501(mongo_db, api_client):
+    from pymongo.errors import OperationFailure
+
+    from benchmarks.load_test import bind_app
+    import server
+
+    class OldTimeseries:
+        async def delete_one(self, query):
+            raise OperationFailure("Cannot perform a delete with a non-metaField predicate on a time-series")
+
+    async def run():
+        app = bind_app(mongo_db)
+        server.weight_store.series = OldTimeseries()
+        async with api_client(app) as client:
+            return await client.delete("/api/progress/weight/w1")
+
+    assert asyncio.run(run()).status_code == 501
@@ -0,0 +1,59 @@
+"""
+Tendência de peso vetorizada e downsampling LTTB (backend/tracking/trends.py).
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from tracking.trends import TREND_MAX_POINTS, ewma, lttb, weight_trend
+
+BASE = datetime(2025, 1, 1)
+
+
+def series(days, weights):
+    return [{"recorded_at": BASE + timedelta(days=float(d)), "weight": float(w)} for d, w in zip(days, weights)]
+
+
+def test_ewma_matches_recursive_definition_on_irregular_spacing():
+    rng = np.random.default_rng(7)
+    t = np.sort(rng.uniform(0, 400, 150))
+    y = rng.normal(80, 1, 150)
+    expected, norm = [y[0]], 1.0
+    for i in range(1, y.size):
+        norm = norm * 0.5 ** ((t[i] - t[i - 1]) / 7.0) + 1.0
+        expected.append(expected[-1] + (y[i] - expected[-1]) / norm)
+    assert np.allclose(ewma(t, y), expected)
+    # Histórico longo (e^x estouraria): mesmo resultado pela recursão
+    assert np.allclose(ewma(t * 20, y), ewma(t * 20, y, half_life_days=7.0))
+
+
+def test_lttb_keeps_endpoints_and_peak():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[500] = 10
+    idx = lttb(x, y, 50)
+    assert idx.size == 50 and idx[0] == 0 and idx[-1] == 999
+    assert 500 in idx and np.all(np.diff(idx) > 0)
+
+
+def test_weight_trend_rejects_outliers_and_projects_goal():
+    days = np.arange(0, 700, 2)
+    weights = 90 - 0.1 * days / 7 + np.random.default_rng(3).normal(0, 0.2, days.size)
+    weights[100] = 9.0  # vírgula no lugar errado
+    records = series(days, weights)
+    now = records[-1]["recorded_at"]
+    trend = weight_trend(records, target_weight=79, now=now)
+
+    assert len(trend["points"]) == TREND_MAX_POINTS
+    assert trend["outliers"] == 1
+    assert abs(trend["weekly_rate"] + 0.1) < 0.01
+    assert trend["min"] == 9.0 and all(p["trend"] > 79 for p in trend["points"])
+    projected = datetime.strptime(trend["projected_goal_date"], "%Y-%m-%d")
+    assert timedelta(weeks=8) < projected - now < timedelta(weeks=13)
+
+
+def test_weight_trend_without_target_or_movement():
+    trend = weight_trend(series([0, 7], [80, 80]), target_weight=70)
+    assert abs(trend["weekly_rate"]) < 1e-9 and trend["projected_goal_date"] is None
+    assert [p["value"] for p in trend["points"]] == [80.0, 80.0]
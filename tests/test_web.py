@@ -0,0 +1,112 @@
+"""
+Compressão (Brotli/GZip) e GET condicional com ETag (backend/web).
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request, Response
+
+from web import CompressionMiddleware, etag_matches, not_modified, plan_etag
+
+PLAN = {"_id": "plan-1", "revision": 3, "meals": [{"name": f"Refeição {i}", "foods": ["arroz"] * 50} for i in range(6)]}
+
+
+def build_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/plan")
+    async def plan(request: Request, response: Response):
+        etag = plan_etag(PLAN, "training", "pt")
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        return PLAN
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    return app
+
+
+@pytest.fixture
+def fetch(api_client):
+    def get(path, headers):
+        async def run():
+            async with api_client(build_app()) as client:
+                return await client.get(path, headers=headers)
+        return asyncio.run(run())
+    return get
+
+
+def test_large_responses_are_compressed_with_preferred_encoding(fetch):
+    br = fetch("/plan", {"accept-encoding": "gzip, br"})
+    assert br.headers["content-encoding"] == "br"
+    assert "accept-encoding" in br.headers["vary"].lower()
+    assert br.json() == PLAN
+
+    gz = fetch("/plan", {"accept-encoding": "gzip, br;q=0"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.json() == PLAN
+
+    identity = fetch("/plan", {"accept-encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+
+def test_small_responses_are_not_compressed(fetch):
+    response = fetch("/small", {"accept-encoding": "gzip, br"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+def test_etag_survives_compression_and_yields_304(fetch):
+    first = fetch("/plan", {"accept-encoding": "br"})
+    etag = first.headers["etag"]
+    assert etag.endswith('-br"')
+
+    again = fetch("/plan", {"accept-encoding": "br", "if-none-match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    plain = fetch("/plan", {"accept-encoding": "identity", "if-none-match": etag})
+    assert plain.status_code == 304
+
+
+def test_plan_etag_changes_with_revision_and_variant():
+    base = plan_etag(PLAN, "training", "pt")
+    assert base == plan_etag(dict(PLAN), "training", "pt")
+    assert base != plan_etag({**PLAN, "revision": 4}, "training", "pt")
+    assert base != plan_etag(PLAN, "rest", "pt")
+    assert base != plan_etag(PLAN, "training", "en")
+    assert etag_matches(f'W/{base}, "other"', base)
+    assert not etag_matches('"other"', base)
+
+
+def test_json_response_matches_default_encoder_and_keeps_headers():
+    import json
+    from datetime import datetime
+
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import BaseModel
+
+    from web import json_response
+
+    class Food(BaseModel):
+        key: str
+        grams: float
+        added_at: datetime
+
+    content = {
+        "_id": "plan-1",
+        "foods": [Food(key="arroz_branco", grams=150.0, added_at=datetime(2026, 1, 2, 3, 4, 5, 678))],
+        "created_at": datetime(2026, 1, 2),
+    }
+    injected = Response()
+    injected.headers["ETag"] = '"abc"'
+
+    response = json_response(content, injected)
+    assert json.loads(response.body) == jsonable_encoder(content)
+    assert response.headers["etag"] == '"abc"'
+    assert response.media_type == "application/json"
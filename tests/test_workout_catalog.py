@@ -0,0 +1,97 @@
+"""
+Catálogo indexado de exercícios (backend/workout/catalog.py) contra a
+seleção antiga por substring (tests/legacy_workout.py).
+"""
+
+import pytest
+
+from . import legacy_workout as legacy
+from workout import (
+    CATALOG,
+    catalog_level,
+    full_body_exercise_ids,
+    get_candidates,
+    muscle_exercise_ids,
+)
+from workout_service import WorkoutAIService
+
+LEVELS = ("novato", "iniciante", "intermediario", "avancado")
+
+# (apenas máquinas, bloqueios) de cada configuração do gerador antigo
+LEGACY_FILTERS = {
+    (True, "novato"): (True, []),  # fase de adaptação
+    (False, "novato"): (True, []),
+    (False, "iniciante"): (False, ["supino_barra", "agachamento_livre", "stiff_livre"]),
+    (False, "intermediario"): (False, []),
+    (False, "avancado"): (False, []),
+}
+
+
+def legacy_filter(available, machine_only, blocked):
+    """Filtro por substring do gerador antigo (sem o fallback)"""
+    filtered = []
+    for ex in available:
+        ex_name_lower = ex["name"].lower()
+        if machine_only:
+            if "máquina" in ex_name_lower or "polia" in ex_name_lower or "pulley" in ex_name_lower or "leg press" in ex_name_lower or "cadeira" in ex_name_lower or "mesa" in ex_name_lower or "cross" in ex_name_lower or "smith" in ex_name_lower:
+                filtered.append(ex)
+        else:
+            is_blocked = False
+            if "supino" in ex_name_lower and "barra" in ex_name_lower and "supino_barra" in blocked:
+                is_blocked = True
+            if "rosca" in ex_name_lower and "barra" in ex_name_lower and "direta" in ex_name_lower:
+                is_blocked = True
+            if "agachamento" in ex_name_lower and "livre" in ex_name_lower and "agachamento_livre" in blocked:
+                is_blocked = True
+            if "stiff" in ex_name_lower and "livre" in ex_name_lower and "stiff_livre" in blocked:
+                is_blocked = True
+            if not is_blocked:
+                filtered.append(ex)
+    return filtered
+
+
+def names(exercise_ids):
+    return [CATALOG[ex_id].name for ex_id in exercise_ids]
+
+
+def test_catalog_mirrors_legacy_exercise_list():
+    for muscle, exercises in legacy.EXERCISES.items():
+        compiled = [CATALOG[ex_id] for ex_id in muscle_exercise_ids(muscle)]
+        assert [(e.name, e.focus, e.notes) for e in compiled] == [(e["name"], e.get("focus"), e["notes"]) for e in exercises]
+        assert all(e.muscle == muscle for e in compiled)
+
+
+@pytest.mark.parametrize("frequency", range(1, 8))
+def test_candidates_match_legacy_filter_for_every_split_and_level(frequency):
+    muscles = {m for day in legacy.get_split_for_frequency(frequency) for m in day["muscles"]}
+    for (is_adaptation, level), (machine_only, blocked) in LEGACY_FILTERS.items():
+        for muscle in muscles:
+            expected = [e["name"] for e in legacy_filter(legacy.EXERCISES[muscle], machine_only, blocked)]
+            assert names(get_candidates(muscle, catalog_level(level, is_adaptation))) == expected, (level, muscle)
+
+
+def test_unknown_level_uses_advanced_candidates():
+    assert catalog_level("elite") == "avancado"
+    assert catalog_level("avancado", is_adaptation=True) == "novato"
+    assert get_candidates("peito", catalog_level("elite")) == get_candidates("peito", "avancado")
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_full_body_keeps_legacy_selection_with_catalog_notes(level):
+    service, old = WorkoutAIService(), legacy.WorkoutAIService()
+    for duration in (30, 45, 60, 75, 90, 120):
+        user = {"user_id": "u1", "weekly_training_frequency": 1, "training_level": level,
+                "available_time_per_session": duration, "completed_workouts": 40}
+        (day,), (old_day,) = service.generate_workout_plan(user).workout_days, old.generate_workout_plan(user).workout_days
+        expected_ids = full_body_exercise_ids(duration)
+
+        assert (day.name, day.day, day.duration) == (old_day.name, old_day.day, old_day.duration)
+        assert [(e.name, e.muscle_group, e.sets, e.reps, e.rest) for e in day.exercises] == \
+            [(e.name, e.muscle_group, e.sets, e.reps, e.rest) for e in old_day.exercises]
+        # Lista do catálogo cortada pelo máximo de exercícios (mínimo 7)
+        assert [e.name for e in day.exercises] == names(expected_ids)[:len(day.exercises)]
+        assert len(day.exercises) >= 7
+        # Mudança intencional: foco e instruções completas vêm do catálogo
+        for exercise, ex_id in zip(day.exercises, expected_ids):
+            assert exercise.focus == CATALOG[ex_id].focus
+            assert exercise.notes.endswith(CATALOG[ex_id].notes)
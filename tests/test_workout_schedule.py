@@ -0,0 +1,112 @@
+"""
+Agenda semanal pré-calculada do ciclo de treino (backend/workout/schedule.py).
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+from workout import (
+    WEEKDAY_NAMES,
+    build_weekly_schedule,
+    is_schedule_current,
+    iter_schedule_range,
+    resolve_day,
+)
+
+SUNDAY = date(2026, 5, 3)
+
+
+def test_weekday_convention_starts_on_sunday():
+    schedule = build_weekly_schedule([1, 3, 5], 3)
+    resolved = [resolve_day(schedule, SUNDAY, SUNDAY + timedelta(days=i)) for i in range(7)]
+
+    assert [d["weekday"] for d in resolved] == list(range(7))
+    assert [d["weekday_name"] for d in resolved] == list(WEEKDAY_NAMES)
+    assert WEEKDAY_NAMES[0] == "Domingo" and WEEKDAY_NAMES[6] == "Sábado"
+    # training_days também usa 0=Domingo: 1,3,5 = Segunda, Quarta, Sexta
+    assert [d["weekday_name"] for d in resolved if d["is_training_day"]] == ["Segunda", "Quarta", "Sexta"]
+
+
+def test_training_days_schedule_is_indexed_by_weekday():
+    full_body = build_weekly_schedule([5, 1, 3], 3)
+    ppl = build_weekly_schedule([1, 2, 3, 4, 5, 6], 6)
+
+    assert full_body["mode"] == "training_days" and full_body["training_split"] == "full_body"
+    assert [d["day_type"] for d in full_body["days"]] == ["rest", "train", "rest", "train", "rest", "train", "rest"]
+    assert [d["workout_index"] for d in full_body["days"] if d["day_type"] == "train"] == [0, 1, 2]
+    assert [d["workout_name"] for d in ppl["days"]] == [None, "Push", "Pull", "Legs", "Push", "Pull", "Legs"]
+    assert build_weekly_schedule([0, 2], 2, "ppl")["days"][2]["workout_name"] == "Pull"
+
+
+def test_division_schedule_follows_cycle_days_from_start_date():
+    schedule = build_weekly_schedule([], 3)
+    start = date(2026, 5, 6)  # quarta
+    first, day_one, day_seven, day_eight = (
+        resolve_day(schedule, start, start + timedelta(days=n)) for n in (0, 1, 7, 8)
+    )
+
+    assert schedule["mode"] == "division" and schedule["cycle_training_days"] == [1, 3, 5]
+    assert first["day_type"] == "rest" and first["is_first_day"] and first["weekday"] == 3
+    assert (day_one["cycle_day"], day_one["cycle_week"], day_one["day_type"]) == (1, 1, "train")
+    assert (day_seven["cycle_day"], day_seven["day_type"]) == (7, "rest")
+    assert (day_eight["cycle_day"], day_eight["cycle_week"], day_eight["day_type"]) == (1, 2, "train")
+    assert build_weekly_schedule(None, 9)["cycle_training_days"] == [1, 2, 4, 5]
+
+
+def test_iter_schedule_range_is_inclusive_and_crosses_year():
+    schedule = build_weekly_schedule([1, 3, 5], 3)
+    first, last = date(2026, 12, 27), date(2027, 1, 9)
+    days = list(iter_schedule_range(schedule, "2026-01-01", first, last))
+
+    assert len(days) == 14
+    assert (days[0]["date"], days[-1]["date"]) == ("2026-12-27", "2027-01-09")
+    assert [d["date"] for d in days] == [(first + timedelta(days=i)).isoformat() for i in range(14)]
+    assert [d["weekday"] for d in days] == [i % 7 for i in range(14)]
+    assert [d["day_type"] for d in days] == [resolve_day(schedule, "2026-01-01", d["date"])["day_type"] for d in days]
+    assert [d["date"] for d in iter_schedule_range(schedule, None, first, first)] == ["2026-12-27"]
+    assert list(iter_schedule_range(schedule, None, last, first)) == []
+
+
+def test_schedule_key_tracks_profile_changes():
+    schedule = build_weekly_schedule([1, 3, 5], 3, "full_body")
+
+    assert is_schedule_current(schedule, [5, 3, 1], 3, None)
+    assert not is_schedule_current(schedule, [1, 3], 3, "full_body")
+    assert not is_schedule_current(schedule, [1, 3, 5], 3, "ppl")
+    assert not is_schedule_current(None, [1, 3, 5], 3, "full_body")
+
+
+def test_schedule_endpoint_returns_range_with_sessions(mongo_db, api_client):
+    from benchmarks.load_test import bind_app
+
+    async def run(db):
+        app = bind_app(db)
+        await db.user_profiles.insert_one({"_id": "u1", "weekly_training_frequency": 3, "training_days": [1, 3, 5]})
+        await db.training_cycles.insert_one({"user_id": "u1", "start_date": "2026-04-01", "frequency": 3})
+        await db.training_sessions.insert_one({"user_id": "u1", "date": "2026-05-04", "completed": True})
+        async with api_client(app) as client:
+            week = await client.get("/api/training-cycle/schedule/u1", params={"start": "2026-05-03", "end": "2026-05-09"})
+            status = await client.get("/api/workout/status/u1", params={"date": "2026-05-03"})
+            errors = [
+                (await client.get("/api/training-cycle/schedule/u1", params=params)).status_code
+                for params in (
+                    {"start": "03/05/2026", "end": "2026-05-09"},
+                    {"start": "2026-05-09", "end": "2026-05-03"},
+                    {"start": "2026-01-01", "end": "2027-01-02"},
+                )
+            ]
+            missing = await client.get("/api/training-cycle/schedule/ghost", params={"start": "2026-05-03", "end": "2026-05-03"})
+        cycle = await db.training_cycles.find_one({"user_id": "u1"})
+        return week, status, errors, missing, cycle
+
+    week, status, errors, missing, cycle = asyncio.run(run(mongo_db))
+    assert week.status_code == 200
+    days = week.json()["days"]
+    assert [d["weekday"] for d in days] == list(range(7))
+    assert [d["day_type"] for d in days] == ["rest", "train", "rest", "train", "rest", "train", "rest"]
+    assert [d["date"] for d in days if d["has_trained"]] == ["2026-05-04"]
+    assert days[1]["calorie_multiplier"] == 1.05 and days[0]["carb_multiplier"] == 0.80
+    assert cycle["schedule_key"] == cycle["weekly_schedule"]["key"]
+    assert status.json()["day_of_week"] == 0 and status.json()["is_scheduled_training_day"] is False
+    assert errors == [400, 400, 400]
+    assert missing.status_code == 404
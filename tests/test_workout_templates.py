@@ -0,0 +1,107 @@
+"""
+Templates de treino memoizados e carimbados por usuário (backend/workout_service.py).
+"""
+
+import itertools
+
+import pytest
+
+from . import legacy_workout
+from workout_service import (
+    PREWARM_DURATIONS,
+    WorkoutAIService,
+    WorkoutPlan,
+    get_workout_template,
+    prewarm_workout_templates,
+    stamp_workout_template,
+)
+
+LEVELS = ("novato", "iniciante", "intermediario", "avancado")
+DURATIONS = (20, 30, 45, 60, 75, 90, 120)
+PROGRESS = (0, 29, 30)
+
+
+def profile(frequency, level, duration, completed=0, goal="bulking", user_id="u1"):
+    return {
+        "user_id": user_id, "weekly_training_frequency": frequency, "training_level": level,
+        "available_time_per_session": duration, "completed_workouts": completed, "goal": goal,
+    }
+
+
+def without_ids(plan):
+    """Plano sem ids e timestamp (mudam a cada geração)"""
+    data = plan.model_dump(exclude={"id", "created_at"})
+    for day in data["workout_days"]:
+        day.pop("id")
+        for exercise in day["exercises"]:
+            exercise.pop("id")
+    return data
+
+
+def ids(plan):
+    return {plan.id} | {d.id for d in plan.workout_days} | {e.id for d in plan.workout_days for e in d.exercises}
+
+
+# Full Body (1x/semana) mudou de propósito no catálogo indexado (user-029)
+@pytest.mark.parametrize("frequency", range(2, 8))
+def test_cached_generator_matches_legacy_generator(frequency):
+    service, legacy = WorkoutAIService(), legacy_workout.WorkoutAIService()
+    for level, duration, completed, goal in itertools.product(LEVELS, DURATIONS, PROGRESS, ("bulking", "cutting")):
+        user = profile(frequency, level, duration, completed, goal)
+        assert without_ids(service.generate_workout_plan(user)) == without_ids(legacy.generate_workout_plan(user)), user
+
+
+@pytest.mark.parametrize("frequency", range(1, 8))
+def test_cached_generator_matches_uncached_build(frequency):
+    service = WorkoutAIService()
+    for level, duration, completed in itertools.product(LEVELS, DURATIONS, PROGRESS):
+        plan = service.generate_workout_plan(profile(frequency, level, duration, completed))
+        effective = min(frequency, {"novato": 3, "iniciante": 5}.get(level, 7))
+        fresh = service._build_workout_template(effective, level, duration, level == "novato" and completed < 30)
+        assert without_ids(plan) == without_ids(stamp_workout_template(fresh, "u1", "bulking", completed))
+
+
+def test_stamped_plans_are_independent_copies():
+    service = WorkoutAIService()
+    user = profile(4, "intermediario", 60)
+    template = get_workout_template(4, "intermediario", 60, False)
+    snapshot = [(dict(day), [dict(ex) for ex in exercises]) for day, exercises in template.days]
+
+    first = service.generate_workout_plan(user)
+    expected = without_ids(first)
+    first.notes = "alterado"
+    first.workout_days[0].name = "alterado"
+    first.workout_days[0].exercises[0].sets = 99
+    first.workout_days[0].exercises[0].completed = True
+    first.workout_days[0].exercises.append(first.workout_days[1].exercises[0])
+    first.workout_days.pop()
+
+    second = service.generate_workout_plan(user)
+    assert without_ids(second) == expected
+    assert [(dict(day), [dict(ex) for ex in exercises]) for day, exercises in template.days] == snapshot
+    assert get_workout_template(4, "intermediario", 60, False) is template
+    assert not ids(first) & ids(second)
+
+
+def test_adaptation_notes_are_stamped_per_user():
+    service = WorkoutAIService()
+    early = service.generate_workout_plan(profile(3, "novato", 45, completed=5, user_id="a"))
+    late = service.generate_workout_plan(profile(3, "novato", 45, completed=28, user_id="b", goal="cutting"))
+
+    assert "{remaining}" not in early.notes and "{remaining}" not in late.notes
+    assert early.notes != late.notes
+    assert (early.user_id, late.user_id, late.goal) == ("a", "b", "cutting")
+    # Construído sem revalidar, mas continua um WorkoutPlan válido
+    assert WorkoutPlan.model_validate(late.model_dump()).model_dump() == late.model_dump()
+
+
+def test_prewarm_fills_cache_with_onboarding_combinations():
+    get_workout_template.cache_clear()
+    cached = prewarm_workout_templates()
+    # novato: 3 frequências x 2 fases; iniciante: 5; intermediário/avançado: 7
+    assert cached == (3 * 2 + 5 + 7 + 7) * len(PREWARM_DURATIONS)
+
+    hits = get_workout_template.cache_info().hits
+    WorkoutAIService().generate_workout_plan(profile(7, "novato", 60, completed=40))
+    assert get_workout_template.cache_info().hits == hits + 1
+    assert get_workout_template.cache_info().currsize == cached